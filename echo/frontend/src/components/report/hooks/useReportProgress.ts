@@ -39,6 +39,10 @@ export const useReportProgress = (
 						return; // Don't overwrite meaningful progress message
 					}
 					setProgress(data);
+					// The server ends the stream here; don't let EventSource reconnect.
+					if (data.type === "completed" || data.type === "failed") {
+						eventSource.close();
+					}
 				} catch {
 					// ignore parse errors
 				}
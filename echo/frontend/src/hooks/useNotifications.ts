@@ -1,4 +1,5 @@
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
+import { useEffect, useState } from "react";
 import { API_BASE_URL } from "@/config";
 
 /**
@@ -77,18 +78,94 @@ export const useNotifications = () =>
 	useQuery({
 		queryFn: fetchNotifications,
 		queryKey: ["v2", "notifications"],
-		// Light polling so the badge stays honest without a websocket.
+		// Light polling for the list; the badge count is pushed (see below).
 		refetchInterval: 60_000,
 		staleTime: 30_000,
 	});
 
-export const useUnreadNotificationCount = () =>
-	useQuery({
+const UNREAD_COUNT_QUERY_KEY = ["v2", "notifications", "unread-count"];
+// Only while the badge stream is down.
+const UNREAD_FALLBACK_POLL_MS = 60_000;
+
+type BadgeStreamState = { connected: boolean; unread: number | null };
+
+// One badge stream per tab, shared + ref-counted: the inbox badge is rendered
+// by several components at once and they should not each open a connection.
+const badgeStream = {
+	listeners: new Set<(state: BadgeStreamState) => void>(),
+	refCount: 0,
+	source: null as EventSource | null,
+	state: { connected: false, unread: null } as BadgeStreamState,
+};
+
+const notifyBadge = () => {
+	for (const listener of badgeStream.listeners) listener(badgeStream.state);
+};
+
+const openBadgeSource = () => {
+	const source = new EventSource(
+		`${API_BASE_URL}/v2/me/notifications/unread-count/stream`,
+		{ withCredentials: true },
+	);
+	badgeStream.source = source;
+	source.addEventListener("unread", (event: Event) => {
+		if (!(event instanceof MessageEvent)) return;
+		try {
+			const data = JSON.parse(event.data) as { unread?: unknown };
+			if (typeof data.unread !== "number") return;
+			badgeStream.state = { connected: true, unread: data.unread };
+			notifyBadge();
+		} catch {
+			// Ignore a malformed frame; the next count recovers.
+		}
+	});
+	source.onerror = () => {
+		// Auto-reconnects (unless closed for good); poll meanwhile.
+		badgeStream.state = { ...badgeStream.state, connected: false };
+		notifyBadge();
+	};
+};
+
+const subscribeToBadge = (
+	listener: (state: BadgeStreamState) => void,
+): (() => void) => {
+	badgeStream.listeners.add(listener);
+	badgeStream.refCount += 1;
+	if (badgeStream.refCount === 1) openBadgeSource();
+	listener(badgeStream.state);
+	return () => {
+		badgeStream.listeners.delete(listener);
+		badgeStream.refCount -= 1;
+		if (badgeStream.refCount <= 0) {
+			badgeStream.source?.close();
+			badgeStream.source = null;
+			badgeStream.state = { connected: false, unread: null };
+		}
+	};
+};
+
+export const useUnreadNotificationCount = () => {
+	const queryClient = useQueryClient();
+	const [streaming, setStreaming] = useState(false);
+
+	useEffect(() => {
+		if (typeof EventSource === "undefined") return;
+		return subscribeToBadge((state) => {
+			setStreaming(state.connected);
+			if (state.unread !== null) {
+				queryClient.setQueryData(UNREAD_COUNT_QUERY_KEY, state.unread);
+			}
+		});
+	}, [queryClient]);
+
+	return useQuery({
 		queryFn: fetchUnreadCount,
-		queryKey: ["v2", "notifications", "unread-count"],
-		refetchInterval: 60_000,
+		queryKey: UNREAD_COUNT_QUERY_KEY,
+		// The badge stream pushes every change; polling is only the fallback.
+		refetchInterval: streaming ? false : UNREAD_FALLBACK_POLL_MS,
 		staleTime: 30_000,
 	});
+};
 
 export const useMarkNotificationRead = () => {
 	const queryClient = useQueryClient();
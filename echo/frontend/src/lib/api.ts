@@ -1367,6 +1367,10 @@ export const streamAgenticRun = async (
 	const reader = response.body.getReader();
 	const decoder = new TextDecoder();
 	let buffer = "";
+	// Full draft text per message: checkpoints replace it, deltas extend it.
+	// The server only forwards deltas that line up, so a mismatch means a
+	// frame from before a checkpoint and is dropped.
+	const draftTexts = new Map<string, string>();
 
 	try {
 		while (true) {
@@ -1383,18 +1387,33 @@ export const streamAgenticRun = async (
 				if (parsed) {
 					if (parsed.eventType === "heartbeat") {
 						options.onHeartbeat?.();
-					} else if (parsed.eventType === "assistant.draft") {
+					} else if (
+						parsed.eventType === "assistant.draft" ||
+						parsed.eventType === "assistant.draft.delta"
+					) {
 						// Drafts have no seq and must never reach the onEvent merge map.
 						if (parsed.data) {
 							try {
 								const frame = JSON.parse(parsed.data) as {
-									payload?: AgenticDraftPayload;
+									payload?: AgenticDraftPayload & { offset?: number };
 								};
-								if (
-									typeof frame.payload?.message_id === "string" &&
-									typeof frame.payload?.text === "string"
-								) {
-									options.onDraft?.(frame.payload);
+								const messageId = frame.payload?.message_id;
+								const text = frame.payload?.text;
+								if (typeof messageId === "string" && typeof text === "string") {
+									if (parsed.eventType === "assistant.draft") {
+										draftTexts.set(messageId, text);
+										options.onDraft?.({ message_id: messageId, text });
+									} else {
+										const current = draftTexts.get(messageId);
+										if (
+											current !== undefined &&
+											frame.payload?.offset === current.length
+										) {
+											const next = current + text;
+											draftTexts.set(messageId, next);
+											options.onDraft?.({ message_id: messageId, text: next });
+										}
+									}
 								}
 							} catch {
 								// Ignore malformed frames and continue streaming.
@@ -1772,15 +1791,90 @@ export type VerificationArtifactDetail = {
 	read_aloud_stream_url: string;
 };
 
+type VerificationJobEvent = {
+	type: string;
+	message: string;
+	detail?: {
+		artifact_list?: VerificationArtifact[];
+	} | null;
+};
+
+// Matches the server's in-flight claim TTL; a job still running by then is lost.
+const VERIFICATION_JOB_TIMEOUT_MS = 15 * 60 * 1000;
+
+// Follows a generation job over SSE until it completes or fails. If the stream
+// closes for good, the job's last state is read once over plain GET instead.
+const waitForVerificationJob = (
+	jobId: string,
+	signal?: AbortSignal,
+): Promise<VerificationArtifact[]> =>
+	new Promise((resolve, reject) => {
+		const eventSource = new EventSource(
+			`${API_BASE_URL}/verify/generate/${jobId}/progress`,
+		);
+
+		const close = () => {
+			eventSource.close();
+			clearTimeout(timeout);
+			signal?.removeEventListener("abort", onAbort);
+		};
+		const settle = (data: VerificationJobEvent) => {
+			if (data.type === "completed") {
+				close();
+				resolve(data.detail?.artifact_list ?? []);
+			} else if (data.type === "failed") {
+				close();
+				reject(new Error(data.message));
+			}
+		};
+		const onAbort = () => {
+			close();
+			reject(new DOMException("Aborted", "AbortError"));
+		};
+		const timeout = setTimeout(() => {
+			close();
+			reject(new Error("Verification artifact generation timed out"));
+		}, VERIFICATION_JOB_TIMEOUT_MS);
+		signal?.addEventListener("abort", onAbort);
+
+		eventSource.addEventListener("progress", (ev: Event) => {
+			if (!(ev instanceof MessageEvent)) return;
+			let data: VerificationJobEvent;
+			try {
+				data = JSON.parse(ev.data) as VerificationJobEvent;
+			} catch {
+				return;
+			}
+			settle(data);
+		});
+		eventSource.onerror = () => {
+			// EventSource reconnects by itself and the job state is replayed on
+			// reconnect; CLOSED means it gave up (e.g. a 404 for an expired job).
+			if (eventSource.readyState !== EventSource.CLOSED) return;
+			close();
+			apiNoAuth
+				.get<unknown, VerificationJobEvent>(`/verify/generate/${jobId}`, {
+					signal,
+				})
+				.then((data) => {
+					settle(data);
+					reject(new Error("Lost connection to verification job"));
+				})
+				.catch(reject);
+		};
+	});
+
 export const generateVerificationArtefact = async (payload: {
 	conversationId: string;
 	topicList: string[];
 	signal?: AbortSignal;
 }): Promise<VerificationArtifact[]> => {
+	// A repeated request for the same conversation and topic joins the running job.
 	const response = await apiNoAuth.post<
 		unknown,
 		{
-			artifact_list?: VerificationArtifact[];
+			job_id: string;
+			created: boolean;
 		}
 	>(
 		"/verify/generate",
@@ -1793,7 +1887,7 @@ export const generateVerificationArtefact = async (payload: {
 		},
 	);
 
-	return response?.artifact_list ?? [];
+	return waitForVerificationJob(response.job_id, payload.signal);
 };
 
 export type UpdateVerificationArtefactPayload = {
@@ -0,0 +1,278 @@
+"""Redis Streams log for agentic run events, persisted to Directus write-behind.
+
+Every agentic run event used to cost three Directus round trips on append
+(max-seq read, create, run update) and every idle SSE watcher re-queried
+Directus once a second. Events now land in one Redis Stream per run:
+
+- ``agentic:run:{id}:log`` — stream entry id ``{seq}-0``, field ``event``
+  holding ``{"event_type", "payload", "timestamp"}`` as JSON. Using the seq as
+  the entry id makes "events after seq N" a plain XRANGE / XREAD.
+- ``agentic:run:{id}:log:seq`` — per-run counter. The append script INCRs it
+  and XADDs in one round trip, so seq is server-assigned and monotonic across
+  API pods. A run whose counter is missing (created before this shipped, or
+  expired) is seeded once from the Directus max seq.
+- ``agentic:run:{id}:log:flushed`` — highest seq already written to Directus.
+- ``agentic:run:{id}:status`` — mirror of the run status, so watchers can
+  notice a terminal run without reading Directus.
+- ``agentic:runs:unflushed`` — ZSET of runs with buffered events (score =
+  first unflushed append). The flusher drains it in batches.
+
+Directus stays the system of record: `AgenticRunService.flush_events` copies
+buffered entries over in one bulk create per batch, on a short scheduler tick
+and whenever a run reaches a terminal status. Reads go to the stream first and
+only fall back to Directus for history older than the stream.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Optional
+from logging import getLogger
+
+from dembrane.redis_async import get_redis_client
+from dembrane.coordination import get_shared_sync_redis
+
+logger = getLogger("dembrane.agentic_event_log")
+
+RUN_LOG_TTL_SECONDS = 7 * 24 * 60 * 60
+UNFLUSHED_RUNS_KEY = "agentic:runs:unflushed"
+FLUSH_BATCH_SIZE = 200
+_FLUSH_LOCK_TTL_SECONDS = 60
+_LATEST_SCAN_PAGE = 200
+
+_KEY_PREFIX = "agentic:run"
+
+# KEYS[1] = seq counter, KEYS[2] = log stream, KEYS[3] = unflushed index
+# ARGV[1] = seed (current max seq, "" when unknown), ARGV[2] = event json,
+# ARGV[3] = ttl seconds, ARGV[4] = now (epoch seconds), ARGV[5] = run id
+# Returns the new seq, or 0 when the counter is missing and no seed was given.
+_APPEND_SCRIPT = """
+local seq
+if redis.call("exists", KEYS[1]) == 1 then
+    seq = redis.call("incr", KEYS[1])
+elseif ARGV[1] == "" then
+    return 0
+else
+    seq = tonumber(ARGV[1]) + 1
+    redis.call("set", KEYS[1], seq)
+end
+redis.call("xadd", KEYS[2], seq .. "-0", "event", ARGV[2])
+redis.call("expire", KEYS[1], ARGV[3])
+redis.call("expire", KEYS[2], ARGV[3])
+redis.call("zadd", KEYS[3], "NX", ARGV[4], ARGV[5])
+return seq
+"""
+
+# KEYS[1] = flushed cursor, KEYS[2] = seq counter, KEYS[3] = unflushed index
+# ARGV[1] = flushed seq, ARGV[2] = ttl seconds, ARGV[3] = run id
+# Drops the run from the index only if nothing was appended meanwhile; the
+# append script runs atomically, so a concurrent append can't be lost.
+_MARK_FLUSHED_SCRIPT = """
+redis.call("set", KEYS[1], ARGV[1], "EX", ARGV[2])
+local current = tonumber(redis.call("get", KEYS[2]) or "0")
+if current <= tonumber(ARGV[1]) then
+    redis.call("zrem", KEYS[3], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+else
+    return 0
+end
+"""
+
+
+def run_log_key(run_id: str) -> str:
+    return f"{_KEY_PREFIX}:{run_id}:log"
+
+
+def run_seq_key(run_id: str) -> str:
+    return f"{_KEY_PREFIX}:{run_id}:log:seq"
+
+
+def run_flushed_key(run_id: str) -> str:
+    return f"{_KEY_PREFIX}:{run_id}:log:flushed"
+
+
+def run_flush_lock_key(run_id: str) -> str:
+    return f"{_KEY_PREFIX}:{run_id}:log:flush_lock"
+
+
+def run_status_key(run_id: str) -> str:
+    return f"{_KEY_PREFIX}:{run_id}:status"
+
+
+def _decode(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="ignore")
+    return str(value)
+
+
+def entry_to_event(run_id: str, entry_id: Any, fields: dict[Any, Any]) -> dict[str, Any]:
+    """Shape a stream entry like a Directus event row (minus the row id)."""
+    raw = fields.get("event", fields.get(b"event", "{}"))
+    body = json.loads(_decode(raw))
+    return {
+        "project_agentic_run_id": run_id,
+        "seq": int(_decode(entry_id).split("-", 1)[0]),
+        "event_type": body.get("event_type"),
+        "payload": body.get("payload"),
+        "timestamp": body.get("timestamp"),
+    }
+
+
+class RunEventLog:
+    """Sync access to the per-run streams, used by AgenticRunService."""
+
+    def __init__(self, ttl_seconds: int = RUN_LOG_TTL_SECONDS) -> None:
+        self._ttl_seconds = ttl_seconds
+
+    def append(
+        self,
+        run_id: str,
+        event_type: str,
+        payload: dict[str, Any],
+        timestamp: str,
+        *,
+        seed_seq: Optional[int] = None,
+    ) -> Optional[int]:
+        """Append one event and return its seq.
+
+        Returns None when the run has no counter yet and `seed_seq` was not
+        given; the caller then reads the Directus max seq and retries once.
+        """
+        event_json = json.dumps(
+            {"event_type": event_type, "payload": payload, "timestamp": timestamp},
+            default=str,
+        )
+        seq = get_shared_sync_redis().eval(
+            _APPEND_SCRIPT,
+            3,
+            run_seq_key(run_id),
+            run_log_key(run_id),
+            UNFLUSHED_RUNS_KEY,
+            "" if seed_seq is None else int(seed_seq),
+            event_json,
+            self._ttl_seconds,
+            repr(time.time()),
+            run_id,
+        )
+        return int(seq) or None
+
+    def read(
+        self, run_id: str, *, after_seq: int = 0, limit: int = 500
+    ) -> tuple[list[dict[str, Any]], Optional[int]]:
+        """Events with seq > after_seq, plus the run's latest seq.
+
+        The latest seq is None when the run has no log in Redis, in which case
+        Directus is the only source.
+        """
+        pipe = get_shared_sync_redis().pipeline(transaction=False)
+        pipe.xrange(run_log_key(run_id), min=str(after_seq + 1), max="+", count=limit)
+        pipe.get(run_seq_key(run_id))
+        entries, latest = pipe.execute()
+        events = [entry_to_event(run_id, entry_id, fields) for entry_id, fields in entries or []]
+        return events, (int(latest) if latest is not None else None)
+
+    def latest(
+        self, run_id: str, *, event_type: Optional[str] = None
+    ) -> tuple[Optional[dict[str, Any]], bool]:
+        """Newest event (optionally of one type) held in the stream.
+
+        The flag says whether the stream holds the run's whole history (its
+        first entry is seq 1), i.e. whether a miss is authoritative.
+        """
+        client = get_shared_sync_redis()
+        upper = "+"
+        while True:
+            entries = client.xrevrange(
+                run_log_key(run_id), max=upper, min="-", count=_LATEST_SCAN_PAGE
+            )
+            if not entries:
+                break
+            for entry_id, fields in entries:
+                event = entry_to_event(run_id, entry_id, fields)
+                if event_type is None or event.get("event_type") == event_type:
+                    return event, True
+            oldest_seq = entry_to_event(run_id, entries[-1][0], entries[-1][1])["seq"]
+            if oldest_seq <= 1:
+                return None, True
+            upper = str(oldest_seq - 1)
+        first = client.xrange(run_log_key(run_id), min="-", max="+", count=1)
+        complete = bool(first) and int(_decode(first[0][0]).split("-", 1)[0]) <= 1
+        return None, complete
+
+    def record_status(self, run_id: str, status: str) -> None:
+        get_shared_sync_redis().set(run_status_key(run_id), status, ex=self._ttl_seconds)
+
+    def unflushed_run_ids(self, limit: int = FLUSH_BATCH_SIZE) -> list[str]:
+        members = get_shared_sync_redis().zrange(UNFLUSHED_RUNS_KEY, 0, max(0, limit - 1))
+        return [_decode(member) for member in members]
+
+    def claim_flush(self, run_id: str, token: str) -> bool:
+        return bool(
+            get_shared_sync_redis().set(
+                run_flush_lock_key(run_id), token, nx=True, ex=_FLUSH_LOCK_TTL_SECONDS
+            )
+        )
+
+    def release_flush(self, run_id: str, token: str) -> None:
+        get_shared_sync_redis().eval(_RELEASE_LOCK_SCRIPT, 1, run_flush_lock_key(run_id), token)
+
+    def pending(
+        self, run_id: str, *, limit: int = FLUSH_BATCH_SIZE
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """The flushed cursor and the next batch of events past it."""
+        flushed = get_shared_sync_redis().get(run_flushed_key(run_id))
+        cursor = int(flushed) if flushed is not None else 0
+        events, _latest = self.read(run_id, after_seq=cursor, limit=limit)
+        return cursor, events
+
+    def mark_flushed(self, run_id: str, seq: int) -> bool:
+        """Advance the flushed cursor; True once nothing is left to flush."""
+        done = get_shared_sync_redis().eval(
+            _MARK_FLUSHED_SCRIPT,
+            3,
+            run_flushed_key(run_id),
+            run_seq_key(run_id),
+            UNFLUSHED_RUNS_KEY,
+            int(seq),
+            self._ttl_seconds,
+            run_id,
+        )
+        return bool(done)
+
+
+async def read_run_log_after(
+    run_id: str, after_seq: int, *, limit: int = 500
+) -> Optional[list[dict[str, Any]]]:
+    """Async XREAD of the run's events past `after_seq` (non-blocking).
+
+    Returns None when the run has no log in Redis, so the caller can fall back
+    to Directus.
+    """
+    client = await get_redis_client()
+    pipe = client.pipeline(transaction=False)
+    pipe.exists(run_seq_key(run_id))
+    pipe.xread({run_log_key(run_id): f"{after_seq}-0"}, count=limit)
+    exists, streams = await pipe.execute()
+    if not exists:
+        return None
+    events: list[dict[str, Any]] = []
+    for _stream, entries in streams or []:
+        events.extend(entry_to_event(run_id, entry_id, fields) for entry_id, fields in entries)
+    return events
+
+
+async def get_run_log_status(run_id: str) -> Optional[str]:
+    """Mirrored run status, or None if this run's status was never mirrored."""
+    client = await get_redis_client()
+    value = await client.get(run_status_key(run_id))
+    if value is None:
+        return None
+    return _decode(value)
@@ -43,7 +43,7 @@ MAX_FOCUS_LABEL_LENGTH = 80
 
 # The fence has two jobs: it tells the model where untrusted data starts and
 # stops, and it gives the worker an exact seam for removing a stale focus block
-# from an earlier turn (see agentic_worker._build_message_history).
+# from an earlier turn (see agentic_worker._history_entry_for_event).
 FOCUS_BLOCK_OPEN = "<focused_conversations>"
 FOCUS_BLOCK_CLOSE = "</focused_conversations>"
 
@@ -0,0 +1,134 @@
+"""Materialized model history per agentic run, cached in Redis.
+
+Building a turn's model history used to replay every event of the run —
+tool starts and ends included — and re-sanitize every assistant message on
+every turn, so turn start-up grew with chat length. The history is now kept
+per run as a Redis list of already-derived entries:
+
+- ``agentic:run:{id}:history:v1`` — one JSON entry per user/assistant
+  message: role, content, and its token count. User entries also carry the
+  focus-stripped variant used once a newer user turn exists.
+- ``agentic:run:{id}:history:v1:seq`` — the last event seq folded in.
+
+Each turn reads the list, folds only the events after the cursor, and
+appends the new entries with a compare-and-set on the cursor, so two
+executors can't interleave entries. The version suffix lets a change to the
+derivation rules (sanitizer, focus stripping) start from a clean slate.
+
+The cache is an optimization: any Redis failure means rebuilding from the
+event log, as before.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional, Awaitable, TypedDict, cast
+from logging import getLogger
+
+from dembrane.redis_async import get_redis_client
+from dembrane.agentic_event_log import RUN_LOG_TTL_SECONDS
+
+logger = getLogger("dembrane.agentic_history")
+
+_HISTORY_VERSION = "v1"
+
+# KEYS[1] = entries list, KEYS[2] = cursor
+# ARGV[1] = expected cursor, ARGV[2] = new cursor, ARGV[3] = ttl, ARGV[4..] = entries
+_EXTEND_SCRIPT = """
+local current = redis.call("get", KEYS[2]) or "0"
+if current ~= ARGV[1] then
+    return 0
+end
+if current == "0" then
+    redis.call("del", KEYS[1])
+end
+for i = 4, #ARGV do
+    redis.call("rpush", KEYS[1], ARGV[i])
+end
+redis.call("set", KEYS[2], ARGV[2], "EX", ARGV[3])
+redis.call("expire", KEYS[1], ARGV[3])
+return 1
+"""
+
+
+class HistoryEntry(TypedDict, total=False):
+    role: str
+    content: str
+    tokens: int
+    # User turns only: the prompt with its focus block removed, for replay
+    # once a newer user turn governs the focus.
+    past_content: str
+    past_tokens: int
+
+
+def history_key(run_id: str) -> str:
+    return f"agentic:run:{run_id}:history:{_HISTORY_VERSION}"
+
+
+def history_cursor_key(run_id: str) -> str:
+    return f"{history_key(run_id)}:seq"
+
+
+async def load_history(run_id: str) -> tuple[list[HistoryEntry], int]:
+    """Cached entries and the seq they cover; ([], 0) when nothing is cached."""
+    client = await get_redis_client()
+    pipe = client.pipeline(transaction=False)
+    pipe.get(history_cursor_key(run_id))
+    pipe.lrange(history_key(run_id), 0, -1)
+    cursor_raw, raw_entries = await pipe.execute()
+    if cursor_raw is None:
+        return [], 0
+    entries = [cast(HistoryEntry, json.loads(raw)) for raw in raw_entries or []]
+    return entries, int(cursor_raw)
+
+
+async def extend_history(
+    run_id: str,
+    *,
+    expected_cursor: int,
+    new_cursor: int,
+    entries: list[HistoryEntry],
+    ttl_seconds: int = RUN_LOG_TTL_SECONDS,
+) -> bool:
+    """Append entries if the cursor is still `expected_cursor`; False if another
+    executor moved it first (its entries are just as good)."""
+    client = await get_redis_client()
+    raw_result = cast(Any, client).eval(
+        _EXTEND_SCRIPT,
+        2,
+        history_key(run_id),
+        history_cursor_key(run_id),
+        str(expected_cursor),
+        str(new_cursor),
+        ttl_seconds,
+        *[json.dumps(entry) for entry in entries],
+    )
+    return bool(await cast(Awaitable[Any], raw_result))
+
+
+def window_history(
+    entries: list[HistoryEntry], token_budget: Optional[int]
+) -> list[dict[str, str]]:
+    """Model messages for `entries`, trimmed from the oldest end to fit.
+
+    The latest user turn keeps its focus block; earlier ones use the stripped
+    variant. The newest message is always kept, even over budget, since the
+    turn is meaningless without it.
+    """
+    latest_user_index = next(
+        (index for index in range(len(entries) - 1, -1, -1) if entries[index]["role"] == "user"),
+        None,
+    )
+    messages: list[dict[str, str]] = []
+    used = 0
+    for index in range(len(entries) - 1, -1, -1):
+        entry = entries[index]
+        content, tokens = entry["content"], entry.get("tokens", 0)
+        if index != latest_user_index and "past_content" in entry:
+            content, tokens = entry["past_content"], entry.get("past_tokens", 0)
+        if token_budget is not None and messages and used + tokens > token_budget:
+            break
+        used += tokens
+        messages.append({"role": entry["role"], "content": content})
+    messages.reverse()
+    return messages
@@ -8,7 +8,11 @@ from uuid import UUID
 from typing import Any, Optional, AsyncGenerator
 from logging import getLogger
 
+from litellm.utils import token_counter
+
+from dembrane.utils import utf16_length
 from dembrane.service import chat_service, agentic_run_service
+from dembrane.settings import get_settings
 from dembrane.analytics import capture_event
 from dembrane.agentic_focus import strip_focus_blocks
 from dembrane.async_helpers import run_in_thread_pool
@@ -17,6 +21,7 @@ from dembrane.agentic_client import (
     AgenticUpstreamError,
     stream_agent_events,
 )
+from dembrane.agentic_history import HistoryEntry, load_history, extend_history, window_history
 from dembrane.agentic_runtime import clear_cancel, publish_live_event, is_cancel_requested
 from dembrane.service.agentic import AgenticRunService
 from dembrane.api.feature_flags import project_canvas_enabled
@@ -26,21 +31,13 @@ logger = getLogger("dembrane.agentic_worker")
 AGENT_CANCELLED_ERROR_CODE = "AGENT_CANCELLED"
 AGENT_CANCELLED_MESSAGE = "Run cancelled by user"
 MAX_TOOL_CALLS_PER_TURN = 20
-# Full-text snapshots are quadratic in message length, so throttle and back
-# off as the text grows; on_chat_model_end always flushes the final snapshot.
+# Drafts stream as append-only deltas (offset + appended text), so bandwidth
+# is linear in message length and the publish interval can stay constant. A
+# full-text checkpoint goes out first, whenever the sanitized text stops being
+# an extension of what was sent, and every DRAFT_CHECKPOINT_INTERVAL_SECONDS so
+# a watcher that joined late or dropped a delta can resync.
 DRAFT_PUBLISH_INTERVAL_SECONDS = 0.15
-DRAFT_PUBLISH_MEDIUM_TEXT_CHARS = 2_000
-DRAFT_PUBLISH_MEDIUM_INTERVAL_SECONDS = 0.5
-DRAFT_PUBLISH_LONG_TEXT_CHARS = 8_000
-DRAFT_PUBLISH_LONG_INTERVAL_SECONDS = 1.0
-
-
-def _draft_publish_interval(text_length: int) -> float:
-    if text_length >= DRAFT_PUBLISH_LONG_TEXT_CHARS:
-        return DRAFT_PUBLISH_LONG_INTERVAL_SECONDS
-    if text_length >= DRAFT_PUBLISH_MEDIUM_TEXT_CHARS:
-        return DRAFT_PUBLISH_MEDIUM_INTERVAL_SECONDS
-    return DRAFT_PUBLISH_INTERVAL_SECONDS
+DRAFT_CHECKPOINT_INTERVAL_SECONDS = 2.0
 MAX_TOOL_CALLS_PER_RUN = MAX_TOOL_CALLS_PER_TURN * 10
 TOOL_LIMIT_EXEMPT_TOOL_NAMES = {"sendProgressUpdate"}
 # Host-facing, in the agent's own voice. "Tool calls" are an internal concept
@@ -60,7 +57,9 @@ AUTOMATIC_NUDGE_TEMPLATE = (
     "are concluding."
 )
 HISTORY_PAGE_SIZE = 500
-OVERFLOW_RETRY_WINDOW_SIZE = 24
+# Model history is windowed to this many tokens before the upstream call; a
+# context-overflow error still gets one retry at half the budget.
+HISTORY_TOKEN_BUDGET = get_settings().agentic.history_token_budget
 
 # Internal placeholder the agent injects for Gemini's empty tool-call turns
 # (see echo/agent/agent.py `_with_placeholder_content`). It is model-input
@@ -419,23 +418,55 @@ def _extract_progress_message_from_tool_end(event: dict[str, Any]) -> Optional[s
     return f"{update_text}\n\n{next_steps}"
 
 
-async def _build_message_history(
-    *,
-    svc: AgenticRunService,
-    run_id: str,
-) -> list[dict[str, str]]:
-    """Replay this run's turns as model history.
+def _count_tokens(text: str) -> int:
+    return int(token_counter(text=text))
+
+
+def _history_entry_for_event(event: dict[str, Any]) -> Optional[HistoryEntry]:
+    """One user/assistant event as a model history entry.
 
     User turns prefer the stored `agent_prompt_content` because it carries the
     project framing the raw message lacks. That stored text also baked in the
     focus selection that was current at the time, so every replayed turn used to
     re-assert "prioritize these conversations" with nothing superseding it: after
     the host cleared the focus, the agent kept narrowing to the old selection.
-    The current turn's focus governs the current turn, so stale focus blocks are
-    dropped from every earlier user turn.
+    The current turn's focus governs the current turn, so the entry also keeps a
+    focus-stripped `past_content` that `window_history` replays once a newer
+    user turn exists.
     """
-    history: list[dict[str, str]] = []
-    after_seq = 0
+    event_type = str(event.get("event_type") or "")
+    if event_type not in {"user.message", "assistant.message"}:
+        return None
+
+    payload = _payload_to_dict(event.get("payload"))
+    if event_type == "user.message":
+        content = _coerce_non_empty_text(payload.get("agent_prompt_content"))
+        if content is None:
+            content = _coerce_non_empty_text(payload.get("content"))
+        if content is None:
+            return None
+        entry: HistoryEntry = {"role": "user", "content": content, "tokens": _count_tokens(content)}
+        past_content = strip_focus_blocks(content).strip()
+        if past_content and past_content != content:
+            entry["past_content"] = past_content
+            entry["past_tokens"] = _count_tokens(past_content)
+        return entry
+
+    content = _coerce_non_empty_text(payload.get("content"))
+    if content is not None:
+        content = _sanitize_host_visible_assistant_content(content)
+    if content is None:
+        return None
+    return {"role": "assistant", "content": content, "tokens": _count_tokens(content)}
+
+
+async def _fold_history_events(
+    *,
+    svc: AgenticRunService,
+    run_id: str,
+    after_seq: int,
+) -> tuple[list[HistoryEntry], int]:
+    entries: list[HistoryEntry] = []
 
     while True:
         events = await run_in_thread_pool(
@@ -448,25 +479,9 @@ async def _build_message_history(
             break
 
         for event in events:
-            event_type = str(event.get("event_type") or "")
-            if event_type not in {"user.message", "assistant.message"}:
-                continue
-
-            payload = _payload_to_dict(event.get("payload"))
-            role = "user" if event_type == "user.message" else "assistant"
-
-            if role == "user":
-                content = _coerce_non_empty_text(payload.get("agent_prompt_content"))
-                if content is None:
-                    content = _coerce_non_empty_text(payload.get("content"))
-            else:
-                content = _coerce_non_empty_text(payload.get("content"))
-                if content is not None:
-                    content = _sanitize_host_visible_assistant_content(content)
-
-            if content is None:
-                continue
-            history.append({"role": role, "content": content})
+            entry = _history_entry_for_event(event)
+            if entry is not None:
+                entries.append(entry)
 
         try:
             last_seq = int(events[-1].get("seq") or 0)
@@ -483,21 +498,42 @@ async def _build_message_history(
         if len(events) < HISTORY_PAGE_SIZE:
             break
 
-    # The last user turn is the one being answered now, so its focus block is
-    # current and stays. Anything earlier is history: keep the turn, drop its
-    # focus block.
-    latest_user_index = next(
-        (index for index in range(len(history) - 1, -1, -1) if history[index]["role"] == "user"),
-        None,
-    )
-    for index, message in enumerate(history):
-        if message["role"] != "user" or index == latest_user_index:
-            continue
-        stripped = strip_focus_blocks(message["content"]).strip()
-        if stripped:
-            message["content"] = stripped
+    return entries, after_seq
 
-    return history
+
+async def _load_history_entries(
+    *,
+    svc: AgenticRunService,
+    run_id: str,
+) -> list[HistoryEntry]:
+    """This run's user/assistant messages as model history entries.
+
+    Served from the per-run cache in dembrane.agentic_history, folding in
+    only the events appended since the cached cursor.
+    """
+    try:
+        cached, cursor = await load_history(run_id)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("History cache read failed for run %s: %s", run_id, exc)
+        cached, cursor = [], 0
+        cache_available = False
+    else:
+        cache_available = True
+
+    new_entries, new_cursor = await _fold_history_events(svc=svc, run_id=run_id, after_seq=cursor)
+
+    if cache_available and new_cursor > cursor:
+        try:
+            await extend_history(
+                run_id,
+                expected_cursor=cursor,
+                new_cursor=new_cursor,
+                entries=new_entries,
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("History cache write failed for run %s: %s", run_id, exc)
+
+    return cached + new_entries
 
 
 async def _stream_with_overflow_retry(
@@ -507,14 +543,15 @@ async def _stream_with_overflow_retry(
     bearer_token: str,
     thread_id: str,
     message_history: list[dict[str, str]],
+    overflow_history: Optional[list[dict[str, str]]] = None,
     chat_id: str | None = None,
     app_user_id: str | None = None,
     message_id: str | None = None,
     canvas_enabled: bool = False,
 ) -> AsyncGenerator[dict[str, Any], None]:
     attempts: list[list[dict[str, str]]] = [message_history]
-    if len(message_history) > OVERFLOW_RETRY_WINDOW_SIZE:
-        attempts.append(message_history[-OVERFLOW_RETRY_WINDOW_SIZE:])
+    if overflow_history is not None and len(overflow_history) < len(message_history):
+        attempts.append(overflow_history)
 
     for index, attempt_history in enumerate(attempts):
         transient_retries_remaining = 1
@@ -562,7 +599,7 @@ async def _stream_with_overflow_retry(
                         "Run %s overflowed context with %s messages; retrying with last %s messages",
                         thread_id,
                         len(attempt_history),
-                        OVERFLOW_RETRY_WINDOW_SIZE,
+                        len(attempts[1]),
                     )
                     break
 
@@ -583,7 +620,7 @@ async def _append_event_and_publish(
 
 
 async def _publish_draft_snapshot(run_id: str, message_id: str, text: str) -> None:
-    """Ephemeral streaming snapshot: Redis pub/sub only, never persisted."""
+    """Ephemeral full-text checkpoint: Redis pub/sub only, never persisted."""
     payload = json.dumps(
         {"event_type": "assistant.draft", "payload": {"message_id": message_id, "text": text}},
         default=str,
@@ -594,6 +631,21 @@ async def _publish_draft_snapshot(run_id: str, message_id: str, text: str) -> No
         logger.warning("Failed to publish draft snapshot for run %s: %s", run_id, exc)
 
 
+async def _publish_draft_delta(run_id: str, message_id: str, offset: int, text: str) -> None:
+    """Ephemeral draft increment: `text` extends the draft at `offset` (UTF-16 units)."""
+    payload = json.dumps(
+        {
+            "event_type": "assistant.draft.delta",
+            "payload": {"message_id": message_id, "offset": offset, "text": text},
+        },
+        default=str,
+    )
+    try:
+        await publish_live_event(run_id, payload)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to publish draft delta for run %s: %s", run_id, exc)
+
+
 async def _raise_if_cancelled(run_id: str, turn_seq: int) -> None:
     if await is_cancel_requested(run_id, turn_seq):
         raise AgenticRunCancelledError(AGENT_CANCELLED_MESSAGE)
@@ -692,7 +744,9 @@ async def _triggering_message_id(
     event = events[0]
     if event.get("event_type") != "user.message":
         return None
-    return str(event.get("id") or "") or None
+    # Not the Directus row id: an event still buffered in the run log has
+    # none yet, so the same message would be keyed two ways around a flush.
+    return f"{run_id}:{turn_seq}"
 
 
 async def _latest_user_turn_seq(*, svc: AgenticRunService, run_id: str) -> int | None:
@@ -792,14 +846,15 @@ async def process_agentic_run(
 
     try:
         await _raise_if_cancelled(run_id, turn_seq)
-        message_history = await _build_message_history(
-            svc=svc,
-            run_id=run_id,
-        )
+        history_entries = await _load_history_entries(svc=svc, run_id=run_id)
+        # Window by tokens up front so overflow is avoided rather than retried.
+        message_history = window_history(history_entries, HISTORY_TOKEN_BUDGET)
+        overflow_history = window_history(history_entries, HISTORY_TOKEN_BUDGET // 2)
         canvas_enabled = await project_canvas_enabled(project_id)
         # Streamed text per model invocation; its run_id doubles as message_id.
         draft_texts: dict[str, str] = {}
         draft_last_publish_at: dict[str, float] = {}
+        draft_last_checkpoint_at: dict[str, float] = {}
         draft_published_texts: dict[str, str] = {}
         # Model turn whose narration a pending sendProgressUpdate result replaces.
         pending_progress_message_id: Optional[str] = None
@@ -810,8 +865,7 @@ async def process_agentic_run(
             if (
                 not flush
                 and last_publish_at is not None
-                and now - last_publish_at
-                < _draft_publish_interval(len(draft_texts[message_id]))
+                and now - last_publish_at < DRAFT_PUBLISH_INTERVAL_SECONDS
             ):
                 return
             sanitized = _sanitize_host_visible_assistant_content(draft_texts[message_id])
@@ -824,8 +878,23 @@ async def process_agentic_run(
                 # A growing draft hits placeholder prefixes ("(calling") before
                 # the sanitizer can match the full string; hold those back.
                 return
+            published = draft_published_texts.get(message_id)
+            last_checkpoint_at = draft_last_checkpoint_at.get(message_id)
             draft_last_publish_at[message_id] = now
             draft_published_texts[message_id] = sanitized
+            if (
+                published is not None
+                and last_checkpoint_at is not None
+                and now - last_checkpoint_at < DRAFT_CHECKPOINT_INTERVAL_SECONDS
+                and sanitized.startswith(published)
+            ):
+                await _publish_draft_delta(
+                    run_id, message_id, utf16_length(published), sanitized[len(published) :]
+                )
+                return
+            # First frame, a rewrite the sanitizer made mid-stream, or time
+            # for a resync point.
+            draft_last_checkpoint_at[message_id] = now
             await _publish_draft_snapshot(run_id, message_id, sanitized)
 
         async for event in _stream_with_overflow_retry(
@@ -834,6 +903,7 @@ async def process_agentic_run(
             bearer_token=bearer_token,
             thread_id=run_id,
             message_history=message_history,
+            overflow_history=overflow_history,
             chat_id=project_chat_id or None,
             app_user_id=app_user_id,
             message_id=message_id,
@@ -859,7 +929,7 @@ async def process_agentic_run(
                 else None
             )
             if model_message_id and model_message_id in draft_texts:
-                # Flush the throttled tail; the final snapshot carries the full text.
+                # Flush the throttled tail so the draft ends on the full text.
                 await _maybe_publish_draft(model_message_id, flush=True)
             model_has_progress_tool_call = "sendProgressUpdate" in model_tool_calls
             if model_has_progress_tool_call:
@@ -14,6 +14,7 @@ from fastapi import Query, Depends, Request, APIRouter, HTTPException
 from pydantic import Field, BaseModel
 from fastapi.responses import JSONResponse, StreamingResponse
 
+from dembrane.utils import utf16_length
 from dembrane.service import chat_service, project_service, agentic_run_service
 from dembrane.directus import directus
 from dembrane.settings import get_settings
@@ -50,6 +51,7 @@ from dembrane.agentic_runtime import (
     subscribe_live_events,
 )
 from dembrane.service.agentic import TERMINAL_RUN_STATUSES, AgenticRunNotFoundException
+from dembrane.agentic_event_log import get_run_log_status, read_run_log_after
 from dembrane.api.feature_flags import require_canvas_enabled_for_project
 from dembrane.api.dependency_auth import DirectusSession, DependencyDirectusSession
 
@@ -2632,26 +2634,85 @@ async def get_run_events(
     }
 
 
+async def _latest_run_status(run_id: str) -> Optional[str]:
+    """Run status from the Redis mirror, falling back to Directus for runs that
+    predate it."""
+    status = await get_run_log_status(run_id)
+    if status is None:
+        latest = await run_in_thread_pool(_get_run_or_404, run_id)
+        status = latest.get("status")
+    return status
+
+
+_DRAFT_CHECKPOINT_EVENT = "assistant.draft"
+_DRAFT_DELTA_EVENT = "assistant.draft.delta"
+
+
+class _DraftTracker:
+    """Per-watcher draft lengths, so deltas are only forwarded gap-free.
+
+    A delta whose offset doesn't match what this watcher has seen (joined
+    mid-message, or pub/sub dropped a frame) is held back until the next
+    full-text checkpoint resyncs the message. The client can therefore append
+    every delta it receives without checking. Lengths are in UTF-16 units,
+    the unit the worker's delta offsets use.
+    """
+
+    def __init__(self) -> None:
+        self._lengths: dict[str, int] = {}
+
+    def accept(self, event_type: Any, payload: Any) -> bool:
+        if not isinstance(payload, dict):
+            return False
+        message_id = payload.get("message_id")
+        text = payload.get("text")
+        if not isinstance(message_id, str) or not isinstance(text, str):
+            return False
+        if event_type == _DRAFT_CHECKPOINT_EVENT:
+            self._lengths[message_id] = utf16_length(text)
+            return True
+        if self._lengths.get(message_id) != payload.get("offset"):
+            return False
+        self._lengths[message_id] += utf16_length(text)
+        return True
+
+    def resolve(self, payload: Any) -> None:
+        if isinstance(payload, dict):
+            self._lengths.pop(str(payload.get("message_id") or ""), None)
+
+
 async def _stream_live_events(run_id: str, after_seq: int) -> AsyncIterator[str]:
     cursor = after_seq
     last_heartbeat = time.monotonic()
+    drafts = _DraftTracker()
 
-    async def _emit_db_delta() -> AsyncIterator[str]:
+    def _emit(events: list[dict[str, Any]]) -> list[str]:
         nonlocal cursor
-        events = await _list_events_after(run_id, cursor)
+        lines: list[str] = []
         for event in events:
             seq = int(event.get("seq") or cursor)
             if seq <= cursor:
                 continue
             cursor = seq
-            yield _sse_event_payload(event, seq)
+            lines.append(_sse_event_payload(event, seq))
+        return lines
+
+    async def _emit_delta() -> list[str]:
+        # Served from the run's Redis log (XREAD past the cursor); Directus
+        # only for runs without one.
+        events = await read_run_log_after(run_id, cursor)
+        if events is None:
+            events = await _list_events_after(run_id, cursor)
+        return _emit(events)
 
     try:
         async with subscribe_live_events(run_id) as pubsub:
-            async for line in _emit_db_delta():
+            # Replay can reach back past the stream's start, so it goes through
+            # the service, which stitches Directus history onto the log.
+            for line in _emit(await _list_events_after(run_id, cursor)):
                 yield line
 
-            async for line in _emit_db_delta():
+            for line in await _emit_delta():
                 yield line
 
             while True:
@@ -2663,22 +2724,27 @@ async def _stream_live_events(run_id: str, after_seq: int) -> AsyncIterator[str]
                         event = None
 
                     if isinstance(event, dict):
-                        if event.get("event_type") == "assistant.draft":
+                        event_type = event.get("event_type")
+                        if event_type in (_DRAFT_CHECKPOINT_EVENT, _DRAFT_DELTA_EVENT):
                             # Ephemeral: forwarded live, never replayed, no cursor.
-                            yield f"event: assistant.draft\ndata: {live_payload}\n\n"
+                            if drafts.accept(event_type, event.get("payload")):
+                                yield f"event: {event_type}\ndata: {live_payload}\n\n"
                             continue
+                        if event_type == "assistant.message":
+                            drafts.resolve(event.get("payload"))
                         seq = int(event.get("seq") or 0)
                         if seq > cursor:
                             cursor = seq
                             yield _sse_event_payload(event, seq)
                     continue
 
-                async for line in _emit_db_delta():
+                # Idle second: close any gap the pub/sub dropped. Both reads
+                # hit Redis, so an idle watcher never queries Directus.
+                for line in await _emit_delta():
                     yield line
 
-                latest = await run_in_thread_pool(_get_run_or_404, run_id)
-                if latest.get("status") in TERMINAL_RUN_STATUSES:
-                    async for line in _emit_db_delta():
+                if await _latest_run_status(run_id) in TERMINAL_RUN_STATUSES:
+                    for line in await _emit_delta():
                         yield line
                     break
 
@@ -21,8 +21,8 @@ from dembrane.chat_utils import (
     MAX_CHAT_CONTEXT_LENGTH,
     generate_title,
     get_project_chat_history,
-    create_system_messages_for_chat,
 )
+from dembrane.chat_context import with_cache_markers, get_chat_system_messages
 from dembrane.service.chat import ChatServiceException, ChatNotFoundException
 from dembrane.async_helpers import run_in_thread_pool
 from dembrane.stream_status import stream_with_status
@@ -894,10 +894,14 @@ async def get_chat_suggestions(
     chat_id: str,
     auth: DependencyDirectusSession,
     language: str = Query("en"),
+    refresh: bool = Query(False),
 ) -> SuggestionsResponseSchema:
     """
     Get contextual question suggestions for a chat.
 
+    Pass ``refresh=true`` when the user asks for new suggestions, so a cached
+    set for the same inputs is not served again.
+
     Generates up to 3 suggestions based on:
     - Project context
     - Chat mode (overview vs deep_dive)
@@ -931,6 +935,7 @@ async def get_chat_suggestions(
             chat_id=chat_id,
             chat_mode=chat_mode,
             language=language,
+            use_cache=not refresh,
         )
 
         return SuggestionsResponseSchema(
@@ -975,10 +980,8 @@ async def initialize_chat_mode(
 
     This can only be called once per chat. Mode cannot be changed after initialization.
     """
-    from dembrane.summary_utils import (
-        ensure_conversation_summaries,
-        get_all_conversations_for_overview,
-    )
+    from dembrane.summary_utils import get_all_conversations_for_overview
+    from dembrane.overview_digest import request_overview_refresh
 
     chat = await raise_if_chat_not_found_or_not_authorized(
         chat_id,
@@ -1016,9 +1019,9 @@ async def initialize_chat_mode(
             message="Agentic mode enabled. Use the agentic run APIs for messaging.",
         )
 
-    # Overview mode: Just set the mode - conversations will be fetched dynamically
-    # when building the chat context (using summaries).
-    # Pre-generate summaries for conversations that don't have them.
+    # Overview mode: Just set the mode - the chat context comes from the
+    # project's overview digest. Refreshing it queues summaries for any
+    # conversations still missing one; nothing is summarized inline.
     conversations = await get_all_conversations_for_overview(body.project_id)
 
     # Filter to conversations with content (chunks)
@@ -1027,15 +1030,8 @@ async def initialize_chat_mode(
     ]
 
     total_conversations = len(conversations_with_content)
-    newly_summarized = 0
-
     if conversations_with_content:
-        # Pre-generate summaries for conversations that don't have them
-        conversation_ids = [conv["id"] for conv in conversations_with_content]
-        summarization_result = await ensure_conversation_summaries(conversation_ids)
-        newly_summarized = len(summarization_result.succeeded) - len(
-            [c for c in conversations_with_content if c.get("summary")]
-        )
+        await run_in_thread_pool(request_overview_refresh, body.project_id)
 
     # Set chat mode
     await run_in_thread_pool(chat_svc.set_chat_mode, chat_id, "overview")
@@ -1051,7 +1047,7 @@ async def initialize_chat_mode(
     return InitializeChatModeResponseSchema(
         chat_mode="overview",
         conversations_added=total_conversations,  # All conversations are included dynamically
-        conversations_summarized=max(0, newly_summarized),
+        conversations_summarized=0,  # Missing summaries are generated in the background
         message=f"Overview mode enabled with {total_conversations} conversations.",
     )
 
@@ -1173,22 +1169,17 @@ async def post_chat(
         # Get chat mode for determining how to build context
         chat_mode = chat_context.chat_mode
 
-        async def build_formatted_messages(conversation_ids: Iterable[str]) -> List[Dict[str, str]]:
-            system_messages_result = await create_system_messages_for_chat(
+        async def build_formatted_messages(conversation_ids: Iterable[str]) -> List[Dict[str, Any]]:
+            # Memoized per chat until a conversation, transcript, summary or
+            # artifact changes; the markers let the provider cache it as well.
+            system_messages_result = await get_chat_system_messages(
+                chat_id,
                 list(conversation_ids),
                 language,
                 project_id,
                 chat_mode=chat_mode,  # Pass mode to determine summary vs transcript
             )
-            formatted: List[Dict[str, str]] = []
-            if isinstance(system_messages_result, list):
-                formatted.extend(
-                    {"role": "system", "content": message["text"]}
-                    for message in system_messages_result
-                )
-            else:
-                formatted.append({"role": "system", "content": system_messages_result})
-
+            formatted: List[Dict[str, Any]] = with_cache_markers(system_messages_result)
             formatted.extend(conversation_history)
             return formatted
 
@@ -1205,13 +1196,14 @@ async def post_chat(
         chat_distinct_id = ((_chat_user or {}).get("email") or "").lower() or auth.user_id
 
         async def stream_response_async(
-            formatted: List[Dict[str, str]],
+            formatted: List[Dict[str, Any]],
         ) -> AsyncGenerator[str, None]:
             try:
                 response = await arouter_completion(
                     MODELS.MULTI_MODAL_PRO,
                     messages=formatted,
                     stream=True,
+                    priority="interactive",
                     timeout=300,
                     stream_timeout=180,
                 )
@@ -1253,7 +1245,7 @@ async def post_chat(
         raw_stream = stream_response_async(formatted_messages)
 
         # Wrap with status notifications for high load scenarios
-        stream = stream_with_status(raw_stream, protocol=protocol)
+        stream = stream_with_status(raw_stream, protocol=protocol, name=f"chat {chat_id}")
 
         return StreamingResponse(stream, headers=headers)
 
@@ -402,6 +402,12 @@ async def get_conversation_content(
             },
         )
 
+        # Move the workspace hour counters by this merge's delta; the
+        # ledger call is best-effort and never raises.
+        from dembrane.usage_ledger import record_conversation_duration
+
+        await record_conversation_duration(conversation_id, duration, source="merge")
+
         # New duration → bust usage cache so /w + billing don't wait
         # 30 min (TTL) for the hours to surface.
         try:
@@ -709,7 +715,7 @@ async def get_reply_for_conversation(
             yield "3:" + json.dumps("Something went wrong.") + "\n"
 
     # Wrap with status notifications for high load scenarios
-    stream = stream_with_status(generate(), protocol="data")
+    stream = stream_with_status(generate(), protocol="data", name=f"reply {conversation_id}")
 
     return StreamingResponse(
         stream,
@@ -723,12 +729,28 @@ async def get_reply_for_conversation(
     )
 
 
-# this should ideally be in the service. the async functions are a bit messy at the moment.
 @ConversationRouter.post("/{conversation_id}/summarize", response_model=None)
 async def summarize_conversation(
     conversation_id: str,
     auth: DependencyDirectusSession,
 ) -> dict:
+    # Someone pressed Generate/Regenerate: they want a new answer, not the one
+    # the background task cached a few minutes ago.
+    return await run_conversation_summary(conversation_id, auth, use_cache=False)
+
+
+# this should ideally be in the service. the async functions are a bit messy at the moment.
+async def run_conversation_summary(
+    conversation_id: str,
+    auth: DirectusSession,
+    *,
+    use_cache: bool = True,
+) -> dict:
+    """Summarize a conversation and save the summary, title and draft tags.
+
+    The background task and its retries keep ``use_cache`` on, so a retry after
+    a partial failure reuses completions it already paid for.
+    """
     await raise_if_conversation_not_found_or_not_authorized(
         conversation_id, auth, require="project:update"
     )
@@ -764,6 +786,7 @@ async def summarize_conversation(
                     "title",
                     "project_id.id",
                     "project_id.language",
+                    "project_id.workspace_id",
                     "project_id.enable_ai_title_and_tags",
                     "project_id.conversation_title_prompt",
                 ],
@@ -816,6 +839,8 @@ async def summarize_conversation(
             project_context_str,
             verified_artifacts,
             conversation_title,
+            conversation_data["project_id"].get("workspace_id"),
+            use_cache=use_cache,
         )
 
         # Prepare update data with summary
@@ -844,6 +869,7 @@ async def summarize_conversation(
                     language if language else "en",
                     existing_titles,
                     custom_prompt,
+                    use_cache=use_cache,
                 )
 
                 if title:
@@ -864,6 +890,7 @@ async def summarize_conversation(
                         summary,
                         language if language else "en",
                         project_tags,
+                        use_cache=use_cache,
                     )
                     if tag_ids:
                         assigned_tag_ids = await run_in_thread_pool(
@@ -893,6 +920,11 @@ async def summarize_conversation(
             update_data,
         )
 
+        # Fold the new summary into the project's overview chat context
+        from dembrane.overview_digest import request_overview_refresh
+
+        await run_in_thread_pool(request_overview_refresh, project_data["id"])
+
         response = {
             "status": "success",
             "message": "Summary generated",
@@ -980,6 +1012,7 @@ async def generate_title_for_conversation(
         language if language else "en",
         existing_titles,
         custom_prompt,
+        use_cache=False,
     )
 
     if title:
@@ -1129,6 +1162,19 @@ async def retranscribe_conversation(
             },
         )
 
+        # The clone bills its own hours, like any new conversation.
+        from dembrane.usage_ledger import record_conversation_duration
+
+        await record_conversation_duration(new_conversation_id, duration, source="clone")
+        try:
+            await _invalidate_usage_cache_for_conversation(new_conversation_id)
+        except Exception as exc:
+            logger.warning(
+                "usage cache invalidation failed for conversation %s: %s",
+                new_conversation_id,
+                exc,
+            )
+
         try:
             logger.info(f"Creating links from {conversation_id} to {new_conversation_id}")
             link_id = (
@@ -20,10 +20,7 @@ from dembrane.legal_basis import (
 )
 from dembrane.async_helpers import run_in_thread_pool
 from dembrane.api.rate_limit import create_rate_limiter
-from dembrane.monitor_stream import (
-    publish_monitor_dirty,
-    register_active_conversation,
-)
+from dembrane.monitor_stream import publish_monitor_dirty
 from dembrane.service.project import ProjectNotFoundException
 from dembrane.visitor_session import (
     VALID_VISITOR_STAGES,
@@ -514,17 +511,25 @@ async def ping_conversation(
         return {"ok": True}
     if len(conversation_id) > _MAX_PING_ID_LEN:
         return {"ok": True}
+    project_id = (
+        body.project_id
+        if body is not None and body.project_id and len(body.project_id) <= _MAX_PING_ID_LEN
+        else None
+    )
     try:
-        await mark_conversation_seen(conversation_id, telemetry=_build_ping_telemetry(body) or None)
+        # One atomic round trip: store the ping and, when the portal sent its
+        # project_id, index the conversation as active (so the monitor shows it
+        # the instant it is initiated, before any audio chunk exists) and nudge
+        # open streams to recompute.
+        await mark_conversation_seen(
+            conversation_id,
+            telemetry=_build_ping_telemetry(body) or None,
+            project_id=project_id,
+            score=time(),
+        )
     except Exception as exc:  # noqa: BLE001
         logger.warning("Liveness ping failed for %s: %s", conversation_id, exc)
         return {"ok": False}
-    if body is not None and body.project_id and len(body.project_id) <= _MAX_PING_ID_LEN:
-        # Index the conversation as active so the monitor can show it the
-        # instant it is initiated, before any audio chunk exists, then nudge
-        # open streams to recompute.
-        await register_active_conversation(body.project_id, conversation_id, score=time())
-        await publish_monitor_dirty(body.project_id)
     return {"ok": True}
 
 
@@ -1114,17 +1114,26 @@ async def stream_report_progress(
     request: Request,
     auth: DependencyDirectusSession,
 ) -> StreamingResponse:
-    """SSE endpoint for real-time report generation progress."""
+    """
+    SSE endpoint for real-time report generation progress.
+
+    Each event carries its stream entry id, so a reconnecting EventSource
+    resumes after its Last-Event-ID; without one the report's events are
+    replayed from the start.
+    """
     await _verify_project_access(auth, project_id)
     import json
     import time
 
-    from dembrane.report_events import read_report_event, subscribe_report_events
+    from dembrane.report_events import read_report_events, parse_report_event_id
+
+    cursor = parse_report_event_id(request.headers.get("last-event-id"))
 
     async def _generate_events() -> AsyncGenerator[str, None]:
+        nonlocal cursor
         last_heartbeat = time.monotonic()
 
-        # Check if report is already done before subscribing
+        # Check if report is already done before reading its stream
         from dembrane.directus import directus
 
         report = await run_in_thread_pool(directus.get_item, "project_report", str(report_id))
@@ -1136,29 +1145,32 @@ async def stream_report_progress(
             return
 
         try:
-            async with subscribe_report_events(report_id) as pubsub:
-                yield f"event: progress\ndata: {json.dumps({'type': 'connected', 'message': 'Connected'})}\n\n"
-
-                while True:
-                    if await request.is_disconnected():
-                        break
-
-                    payload = await read_report_event(pubsub, timeout_seconds=1.0)
-                    if payload:
-                        yield f"event: progress\ndata: {payload}\n\n"
-
-                        try:
-                            event = json.loads(payload)
-                            if event.get("type") in ("completed", "failed"):
-                                break
-                        except json.JSONDecodeError:
-                            pass
-                        continue
-
-                    now = time.monotonic()
-                    if now - last_heartbeat >= 10.0:
-                        yield "event: heartbeat\ndata: {}\n\n"
-                        last_heartbeat = now
+            yield f"event: progress\ndata: {json.dumps({'type': 'connected', 'message': 'Connected'})}\n\n"
+
+            finished = False
+            while not finished:
+                if await request.is_disconnected():
+                    break
+
+                events = await read_report_events(report_id, cursor, block_ms=1000)
+                for event_id, payload in events:
+                    cursor = event_id
+                    yield f"id: {event_id}\nevent: progress\ndata: {payload}\n\n"
+
+                    try:
+                        event = json.loads(payload)
+                        if event.get("type") in ("completed", "failed"):
+                            finished = True
+                            break
+                    except json.JSONDecodeError:
+                        pass
+                if events:
+                    continue
+
+                now = time.monotonic()
+                if now - last_heartbeat >= 10.0:
+                    yield "event: heartbeat\ndata: {}\n\n"
+                    last_heartbeat = now
         except Exception as exc:
             logger.warning("SSE stream error for report %s: %s", report_id, exc)
             yield f"event: progress\ndata: {json.dumps({'type': 'failed', 'message': 'Stream error'})}\n\n"
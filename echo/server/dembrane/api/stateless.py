@@ -44,6 +44,8 @@ def generate_summary(
     project_context: str | None = None,
     verified_artifacts: list[str] | None = None,
     conversation_title: str | None = None,
+    workspace_id: str | None = None,
+    use_cache: bool = True,
 ) -> str:
     """
     Generate a summary of the transcript using LangChain and a custom API endpoint.
@@ -54,6 +56,8 @@ def generate_summary(
         project_context (str | None): Optional project context to include.
         verified_artifacts (list[str] | None): Optional list of verified artifacts.
         conversation_title (str | None): Optional title of the conversation set by the user.
+        workspace_id (str | None): Workspace the summary is for, for LLM fair-share scheduling.
+        use_cache (bool): Reuse a recent identical completion. Off for explicit regenerates.
 
     Returns:
         str: The generated summary.
@@ -75,6 +79,8 @@ def generate_summary(
         # Use router for load balancing and failover
         response = router_completion(
             MODELS.MULTI_MODAL_PRO,
+            cache="conversation_summary" if use_cache else None,
+            workspace_id=workspace_id,
             messages=[
                 {
                     "role": "user",
@@ -128,6 +134,7 @@ def generate_conversation_title(
     language: str | None,
     existing_titles: list[str] | None = None,
     custom_prompt: str | None = None,
+    use_cache: bool = True,
 ) -> str:
     """
     Generate a 1-3 word title for a conversation based on its summary.
@@ -137,6 +144,7 @@ def generate_conversation_title(
         language (str | None): The language code (e.g., "en", "nl", "de").
         existing_titles (list[str] | None): Optional list of existing titles for style matching.
         custom_prompt (str | None): Optional custom instructions for title generation.
+        use_cache (bool): Reuse a recent identical completion. Off for explicit regenerates.
 
     Returns:
         str: The generated title.
@@ -157,6 +165,7 @@ def generate_conversation_title(
     try:
         response = router_completion(
             MODELS.MULTI_MODAL_FAST,
+            cache="conversation_title" if use_cache else None,
             messages=[
                 {
                     "role": "user",
@@ -223,6 +232,7 @@ def generate_conversation_tag_ids(
     summary: str,
     language: str | None,
     project_tags: list[dict[str, str]],
+    use_cache: bool = True,
 ) -> list[str]:
     """Choose existing project tags that fit a conversation summary.
 
@@ -252,6 +262,7 @@ def generate_conversation_tag_ids(
     try:
         response = router_completion(
             MODELS.MULTI_MODAL_FAST,
+            cache="conversation_tags" if use_cache else None,
             messages=[
                 {
                     "role": "user",
@@ -391,6 +402,12 @@ async def _record_stateless_usage(project_id: str, duration_seconds: float | Non
         },
     )
 
+    from dembrane.usage_ledger import record_conversation_duration
+
+    await record_conversation_duration(
+        conversation_id, duration_seconds, source=STATELESS_CONVERSATION_SOURCE
+    )
+
     # New duration → bust usage cache, same as the participant upload path, so hours
     # don't wait out the cache TTL before they surface.
     try:
@@ -32,6 +32,7 @@ from dembrane.seat_capacity import assert_can_add_seat
 from dembrane.api.rate_limit import create_user_rate_limiter
 from dembrane.directus_async import async_directus
 from dembrane.api.dependency_auth import DependencyDirectusSession
+from dembrane.directus_aggregates import count_grouped
 from dembrane.api.v2._invite_helpers import create_membership_row
 
 router = APIRouter()
@@ -366,6 +367,9 @@ async def request_workspace_access(
     ws_name = workspace.get("name") or "a workspace"
     await emit_to_audience(
         audience,
+        # _pending_request above turns a double submit into already_pending, so
+        # each request row notifies once.
+        idempotency_key=f"MEMBERSHIP_REQUESTED:{req_id}",
         actor_user_id=app_user_id,
         event_code="MEMBERSHIP_REQUESTED",
         title=f"{requester_name} wants to join {ws_name}",
@@ -753,29 +757,13 @@ async def list_discoverable_workspaces(
             pending_map = {r["workspace_id"]: r["id"] for r in reqs}
 
     # Single grouped aggregate so the discovery list can show "N members" without N round-trips.
-    member_counts: dict[str, int] = {}
-    if ws_ids:
-        member_agg = await async_directus.get_items(
-            "workspace_membership",
-            {
-                "query": {
-                    "aggregate": {"count": "id"},
-                    "groupBy": ["workspace_id"],
-                    # Directus caps grouped rows at its default limit (100).
-                    "limit": -1,
-                    "filter": {
-                        "workspace_id": {"_in": ws_ids},
-                        "deleted_at": {"_null": True},
-                    },
-                }
-            },
-        )
-        if isinstance(member_agg, list):
-            for row in member_agg:
-                wid = row.get("workspace_id")
-                cnt = int((row.get("count") or {}).get("id", 0) or 0)
-                if wid:
-                    member_counts[wid] = cnt
+    member_counts = await count_grouped(
+        async_directus,
+        "workspace_membership",
+        "workspace_id",
+        ws_ids,
+        {"deleted_at": {"_null": True}},
+    )
 
     out: list[DiscoverableWorkspace] = []
     for w in workspaces:
@@ -1558,6 +1558,8 @@ async def monitor_conversations(
 MONITOR_STREAM_POLL_SECONDS = 2.0
 # Emit an SSE comment at least this often so proxies keep the connection open.
 MONITOR_STREAM_HEARTBEAT_SECONDS = 15.0
+# Queued nudges folded into one recompute after a wake.
+_MONITOR_STREAM_MAX_DRAIN = 32
 
 _MONITOR_SSE_HEADERS = {
     "Cache-Control": "no-cache",
@@ -1653,12 +1655,21 @@ async def monitor_conversations_stream(
                     yield ": keep-alive\n\n"
 
                 # Wait for a nudge, capped by the poll timeout as a safety net.
+                # Writers coalesce nudges per project (leading + trailing edge,
+                # see monitor_stream), so one wake per window is enough: drain
+                # whatever else queued meanwhile and recompute once.
                 if pubsub is not None:
                     try:
-                        await pubsub.get_message(
+                        message = await pubsub.get_message(
                             ignore_subscribe_messages=True,
                             timeout=MONITOR_STREAM_POLL_SECONDS,
                         )
+                        drained = 0
+                        while message is not None and drained < _MONITOR_STREAM_MAX_DRAIN:
+                            message = await pubsub.get_message(
+                                ignore_subscribe_messages=True, timeout=0
+                            )
+                            drained += 1
                     except Exception:  # noqa: BLE001
                         await asyncio.sleep(MONITOR_STREAM_POLL_SECONDS)
                 else:
@@ -140,57 +140,13 @@ async def _current_cycle_hours(workspace_id: str) -> float:
     """Cycle hours for the Pilot hard-block.
 
     Soft-deleted rows count — PRD §270, otherwise admins could reclaim
-    the cap by deleting a project.
+    the cap by deleting a project. Reads the usage ledger's month counter
+    (one Redis GET; rebuilt from a Directus aggregate on miss) so the gate
+    costs the same however many conversations the workspace has recorded.
     """
-    from datetime import datetime, timezone
-
-    now = datetime.now(timezone.utc)
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    if now.month == 12:
-        next_start = month_start.replace(year=now.year + 1, month=1)
-    else:
-        next_start = month_start.replace(month=now.month + 1)
-
-    projects = await async_directus.get_items(
-        "project",
-        {
-            "query": {
-                "filter": {
-                    "workspace_id": {"_eq": workspace_id},
-                },
-                "fields": ["id"],
-                "limit": -1,
-            }
-        },
-    )
-    if not isinstance(projects, list) or not projects:
-        return 0.0
-
-    ids = [p["id"] for p in projects if p.get("id")]
-    if not ids:
-        return 0.0
-
-    conversations = await async_directus.get_items(
-        "conversation",
-        {
-            "query": {
-                "filter": {
-                    "project_id": {"_in": ids},
-                    "created_at": {
-                        "_gte": month_start.isoformat(),
-                        "_lt": next_start.isoformat(),
-                    },
-                },
-                "fields": ["duration"],
-                "limit": -1,
-            }
-        },
-    )
-    if not isinstance(conversations, list):
-        return 0.0
+    from dembrane.usage_ledger import get_cycle_seconds
 
-    total = sum(int(c.get("duration") or 0) for c in conversations)
-    return total / 3600.0
+    return await get_cycle_seconds(workspace_id) / 3600.0
 
 
 async def require_no_pilot_block(
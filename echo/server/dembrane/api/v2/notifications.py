@@ -6,20 +6,44 @@ or activity sidecars to join. Read state lives inline as `read_at`.
 
 from __future__ import annotations
 
+import json
+import time
+import asyncio
 from typing import Any, Optional
 from logging import getLogger
 from datetime import datetime, timezone
+from contextlib import AsyncExitStack
+from collections.abc import AsyncGenerator
 
-from fastapi import APIRouter, HTTPException
+from fastapi import Request, APIRouter, HTTPException
 from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
 
 from dembrane.app_user import get_app_user_or_raise
 from dembrane.directus_async import async_directus
+from dembrane.notification_badge import (
+    aset_unread,
+    aadjust_unread,
+    subscribe_badge,
+    get_unread_count,
+)
 from dembrane.api.dependency_auth import DependencyDirectusSession
 
 router = APIRouter()
 logger = getLogger("api.v2.notifications")
 
+MARK_ALL_READ_LIMIT = 500
+# How long the badge stream waits for a nudge before re-reading the count anyway.
+BADGE_STREAM_POLL_SECONDS = 15.0
+# Emit an SSE comment at least this often so proxies keep the connection open.
+BADGE_STREAM_HEARTBEAT_SECONDS = 15.0
+
+_BADGE_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
 
 class NotificationRefs(BaseModel):
     org_id: Optional[str] = None
@@ -169,25 +193,76 @@ async def list_notifications(
 
 @router.get("/unread-count")
 async def unread_count(auth: DependencyDirectusSession) -> dict:
-    """Cheap count for the inbox badge."""
+    """Cheap count for the inbox badge (Redis counter, see notification_badge)."""
     app_user = await get_app_user_or_raise(auth.user_id)
-    now_iso = datetime.now(timezone.utc).isoformat()
+    return {"unread": await get_unread_count(app_user["id"])}
 
-    notif_filter = _row_filter(app_user["id"], now_iso)
-    notif_filter["read_at"] = {"_null": True}
 
-    rows = await async_directus.get_items(
-        "notification",
-        {
-            "query": {
-                "filter": notif_filter,
-                "fields": ["id"],
-                "limit": -1,
-            }
-        },
-    ) or []
-    count = len(rows) if isinstance(rows, list) else 0
-    return {"unread": count}
+@router.get("/unread-count/stream")
+async def unread_count_stream(
+    request: Request,
+    auth: DependencyDirectusSession,
+) -> StreamingResponse:
+    """Server-sent events for the inbox badge.
+
+    Sends an `unread` event with the count on connect and whenever it
+    changes. Counter updates publish a nudge on the user's badge channel
+    that wakes the stream; the poll timeout is the safety net if a nudge
+    is missed or pub/sub is unavailable. Re-reading the count is a single
+    Redis GET, so the stream costs the same whatever the inbox size.
+    """
+    app_user = await get_app_user_or_raise(auth.user_id)
+    app_user_id = app_user["id"]
+
+    async def event_stream() -> AsyncGenerator[str, None]:
+        async with AsyncExitStack() as stack:
+            pubsub = None
+            try:
+                pubsub = await stack.enter_async_context(subscribe_badge(app_user_id))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("badge stream subscribe failed: %s", exc)
+
+            last_count: Optional[int] = None
+            last_emit = time.monotonic()
+            while True:
+                if await request.is_disconnected():
+                    break
+
+                try:
+                    count: Optional[int] = await get_unread_count(app_user_id)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("badge stream count failed: %s", exc)
+                    count = None
+
+                now_mono = time.monotonic()
+                if count is not None and count != last_count:
+                    last_count = count
+                    last_emit = now_mono
+                    yield f"event: unread\ndata: {json.dumps({'unread': count})}\n\n"
+                elif now_mono - last_emit >= BADGE_STREAM_HEARTBEAT_SECONDS:
+                    last_emit = now_mono
+                    yield ": keep-alive\n\n"
+
+                if pubsub is None:
+                    await asyncio.sleep(BADGE_STREAM_POLL_SECONDS)
+                    continue
+                try:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=BADGE_STREAM_POLL_SECONDS
+                    )
+                    # A burst of emits is one recount.
+                    while message is not None:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=0
+                        )
+                except Exception:  # noqa: BLE001
+                    await asyncio.sleep(BADGE_STREAM_POLL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=_BADGE_SSE_HEADERS,
+    )
 
 
 @router.post("/{notification_id}/read")
@@ -209,11 +284,12 @@ async def mark_read(
     if notif.get("read_at"):
         return {"status": "read"}  # already read — idempotent no-op
 
-    await async_directus.update_item(
-        "notification",
-        notification_id,
-        {"read_at": datetime.now(timezone.utc).isoformat()},
-    )
+    now_iso = datetime.now(timezone.utc).isoformat()
+    await async_directus.update_item("notification", notification_id, {"read_at": now_iso})
+    # Expired rows were never in the badge count.
+    expires_at = notif.get("expires_at")
+    if not expires_at or expires_at > now_iso:
+        await aadjust_unread(app_user["id"], -1)
     return {"status": "read"}
 
 
@@ -237,15 +313,17 @@ async def mark_all_read(auth: DependencyDirectusSession) -> dict:
                 },
                 "fields": ["id"],
                 "sort": ["-created_at"],
-                "limit": 500,
+                "limit": MARK_ALL_READ_LIMIT,
             }
         },
     ) or []
     marked = 0
-    if isinstance(rows, list):
-        for row in rows:
-            await async_directus.update_item(
-                "notification", row["id"], {"read_at": now_iso}
-            )
-            marked += 1
+    if isinstance(rows, list) and rows:
+        updated = await async_directus.update_many(
+            "notification", [row["id"] for row in rows], {"read_at": now_iso}
+        )
+        marked = len(updated)
+    # Under the cap everything unread is read now; at the cap older rows
+    # may remain, so let the next read recount.
+    await aset_unread(app_user["id"], 0 if len(rows) < MARK_ALL_READ_LIMIT else None)
     return {"status": "read", "marked": marked}
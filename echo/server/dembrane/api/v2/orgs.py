@@ -49,6 +49,7 @@ from dembrane.api.rate_limit import create_user_rate_limiter
 from dembrane.api.v2.invites import compute_invite_hash, _enqueue_invite_email
 from dembrane.directus_async import async_directus
 from dembrane.api.dependency_auth import DependencyDirectusSession
+from dembrane.directus_aggregates import count_grouped
 from dembrane.api.v2._invite_helpers import build_invite_accept_url
 
 # Only http/https logos allowed — blocks javascript:/data: URIs. Shared
@@ -218,40 +219,24 @@ async def _require_org_role(org_id: str, app_user_id: str, minimum: str = "membe
     return role
 
 
-async def _count_organisation_members(org_id: str) -> int:
-    rows = await async_directus.get_items(
-        "org_membership",
-        {
-            "query": {
-                "filter": {
-                    "org_id": {"_eq": org_id},
-                    "deleted_at": {"_null": True},
-                },
-                "aggregate": {"count": "id"},
-            }
-        },
+async def _count_members_by_organisation(org_ids: list[str]) -> dict[str, int]:
+    return await count_grouped(
+        async_directus, "org_membership", "org_id", org_ids, {"deleted_at": {"_null": True}}
     )
-    if isinstance(rows, list) and rows:
-        return int(rows[0].get("count", {}).get("id", 0) or 0)
-    return 0
 
 
-async def _count_organisation_workspaces(org_id: str) -> int:
-    rows = await async_directus.get_items(
-        "workspace",
-        {
-            "query": {
-                "filter": {
-                    "org_id": {"_eq": org_id},
-                    "deleted_at": {"_null": True},
-                },
-                "aggregate": {"count": "id"},
-            }
-        },
+async def _count_workspaces_by_organisation(org_ids: list[str]) -> dict[str, int]:
+    return await count_grouped(
+        async_directus, "workspace", "org_id", org_ids, {"deleted_at": {"_null": True}}
     )
-    if isinstance(rows, list) and rows:
-        return int(rows[0].get("count", {}).get("id", 0) or 0)
-    return 0
+
+
+async def _count_organisation_members(org_id: str) -> int:
+    return (await _count_members_by_organisation([org_id])).get(org_id, 0)
+
+
+async def _count_organisation_workspaces(org_id: str) -> int:
+    return (await _count_workspaces_by_organisation([org_id])).get(org_id, 0)
 
 
 async def _count_external_in_organisation(org_id: str) -> int:
@@ -431,19 +416,24 @@ async def list_my_orgs(
     org_map = {o["id"]: o for o in orgs}
     role_map = {m["org_id"]: m["role"] for m in memberships}
 
+    # One grouped count per collection covers every organisation in the list.
+    live_org_ids = [org_id for org_id in org_ids if org_id in org_map]
+    member_counts, workspace_counts = await asyncio.gather(
+        _count_members_by_organisation(live_org_ids),
+        _count_workspaces_by_organisation(live_org_ids),
+    )
+
     out: list[OrgSummaryResponse] = []
-    for org_id in org_ids:
-        org = org_map.get(org_id)
-        if not org:
-            continue
+    for org_id in live_org_ids:
+        org = org_map[org_id]
         out.append(
             OrgSummaryResponse(
                 id=org_id,
                 name=org.get("name", ""),
                 logo_url=org.get("logo_url"),
                 role=role_map.get(org_id, "member"),
-                member_count=await _count_organisation_members(org_id),
-                workspace_count=await _count_organisation_workspaces(org_id),
+                member_count=member_counts.get(org_id, 0),
+                workspace_count=workspace_counts.get(org_id, 0),
             )
         )
     return out
@@ -1684,18 +1674,22 @@ class OrgWorkspaceSummary(BaseModel):
 
 
 async def _get_org_workspace_pinned(
-    ws_id: str, caller_is_manager: bool
-) -> list[OrgWorkspacePinnedProject]:
-    """Top-3 pinned projects for a workspace, for the org overview cards.
-
-    Managers see every pinned project; everyone else only non-private ones so
-    a member never sees a pinned private project they can't open. (Mirrors the
-    conservative end of workspace_projects._visibility_filter_for_caller — we
-    skip the shared/creator ladder here and just hide private, which can omit a
+    ws_ids: list[str], caller_is_manager: bool
+) -> dict[str, list[OrgWorkspacePinnedProject]]:
+    """Top-3 pinned projects per workspace, for the org overview cards.
+
+    One read over every listed workspace (pins are few; the top three per
+    workspace are picked here). Managers see every pinned project; everyone
+    else only non-private ones so a member never sees a pinned private project
+    they can't open. (Mirrors the conservative end of
+    workspace_projects._visibility_filter_for_caller — we skip the
+    shared/creator ladder here and just hide private, which can omit a
     shared-private pin but never leaks one.)
     """
+    if not ws_ids:
+        return {}
     filt: dict = {
-        "workspace_id": {"_eq": ws_id},
+        "workspace_id": {"_in": ws_ids},
         "deleted_at": {"_null": True},
         "pin_order": {"_nnull": True},
     }
@@ -1708,18 +1702,19 @@ async def _get_org_workspace_pinned(
         "project",
         {
             "query": {
-                "fields": ["id", "name", "pin_order"],
+                "fields": ["id", "name", "workspace_id", "pin_order"],
                 "filter": filt,
                 "sort": ["pin_order"],
-                "limit": 3,
+                "limit": -1,
             }
         },
     )
-    if not isinstance(rows, list):
-        return []
-    return [
-        OrgWorkspacePinnedProject(id=r["id"], name=r.get("name") or "") for r in rows if r.get("id")
-    ]
+    pinned: dict[str, list[OrgWorkspacePinnedProject]] = {}
+    for r in rows if isinstance(rows, list) else []:
+        ws_pins = pinned.setdefault(r.get("workspace_id") or "", [])
+        if r.get("id") and len(ws_pins) < 3:
+            ws_pins.append(OrgWorkspacePinnedProject(id=r["id"], name=r.get("name") or ""))
+    return pinned
 
 
 @router.get("/{org_id}/workspaces", response_model=list[OrgWorkspaceSummary])
@@ -1829,52 +1824,11 @@ async def list_organisation_workspaces(
     ws_ids = [w["id"] for w in workspaces if w.get("id")]
 
     # Batch per-workspace counts with group-by so one call covers the organisation.
-    project_counts: dict[str, int] = {}
-    member_counts: dict[str, int] = {}
-    if ws_ids:
-        project_agg = await async_directus.get_items(
-            "project",
-            {
-                "query": {
-                    "aggregate": {"count": "id"},
-                    "groupBy": ["workspace_id"],
-                    # Directus caps grouped rows at its default limit (100).
-                    "limit": -1,
-                    "filter": {
-                        "workspace_id": {"_in": ws_ids},
-                        "deleted_at": {"_null": True},
-                    },
-                }
-            },
-        )
-        if isinstance(project_agg, list):
-            for row in project_agg:
-                wid = row.get("workspace_id")
-                cnt = int((row.get("count") or {}).get("id", 0) or 0)
-                if wid:
-                    project_counts[wid] = cnt
-
-        member_agg = await async_directus.get_items(
-            "workspace_membership",
-            {
-                "query": {
-                    "aggregate": {"count": "id"},
-                    "groupBy": ["workspace_id"],
-                    # Directus caps grouped rows at its default limit (100).
-                    "limit": -1,
-                    "filter": {
-                        "workspace_id": {"_in": ws_ids},
-                        "deleted_at": {"_null": True},
-                    },
-                }
-            },
-        )
-        if isinstance(member_agg, list):
-            for row in member_agg:
-                wid = row.get("workspace_id")
-                cnt = int((row.get("count") or {}).get("id", 0) or 0)
-                if wid:
-                    member_counts[wid] = cnt
+    live = {"deleted_at": {"_null": True}}
+    project_counts, member_counts = await asyncio.gather(
+        count_grouped(async_directus, "project", "workspace_id", ws_ids, live),
+        count_grouped(async_directus, "workspace_membership", "workspace_id", ws_ids, live),
+    )
 
     # Hide private workspaces from non-admin organisation members — the whole
     # point of a private workspace is that organisation admins can't see it,
@@ -1941,13 +1895,10 @@ async def list_organisation_workspaces(
 
     # Pinned-projects enrichment for the overview cards. Member avatars + usage
     # hours come from the caller's own /v2/workspaces list (membership-scoped),
-    # so we don't recompute them per org workspace here. Fanned out in parallel.
-    if out:
-        pinned_lists = await asyncio.gather(
-            *[_get_org_workspace_pinned(o.id, caller_is_manager) for o in out]
-        )
-        for o, pinned in zip(out, pinned_lists, strict=True):
-            o.pinned_projects = pinned
+    # so we don't recompute them per org workspace here.
+    pinned = await _get_org_workspace_pinned([o.id for o in out], caller_is_manager)
+    for o in out:
+        o.pinned_projects = pinned.get(o.id, [])
 
     return out
 
@@ -2427,9 +2378,9 @@ async def get_org_usage(
     ws_ids = [w["id"] for w in workspaces if w.get("id")]
 
     # Soft-deleted rows stay in the rollup (PRD §270, delete preserves
-    # billable duration). project_count below is the live count.
-    # TODO: PRD §218 usage_event table replaces this scan path; until
-    # then this fetches every project across every workspace in the org.
+    # billable duration). project_count below is the live count. Hours
+    # come from one grouped DB-side aggregate, so no conversation rows
+    # cross the wire however many the org has recorded.
     project_count = 0
     per_ws_hours: dict[str, float] = {w["id"]: 0.0 for w in workspaces if w.get("id")}
     if ws_ids:
@@ -2457,7 +2408,7 @@ async def get_org_usage(
             }
             pids = list(ws_by_project.keys())
             if pids:
-                conversations = (
+                hour_rows = (
                     await async_directus.get_items(
                         "conversation",
                         {
@@ -2469,21 +2420,23 @@ async def get_org_usage(
                                         "_lt": cycle_end_exclusive,
                                     },
                                 },
-                                "fields": ["project_id", "duration"],
+                                "aggregate": {"sum": ["duration"]},
+                                "groupBy": ["project_id"],
+                                # Directus caps grouped rows at its default limit (100).
                                 "limit": -1,
                             }
                         },
                     )
                     or []
                 )
-                if isinstance(conversations, list):
-                    for c in conversations:
-                        pid = c.get("project_id")
+                if isinstance(hour_rows, list):
+                    for row in hour_rows:
+                        pid = row.get("project_id")
                         ws_id = ws_by_project.get(pid) if pid else None
                         if not ws_id:
                             continue
                         per_ws_hours[ws_id] = per_ws_hours.get(ws_id, 0.0) + (
-                            int(c.get("duration") or 0) / 3600.0
+                            float((row.get("sum") or {}).get("duration") or 0) / 3600.0
                         )
 
     # Effective seat + guest counts per workspace. Uses
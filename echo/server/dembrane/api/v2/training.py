@@ -307,6 +307,7 @@ async def request_training(
         staff_ids = await audience_staff()
         await emit_to_audience(
             staff_ids,
+            idempotency_key=f"TRAINING_REQUESTED:{training_id}",
             actor_user_id=app_user["id"],
             event_code="TRAINING_REQUESTED",
             title=f"{org_name} requested a {product.name} training",
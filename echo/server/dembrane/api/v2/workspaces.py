@@ -29,9 +29,14 @@ from dembrane.api.v2.schemas import (
     CreateWorkspaceResponse,
 )
 from dembrane.directus_async import async_directus
-from dembrane.tier_downgrade import preview_downgrade, apply_downgrade_effects
+from dembrane.tier_downgrade import (
+    preview_downgrade,
+    apply_downgrade_effects,
+    recalculate_over_cap_on_upgrade,
+)
 from dembrane.api.v2.middleware import WorkspaceContext, get_workspace_context
 from dembrane.api.dependency_auth import DependencyDirectusSession
+from dembrane.directus_aggregates import count_grouped
 
 # Reusable Annotated alias mirrors the convention in
 # dembrane/api/dependency_auth.py (DependencyDirectusSession). Avoids
@@ -319,53 +324,32 @@ async def list_workspaces(
         (m, ws_map[m["workspace_id"]]) for m in memberships if ws_map.get(m.get("workspace_id"))
     ]
 
-    async def _get_workspace_aggregates(
-        ws_id: str,
-    ) -> tuple[int, int, WorkspaceUsage, list[MemberPreview]]:
-        """Fetch project count, member count, usage, and member previews in parallel."""
-        proj_task = async_directus.get_items(
+    # Project and member counts come from one grouped aggregate each; usage
+    # (cached per workspace) and member previews stay per-workspace.
+    valid_ws_ids = [ws["id"] for _, ws in valid_memberships]
+    project_counts, member_counts, usages, all_previews = await asyncio.gather(
+        count_grouped(
+            async_directus,
             "project",
-            {
-                "query": {
-                    "filter": {"workspace_id": {"_eq": ws_id}, "deleted_at": {"_null": True}},
-                    "aggregate": {"count": ["id"]},
-                }
-            },
-        )
-        mem_task = async_directus.get_items(
+            "workspace_id",
+            valid_ws_ids,
+            {"deleted_at": {"_null": True}},
+        ),
+        # Exclude staff_support so support access never inflates the count.
+        count_grouped(
+            async_directus,
             "workspace_membership",
-            {
-                "query": {
-                    # Exclude staff_support so support access never inflates the count.
-                    "filter": {
-                        "workspace_id": {"_eq": ws_id},
-                        "deleted_at": {"_null": True},
-                        "source": {"_neq": "staff_support"},
-                    },
-                    "aggregate": {"count": ["id"]},
-                }
-            },
-        )
-        usage_task = _get_workspace_usage(ws_id)
-        previews_task = _get_member_previews(ws_id)
-
-        proj_count_result, mem_count_result, usage, previews = await asyncio.gather(
-            proj_task, mem_task, usage_task, previews_task
-        )
-
-        project_count = 0
-        if isinstance(proj_count_result, list) and len(proj_count_result) > 0:
-            project_count = int(proj_count_result[0].get("count", {}).get("id", 0))
-        member_count = 0
-        if isinstance(mem_count_result, list) and len(mem_count_result) > 0:
-            member_count = int(mem_count_result[0].get("count", {}).get("id", 0))
-
-        return project_count, member_count, usage, previews
-
-    # Run all workspace aggregate queries in parallel across all workspaces
-    all_aggregates = await asyncio.gather(
-        *[_get_workspace_aggregates(ws["id"]) for _, ws in valid_memberships]
+            "workspace_id",
+            valid_ws_ids,
+            {"deleted_at": {"_null": True}, "source": {"_neq": "staff_support"}},
+        ),
+        asyncio.gather(*[_get_workspace_usage(ws_id) for ws_id in valid_ws_ids]),
+        asyncio.gather(*[_get_member_previews(ws_id) for ws_id in valid_ws_ids]),
     )
+    all_aggregates = [
+        (project_counts.get(ws_id, 0), member_counts.get(ws_id, 0), usage, previews)
+        for ws_id, usage, previews in zip(valid_ws_ids, usages, all_previews, strict=True)
+    ]
 
     results: list[WorkspaceSummary] = []
     from dembrane.tier_capacity import next_tier as tier_next, get_capacity, compute_usage_gates
@@ -449,37 +433,28 @@ async def list_workspaces(
             all_organisation_ws_ids.extend(tw.id for tw in organisation_ws)
             valid_org_memberships.append(om)
 
-        # Fetch all workspace memberships for organisation rollups in parallel
-        all_organisation_mems = (
-            await asyncio.gather(
-                *[
-                    async_directus.get_items(
-                        "workspace_membership",
-                        {
-                            "query": {
-                                "filter": {
-                                    "workspace_id": {"_eq": ws_id},
-                                    "deleted_at": {"_null": True},
-                                },
-                                "fields": ["user_id"],
-                                "limit": -1,
-                            }
+        # One read covers the memberships of every workspace in the rollups.
+        organisation_mems: list = []
+        if all_organisation_ws_ids:
+            organisation_mems = await async_directus.get_items(
+                "workspace_membership",
+                {
+                    "query": {
+                        "filter": {
+                            "workspace_id": {"_in": list(dict.fromkeys(all_organisation_ws_ids))},
+                            "deleted_at": {"_null": True},
                         },
-                    )
-                    for ws_id in all_organisation_ws_ids
-                ]
+                        "fields": ["workspace_id", "user_id"],
+                        "limit": -1,
+                    }
+                },
             )
-            if all_organisation_ws_ids
-            else []
-        )
 
         # Build ws_id -> member user_ids map
         ws_member_map: dict[str, set[str]] = {}
-        for ws_id, mems in zip(all_organisation_ws_ids, all_organisation_mems, strict=True):
-            member_ids: set[str] = set()
-            if isinstance(mems, list):
-                member_ids = {m["user_id"] for m in mems if m.get("user_id")}
-            ws_member_map[ws_id] = member_ids
+        for mem in organisation_mems if isinstance(organisation_mems, list) else []:
+            if mem.get("workspace_id") and mem.get("user_id"):
+                ws_member_map.setdefault(mem["workspace_id"], set()).add(mem["user_id"])
 
         for om in valid_org_memberships:
             oid = om["org_id"]
@@ -912,6 +887,7 @@ async def create_workspace(
     organisation_admin_ids = await audience_organisation_admins(org_id)
     await emit_to_audience(
         organisation_admin_ids,
+        idempotency_key=f"WORKSPACE_CREATED:{ws_id}",
         actor_user_id=app_user_id,
         event_code="WORKSPACE_CREATED",
         title=f"{creator_name} created {body.name.strip()}",
@@ -1121,6 +1097,11 @@ async def set_workspace_tier(
 
     await update_workspace_billing(workspace_id, account_update)
 
+    # Stamps taken under the old tier's cap may now be within the new one
+    # (ledger-driven, one bulk PATCH; a no-op for overage tiers).
+    if direction == "upgrade":
+        await recalculate_over_cap_on_upgrade(workspace_id, to_tier)
+
     # Bust the cached usage rollup so the UI reflects the new tier's
     # caps + rates on the next read. Both the workspace-scope cache and
     # the org-scope aggregate depend on tier info, so bust both.
@@ -1498,9 +1479,10 @@ async def get_workspace_usage(
     cycle_start, cycle_end_exclusive = _calendar_month_bounds(now, month_offset)
 
     # Soft-deleted rows stay in the rollup — PRD §270, delete preserves
-    # billable duration. project_count below excludes them.
-    # TODO: PRD §218 usage_event table replaces this scan path; until
-    # then this fetches every project the workspace has ever had.
+    # billable duration. project_count below excludes them. The project
+    # list is still needed for names in the breakdown; conversation hours
+    # come from a grouped DB-side aggregate (per-project) and the usage
+    # ledger (lifetime), so no conversation rows cross the wire.
     projects = await async_directus.get_items(
         "project",
         {
@@ -1518,55 +1500,55 @@ async def get_workspace_usage(
 
     project_ids = [p["id"] for p in projects if p.get("id")]
 
+    from dembrane.usage_ledger import cycle_for, prime_counter, get_lifetime_seconds
+
     if project_ids:
-        cycle_task = async_directus.get_items(
-            "conversation",
-            {
-                "query": {
-                    "filter": {
-                        "project_id": {"_in": project_ids},
-                        "created_at": {
-                            "_gte": cycle_start,
-                            "_lt": cycle_end_exclusive,
+        cycle_rows, lifetime_seconds = await asyncio.gather(
+            async_directus.get_items(
+                "conversation",
+                {
+                    "query": {
+                        "filter": {
+                            "project_id": {"_in": project_ids},
+                            "created_at": {
+                                "_gte": cycle_start,
+                                "_lt": cycle_end_exclusive,
+                            },
                         },
-                    },
-                    "fields": ["project_id", "duration"],
-                    "limit": -1,
-                }
-            },
-        )
-        all_time_task = async_directus.get_items(
-            "conversation",
-            {
-                "query": {
-                    "filter": {"project_id": {"_in": project_ids}},
-                    "fields": ["duration"],
-                    "limit": -1,
-                }
-            },
+                        "aggregate": {"sum": ["duration"], "count": ["id"]},
+                        "groupBy": ["project_id"],
+                        # Directus caps grouped rows at its default limit (100).
+                        "limit": -1,
+                    }
+                },
+            ),
+            get_lifetime_seconds(ctx.workspace_id),
         )
-        conversations, all_time_convs = await asyncio.gather(cycle_task, all_time_task)
     else:
-        conversations = []
-        all_time_convs = []
-    if not isinstance(conversations, list):
-        conversations = []
-    if not isinstance(all_time_convs, list):
-        all_time_convs = []
-    hours_lifetime = round(sum(c.get("duration") or 0 for c in all_time_convs) / 3600, 2)
+        cycle_rows, lifetime_seconds = [], 0.0
+    if not isinstance(cycle_rows, list):
+        cycle_rows = []
+    hours_lifetime = round(lifetime_seconds / 3600, 2)
 
     # Per-project and total aggregates.
     per_project_seconds: dict[str, int] = {}
     per_project_count: dict[str, int] = {}
     total_seconds = 0
-    for c in conversations:
-        pid = c.get("project_id")
+    for row in cycle_rows:
+        pid = row.get("project_id")
         if not pid:
             continue
-        sec = int(c.get("duration") or 0)
+        sec = int(float((row.get("sum") or {}).get("duration") or 0))
         total_seconds += sec
         per_project_seconds[pid] = per_project_seconds.get(pid, 0) + sec
-        per_project_count[pid] = per_project_count.get(pid, 0) + 1
+        per_project_count[pid] = per_project_count.get(pid, 0) + int(
+            (row.get("count") or {}).get("id") or 0
+        )
+
+    if is_current_month and cycle_rows:
+        # We just paid for the exact month sum; warm the ledger counter the
+        # Pilot gate reads so its first check is a cache hit.
+        await prime_counter(ctx.workspace_id, cycle_for(now), float(total_seconds))
 
     # Show deleted projects in the breakdown only if they had cycle
     # activity — keeps the bill reconcilable without listing empty rows.
@@ -1,19 +1,39 @@
 from __future__ import annotations
 
 import re
+import json
+import time
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Callable, Optional, AsyncGenerator
 from datetime import datetime
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter, HTTPException
+from fastapi import Request, APIRouter, HTTPException
 from pydantic import Field, BaseModel
+from fastapi.responses import StreamingResponse
 
+from dembrane.s3 import delete_from_s3, get_signed_url, get_file_size_bytes_from_s3
 from dembrane.llms import MODELS, arouter_completion
 from dembrane.utils import generate_uuid
 from dembrane.prompts import render_prompt
 from dembrane.directus import DirectusClient, directus
 from dembrane.settings import get_settings
 from dembrane.transcribe import _get_audio_file_object
+from dembrane.audio_utils import (
+    sanitize_filename_component,
+    merge_multiple_audio_files_and_save_to_s3,
+)
+from dembrane.verify_jobs import (
+    TERMINAL_EVENT_TYPES,
+    start_job,
+    finish_job,
+    get_job_state,
+    read_job_event,
+    publish_job_progress,
+    subscribe_job_events,
+)
 from dembrane.async_helpers import run_in_thread_pool
 from dembrane.api.exceptions import ProjectNotFoundException, ConversationNotFoundException
 from dembrane.api.dependency_auth import DependencyDirectusSession
@@ -23,6 +43,12 @@ logger = logging.getLogger("api.verify")
 settings = get_settings()
 GCP_SA_JSON = settings.transcription.gcp_sa_json
 
+# Source bytes of untranscribed audio sent with one call; past it the oldest
+# clips are left out. Inline parts are base64, a third larger than this.
+AUDIO_BYTE_BUDGET = 20 * 1024 * 1024
+AUDIO_FETCH_CONCURRENCY = 4
+MERGE_AUDIO_MIN_CHUNKS = settings.transcription.verify_merge_audio_min_chunks
+
 VerifyRouter = APIRouter(tags=["verify"])
 
 
@@ -75,6 +101,13 @@ class GenerateArtifactsResponse(BaseModel):
     artifact_list: List[ConversationArtifactResponse]
 
 
+class GenerateArtifactsJobResponse(BaseModel):
+    job_id: str
+    # False when the conversation/topic was already being generated and this
+    # request joined that job.
+    created: bool
+
+
 class UpdateVerificationTopicsRequest(BaseModel):
     topic_list: List[str] = Field(default_factory=list)
 
@@ -753,7 +786,7 @@ def _select_audio_chunks(
     return selected
 
 
-def _format_audio_summary(audio_chunks: List[dict]) -> str:
+def _format_audio_summary(audio_chunks: List[dict], omitted: int = 0) -> str:
     if not audio_chunks:
         return "Audio attachments: None."
 
@@ -762,9 +795,137 @@ def _format_audio_summary(audio_chunks: List[dict]) -> str:
         timestamp = chunk.get("timestamp")
         ts_value = timestamp.isoformat() if isinstance(timestamp, datetime) else "unknown"
         lines.append(f"- chunk_id={chunk.get('id')} timestamp={ts_value}")
+    if omitted:
+        lines.append(f"- {omitted} older chunk(s) omitted to stay within the audio size limit")
     return "\n".join(lines)
 
 
+def _audio_label(chunk: dict) -> Dict[str, Any]:
+    timestamp = chunk.get("timestamp")
+    ts_value = timestamp.isoformat() if isinstance(timestamp, datetime) else "unknown"
+    return {"type": "text", "text": f"Audio chunk {chunk.get('id')} captured at {ts_value}"}
+
+
+async def _fit_audio_budget(
+    audio_chunks: List[dict],
+    byte_budget: int,
+    semaphore: asyncio.Semaphore,
+) -> List[dict]:
+    """
+    The newest run of `audio_chunks` whose stored sizes fit in `byte_budget`,
+    in chunk order. A size that cannot be read counts as 0; the fetch that
+    follows logs the failure.
+    """
+
+    async def _size(chunk: dict) -> int:
+        async with semaphore:
+            try:
+                return await run_in_thread_pool(get_file_size_bytes_from_s3, chunk["path"])
+            except Exception as exc:
+                logger.debug("Could not read size of audio chunk %s: %s", chunk.get("id"), exc)
+                return 0
+
+    sizes = await asyncio.gather(*(_size(chunk) for chunk in audio_chunks))
+
+    kept: List[dict] = []
+    spent = 0
+    for chunk, size in zip(reversed(audio_chunks), reversed(sizes), strict=True):
+        if spent + size > byte_budget:
+            break
+        spent += size
+        kept.append(chunk)
+    kept.reverse()
+    return kept
+
+
+async def _merged_audio_parts(
+    audio_chunks: List[dict],
+    conversation_id: str,
+) -> tuple[List[Dict[str, Any]], str]:
+    """One compressed mp3 part for all `audio_chunks`, plus the merged file to delete."""
+    merged_path, _duration = await run_in_thread_pool(
+        merge_multiple_audio_files_and_save_to_s3,
+        [chunk["path"] for chunk in audio_chunks],
+        f"audio-conversations/verify-{sanitize_filename_component(conversation_id)}-{generate_uuid()}.mp3",
+        "mp3",
+    )
+    try:
+        part = await run_in_thread_pool(_get_audio_file_object, get_signed_url(merged_path))
+    except Exception:
+        await run_in_thread_pool(delete_from_s3, merged_path)
+        raise
+    chunk_ids = ", ".join(str(chunk.get("id")) for chunk in audio_chunks)
+    label = {
+        "type": "text",
+        "text": f"Audio chunks {chunk_ids}, merged into one recording in this order",
+    }
+    return [label, part], merged_path
+
+
+async def _separate_audio_parts(
+    audio_chunks: List[dict],
+    semaphore: asyncio.Semaphore,
+) -> List[Dict[str, Any]]:
+    """A labelled part per chunk, fetched concurrently and kept in chunk order."""
+
+    async def _fetch(chunk: dict) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                return await run_in_thread_pool(_get_audio_file_object, chunk["path"])
+            except Exception as exc:
+                logger.warning("Failed to attach audio chunk %s: %s", chunk.get("id"), exc)
+                return None
+
+    fetched = await asyncio.gather(*(_fetch(chunk) for chunk in audio_chunks))
+
+    parts: List[Dict[str, Any]] = []
+    for chunk, part in zip(audio_chunks, fetched, strict=True):
+        parts.append(_audio_label(chunk))
+        if part is not None:
+            parts.append(part)
+    return parts
+
+
+@asynccontextmanager
+async def _prepared_audio(
+    audio_chunks: List[dict],
+    conversation_id: str,
+    byte_budget: int = AUDIO_BYTE_BUDGET,
+    concurrency: int = AUDIO_FETCH_CONCURRENCY,
+    merge_min_chunks: int = MERGE_AUDIO_MIN_CHUNKS,
+) -> AsyncIterator[tuple[List[Dict[str, Any]], List[dict]]]:
+    """
+    Yield (message parts, attached chunks) for the untranscribed `audio_chunks`.
+
+    Clips past `byte_budget` are left out, the rest are fetched `concurrency`
+    at a time. From `merge_min_chunks` clips on they are merged into a single
+    mp3 part instead (falling back to separate parts if the merge fails); the
+    merged file lives until the block exits, since a "url" part is fetched by
+    the provider during the call.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    attached = await _fit_audio_budget(audio_chunks, byte_budget, semaphore)
+
+    merged_path: Optional[str] = None
+    parts: Optional[List[Dict[str, Any]]] = None
+    if merge_min_chunks and len(attached) >= merge_min_chunks:
+        try:
+            parts, merged_path = await _merged_audio_parts(attached, conversation_id)
+        except Exception as exc:
+            logger.warning("Failed to merge audio for conversation %s: %s", conversation_id, exc)
+    if parts is None:
+        parts = await _separate_audio_parts(attached, semaphore)
+
+    try:
+        yield parts, attached
+    finally:
+        if merged_path:
+            try:
+                await run_in_thread_pool(delete_from_s3, merged_path)
+            except Exception as exc:
+                logger.warning("Failed to delete merged verify audio %s: %s", merged_path, exc)
+
+
 def _build_user_message_content(
     conversation: dict,
     artifacts: List[dict],
@@ -837,78 +998,91 @@ async def _create_conversation_artifact(
     return created.get("data", artifact_payload)
 
 
-@VerifyRouter.post("/generate", response_model=GenerateArtifactsResponse)
-async def generate_verification_artifacts(
-    body: GenerateArtifactsRequest,
-) -> GenerateArtifactsResponse:
-    if not GCP_SA_JSON:
-        raise HTTPException(status_code=500, detail="GCP credentials are not configured")
+ProgressCallback = Callable[[str, str, Optional[dict]], None]
 
-    client = directus
 
-    conversation = await _get_conversation_with_project(body.conversation_id, client)
+async def _get_generation_topic(
+    conversation_id: str,
+    topic_key: str,
+    client: DirectusClient,
+) -> tuple[dict, VerificationTopicMetadata]:
+    conversation = await _get_conversation_with_project(conversation_id, client)
     project = conversation.get("project_id") or {}
     project_id = project.get("id")
     if not project_id:
         raise HTTPException(status_code=400, detail="Conversation is missing project information")
-    is_anonymized = bool(project.get("anonymize_transcripts", False))
 
     topics = await _get_verification_topics_for_project(project_id, client)
     topic_map = {topic.key: topic for topic in topics if topic.key}
 
-    target_topic_key = body.topic_list[0]
-    target_topic = topic_map.get(target_topic_key)
+    target_topic = topic_map.get(topic_key)
     if not target_topic or not target_topic.prompt:
-        raise HTTPException(
-            status_code=400, detail=f"Verification topic '{target_topic_key}' not found"
-        )
+        raise HTTPException(status_code=400, detail=f"Verification topic '{topic_key}' not found")
 
-    artifacts = await _get_conversation_artifacts(body.conversation_id, client)
+    return conversation, target_topic
+
+
+def _no_chunks_error(conversation_id: str) -> HTTPException:
+    logger.error(
+        "Verify blocked for conversation %s: %s",
+        conversation_id,
+        "Conversation has no chunks yet",
+    )
+    return HTTPException(
+        status_code=400,
+        detail={
+            "code": "NO_CHUNKS",
+            "message": "Conversation has no chunks yet",
+        },
+    )
+
+
+async def _conversation_has_chunks(conversation_id: str, client: DirectusClient) -> bool:
+    chunk_rows = await run_in_thread_pool(
+        client.get_items,
+        "conversation_chunk",
+        {
+            "query": {
+                "filter": {"conversation_id": {"_eq": conversation_id}},
+                "fields": ["id"],
+                "limit": 1,
+            }
+        },
+    )
+    return bool(chunk_rows)
+
+
+async def generate_verification_artifact(
+    conversation_id: str,
+    topic_key: str,
+    on_progress: Optional[ProgressCallback] = None,
+) -> ConversationArtifactResponse:
+    """
+    Generate and store the artifact for one topic. Runs in
+    task_generate_verification_artifact; `on_progress(type, message, detail)`
+    is called as the generation moves along.
+    """
+
+    def progress(event_type: str, message: str, detail: Optional[dict] = None) -> None:
+        if on_progress is not None:
+            on_progress(event_type, message, detail)
+
+    client = directus
+
+    conversation, target_topic = await _get_generation_topic(conversation_id, topic_key, client)
+    project = conversation.get("project_id") or {}
+    is_anonymized = bool(project.get("anonymize_transcripts", False))
+
+    artifacts = await _get_conversation_artifacts(conversation_id, client)
     last_artifact_time = None
     if artifacts:
         last_artifact_time = _parse_directus_datetime(artifacts[-1].get("date_created"))
 
-    chunks = await _get_conversation_chunks(body.conversation_id, client)
+    chunks = await _get_conversation_chunks(conversation_id, client)
     if not _has_chunks(chunks):
-        logger.error(
-            "Verify blocked for conversation %s: %s",
-            body.conversation_id,
-            "Conversation has no chunks yet",
-        )
-
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "code": "NO_CHUNKS",
-                "message": "Conversation has no chunks yet",
-            },
-        )
+        raise _no_chunks_error(conversation_id)
     transcript_text = _build_transcript_text(chunks)
     audio_chunks = _select_audio_chunks(chunks, last_artifact_time)
-    audio_summary = _format_audio_summary(audio_chunks)
-
-    user_text = _build_user_message_content(
-        conversation, artifacts, transcript_text, audio_summary, is_anonymized=is_anonymized
-    )
-    message_content = [{"type": "text", "text": user_text}]
-
-    for chunk in audio_chunks:
-        timestamp = chunk.get("timestamp")
-        ts_value = timestamp.isoformat() if isinstance(timestamp, datetime) else "unknown"
-        chunk_id = chunk.get("id")
-        message_content.append(
-            {
-                "type": "text",
-                "text": f"Audio chunk {chunk_id} captured at {ts_value}",
-            }
-        )
-        path = chunk.get("path")
-        if path:
-            try:
-                audio_obj = await run_in_thread_pool(_get_audio_file_object, path)
-                message_content.append(audio_obj)
-            except Exception as exc:
-                logger.warning("Failed to attach audio chunk %s: %s", chunk_id, exc)
 
     project_language = project.get("language") or "en"
 
@@ -922,60 +1096,182 @@ async def generate_verification_artifacts(
         },
     )
 
-    try:
-        # Use router for load balancing and failover across Gemini regions
-        response = await arouter_completion(
-            MODELS.MULTI_MODAL_PRO,
-            messages=[
-                {
-                    "role": "system",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": system_prompt,
-                        }
-                    ],
-                },
-                {
-                    "role": "user",
-                    "content": message_content,
-                },
-            ],
-            thinking={"type": "enabled", "budget_tokens": 2048},
+    if audio_chunks:
+        progress("preparing_audio", "Preparing audio", {"chunks": len(audio_chunks)})
+
+    async with _prepared_audio(audio_chunks, conversation_id) as (audio_parts, attached):
+        audio_summary = _format_audio_summary(attached, omitted=len(audio_chunks) - len(attached))
+        user_text = _build_user_message_content(
+            conversation, artifacts, transcript_text, audio_summary, is_anonymized=is_anonymized
         )
-    except Exception as exc:
-        logger.error("Gemini completion failed: %s", exc, exc_info=True)
-        raise HTTPException(
-            status_code=500, detail="Failed to generate verification artifact"
-        ) from exc
+        message_content = [{"type": "text", "text": user_text}, *audio_parts]
+
+        progress("generating", "Generating artifact", None)
+        try:
+            # Use router for load balancing and failover across Gemini regions
+            response = await arouter_completion(
+                MODELS.MULTI_MODAL_PRO,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": system_prompt,
+                            }
+                        ],
+                    },
+                    {
+                        "role": "user",
+                        "content": message_content,
+                    },
+                ],
+                thinking={"type": "enabled", "budget_tokens": 2048},
+            )
+        except Exception as exc:
+            logger.error("Gemini completion failed: %s", exc, exc_info=True)
+            raise HTTPException(
+                status_code=500, detail="Failed to generate verification artifact"
+            ) from exc
 
     generated_text = _extract_response_text(response)
 
     resolved_label = (
         target_topic.translations.get("en-US", VerificationTopicTranslation(label="")).label
-        or target_topic_key
+        or topic_key
     )
 
     artifact_record = await _create_conversation_artifact(
-        body.conversation_id,
-        target_topic_key,
+        conversation_id,
+        topic_key,
         generated_text,
         client,
         topic_label=resolved_label,
     )
 
-    artifact_response = ConversationArtifactResponse(
+    return ConversationArtifactResponse(
         id=artifact_record.get("id") or "",
         key=artifact_record.get("key"),
         topic_label=artifact_record.get("topic_label"),
         content=artifact_record.get("content", ""),
-        conversation_id=artifact_record.get("conversation_id", body.conversation_id),
+        conversation_id=artifact_record.get("conversation_id", conversation_id),
         approved_at=artifact_record.get("approved_at"),
         date_created=artifact_record.get("date_created"),
         read_aloud_stream_url=artifact_record.get("read_aloud_stream_url") or "",
     )
 
-    return GenerateArtifactsResponse(artifact_list=[artifact_response])
+
+@VerifyRouter.post("/generate", response_model=GenerateArtifactsJobResponse, status_code=202)
+async def generate_verification_artifacts(
+    body: GenerateArtifactsRequest,
+) -> GenerateArtifactsJobResponse:
+    """
+    Start generating the artifact for the first topic in `topic_list` and
+    return the job to follow on /generate/{job_id}/progress. While a job for
+    the same conversation and topic is running, its id is returned instead.
+    """
+    if not GCP_SA_JSON:
+        raise HTTPException(status_code=500, detail="GCP credentials are not configured")
+    if not body.topic_list:
+        raise HTTPException(status_code=400, detail="No verification topic provided")
+
+    client = directus
+    target_topic_key = body.topic_list[0]
+
+    # Validate up front so these errors still reach the participant as a 4xx.
+    await _get_generation_topic(body.conversation_id, target_topic_key, client)
+    if not await _conversation_has_chunks(body.conversation_id, client):
+        raise _no_chunks_error(body.conversation_id)
+
+    job_id, created = await start_job(body.conversation_id, target_topic_key)
+    if created:
+        from dembrane.tasks import task_generate_verification_artifact
+
+        try:
+            task_generate_verification_artifact.send(job_id, body.conversation_id, target_topic_key)
+        except Exception as exc:
+            # Nothing will run this job: release the claim so the next request
+            # can start over, and fail it for anyone who already joined.
+            logger.error("Failed to enqueue verify job %s: %s", job_id, exc)
+            await run_in_thread_pool(finish_job, job_id, body.conversation_id, target_topic_key)
+            await run_in_thread_pool(
+                publish_job_progress, job_id, "failed", "Failed to start generation"
+            )
+            raise HTTPException(
+                status_code=500, detail="Failed to start verification artifact generation"
+            ) from exc
+        logger.info(
+            "Queued verify job %s for conversation %s topic %s",
+            job_id,
+            body.conversation_id,
+            target_topic_key,
+        )
+
+    return GenerateArtifactsJobResponse(job_id=job_id, created=created)
+
+
+@VerifyRouter.get("/generate/{job_id}")
+async def get_verification_job(job_id: str) -> dict:
+    """Latest progress event of a generation job (for clients without SSE)."""
+    state = await get_job_state(job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return state
+
+
+@VerifyRouter.get("/generate/{job_id}/progress")
+async def stream_verification_job(job_id: str, request: Request) -> StreamingResponse:
+    """SSE endpoint for verification artifact generation progress."""
+    if await get_job_state(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def _generate_events() -> AsyncGenerator[str, None]:
+        last_heartbeat = time.monotonic()
+
+        try:
+            async with subscribe_job_events(job_id) as pubsub:
+                # Read the state after subscribing, so an event published in
+                # between is either in the state or on the channel.
+                state = await get_job_state(job_id)
+                if state is None:
+                    state = {"type": "failed", "message": "Job expired", "detail": None}
+                yield f"event: progress\ndata: {json.dumps(state)}\n\n"
+                if state.get("type") in TERMINAL_EVENT_TYPES:
+                    return
+
+                while True:
+                    if await request.is_disconnected():
+                        break
+
+                    payload = await read_job_event(pubsub, timeout_seconds=1.0)
+                    if payload:
+                        yield f"event: progress\ndata: {payload}\n\n"
+
+                        try:
+                            event = json.loads(payload)
+                            if event.get("type") in TERMINAL_EVENT_TYPES:
+                                break
+                        except json.JSONDecodeError:
+                            pass
+                        continue
+
+                    now = time.monotonic()
+                    if now - last_heartbeat >= 10.0:
+                        yield "event: heartbeat\ndata: {}\n\n"
+                        last_heartbeat = now
+        except Exception as exc:
+            logger.warning("SSE stream error for verify job %s: %s", job_id, exc)
+            yield f"event: progress\ndata: {json.dumps({'type': 'failed', 'message': 'Stream error'})}\n\n"
+
+    return StreamingResponse(
+        _generate_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 @VerifyRouter.put("/artifact/{artifact_id}", response_model=ConversationArtifactResponse)
@@ -1049,50 +1345,35 @@ async def update_verification_artifact(
             }
         ]
 
-        for chunk in audio_chunks:
-            timestamp = chunk.get("timestamp")
-            ts_value = timestamp.isoformat() if isinstance(timestamp, datetime) else "unknown"
-            chunk_id = chunk.get("id")
-            message_content.append(
-                {
-                    "type": "text",
-                    "text": f"Audio chunk {chunk_id} captured at {ts_value}",
-                }
-            )
-            path = chunk.get("path")
-            if path:
-                try:
-                    audio_obj = await run_in_thread_pool(_get_audio_file_object, path)
-                    message_content.append(audio_obj)
-                except Exception as exc:  # pragma: no cover - logging side effect
-                    logger.warning("Failed to attach audio chunk %s: %s", chunk_id, exc)
+        async with _prepared_audio(audio_chunks, reference_conversation_id) as (audio_parts, _):
+            message_content.extend(audio_parts)
 
-        try:
-            # Use router for load balancing and failover across Gemini regions
-            response = await arouter_completion(
-                MODELS.MULTI_MODAL_PRO,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": system_prompt,
-                            }
-                        ],
-                    },
-                    {
-                        "role": "user",
-                        "content": message_content,
-                    },
-                ],
-                thinking={"type": "enabled", "budget_tokens": 2048},
-            )
-        except Exception as exc:  # pragma: no cover - external failure
-            logger.error("Gemini revision failed: %s", exc, exc_info=True)
-            raise HTTPException(
-                status_code=500, detail="Failed to revise verification artifact"
-            ) from exc
+            try:
+                # Use router for load balancing and failover across Gemini regions
+                response = await arouter_completion(
+                    MODELS.MULTI_MODAL_PRO,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": [
+                                {
+                                    "type": "text",
+                                    "text": system_prompt,
+                                }
+                            ],
+                        },
+                        {
+                            "role": "user",
+                            "content": message_content,
+                        },
+                    ],
+                    thinking={"type": "enabled", "budget_tokens": 2048},
+                )
+            except Exception as exc:  # pragma: no cover - external failure
+                logger.error("Gemini revision failed: %s", exc, exc_info=True)
+                raise HTTPException(
+                    status_code=500, detail="Failed to revise verification artifact"
+                ) from exc
 
         generated_text = _extract_response_text(response)
         updates["content"] = generated_text
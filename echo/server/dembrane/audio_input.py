@@ -0,0 +1,192 @@
+"""Audio input for transcription calls, without holding whole chunks in memory.
+
+The Gemini calls used to read the chunk into memory and base64 encode it once
+per call (twice with PII redaction), and the LiteLLM transcription path copied
+the whole object into a BytesIO. Here the audio is read from storage in
+`READ_CHUNK_BYTES` pieces into a spooled temp file that moves to disk past
+`SPOOL_MAX_BYTES`, and the provider input is built from that file:
+
+* `audio_content_part` builds the multimodal part for the Gemini calls. In
+  "url" mode an https signed URL is sent as a file reference, so the provider
+  fetches the audio and nothing is downloaded here. In "inline" mode (and for
+  plain http URLs, e.g. local MinIO) the spool is base64-encoded piece by
+  piece into a buffer sized up front. The request body still needs the data
+  URI as one str, so inline input peaks at twice the encoded size while that
+  str is made; the raw audio is never in memory next to it.
+* `open_audio_upload` yields a (filename, file, mime type) tuple over the
+  spool for `litellm.transcription`, which uploads it as multipart.
+
+Wrap a task in `audio_task()` to share the encoded part between the calls of
+one task (transcription plus the PII correction pass) and to log the peak
+number of bytes this module held for it.
+"""
+import os
+import logging
+import tempfile
+import mimetypes
+import contextvars
+from base64 import b64encode
+from typing import IO, Any, Iterator, Optional
+from contextlib import contextmanager
+from dataclasses import field, dataclass
+
+import requests
+
+from dembrane.service import file_service
+from dembrane.settings import get_settings
+
+logger = logging.getLogger("audio_input")
+
+AUDIO_INPUT_MODE = get_settings().transcription.audio_input
+
+READ_CHUNK_BYTES = 256 * 1024
+# Multiple of 3 so each encoded piece is padding-free and can be concatenated.
+ENCODE_CHUNK_BYTES = 3 * 128 * 1024
+SPOOL_MAX_BYTES = 1024 * 1024
+DEFAULT_AUDIO_MIME_TYPE = "audio/mp3"
+NAIVE_FETCH_TIMEOUT_SECONDS = 60
+
+
+@dataclass
+class AudioTask:
+    """Bytes held for one transcription task, plus the parts it already built."""
+
+    mode: Optional[str] = None
+    source_bytes: int = 0
+    held_bytes: int = 0
+    peak_bytes: int = 0
+    parts: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def adjust(self, delta: int) -> None:
+        self.held_bytes += delta
+        self.peak_bytes = max(self.peak_bytes, self.held_bytes)
+
+
+_current_task: contextvars.ContextVar[Optional[AudioTask]] = contextvars.ContextVar(
+    "audio_input_task", default=None
+)
+
+
+def _filename(uri: str) -> str:
+    return os.path.basename(uri.split("?", 1)[0])
+
+
+@contextmanager
+def audio_task(audio_file_uri: str) -> Iterator[AudioTask]:
+    """Scope one transcription task's audio input and log what it held."""
+    task = AudioTask()
+    token = _current_task.set(task)
+    try:
+        yield task
+    finally:
+        _current_task.reset(token)
+        logger.info(
+            f"Audio input for {_filename(audio_file_uri)}: {task.mode}, "
+            f"{task.source_bytes} bytes read, peak {task.peak_bytes} bytes held"
+        )
+
+
+def _task() -> AudioTask:
+    # Outside audio_task() the accounting still runs, it is just not kept.
+    return _current_task.get() or AudioTask()
+
+
+def _mime_type(uri: str) -> str:
+    # A file reference needs the real type: chunks are stored as ogg as well as mp3.
+    guessed, _ = mimetypes.guess_type(uri.split("?", 1)[0])
+    return guessed if guessed and guessed.startswith("audio/") else DEFAULT_AUDIO_MIME_TYPE
+
+
+def _iter_remote(uri: str, naive_fallback: bool) -> Iterator[bytes]:
+    try:
+        stream = file_service.get_stream(uri)
+    except Exception as e:
+        if not naive_fallback:
+            raise
+        logger.warning(f"failed to get audio bytes for {uri} using file service: {e}")
+        logger.info("trying to get audio bytes naively")
+        with requests.get(uri, stream=True, timeout=NAIVE_FETCH_TIMEOUT_SECONDS) as response:
+            response.raise_for_status()
+            yield from response.iter_content(READ_CHUNK_BYTES)
+        return
+
+    try:
+        while piece := stream.read(READ_CHUNK_BYTES):
+            yield piece
+    finally:
+        stream.close()
+
+
+def _resident(size: int) -> int:
+    # SpooledTemporaryFile keeps its content in memory until it grows past max_size.
+    return size if size <= SPOOL_MAX_BYTES else 0
+
+
+@contextmanager
+def _spooled(uri: str, task: AudioTask, naive_fallback: bool) -> Iterator[tuple[IO[bytes], int]]:
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    size = 0
+    try:
+        for piece in _iter_remote(uri, naive_fallback):
+            task.adjust(len(piece))
+            spool.write(piece)
+            task.adjust(_resident(size + len(piece)) - _resident(size) - len(piece))
+            size += len(piece)
+        task.source_bytes += size
+        spool.seek(0)
+        yield spool, size
+    finally:
+        spool.close()
+        task.adjust(-_resident(size))
+
+
+def _encode_data_uri(spool: IO[bytes], size: int, mime_type: str, task: AudioTask) -> str:
+    prefix = f"data:{mime_type};base64,".encode("ascii")
+    buffer = bytearray(len(prefix) + 4 * ((size + 2) // 3))
+    task.adjust(len(buffer))
+    buffer[: len(prefix)] = prefix
+    offset = len(prefix)
+    while piece := spool.read(ENCODE_CHUNK_BYTES):
+        encoded = b64encode(piece)
+        buffer[offset : offset + len(encoded)] = encoded
+        offset += len(encoded)
+    data_uri = buffer.decode("ascii")
+    # The data URI stays referenced until the task ends, the buffer does not.
+    task.adjust(len(data_uri) - len(buffer))
+    return data_uri
+
+
+def audio_content_part(audio_file_uri: str, mode: Optional[str] = None) -> dict[str, Any]:
+    """Multimodal `file` content part for the audio at `audio_file_uri` (a signed URL)."""
+    task = _current_task.get()
+    if task is not None and audio_file_uri in task.parts:
+        return task.parts[audio_file_uri]
+    task = task or AudioTask()
+    mode = mode or AUDIO_INPUT_MODE
+
+    if mode == "url" and audio_file_uri.startswith("https://"):
+        task.mode = "url"
+        part = {
+            "type": "file",
+            "file": {"file_id": audio_file_uri, "format": _mime_type(audio_file_uri)},
+        }
+    else:
+        task.mode = "inline"
+        with _spooled(audio_file_uri, task, naive_fallback=True) as (spool, size):
+            # Inline data has always been labelled mp3, whatever the chunk format.
+            data_uri = _encode_data_uri(spool, size, DEFAULT_AUDIO_MIME_TYPE, task)
+        part = {"type": "file", "file": {"file_data": data_uri}}
+
+    task.parts[audio_file_uri] = part
+    return part
+
+
+@contextmanager
+def open_audio_upload(audio_file_uri: str) -> Iterator[tuple[str, IO[bytes], Optional[str]]]:
+    """(filename, file, mime type) upload tuple over a spooled copy of the audio."""
+    task = _task()
+    task.mode = "upload"
+    filename = _filename(audio_file_uri)
+    mime_type, _ = mimetypes.guess_type(filename)
+    with _spooled(audio_file_uri, task, naive_fallback=False) as (spool, _size):
+        yield filename, spool, mime_type
@@ -0,0 +1,253 @@
+"""Memoized system-message prefix for overview and deep-dive chats.
+
+`create_system_messages_for_chat` refetches every conversation, tag, artifact
+and chunk transcript (or every summary, re-tokenized) on each turn, and the
+model is then sent the same multi-hundred-k-token prefix again. Between two
+turns of a chat that prefix almost never changes.
+
+`get_chat_system_messages` stores the rendered prefix per chat under
+``chat:context:v1:{chat_id}`` together with a fingerprint of everything it
+was built from:
+
+- chat mode and language;
+- the project's ``updated_at``;
+- deep dive: each locked conversation's ``updated_at`` and tag texts, the
+  count and latest ``updated_at`` of its chunks (transcripts), and the count
+  and latest approval/edit of its approved artifacts;
+- overview: the project's overview digest version (see
+  `dembrane.overview_digest`) and every conversation's ``updated_at`` and
+  chunk count.
+
+The fingerprint costs a handful of grouped aggregates; on a match the stored
+prefix is returned byte-for-byte, which is also what lets the provider's own
+prompt cache hit (`with_cache_markers`). Redis is an optimization only: any
+error here means building the prefix as before.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional
+from logging import getLogger
+
+from dembrane.redis_async import get_redis_client
+from dembrane.directus_async import async_directus
+from dembrane.overview_digest import aget_overview_digest_version
+
+logger = getLogger("dembrane.chat_context")
+
+PREFIX_TTL_SECONDS = 30 * 60
+
+_KEY_PREFIX = "chat:context:v1"
+
+# Anthropic reads it as a cache breakpoint, Vertex/Gemini turns the marked
+# block into context caching, OpenAI/Azure strip it (their prefix caching is
+# automatic). LiteLLM handles each of those.
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _key(chat_id: str) -> str:
+    return f"{_KEY_PREFIX}:{chat_id}"
+
+
+def _latest(row: Dict[str, Any], *fields: str) -> List[Any]:
+    return [(row.get("max") or {}).get(field) for field in fields]
+
+
+def _count(row: Dict[str, Any]) -> int:
+    return int((row.get("count") or {}).get("id") or 0)
+
+
+async def _grouped(collection: str, filter_query: Dict[str, Any], latest: List[str]) -> List[Any]:
+    rows = await async_directus.get_items(
+        collection,
+        {
+            "query": {
+                "filter": filter_query,
+                "aggregate": {"count": ["id"], "max": latest},
+                "groupBy": ["conversation_id"],
+                "limit": -1,
+            }
+        },
+    )
+    if not isinstance(rows, list):
+        raise RuntimeError(f"Unexpected aggregate response for {collection}")
+    return sorted([row.get("conversation_id"), _count(row), *_latest(row, *latest)] for row in rows)
+
+
+async def _project_version(project_id: str) -> Optional[str]:
+    rows = await async_directus.get_items(
+        "project",
+        {"query": {"filter": {"id": {"_eq": project_id}}, "fields": ["updated_at"], "limit": 1}},
+    )
+    return rows[0].get("updated_at") if isinstance(rows, list) and rows else None
+
+
+async def _totals(collection: str, filter_query: Dict[str, Any], latest: List[str]) -> List[Any]:
+    rows = await async_directus.get_items(
+        collection,
+        {"query": {"filter": filter_query, "aggregate": {"count": ["id"], "max": latest}}},
+    )
+    if not isinstance(rows, list):
+        raise RuntimeError(f"Unexpected aggregate response for {collection}")
+    row = rows[0] if rows else {}
+    return [_count(row), *_latest(row, *latest)]
+
+
+async def _overview_versions(project_id: str) -> List[Any]:
+    # Count plus newest timestamp over the whole project: one row each, however
+    # many conversations it has, and the same answer on every call.
+    return list(
+        await asyncio.gather(
+            aget_overview_digest_version(project_id),
+            _totals(
+                "conversation",
+                {"project_id": {"_eq": project_id}, "deleted_at": {"_null": True}},
+                ["updated_at"],
+            ),
+            _totals(
+                "conversation_chunk",
+                {"conversation_id": {"project_id": {"_eq": project_id}}},
+                ["updated_at"],
+            ),
+        )
+    )
+
+
+async def _deep_dive_versions(conversation_ids: List[str]) -> List[Any]:
+    if not conversation_ids:
+        return []
+    conversations, chunks, artifacts = await asyncio.gather(
+        async_directus.get_items(
+            "conversation",
+            {
+                "query": {
+                    "filter": {"id": {"_in": conversation_ids}},
+                    "fields": ["id", "updated_at", "tags.project_tag_id.text"],
+                    "limit": -1,
+                }
+            },
+        ),
+        _grouped(
+            "conversation_chunk", {"conversation_id": {"_in": conversation_ids}}, ["updated_at"]
+        ),
+        _grouped(
+            "conversation_artifact",
+            {
+                "_and": [
+                    {"conversation_id": {"_in": conversation_ids}},
+                    {"approved_at": {"_nnull": True}},
+                ]
+            },
+            ["approved_at", "last_updated_at"],
+        ),
+    )
+    conversation_versions = sorted(
+        [
+            row.get("id"),
+            row.get("updated_at"),
+            sorted(
+                str((tag.get("project_tag_id") or {}).get("text"))
+                for tag in row.get("tags") or []
+                if isinstance(tag, dict) and isinstance(tag.get("project_tag_id"), dict)
+            ),
+        ]
+        for row in conversations or []
+    )
+    return [conversation_versions, chunks, artifacts]
+
+
+async def context_fingerprint(
+    project_id: str,
+    conversation_ids: List[str],
+    language: str,
+    chat_mode: Optional[str],
+) -> str:
+    """Digest of every input the system-message prefix is rendered from."""
+    if chat_mode == "overview":
+        versions = _overview_versions(project_id)
+    else:
+        versions = _deep_dive_versions(sorted(set(conversation_ids)))
+    project_version, content_versions = await asyncio.gather(_project_version(project_id), versions)
+    payload = json.dumps(
+        [chat_mode, language, project_version, content_versions],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def _load(chat_id: str, fingerprint: str) -> Optional[List[Dict[str, Any]]]:
+    client = await get_redis_client()
+    raw = await client.get(_key(chat_id))
+    if raw is None:
+        return None
+    entry = json.loads(zlib.decompress(raw))
+    if entry.get("fingerprint") != fingerprint:
+        return None
+    return entry["messages"]
+
+
+async def _store(chat_id: str, fingerprint: str, messages: List[Dict[str, Any]]) -> None:
+    client = await get_redis_client()
+    value = zlib.compress(
+        json.dumps({"fingerprint": fingerprint, "messages": messages}).encode(), 6
+    )
+    await client.set(_key(chat_id), value, ex=PREFIX_TTL_SECONDS)
+
+
+async def get_chat_system_messages(
+    chat_id: str,
+    locked_conversation_id_list: List[str],
+    language: str,
+    project_id: str,
+    chat_mode: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """`create_system_messages_for_chat`, served from the per-chat prefix
+    cache while nothing it was built from has changed."""
+    from dembrane.chat_utils import create_system_messages_for_chat
+
+    fingerprint: Optional[str] = None
+    try:
+        fingerprint = await context_fingerprint(
+            project_id, locked_conversation_id_list, language, chat_mode
+        )
+        cached = await _load(chat_id, fingerprint)
+        if cached is not None:
+            logger.info("Chat %s: reusing cached context prefix", chat_id)
+            return cached
+    except Exception as exc:
+        logger.warning("Chat context cache unavailable for %s: %s", chat_id, exc)
+        fingerprint = None
+
+    messages = await create_system_messages_for_chat(
+        locked_conversation_id_list, language, project_id, chat_mode=chat_mode
+    )
+    if fingerprint is None:
+        return messages
+
+    try:
+        await _store(chat_id, fingerprint, messages)
+    except Exception as exc:
+        logger.warning("Failed to cache chat context for %s: %s", chat_id, exc)
+    return messages
+
+
+def with_cache_markers(system_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """System messages for the router, each marked for provider prompt caching.
+
+    All parts are marked so the cached block is one contiguous prefix, which
+    Vertex context caching requires; that stays within Anthropic's four
+    breakpoints.
+    """
+    return [
+        {
+            "role": "system",
+            "content": [{"type": "text", "text": message["text"], "cache_control": CACHE_CONTROL}],
+        }
+        for message in system_messages
+    ]
@@ -95,18 +95,29 @@ async def create_system_messages_for_chat(
     """
     Create system messages for chat context.
 
-    In overview mode: Uses summaries for ALL project conversations (dynamically fetched).
+    In overview mode: Uses the project's precomputed overview digest (summaries,
+    older ones rolled up). Without one, packs the summaries that exist; missing
+    summaries are generated in the background, never inside the request.
     In deep_dive mode: Uses full transcripts for selected conversations only.
     """
-    from dembrane.summary_utils import (
-        ensure_conversation_summaries,
-        get_all_conversations_for_overview,
-    )
+    from dembrane.summary_utils import get_all_conversations_for_overview
+    from dembrane.overview_digest import aload_overview_digest, request_overview_refresh
 
     is_overview_mode = chat_mode == "overview"
+    overview_digest: Optional[Dict[str, Any]] = None
 
     # Fetch conversations based on mode
     if is_overview_mode:
+        overview_digest = await aload_overview_digest(project_id)
+        if overview_digest is None or overview_digest.get("stale"):
+            await run_in_thread_pool(request_overview_refresh, project_id)
+
+    if overview_digest is not None:
+        logger.info(
+            f"Overview mode: Using digest v{overview_digest.get('version')} for project {project_id}"
+        )
+        conversations = []
+    elif is_overview_mode:
         # Overview mode: Get ALL conversations for the project, use summaries
         logger.info(f"Overview mode: Fetching all conversations for project {project_id}")
         conversations = await get_all_conversations_for_overview(project_id)
@@ -115,17 +126,6 @@ async def create_system_messages_for_chat(
         conversations = [
             conv for conv in conversations if int(conv.get("chunks_count", 0) or 0) > 0
         ]
-
-        if conversations:
-            # Ensure all conversations have summaries (generate if missing)
-            conv_ids = [c["id"] for c in conversations]
-            await ensure_conversation_summaries(conv_ids)
-
-            # Re-fetch to get updated summaries
-            conversations = await get_all_conversations_for_overview(project_id)
-            conversations = [
-                conv for conv in conversations if int(conv.get("chunks_count", 0) or 0) > 0
-            ]
     else:
         # Deep dive mode: Use the selected conversations
         conversations = await run_in_thread_pool(
@@ -217,6 +217,9 @@ async def create_system_messages_for_chat(
     # Build conversation data based on mode
     conversation_data_list: list[dict[str, Any]] = []
     total_summary_tokens = 0
+    if overview_digest is not None:
+        conversation_data_list = list(overview_digest.get("context") or [])
+        total_summary_tokens = int(overview_digest.get("total_tokens") or 0)
     max_summary_tokens = int(MAX_CHAT_CONTEXT_LENGTH * 0.7)  # Reserve 30% for messages
 
     for conversation in conversations:
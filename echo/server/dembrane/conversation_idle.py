@@ -0,0 +1,122 @@
+"""Idle-deadline index for auto-finishing abandoned conversations.
+
+A conversation that stops receiving chunks is finished automatically once it
+has been idle for IDLE_FINISH_SECONDS. Instead of asking Directus for every
+unfinished conversation without a recent chunk (a relational anti-join whose
+cost grows with the conversation table), each conversation carries a
+deadline in one Redis sorted set:
+
+- ``conversation_idle_deadlines`` — member = conversation id, score = epoch
+  seconds after which it counts as idle.
+
+Writers move the deadline forward (ZADD GT): every chunk arrival pushes it to
+now + IDLE_FINISH_SECONDS. Creation and participant pings only register a
+conversation that isn't indexed yet (ZADD NX), so an initiated conversation
+that never records still gets finished, while pings alone never hold a
+paused conversation open (matching the old "no chunk in 5 minutes" rule).
+
+The timer actor (`task_finish_idle_conversations`, every few seconds) pops
+expired members atomically and dispatches the normal finish hook, so the
+cost per tick is one ZRANGEBYSCORE regardless of how many conversations
+exist. A finish (or a delete) removes the member and sets
+``conversation_idle_closed:{id}``, which keeps pings from a tab left open
+from registering the conversation again; the next chunk clears it. The old Directus sweep stays as a
+low-frequency backstop for conversations the index never saw (created
+before this shipped, or lost in a Redis flush).
+
+Index writes are best-effort: a failure must never break chunk upload,
+conversation creation or a ping.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import List, Optional
+from logging import getLogger
+
+from dembrane.coordination import get_shared_sync_redis
+
+logger = getLogger("dembrane.conversation_idle")
+
+IDLE_FINISH_SECONDS = 5 * 60
+IDLE_DEADLINES_KEY = "conversation_idle_deadlines"
+
+CLOSED_KEY_PREFIX = "conversation_idle_closed:"
+# Long enough to outlive an abandoned participant tab; once it lapses the
+# finish hook skips the conversation once and sets it again.
+CLOSED_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Bound one tick's fan-out; anything left is popped on the next tick.
+_POP_BATCH_SIZE = 200
+
+# KEYS[1] = index; ARGV[1] = now (epoch seconds), ARGV[2] = max members
+_POP_EXPIRED_SCRIPT = """
+local due = redis.call("zrangebyscore", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+if #due > 0 then
+    redis.call("zrem", KEYS[1], unpack(due))
+end
+return due
+"""
+
+
+def idle_deadline(now: Optional[float] = None) -> float:
+    """Epoch deadline for a conversation last active at `now`."""
+    return (now if now is not None else time.time()) + IDLE_FINISH_SECONDS
+
+
+def closed_key(conversation_id: str) -> str:
+    return f"{CLOSED_KEY_PREFIX}{conversation_id}"
+
+
+def touch_idle_deadline(conversation_id: str, *, now: Optional[float] = None) -> None:
+    """A chunk arrived: push the conversation's idle deadline forward.
+
+    A chunk reopens a finished conversation, so it also drops the closed marker.
+    """
+    try:
+        pipe = get_shared_sync_redis().pipeline(transaction=False)
+        pipe.zadd(IDLE_DEADLINES_KEY, {conversation_id: idle_deadline(now)}, gt=True)
+        pipe.delete(closed_key(conversation_id))
+        pipe.execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("idle deadline update failed for %s: %s", conversation_id, exc)
+
+
+def register_idle_deadline(conversation_id: str, *, now: Optional[float] = None) -> None:
+    """Index a conversation that isn't tracked yet; never moves a deadline."""
+    try:
+        get_shared_sync_redis().zadd(
+            IDLE_DEADLINES_KEY, {conversation_id: idle_deadline(now)}, nx=True
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("idle deadline update failed for %s: %s", conversation_id, exc)
+
+
+def clear_idle_deadline(conversation_id: str) -> None:
+    """The conversation finished or was deleted: stop tracking it, and keep
+    participant pings from registering it again."""
+    try:
+        pipe = get_shared_sync_redis().pipeline(transaction=False)
+        pipe.zrem(IDLE_DEADLINES_KEY, conversation_id)
+        pipe.set(closed_key(conversation_id), "1", ex=CLOSED_TTL_SECONDS)
+        pipe.execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("idle deadline clear failed for %s: %s", conversation_id, exc)
+
+
+def pop_expired_conversations(
+    *, now: Optional[float] = None, limit: int = _POP_BATCH_SIZE
+) -> List[str]:
+    """Atomically remove and return conversations whose deadline passed.
+
+    Popping (rather than reading) means concurrent ticks never dispatch the
+    same conversation twice. Raises on Redis errors so the actor retries.
+    """
+    due = get_shared_sync_redis().eval(
+        _POP_EXPIRED_SCRIPT,
+        1,
+        IDLE_DEADLINES_KEY,
+        repr(now if now is not None else time.time()),
+        limit,
+    )
+    return [str(member) for member in due or []]
@@ -11,16 +11,32 @@ The ping now carries lightweight telemetry (lifecycle state, capture mode,
 screen, and best-effort network/battery). All of it is optional and
 best-effort: older portals (and browsers without the Network/Battery APIs)
 simply omit fields, and the value degrades to a bare "last seen" timestamp.
+
+A ping is our busiest write, so the whole read-modify-write (ordering check,
+sticky `recording_started_at` merge, SET with TTL) plus the monitor's
+active-index update, dirty publish and auto-finish registration (see
+conversation_idle) run as one Lua script: one round trip, and concurrent
+pings for the same conversation can't interleave.
 """
 
 from __future__ import annotations
 
 import json
-from typing import Any, Optional
+from typing import Any, Optional, Awaitable, cast
 from logging import getLogger
 from datetime import datetime, timezone
 
 from dembrane.redis_async import get_redis_client
+from dembrane.monitor_stream import (
+    ACTIVE_TTL_SECONDS,
+    DIRTY_COALESCE_LUA,
+    MAX_ACTIVE_MEMBERS,
+    dirty_args,
+    dirty_keys,
+    active_index_key,
+    handle_coalesce_result,
+)
+from dembrane.conversation_idle import IDLE_DEADLINES_KEY, closed_key, idle_deadline
 
 logger = getLogger("dembrane.conversation_liveness")
 
@@ -75,6 +91,71 @@ _TELEMETRY_FIELDS = (
 )
 
 
+# KEYS[1] = liveness key, KEYS[2] = conversation_idle deadline index,
+# KEYS[3] = conversation_idle closed marker; with a project: KEYS[4] = active
+# index, KEYS[5..7] = monitor_stream.dirty_keys(project_id)
+# ARGV[1] = payload JSON (object, no recording_started_at), ARGV[2] = ttl,
+# ARGV[3] = incoming client_ts ("" if absent), ARGV[4] = seen iso,
+# ARGV[5] = "1" if the ping reports "recording", ARGV[6] = conversation id,
+# ARGV[7] = active score, ARGV[8] = active ttl, ARGV[9] = active cap,
+# ARGV[10..11] = monitor_stream.dirty_args(project_id), ARGV[12] = idle deadline.
+# Returns {result, dirty}. result: 0 when the ping was out of order (dropped),
+# 1 when written, 2 when written and it stamped recording_started_at for the
+# first time. dirty: the coalesce_dirty result, or -2 when nothing was signalled.
+_PING_SCRIPT = DIRTY_COALESCE_LUA + """
+local existing = nil
+local raw = redis.call("get", KEYS[1])
+if raw then
+    local ok, decoded = pcall(cjson.decode, raw)
+    if ok and type(decoded) == "table" then
+        existing = decoded
+    end
+end
+
+local result = 1
+local incoming_ts = tonumber(ARGV[3])
+local existing_ts = existing and existing["client_ts"]
+if incoming_ts and type(existing_ts) == "number" and existing_ts == math.floor(existing_ts)
+    and incoming_ts < existing_ts then
+    result = 0
+end
+
+if result == 1 then
+    local payload = ARGV[1]
+    local started = existing and existing["recording_started_at"]
+    if type(started) ~= "string" or started == "" then
+        started = nil
+        if ARGV[5] == "1" then
+            started = ARGV[4]
+            result = 2
+        end
+    end
+    if started then
+        payload = string.sub(payload, 1, -2)
+            .. ',"recording_started_at":' .. cjson.encode(started) .. "}"
+    end
+    redis.call("set", KEYS[1], payload, "EX", ARGV[2])
+end
+
+-- Register for auto-finish if not tracked yet; only chunks move the deadline.
+-- A finished or deleted conversation stays out of the index.
+if redis.call("exists", KEYS[3]) == 0 then
+    redis.call("zadd", KEYS[2], "NX", ARGV[12], ARGV[6])
+end
+
+local dirty = -2
+if #KEYS > 3 then
+    redis.call("zadd", KEYS[4], ARGV[7], ARGV[6])
+    redis.call("expire", KEYS[4], ARGV[8])
+    redis.call("zremrangebyrank", KEYS[4], 0, -(tonumber(ARGV[9]) + 1))
+    if result > 0 then
+        dirty = coalesce_dirty(KEYS[5], KEYS[6], KEYS[7], ARGV[10], ARGV[11])
+    end
+end
+return {result, dirty}
+"""
+
+
 def _key(conversation_id: str) -> str:
     return f"{_LIVENESS_KEY_PREFIX}{conversation_id}"
 
@@ -156,64 +237,72 @@ async def mark_conversation_seen(
     *,
     now: Optional[datetime] = None,
     telemetry: Optional[dict[str, Any]] = None,
+    project_id: Optional[str] = None,
+    score: Optional[float] = None,
 ) -> None:
     """Record a participant liveness ping with optional telemetry (best-effort).
 
     A Redis hiccup must never interfere with the participant's recording, so
     callers should swallow exceptions from this. `telemetry` should already be
     sanitised by the caller (the public ping endpoint validates it).
+
+    With `project_id`, the same round trip also indexes the conversation as
+    active for that project (scored by `score`, epoch seconds, default now)
+    and nudges open monitor streams. An out-of-order ping still refreshes the
+    active index but is not stored and does not publish. The publish is
+    coalesced per project (see monitor_stream).
     """
-    payload: dict[str, Any] = {"seen": _now_iso(now)}
+    moment = now or datetime.now(timezone.utc)
+    payload: dict[str, Any] = {"seen": _now_iso(moment)}
     if telemetry:
         for field in _TELEMETRY_FIELDS:
             value = telemetry.get(field)
             if value is not None:
                 payload[field] = value
+    # recording_started_at is owned by the script (stamped or carried forward).
+    payload.pop("recording_started_at", None)
     ttl = (
         STICKY_STATE_TTL_SECONDS
         if payload.get("state") in _STICKY_STATES
         else LIVENESS_TTL_SECONDS
     )
+    # Ordering is by the client-stamped send time, so a late in-flight ping
+    # can't clobber a newer state such as a terminal "left"; only ints count.
+    incoming_ts = payload.get("client_ts")
+    ordering_ts = (
+        str(incoming_ts)
+        if isinstance(incoming_ts, int) and not isinstance(incoming_ts, bool)
+        else ""
+    )
+
+    keys = [_key(conversation_id), IDLE_DEADLINES_KEY, closed_key(conversation_id)]
+    if project_id:
+        keys.append(active_index_key(project_id))
+        keys.extend(dirty_keys(project_id))
     client = await get_redis_client()
-    key = _key(conversation_id)
+    raw_result = cast(Any, client).eval(
+        _PING_SCRIPT,
+        len(keys),
+        *keys,
+        json.dumps(payload),
+        ttl,
+        ordering_ts,
+        payload["seen"],
+        "1" if payload.get("state") == "recording" else "0",
+        conversation_id,
+        repr(float(score if score is not None else moment.timestamp())),
+        ACTIVE_TTL_SECONDS,
+        MAX_ACTIVE_MEMBERS,
+        *(dirty_args(project_id) if project_id else ["", 0]),
+        repr(idle_deadline(moment.timestamp())),
+    )
+    result, dirty = await cast(Awaitable[Any], raw_result)
+    if project_id:
+        handle_coalesce_result(project_id, dirty)
 
-    existing: Optional[dict[str, Any]] = None
-    try:
-        existing_raw = await client.get(key)
-        if existing_raw:
-            text = (
-                existing_raw.decode("utf-8")
-                if isinstance(existing_raw, (bytes, bytearray))
-                else str(existing_raw)
-            )
-            parsed = json.loads(text)
-            if isinstance(parsed, dict):
-                existing = parsed
-    except Exception:  # noqa: BLE001
-        existing = None
-
-    # Drop an out-of-order ping so a late one (e.g. an in-flight recording ping)
-    # can't clobber a newer state such as a terminal "left". Ordering is by the
-    # client-stamped send time; a genuine later resume still wins (newer ts).
-    incoming_ts = payload.get("client_ts")
-    if isinstance(incoming_ts, int) and existing is not None:
-        existing_ts = existing.get("client_ts")
-        if isinstance(existing_ts, int) and incoming_ts < existing_ts:
-            return
-
-    # Stamp the first "recording" ping (server time) and carry it forward, so the
-    # monitor gets a real "recording started" without reading chunks.
-    existing_started = existing.get("recording_started_at") if existing else None
-    first_recording_ping = False
-    if existing_started:
-        payload["recording_started_at"] = existing_started
-    elif payload.get("state") == "recording":
-        payload["recording_started_at"] = payload["seen"]
-        first_recording_ping = True
-
-    await client.set(key, json.dumps(payload), ex=ttl)
-
-    if first_recording_ping:
+    # Mirror the first "recording" ping (server time) onto the conversation
+    # row, so the monitor gets a real "recording started" without reading chunks.
+    if int(result or 0) == 2:
         await _persist_recording_started_at(conversation_id, payload["seen"])
 
 
@@ -13,6 +13,7 @@ This solves the race condition where summary/merge would start before all
 transcriptions completed.
 """
 
+import threading
 from typing import Any
 from logging import getLogger
 
@@ -53,6 +54,37 @@ def _get_sync_redis_client() -> Any:
     return redis.from_url(connection_string, decode_responses=True)
 
 
+# Pooled clients on the cache DB (the one dembrane.redis_async uses), one per
+# decode_responses setting. redis-py clients are thread-safe and borrow a
+# connection from their pool per command.
+_shared_sync_clients: dict[bool, Any] = {}
+_shared_sync_lock = threading.Lock()
+
+
+def get_shared_sync_redis(decode_responses: bool = True) -> Any:
+    """
+    Get the process-wide sync Redis client for hot paths (API handlers that
+    run in the thread pool, Dramatiq tasks, background threads).
+
+    The client is shared: never close() it.
+
+    Returns redis.Redis but typed as Any to avoid mypy issues with redis library.
+    """
+    client = _shared_sync_clients.get(decode_responses)
+    if client is not None:
+        return client
+    with _shared_sync_lock:
+        client = _shared_sync_clients.get(decode_responses)
+        if client is None:
+            url = REDIS_URL
+            ssl_params = ""
+            if url.startswith("rediss://") and "?ssl_cert_reqs=" not in url:
+                ssl_params = "?ssl_cert_reqs=none"
+            client = redis.from_url(f"{url}{ssl_params}", decode_responses=decode_responses)
+            _shared_sync_clients[decode_responses] = client
+    return client
+
+
 def _pending_chunks_key(conversation_id: str) -> str:
     """Redis key for tracking pending chunks count."""
     return f"{_KEY_PREFIX}:pending_chunks:{conversation_id}"
@@ -722,6 +722,55 @@ class DirectusClient(DirectusClientProtocol):
                 print(f"Inserting {i}-{min(i + interval, length)} out of {length}")
             self.post(f"/items/{collection_name}", json=items[i : i + interval])
 
+    def update_many(
+        self,
+        collection_name: str,
+        keys: List[str],
+        item_data: Dict[str, Any],
+        interval: int = 100,
+        fields: str = "id",
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply the same update to many items, `interval` keys per batch PATCH.
+        Returns the updated items, limited to `fields`.
+        """
+        updated: List[Dict[str, Any]] = []
+        for i in range(0, len(keys), interval):
+            response = self.patch(
+                f"/items/{collection_name}",
+                json={"keys": keys[i : i + interval], "data": item_data},
+                params={"fields": fields},
+            )
+            updated.extend(response.get("data") or [])
+        return updated
+
+    def update_by_filter(
+        self,
+        collection_name: str,
+        query_filter: Dict[str, Any],
+        item_data: Dict[str, Any],
+        limit: int = -1,
+        fields: str = "id",
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply the same update to every item matching `query_filter` in one PATCH.
+        Directus applies its default page size to query updates, so pass a limit
+        (-1 for all). Returns the updated items, limited to `fields`.
+        """
+        response = self.patch(
+            f"/items/{collection_name}",
+            json={"query": {"filter": query_filter, "limit": limit}, "data": item_data},
+            params={"fields": fields},
+        )
+        return response.get("data") or []
+
+    def delete_many(self, collection_name: str, keys: List[str], interval: int = 100) -> None:
+        """
+        Delete many items, `interval` keys per batch DELETE.
+        """
+        for i in range(0, len(keys), interval):
+            self.delete(f"/items/{collection_name}", json=keys[i : i + interval])
+
     def duplicate_collection(self, collection_name: str, duplicate_collection_name: str) -> None:
         """
         Duplicate a collection with its schema, fields, and data.
@@ -762,8 +811,7 @@ class DirectusClient(DirectusClientProtocol):
         if not item_ids:
             raise AssertionError("No items to delete!")
 
-        for i in range(0, len(item_ids), 100):
-            self.delete(f"/items/{collection_name}", json=item_ids[i : i + 100])
+        self.delete_many(collection_name, item_ids)
 
     def get_all_fields(
         self, collection_name: str, query: Optional[Dict[str, Any]] = None, **kwargs: Any
@@ -0,0 +1,58 @@
+"""Grouped Directus aggregates for listing endpoints.
+
+Listing endpoints show per-row counts ("12 members", "3 workspaces").
+Counting each row with its own `aggregate: count` makes the request N+1
+(two per organisation in the org switcher, fully serialised). Use one
+`groupBy` aggregate over an `_in` filter instead:
+
+    counts = await count_grouped(
+        async_directus, "project", "workspace_id", ws_ids, {"deleted_at": {"_null": True}}
+    )
+
+The client is passed in so callers keep using their own module's
+`async_directus` (and the tests that patch it).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+
+async def count_grouped(
+    client: Any,
+    collection: str,
+    group_field: str,
+    keys: list[str],
+    query_filter: Optional[dict[str, Any]] = None,
+) -> dict[str, int]:
+    """Count `collection` items per `group_field` value for every key in `keys`
+    with a single grouped aggregate. Keys without items map to 0; an empty
+    `keys` list returns {} without a Directus call (an empty `_in` may match
+    everything on some adapters)."""
+    keys = list(dict.fromkeys(key for key in keys if key))
+    if not keys:
+        return {}
+    rows = await client.get_items(
+        collection,
+        {
+            "query": {
+                "filter": {**(query_filter or {}), group_field: {"_in": keys}},
+                "aggregate": {"count": "id"},
+                "groupBy": [group_field],
+                # Directus caps grouped rows at its default limit (100).
+                "limit": -1,
+            }
+        },
+    )
+    counts = dict.fromkeys(keys, 0)
+    if not isinstance(rows, list):
+        return counts
+    for row in rows:
+        group = row.get(group_field)
+        if group is None:
+            continue
+        count = row.get("count")
+        if isinstance(count, dict):
+            count = count.get("id")
+        counts[str(group)] = int(count or 0)
+    return counts
@@ -20,6 +20,8 @@ Return value contract (matches sync client):
     - get_item() returns dict directly
     - update_item() returns {"data": {...}} — caller MUST unwrap with ["data"]
     - delete_item() returns None
+    - update_many() / update_by_filter() return the updated items as a list
+    - delete_many() returns None
 """
 
 from __future__ import annotations
@@ -319,6 +321,53 @@ class AsyncDirectusClient:
         """Delete an item. Returns None."""
         await self.delete(f"/items/{collection}/{item_id}", **kwargs)
 
+    # ------------------------------------------------------------------
+    # Bulk mutations (Directus batch PATCH / DELETE on /items/{collection})
+    # ------------------------------------------------------------------
+
+    async def update_many(
+        self,
+        collection: str,
+        keys: list[str],
+        data: dict[str, Any],
+        interval: int = 100,
+        fields: str = "id",
+    ) -> list[dict[str, Any]]:
+        """Apply the same update to many items, `interval` keys per PATCH.
+        Returns the updated items (limited to `fields`) as a list."""
+        updated: list[dict[str, Any]] = []
+        for i in range(0, len(keys), interval):
+            response = await self.patch(
+                f"/items/{collection}",
+                json={"keys": keys[i : i + interval], "data": data},
+                params={"fields": fields},
+            )
+            updated.extend(response.get("data") or [])
+        return updated
+
+    async def update_by_filter(
+        self,
+        collection: str,
+        query_filter: dict[str, Any],
+        data: dict[str, Any],
+        limit: int = -1,
+        fields: str = "id",
+    ) -> list[dict[str, Any]]:
+        """Apply the same update to every item matching `query_filter` in one
+        PATCH. Directus pages query updates like reads, hence the explicit
+        limit (-1 for all). Returns the updated items as a list."""
+        response = await self.patch(
+            f"/items/{collection}",
+            json={"query": {"filter": query_filter, "limit": limit}, "data": data},
+            params={"fields": fields},
+        )
+        return response.get("data") or []
+
+    async def delete_many(self, collection: str, keys: list[str], interval: int = 100) -> None:
+        """Delete many items, `interval` keys per DELETE. Returns None."""
+        for i in range(0, len(keys), interval):
+            await self.delete(f"/items/{collection}", json=keys[i : i + interval])
+
     # ------------------------------------------------------------------
     # User operations
     # ------------------------------------------------------------------
@@ -20,6 +20,7 @@ from __future__ import annotations
 
 import json
 import time
+import uuid
 from typing import Any, Literal, Awaitable, cast
 from logging import getLogger
 
@@ -35,6 +36,16 @@ _KEY_PREFIX = "email_throttle"
 _DIGEST_KEY_PREFIX = "digest_queue"
 _DIGEST_RECIPIENTS_KEY = "digest_pending_recipients"
 
+# KEYS[1] throttle sorted set; ARGV: cutoff, now, member, ttl.
+# Returns the number of sends in the window before this one.
+_RECORD_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local count = redis.call('ZCARD', KEYS[1])
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return count
+"""
+
 
 def should_send_now(
     _recipient: str,
@@ -71,27 +82,26 @@ async def record_and_check_throttle(
 ) -> Literal["individual", "queue_for_digest"]:
     """Record an email event and return the throttle decision.
 
-    1. Prune entries older than 24h from the sorted set.
-    2. Count remaining entries (= history before this event).
-    3. Add the current timestamp.
-    4. Return the decision.
+    ``_RECORD_SCRIPT`` prunes entries older than 24h, counts the rest
+    (= history before this event), adds the current event and refreshes
+    the TTL in one atomic step, so concurrent sends to one recipient each
+    see the sends before them and exactly ``THROTTLE_THRESHOLD`` go out
+    individually.
     """
     from dembrane.redis_async import get_redis_client
 
     now = time.time()
     cutoff = now - _WINDOW_SECONDS
     key = _throttle_key(event_code, recipient_id)
+    # Unique member: two sends in the same instant are still two sends.
+    member = f"{now}:{uuid.uuid4().hex}"
 
     try:
         client = await get_redis_client()
-        await client.zremrangebyscore(key, "-inf", cutoff)
-        count_bytes = await client.zcard(key)
-        count = int(count_bytes) if count_bytes else 0
-        await client.zadd(key, {str(now): now})
-        await client.expire(key, _SORTED_SET_TTL)
-
-        decision = should_send_now(recipient_id, event_code, count)
-        return decision
+        count = await cast(Any, client).eval(
+            _RECORD_SCRIPT, 1, key, cutoff, now, member, _SORTED_SET_TTL
+        )
+        return should_send_now(recipient_id, event_code, int(count or 0))
     except Exception:
         logger.warning("record_and_check_throttle failed, defaulting to individual", exc_info=True)
         return "individual"
@@ -132,8 +142,9 @@ def _get_sync_redis() -> Any:
 def flush_all_digests_sync() -> dict[str, list[dict[str, Any]]]:
     """Drain all digest queues, returning items grouped by recipient.
 
-    Called by the daily 09:00 UTC Dramatiq actor. Each call atomically
-    pops items and removes the recipient from the pending set.
+    Called by the daily 09:00 UTC Dramatiq actor. Each recipient is one
+    MULTI (LRANGE + DEL + SREM): one round trip for the whole queue, and an
+    item pushed meanwhile lands either in this batch or in the next flush.
     """
     client = _get_sync_redis()
     result: dict[str, list[dict[str, Any]]] = {}
@@ -141,18 +152,19 @@ def flush_all_digests_sync() -> dict[str, list[dict[str, Any]]]:
         recipient_ids: set[str] = client.smembers(_DIGEST_RECIPIENTS_KEY) or set()
         for rid in recipient_ids:
             key = _digest_queue_key(rid)
+            pipe = client.pipeline(transaction=True)
+            pipe.lrange(key, 0, -1)
+            pipe.delete(key)
+            pipe.srem(_DIGEST_RECIPIENTS_KEY, rid)
+            raw_items, _deleted, _removed = pipe.execute()
             items: list[dict[str, Any]] = []
-            while True:
-                raw = client.lpop(key)
-                if raw is None:
-                    break
+            for raw in raw_items or []:
                 try:
                     items.append(json.loads(raw))
                 except (json.JSONDecodeError, TypeError):
                     logger.warning("corrupt digest item for %s, skipping", rid)
             if items:
                 result[rid] = items
-            client.srem(_DIGEST_RECIPIENTS_KEY, rid)
         return result
     except Exception:
         logger.warning("flush_all_digests_sync failed", exc_info=True)
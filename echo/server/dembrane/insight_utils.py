@@ -169,6 +169,7 @@ async def generate_chat_insight(
     response = await arouter_completion(
         MODELS.MULTI_MODAL_FAST,
         messages=[{"role": "user", "content": prompt}],
+        cache="chat_insight",
     )
 
     content = response.choices[0].message.content
@@ -0,0 +1,248 @@
+"""Exact-match response cache for repeatable router completions.
+
+Titles, tag assignment, suggestions, chat insights and summaries are asked
+for with the same prompt again and again: task retries, duplicate
+dispatches, two tabs hitting "summarize". Each repeat used to pay for a full
+LLM call. Call sites opt in by passing ``cache="<site>"`` to
+`router_completion` / `arouter_completion`; everything else is untouched.
+
+- Key: ``llm:cache:v1:{site}:{sha256}`` over the model group and the
+  canonicalized request (messages, response_format, temperature and any
+  other sampling kwargs). Transport-only kwargs (timeout, retries) are left
+  out so they don't split the cache.
+- Value: the response's JSON, zlib-compressed, with the site's TTL from
+  `CACHE_SITE_TTLS`. Only responses with content are stored; errors and
+  empty answers are never cached.
+- Single flight: the first caller of a key takes a short lease
+  (``...:flight``); identical concurrent callers, in this process or
+  another worker, poll for its result instead of calling the model too. If
+  the leader fails or the wait runs out they call the model themselves.
+- Metrics: ``llm:cache:stats`` hash with ``{site}:hits`` / ``:misses`` /
+  ``:coalesced``; `get_cache_stats` turns it into per-site hit rates.
+
+Redis is an optimization only: any Redis error means calling the model
+directly, exactly as before.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+import zlib
+import asyncio
+import hashlib
+from typing import Any, Callable, Awaitable, cast
+from logging import getLogger
+
+from dembrane.redis_async import get_redis_client
+from dembrane.coordination import get_shared_sync_redis
+
+logger = getLogger("dembrane.llm_cache")
+
+# Per call-site TTLs. An explicit regenerate (summary, title, new suggestions)
+# skips the cache altogether; these only bound how long background runs and
+# their retries reuse an answer, so user-facing sites keep a short TTL.
+CACHE_SITE_TTLS: dict[str, int] = {
+    "conversation_summary": 10 * 60,
+    "conversation_title": 10 * 60,
+    "conversation_tags": 24 * 60 * 60,
+    "chat_suggestions": 10 * 60,
+    "chat_insight": 24 * 60 * 60,
+}
+
+_KEY_PREFIX = "llm:cache:v1"
+STATS_KEY = "llm:cache:stats"
+_STATS_TTL_SECONDS = 7 * 24 * 60 * 60
+
+_FLIGHT_LEASE_MS = 60_000
+_FLIGHT_WAIT_SECONDS = 30.0
+_FLIGHT_POLL_SECONDS = 0.1
+
+# Don't change what the model is asked, only how the call is made.
+_TRANSPORT_KWARGS = frozenset({"timeout", "num_retries", "metadata", "mock_response"})
+
+_RELEASE_FLIGHT_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+else
+    return 0
+end
+"""
+
+
+def _site_ttl(site: str) -> int:
+    try:
+        return CACHE_SITE_TTLS[site]
+    except KeyError:
+        raise ValueError(f"Unknown LLM cache site: {site}") from None
+
+
+def _canonical(value: Any) -> Any:
+    # Structured-output schemas may be passed as pydantic classes.
+    if isinstance(value, type) and hasattr(value, "model_json_schema"):
+        return {"__schema__": value.__name__, "schema": value.model_json_schema()}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def cache_key(site: str, model_group: str, request_kwargs: dict[str, Any]) -> str:
+    request = {
+        name: _canonical(value)
+        for name, value in request_kwargs.items()
+        if name not in _TRANSPORT_KWARGS
+    }
+    blob = json.dumps(
+        {"model": model_group, "request": request},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    digest = hashlib.sha256(blob.encode("utf-8")).hexdigest()
+    return f"{_KEY_PREFIX}:{site}:{digest}"
+
+
+def _flight_key(key: str) -> str:
+    return f"{key}:flight"
+
+
+def _has_content(response: Any) -> bool:
+    try:
+        return bool(response.choices[0].message.content)
+    except (IndexError, AttributeError, KeyError, TypeError):
+        return False
+
+
+def encode_response(response: Any) -> bytes:
+    data = response.model_dump() if hasattr(response, "model_dump") else dict(response)
+    return zlib.compress(json.dumps(data, default=str).encode("utf-8"))
+
+
+def decode_response(raw: bytes) -> Any:
+    from litellm import ModelResponse
+
+    return ModelResponse(**json.loads(zlib.decompress(raw).decode("utf-8")))
+
+
+def _record(client: Any, site: str, outcome: str) -> Any:
+    pipe = client.pipeline(transaction=False)
+    pipe.hincrby(STATS_KEY, f"{site}:{outcome}", 1)
+    pipe.expire(STATS_KEY, _STATS_TTL_SECONDS)
+    return pipe.execute()
+
+
+def cached_completion(
+    site: str, model_group: str, request_kwargs: dict[str, Any], call: Callable[[], Any]
+) -> Any:
+    """Serve `call()` through the cache (sync callers: tasks, thread pool)."""
+    ttl = _site_ttl(site)
+    key = cache_key(site, model_group, request_kwargs)
+    try:
+        client = get_shared_sync_redis(decode_responses=False)
+        raw = client.get(key)
+        if raw is not None:
+            _record(client, site, "hits")
+            return decode_response(raw)
+        token = uuid.uuid4().hex
+        leader = bool(client.set(_flight_key(key), token, nx=True, px=_FLIGHT_LEASE_MS))
+        if not leader:
+            deadline = time.monotonic() + _FLIGHT_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(_FLIGHT_POLL_SECONDS)
+                raw = client.get(key)
+                if raw is not None:
+                    _record(client, site, "coalesced")
+                    return decode_response(raw)
+                if not client.exists(_flight_key(key)):
+                    break
+        _record(client, site, "misses")
+    except Exception as exc:
+        logger.warning("LLM cache unavailable for %s, calling the model: %s", site, exc)
+        return call()
+
+    try:
+        response = call()
+        if _has_content(response):
+            try:
+                client.set(key, encode_response(response), ex=ttl)
+            except Exception as exc:
+                logger.warning("LLM cache write failed for %s: %s", site, exc)
+        return response
+    finally:
+        if leader:
+            try:
+                client.eval(_RELEASE_FLIGHT_SCRIPT, 1, _flight_key(key), token)
+            except Exception as exc:
+                logger.debug("LLM cache flight release failed for %s: %s", site, exc)
+
+
+async def acached_completion(
+    site: str,
+    model_group: str,
+    request_kwargs: dict[str, Any],
+    call: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Async twin of `cached_completion`; waiters yield the loop while polling."""
+    ttl = _site_ttl(site)
+    key = cache_key(site, model_group, request_kwargs)
+    try:
+        client = await get_redis_client()
+        raw = await client.get(key)
+        if raw is not None:
+            await _record(client, site, "hits")
+            return decode_response(raw)
+        token = uuid.uuid4().hex
+        leader = bool(await client.set(_flight_key(key), token, nx=True, px=_FLIGHT_LEASE_MS))
+        if not leader:
+            deadline = time.monotonic() + _FLIGHT_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_FLIGHT_POLL_SECONDS)
+                raw = await client.get(key)
+                if raw is not None:
+                    await _record(client, site, "coalesced")
+                    return decode_response(raw)
+                if not await client.exists(_flight_key(key)):
+                    break
+        await _record(client, site, "misses")
+    except Exception as exc:
+        logger.warning("LLM cache unavailable for %s, calling the model: %s", site, exc)
+        return await call()
+
+    try:
+        response = await call()
+        if _has_content(response):
+            try:
+                await client.set(key, encode_response(response), ex=ttl)
+            except Exception as exc:
+                logger.warning("LLM cache write failed for %s: %s", site, exc)
+        return response
+    finally:
+        if leader:
+            try:
+                await cast(
+                    Awaitable[Any],
+                    cast(Any, client).eval(_RELEASE_FLIGHT_SCRIPT, 1, _flight_key(key), token),
+                )
+            except Exception as exc:
+                logger.debug("LLM cache flight release failed for %s: %s", site, exc)
+
+
+def get_cache_stats() -> dict[str, dict[str, float]]:
+    """Per-site hits, misses, coalesced waits and hit rate (hits + coalesced
+    over all lookups)."""
+    raw = get_shared_sync_redis(decode_responses=False).hgetall(STATS_KEY) or {}
+    stats: dict[str, dict[str, float]] = {}
+    for field, value in raw.items():
+        name = field.decode() if isinstance(field, bytes) else str(field)
+        site, _, outcome = name.rpartition(":")
+        entry = stats.setdefault(site, {"hits": 0, "misses": 0, "coalesced": 0})
+        entry[outcome] = int(value)
+    for entry in stats.values():
+        served = entry["hits"] + entry["coalesced"]
+        total = served + entry["misses"]
+        entry["hit_rate"] = served / total if total else 0.0
+    return stats
@@ -5,7 +5,8 @@ This module provides a centralized router that:
 - Load balances across multiple LLM deployments per model group
 - Handles automatic failover when deployments fail or hit rate limits
 - Uses Redis for distributed cooldown and usage tracking
-- Supports weighted routing based on deployment priority
+- Supports weighted routing based on deployment priority, adjusted at runtime
+  from observed latency (see dembrane.llm_routing)
 
 Usage:
     from dembrane.llm_router import get_router
@@ -20,10 +21,12 @@ import json
 import logging
 from typing import Any, Dict, List, Literal, Optional
 
+import litellm
 from litellm import Router  # type: ignore[attr-defined]
 from litellm.utils import get_model_info
 
 from dembrane.settings import LLMProviderConfig, get_settings
+from dembrane.llm_routing import RedisLatencyStore, LatencyAwareWeights
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +41,7 @@ ROUTER_ROUTING_STRATEGY: Literal["simple-shuffle"] = "simple-shuffle"  # Recomme
 
 # Global router instance (lazy initialized)
 _router: Optional[Router] = None
+_latency_weights: Optional[LatencyAwareWeights] = None
 
 
 def _infer_weight(suffix: Optional[int]) -> int:
@@ -107,6 +111,8 @@ def _build_model_list() -> List[Dict[str, Any]]:
                 {
                     "model_name": group,  # e.g., "text_fast", "multi_modal_pro"
                     "litellm_params": litellm_params,
+                    # Stable id so latency stats are shared across processes
+                    "model_info": {"id": f"{group}:{suffix if suffix is not None else 0}"},
                 }
             )
 
@@ -209,7 +215,7 @@ def get_router() -> Router:
 
     Raises ValueError if no deployments are configured.
     """
-    global _router
+    global _router, _latency_weights
     if _router is None:
         _router = _build_router()
         if _router is None:
@@ -217,9 +223,23 @@ def get_router() -> Router:
                 "LLM Router could not be initialized. "
                 "Ensure at least one LLM__<GROUP>__MODEL is configured."
             )
+        _latency_weights = LatencyAwareWeights(_router, RedisLatencyStore())
+        litellm.logging_callback_manager.add_litellm_callback(_latency_weights)
     return _router
 
 
+def get_hedge_delay(model_group: str) -> float:
+    """
+    Seconds to wait before hedging a call to `model_group` (see llm_routing.hedged).
+    """
+    from dembrane.llm_routing import HEDGE_MAX_DELAY_SECONDS
+
+    get_router()
+    if _latency_weights is None:
+        return HEDGE_MAX_DELAY_SECONDS
+    return _latency_weights.hedge_delay(model_group)
+
+
 def is_router_available() -> bool:
     """
     Check if the router can be initialized.
@@ -294,4 +314,4 @@ def get_min_context_length(model_group: str) -> int:
     return safe_length
 
 
-__all__ = ["get_router", "is_router_available", "get_min_context_length"]
+__all__ = ["get_router", "get_hedge_delay", "is_router_available", "get_min_context_length"]
@@ -0,0 +1,296 @@
+"""Latency-aware deployment weights and hedged calls for the LiteLLM Router.
+
+The router picks deployments with `simple-shuffle` over static weights
+(primary 10, `_1` 9, ...), so a slow-but-healthy region keeps its share of
+traffic until it fails outright and gets cooled down. `LatencyAwareWeights`
+is a LiteLLM callback that keeps the strategy (and with it the router's
+cooldown, pre-call and fallback handling) but rewrites each deployment's
+``weight`` from observed latency:
+
+- Every call records its duration, and for streams its time to first token,
+  into ``llm:route:{deployment}:latency`` / ``:ttft`` (capped Redis lists,
+  shared by every API pod and worker). Failures record FAILURE_PENALTY_SECONDS.
+- At most every STATS_REFRESH_SECONDS, after recording a sample (off the
+  event loop), the weights are recomputed from rolling p50/p95: weight =
+  static weight x (group median / own score)^2, per metric, clamped. A
+  deployment with fewer than MIN_SAMPLES keeps its static weight so it still
+  gets probed.
+
+`hedged` runs a second attempt when the first hasn't answered within the
+group's p95 (clamped to HEDGE_MIN/MAX_DELAY_SECONDS) and returns whichever
+finishes first. It is for short interactive calls only; each hedge costs a
+second completion.
+
+Stats are best-effort: without Redis the weights stay static.
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import statistics
+from typing import Any, Dict, List, TypeVar, Callable, Optional, Awaitable
+from logging import getLogger
+from datetime import timedelta
+from collections import deque
+from dataclasses import dataclass
+
+from litellm.integrations.custom_logger import CustomLogger
+
+logger = getLogger("dembrane.llm_routing")
+
+T = TypeVar("T")
+
+LATENCY_SAMPLE_SIZE = 200
+MIN_SAMPLES = 5
+STATS_REFRESH_SECONDS = 5.0
+FAILURE_PENALTY_SECONDS = 60.0
+MIN_WEIGHT_FACTOR = 0.02
+MAX_WEIGHT_FACTOR = 4.0
+HEDGE_MIN_DELAY_SECONDS = 1.0
+HEDGE_MAX_DELAY_SECONDS = 10.0
+
+_KEY_PREFIX = "llm:route"
+_STATS_TTL_SECONDS = 24 * 60 * 60
+_METRICS = ("latency", "ttft")
+
+
+@dataclass
+class LatencySummary:
+    p50: float
+    p95: float
+    samples: int
+
+    @property
+    def score(self) -> float:
+        return (self.p50 + self.p95) / 2
+
+
+def summarize(values: List[float]) -> Optional[LatencySummary]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    p95_index = min(len(ordered) - 1, max(0, round(0.95 * len(ordered)) - 1))
+    return LatencySummary(statistics.median(ordered), ordered[p95_index], len(ordered))
+
+
+class InMemoryLatencyStore:
+    """Process-local store, for tests and the routing benchmark."""
+
+    def __init__(self, sample_size: int = LATENCY_SAMPLE_SIZE) -> None:
+        self._samples: Dict[tuple[str, str], deque[float]] = {}
+        self._sample_size = sample_size
+
+    def record(self, deployment_id: str, metric: str, seconds: float) -> None:
+        bucket = self._samples.setdefault((deployment_id, metric), deque(maxlen=self._sample_size))
+        bucket.append(seconds)
+
+    def summaries(self, deployment_ids: List[str]) -> Dict[str, Dict[str, LatencySummary]]:
+        result: Dict[str, Dict[str, LatencySummary]] = {}
+        for deployment_id in deployment_ids:
+            for metric in _METRICS:
+                summary = summarize(list(self._samples.get((deployment_id, metric), [])))
+                if summary is not None:
+                    result.setdefault(deployment_id, {})[metric] = summary
+        return result
+
+
+class RedisLatencyStore:
+    """Samples in capped Redis lists, so every process weighs deployments alike."""
+
+    def __init__(self, sample_size: int = LATENCY_SAMPLE_SIZE) -> None:
+        self._sample_size = sample_size
+        self._client: Optional[Any] = None
+
+    def _redis(self) -> Any:
+        if self._client is None:
+            from dembrane.coordination import get_shared_sync_redis
+
+            self._client = get_shared_sync_redis()
+        return self._client
+
+    @staticmethod
+    def _key(deployment_id: str, metric: str) -> str:
+        return f"{_KEY_PREFIX}:{deployment_id}:{metric}"
+
+    def record(self, deployment_id: str, metric: str, seconds: float) -> None:
+        key = self._key(deployment_id, metric)
+        pipe = self._redis().pipeline(transaction=False)
+        pipe.lpush(key, round(seconds, 4))
+        pipe.ltrim(key, 0, self._sample_size - 1)
+        pipe.expire(key, _STATS_TTL_SECONDS)
+        pipe.execute()
+
+    def summaries(self, deployment_ids: List[str]) -> Dict[str, Dict[str, LatencySummary]]:
+        pairs = [(d, m) for d in deployment_ids for m in _METRICS]
+        pipe = self._redis().pipeline(transaction=False)
+        for deployment_id, metric in pairs:
+            pipe.lrange(self._key(deployment_id, metric), 0, -1)
+        result: Dict[str, Dict[str, LatencySummary]] = {}
+        for (deployment_id, metric), raw in zip(pairs, pipe.execute(), strict=True):
+            summary = summarize([float(value) for value in raw or []])
+            if summary is not None:
+                result.setdefault(deployment_id, {})[metric] = summary
+        return result
+
+
+def _seconds(value: Any) -> float:
+    return value.total_seconds() if isinstance(value, timedelta) else float(value)
+
+
+def latency_factors(
+    summaries: Dict[str, Dict[str, LatencySummary]], deployment_ids: List[str]
+) -> Dict[str, float]:
+    """Weight multiplier per deployment: (median score / own score)^2 for each
+    metric with enough samples, clamped. Unmeasured deployments get 1.0."""
+    factors = {deployment_id: 1.0 for deployment_id in deployment_ids}
+    for metric in _METRICS:
+        scores = {
+            deployment_id: summaries[deployment_id][metric].score
+            for deployment_id in deployment_ids
+            if metric in summaries.get(deployment_id, {})
+            and summaries[deployment_id][metric].samples >= MIN_SAMPLES
+        }
+        if len(scores) < 2:
+            continue
+        reference = statistics.median(scores.values())
+        for deployment_id, score in scores.items():
+            factors[deployment_id] *= (reference / max(score, 1e-3)) ** 2
+    return {
+        deployment_id: min(MAX_WEIGHT_FACTOR, max(MIN_WEIGHT_FACTOR, factor))
+        for deployment_id, factor in factors.items()
+    }
+
+
+class LatencyAwareWeights(CustomLogger):
+    """LiteLLM callback that records per-deployment latency and rewrites the
+    router's deployment weights from it."""
+
+    def __init__(self, router: Any, store: Any) -> None:
+        super().__init__()
+        self._router = router
+        self._store = store
+        self._static_weights: Dict[str, float] = {
+            deployment["model_info"]["id"]: float(deployment["litellm_params"].get("weight", 1))
+            for deployment in router.model_list
+        }
+        self._summaries: Dict[str, Dict[str, LatencySummary]] = {}
+        self._refreshed_at = 0.0
+
+    def _deployments(self, model_group: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            deployment
+            for deployment in self._router.model_list
+            if model_group is None or deployment["model_name"] == model_group
+        ]
+
+    def refresh(self, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._refreshed_at < STATS_REFRESH_SECONDS:
+            return
+        self._refreshed_at = now
+        try:
+            self._summaries = self._store.summaries(list(self._static_weights))
+        except Exception as exc:
+            logger.debug("LLM latency stats unavailable: %s", exc)
+            return
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for deployment in self._router.model_list:
+            groups.setdefault(deployment["model_name"], []).append(deployment)
+        for deployments in groups.values():
+            ids = [deployment["model_info"]["id"] for deployment in deployments]
+            factors = latency_factors(self._summaries, ids)
+            for deployment in deployments:
+                deployment_id = deployment["model_info"]["id"]
+                static = self._static_weights.get(deployment_id, 1.0)
+                deployment["litellm_params"]["weight"] = round(static * factors[deployment_id], 4)
+
+    def hedge_delay(self, model_group: str) -> float:
+        """Seconds to wait before hedging: the group's best p95, clamped.
+
+        Reads only the cached summaries; it runs on the event loop for every
+        hedged call. The summaries are refreshed from `_record`, which the
+        async callbacks run in a worker thread.
+        """
+        p95s = [
+            self._summaries[deployment["model_info"]["id"]]["latency"].p95
+            for deployment in self._deployments(model_group)
+            if "latency" in self._summaries.get(deployment["model_info"]["id"], {})
+        ]
+        if not p95s:
+            return HEDGE_MAX_DELAY_SECONDS
+        return min(HEDGE_MAX_DELAY_SECONDS, max(HEDGE_MIN_DELAY_SECONDS, min(p95s)))
+
+    def _record(self, kwargs: Dict[str, Any], start_time: Any, end_time: Any, failed: bool) -> None:
+        deployment_id = ((kwargs.get("litellm_params") or {}).get("model_info") or {}).get("id")
+        if deployment_id is None:
+            return
+        deployment_id = str(deployment_id)
+        try:
+            if failed:
+                self._store.record(deployment_id, "latency", FAILURE_PENALTY_SECONDS)
+            else:
+                self._store.record(deployment_id, "latency", _seconds(end_time - start_time))
+                first_token = kwargs.get("completion_start_time")
+                if kwargs.get("stream") and first_token is not None:
+                    self._store.record(deployment_id, "ttft", _seconds(first_token - start_time))
+        except Exception as exc:
+            logger.debug("LLM latency sample dropped for %s: %s", deployment_id, exc)
+        self.refresh()
+
+    def log_success_event(
+        self,
+        kwargs: Any,
+        response_obj: Any,  # noqa: ARG002
+        start_time: Any,
+        end_time: Any,
+    ) -> None:
+        self._record(kwargs, start_time, end_time, failed=False)
+
+    def log_failure_event(
+        self,
+        kwargs: Any,
+        response_obj: Any,  # noqa: ARG002
+        start_time: Any,
+        end_time: Any,
+    ) -> None:
+        self._record(kwargs, start_time, end_time, failed=True)
+
+    async def async_log_success_event(
+        self,
+        kwargs: Any,
+        response_obj: Any,  # noqa: ARG002
+        start_time: Any,
+        end_time: Any,
+    ) -> None:
+        await asyncio.to_thread(self._record, kwargs, start_time, end_time, False)
+
+    async def async_log_failure_event(
+        self,
+        kwargs: Any,
+        response_obj: Any,  # noqa: ARG002
+        start_time: Any,
+        end_time: Any,
+    ) -> None:
+        await asyncio.to_thread(self._record, kwargs, start_time, end_time, True)
+
+
+async def hedged(call: Callable[[], Awaitable[T]], delay_seconds: float) -> T:
+    """Run `call`; if it hasn't finished after `delay_seconds`, start a second
+    attempt and return whichever succeeds first (the other is cancelled)."""
+    first = asyncio.ensure_future(call())
+    done, _ = await asyncio.wait({first}, timeout=delay_seconds)
+    if done:
+        return first.result()
+    pending = {first, asyncio.ensure_future(call())}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                for other in pending:
+                    other.cancel()
+                return task.result()
+            error = task.exception()
+    assert error is not None
+    raise error
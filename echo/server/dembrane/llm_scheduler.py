@@ -0,0 +1,434 @@
+"""Distributed admission control for router completions.
+
+Live chat, report fan-outs, summary catch-up, canvas ticks and transcription
+all share the same LiteLLM Router deployments. Without coordination a
+500-conversation report fills the provider's rate limit and live chats stall
+behind it. Every router call now takes a slot from a per-model-group pool in
+Redis first:
+
+- ``llm:sched:{group}:active`` — ZSET of held slots (member
+  ``{token}|{workspace}|{priority}``, score = lease expiry in ms). A worker
+  that dies mid-call loses its slot when the lease runs out.
+- ``llm:sched:{group}:limit`` — the group's current concurrency limit,
+  adapted AIMD-style: +1/limit per healthy call, x0.5 on a 429 and x0.8 on a
+  call slower than SLOW_CALL_SECONDS (at most one decrease per second).
+  Streams are judged by their time to first chunk, so a long answer is not
+  a slow call. The bounds come from the LLM_SCHEDULER_* settings.
+- ``llm:sched:{group}:ws`` — slots held per workspace.
+- ``llm:sched:{group}:waiting:{priority}`` — ZSET of waiters per class,
+  scored by a heartbeat so crashed waiters age out. Its size is the queue
+  depth.
+- ``llm:sched:{group}:stats`` — admitted / wait_ms / overflow per class and
+  a throttled counter, for `get_scheduler_stats`.
+
+Admission rules, checked atomically in one script:
+
+- Priority: interactive may use the whole limit, standard CLASS_SHARE of it,
+  background less. A class is never admitted while a higher class is queued.
+- Fair share: outside interactive, one workspace holds at most
+  WORKSPACE_SHARE of the limit, so one project's report can't starve another
+  workspace's summaries.
+
+Worker processes default to background priority (see the tasks middleware);
+the API defaults to standard, live chunk transcription asks for standard and
+streams a user is watching pass ``priority="interactive"``. A waiter that
+exceeds its class's MAX_WAIT_SECONDS runs anyway and is counted as overflow.
+Any Redis failure also lets the call through: the scheduler must never be the
+reason an LLM call fails.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+import random
+import asyncio
+from typing import Any, Literal, Callable, Optional, Awaitable, AsyncIterator, cast
+from logging import getLogger
+from dataclasses import dataclass
+
+from dembrane.settings import get_settings
+from dembrane.redis_async import get_redis_client
+from dembrane.coordination import get_shared_sync_redis
+
+logger = getLogger("dembrane.llm_scheduler")
+settings = get_settings()
+
+Priority = Literal["interactive", "standard", "background"]
+PRIORITIES: tuple[Priority, ...] = ("interactive", "standard", "background")
+
+# Share of the group's limit each class may fill.
+CLASS_SHARE: dict[Priority, float] = {"interactive": 1.0, "standard": 0.85, "background": 0.6}
+MAX_WAIT_SECONDS: dict[Priority, float] = {
+    "interactive": 5.0,
+    "standard": 60.0,
+    "background": 600.0,
+}
+WORKSPACE_SHARE = 0.5
+
+INITIAL_LIMIT = settings.llms.scheduler_initial_limit
+MIN_LIMIT = settings.llms.scheduler_min_limit
+MAX_LIMIT = settings.llms.scheduler_max_limit
+SLOW_CALL_SECONDS = settings.llms.scheduler_slow_call_seconds
+
+_LEASE_MS = 6 * 60 * 1000
+_WAITER_TTL_MS = 5_000
+_POLL_MIN_SECONDS = 0.05
+_POLL_MAX_SECONDS = 0.5
+_STATS_TTL_SECONDS = 7 * 24 * 60 * 60
+
+_KEY_PREFIX = "llm:sched"
+
+# KEYS[1] = active, KEYS[2] = limit, KEYS[3] = per-workspace counts,
+# KEYS[4..6] = waiters (interactive, standard, background)
+# ARGV[1] = now ms, ARGV[2] = lease ms, ARGV[3] = slot member, ARGV[4] = workspace,
+# ARGV[5] = class rank (0..2), ARGV[6] = class share, ARGV[7] = workspace share,
+# ARGV[8] = initial limit, ARGV[9] = waiter member, ARGV[10] = waiter ttl ms
+_ADMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local expired = redis.call("zrangebyscore", KEYS[1], "-inf", now)
+for _, member in ipairs(expired) do
+    local ws = string.match(member, "^[^|]*|([^|]*)|")
+    if ws and ws ~= "" and redis.call("hincrby", KEYS[3], ws, -1) <= 0 then
+        redis.call("hdel", KEYS[3], ws)
+    end
+end
+if #expired > 0 then
+    redis.call("zremrangebyscore", KEYS[1], "-inf", now)
+end
+for i = 4, 6 do
+    redis.call("zremrangebyscore", KEYS[i], "-inf", now)
+end
+
+local rank = tonumber(ARGV[5])
+local waiters = KEYS[4 + rank]
+local function wait()
+    redis.call("zadd", waiters, now + tonumber(ARGV[10]), ARGV[9])
+    redis.call("pexpire", waiters, ARGV[10])
+    return 0
+end
+
+for i = 4, 3 + rank do
+    if redis.call("zcard", KEYS[i]) > 0 then
+        return wait()
+    end
+end
+local limit = tonumber(redis.call("get", KEYS[2]) or ARGV[8])
+local cap = math.max(1, math.floor(limit * tonumber(ARGV[6])))
+if redis.call("zcard", KEYS[1]) >= cap then
+    return wait()
+end
+local share = tonumber(ARGV[7])
+if ARGV[4] ~= "" and share > 0 then
+    local held = tonumber(redis.call("hget", KEYS[3], ARGV[4]) or "0")
+    if held >= math.max(1, math.floor(limit * share)) then
+        return wait()
+    end
+end
+
+redis.call("zrem", waiters, ARGV[9])
+redis.call("zadd", KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+redis.call("pexpire", KEYS[1], ARGV[2])
+if ARGV[4] ~= "" then
+    redis.call("hincrby", KEYS[3], ARGV[4], 1)
+    redis.call("pexpire", KEYS[3], ARGV[2])
+end
+return 1
+"""
+
+# KEYS[1] = active, KEYS[2] = limit, KEYS[3] = per-workspace counts,
+# KEYS[4] = decrease cooldown
+# ARGV[1] = slot member, ARGV[2] = workspace, ARGV[3] = outcome (ok|slow|throttled|error),
+# ARGV[4] = initial limit, ARGV[5] = min limit, ARGV[6] = max limit
+_RELEASE_SCRIPT = """
+if redis.call("zrem", KEYS[1], ARGV[1]) == 1 and ARGV[2] ~= "" then
+    if redis.call("hincrby", KEYS[3], ARGV[2], -1) <= 0 then
+        redis.call("hdel", KEYS[3], ARGV[2])
+    end
+end
+local limit = tonumber(redis.call("get", KEYS[2]) or ARGV[4])
+if ARGV[3] == "throttled" or ARGV[3] == "slow" then
+    if redis.call("set", KEYS[4], "1", "PX", 1000, "NX") then
+        local factor = 0.8
+        if ARGV[3] == "throttled" then
+            factor = 0.5
+        end
+        limit = math.max(tonumber(ARGV[5]), limit * factor)
+    end
+elseif ARGV[3] == "ok" then
+    limit = math.min(tonumber(ARGV[6]), limit + 1 / limit)
+end
+redis.call("set", KEYS[2], tostring(limit))
+return tostring(limit)
+"""
+
+_default_priority: Priority = "standard"
+
+
+def set_default_priority(priority: Priority) -> None:
+    """Priority for calls that don't pass one (worker processes use background)."""
+    global _default_priority
+    _default_priority = priority
+
+
+def _key(group: str, suffix: str) -> str:
+    return f"{_KEY_PREFIX}:{group}:{suffix}"
+
+
+def _admit_keys(group: str) -> list[str]:
+    return [
+        _key(group, "active"),
+        _key(group, "limit"),
+        _key(group, "ws"),
+        *[_key(group, f"waiting:{priority}") for priority in PRIORITIES],
+    ]
+
+
+def _release_keys(group: str) -> list[str]:
+    return [_key(group, "active"), _key(group, "limit"), _key(group, "ws"), _key(group, "backoff")]
+
+
+@dataclass
+class Slot:
+    group: str
+    member: str
+    workspace: str
+    priority: Priority
+    started: float
+
+
+def _new_slot(group: str, priority: Optional[Priority], workspace_id: Optional[str]) -> Slot:
+    resolved = priority or _default_priority
+    workspace = (workspace_id or "").replace("|", "")
+    member = f"{uuid.uuid4().hex}|{workspace}|{resolved}"
+    return Slot(group, member, workspace, resolved, time.monotonic())
+
+
+def _admit_args(slot: Slot, waiter: str) -> list[Any]:
+    rank = PRIORITIES.index(slot.priority)
+    workspace_share = 0.0 if slot.priority == "interactive" else WORKSPACE_SHARE
+    return [
+        int(time.time() * 1000),
+        _LEASE_MS,
+        slot.member,
+        slot.workspace,
+        rank,
+        CLASS_SHARE[slot.priority],
+        workspace_share,
+        INITIAL_LIMIT,
+        waiter,
+        _WAITER_TTL_MS,
+    ]
+
+
+def _release_args(slot: Slot, outcome: str) -> list[Any]:
+    return [slot.member, slot.workspace, outcome, INITIAL_LIMIT, MIN_LIMIT, MAX_LIMIT]
+
+
+def _poll_delay(attempt: int) -> float:
+    return min(_POLL_MAX_SECONDS, _POLL_MIN_SECONDS * (2 ** min(attempt, 4))) * (
+        0.5 + random.random() / 2
+    )
+
+
+def classify_outcome(exc: Optional[BaseException], elapsed: float) -> str:
+    if exc is not None:
+        status = getattr(exc, "status_code", None)
+        if status == 429 or type(exc).__name__ == "RateLimitError":
+            return "throttled"
+        return "error"
+    return "slow" if elapsed > SLOW_CALL_SECONDS else "ok"
+
+
+def _record_admission(client: Any, slot: Slot, waited: float, overflow: bool) -> Any:
+    pipe = client.pipeline(transaction=False)
+    stats = _key(slot.group, "stats")
+    pipe.hincrby(stats, f"{slot.priority}:{'overflow' if overflow else 'admitted'}", 1)
+    pipe.hincrby(stats, f"{slot.priority}:wait_ms", int(waited * 1000))
+    pipe.expire(stats, _STATS_TTL_SECONDS)
+    return pipe.execute()
+
+
+def acquire_slot(
+    group: str, priority: Optional[Priority] = None, workspace_id: Optional[str] = None
+) -> Optional[Slot]:
+    """Block until admitted. None means the call runs unscheduled (Redis down
+    or the wait ran out); release_slot accepts None."""
+    slot = _new_slot(group, priority, workspace_id)
+    waiter = slot.member.split("|", 1)[0]
+    deadline = slot.started + MAX_WAIT_SECONDS[slot.priority]
+    try:
+        client = get_shared_sync_redis()
+        attempt = 0
+        while True:
+            if client.eval(_ADMIT_SCRIPT, 6, *_admit_keys(group), *_admit_args(slot, waiter)):
+                _record_admission(client, slot, time.monotonic() - slot.started, False)
+                slot.started = time.monotonic()
+                return slot
+            if time.monotonic() >= deadline:
+                client.zrem(_key(group, f"waiting:{slot.priority}"), waiter)
+                _record_admission(client, slot, time.monotonic() - slot.started, True)
+                logger.warning(
+                    "LLM %s slot wait exceeded for %s; running anyway", slot.priority, group
+                )
+                return None
+            time.sleep(_poll_delay(attempt))
+            attempt += 1
+    except Exception as exc:
+        logger.warning("LLM scheduler unavailable for %s: %s", group, exc)
+        return None
+
+
+def release_slot(slot: Optional[Slot], outcome: str) -> None:
+    if slot is None:
+        return
+    try:
+        get_shared_sync_redis().eval(
+            _RELEASE_SCRIPT, 4, *_release_keys(slot.group), *_release_args(slot, outcome)
+        )
+        if outcome == "throttled":
+            get_shared_sync_redis().hincrby(_key(slot.group, "stats"), "throttled", 1)
+    except Exception as exc:
+        logger.warning("LLM scheduler release failed for %s: %s", slot.group, exc)
+
+
+async def aacquire_slot(
+    group: str, priority: Optional[Priority] = None, workspace_id: Optional[str] = None
+) -> Optional[Slot]:
+    """Async twin of acquire_slot; waiting yields the loop."""
+    slot = _new_slot(group, priority, workspace_id)
+    waiter = slot.member.split("|", 1)[0]
+    deadline = slot.started + MAX_WAIT_SECONDS[slot.priority]
+    try:
+        client = await get_redis_client()
+        attempt = 0
+        while True:
+            admitted = await cast(
+                Awaitable[Any],
+                cast(Any, client).eval(
+                    _ADMIT_SCRIPT, 6, *_admit_keys(group), *_admit_args(slot, waiter)
+                ),
+            )
+            if admitted:
+                await _record_admission(client, slot, time.monotonic() - slot.started, False)
+                slot.started = time.monotonic()
+                return slot
+            if time.monotonic() >= deadline:
+                await client.zrem(_key(group, f"waiting:{slot.priority}"), waiter)
+                await _record_admission(client, slot, time.monotonic() - slot.started, True)
+                logger.warning(
+                    "LLM %s slot wait exceeded for %s; running anyway", slot.priority, group
+                )
+                return None
+            await asyncio.sleep(_poll_delay(attempt))
+            attempt += 1
+    except Exception as exc:
+        logger.warning("LLM scheduler unavailable for %s: %s", group, exc)
+        return None
+
+
+async def arelease_slot(slot: Optional[Slot], outcome: str) -> None:
+    if slot is None:
+        return
+    try:
+        client = await get_redis_client()
+        await cast(
+            Awaitable[Any],
+            cast(Any, client).eval(
+                _RELEASE_SCRIPT, 4, *_release_keys(slot.group), *_release_args(slot, outcome)
+            ),
+        )
+        if outcome == "throttled":
+            await cast(Awaitable[Any], client.hincrby(_key(slot.group, "stats"), "throttled", 1))
+    except Exception as exc:
+        logger.warning("LLM scheduler release failed for %s: %s", slot.group, exc)
+
+
+def scheduled(
+    group: str,
+    priority: Optional[Priority],
+    workspace_id: Optional[str],
+    call: Callable[[], Any],
+) -> Any:
+    """Run a sync router call inside a slot."""
+    slot = acquire_slot(group, priority, workspace_id)
+    started = time.monotonic()
+    try:
+        response = call()
+    except BaseException as exc:
+        release_slot(slot, classify_outcome(exc, time.monotonic() - started))
+        raise
+    release_slot(slot, classify_outcome(None, time.monotonic() - started))
+    return response
+
+
+async def _release_when_drained(
+    stream: AsyncIterator[Any], slot: Optional[Slot], started: float
+) -> AsyncIterator[Any]:
+    error: Optional[BaseException] = None
+    first_chunk: Optional[float] = None
+    try:
+        async for chunk in stream:
+            if first_chunk is None:
+                first_chunk = time.monotonic()
+            yield chunk
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        # Time to first chunk: how long the reader drains says nothing about the provider.
+        elapsed = (first_chunk if first_chunk is not None else time.monotonic()) - started
+        await arelease_slot(slot, classify_outcome(error, elapsed))
+
+
+async def ascheduled(
+    group: str,
+    priority: Optional[Priority],
+    workspace_id: Optional[str],
+    call: Callable[[], Awaitable[Any]],
+    *,
+    stream: bool = False,
+) -> Any:
+    """Run an async router call inside a slot. A streamed response keeps its
+    slot until the caller has drained (or abandoned) the stream."""
+    slot = await aacquire_slot(group, priority, workspace_id)
+    started = time.monotonic()
+    try:
+        response = await call()
+    except BaseException as exc:
+        await arelease_slot(slot, classify_outcome(exc, time.monotonic() - started))
+        raise
+    if stream:
+        return _release_when_drained(response, slot, started)
+    await arelease_slot(slot, classify_outcome(None, time.monotonic() - started))
+    return response
+
+
+def get_scheduler_stats(group: str) -> dict[str, Any]:
+    """Current limit, slots in use, queue depth per class and wait metrics."""
+    client = get_shared_sync_redis()
+    pipe = client.pipeline(transaction=False)
+    pipe.get(_key(group, "limit"))
+    pipe.zcard(_key(group, "active"))
+    for priority in PRIORITIES:
+        pipe.zcard(_key(group, f"waiting:{priority}"))
+    pipe.hgetall(_key(group, "stats"))
+    limit, in_use, *queued, raw_stats = pipe.execute()
+    classes: dict[str, dict[str, float]] = {}
+    for priority, depth in zip(PRIORITIES, queued, strict=True):
+        admitted = int(raw_stats.get(f"{priority}:admitted", 0))
+        overflow = int(raw_stats.get(f"{priority}:overflow", 0))
+        wait_ms = int(raw_stats.get(f"{priority}:wait_ms", 0))
+        calls = admitted + overflow
+        classes[priority] = {
+            "queued": int(depth),
+            "admitted": admitted,
+            "overflow": overflow,
+            "avg_wait_ms": wait_ms / calls if calls else 0.0,
+        }
+    return {
+        "limit": float(limit) if limit is not None else float(INITIAL_LIMIT),
+        "in_use": int(in_use),
+        "throttled": int(raw_stats.get("throttled", 0)),
+        "classes": classes,
+    }
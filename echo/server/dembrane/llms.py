@@ -6,6 +6,8 @@ from enum import Enum
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from dembrane.settings import get_settings
+from dembrane.llm_cache import cached_completion, acached_completion
+from dembrane.llm_scheduler import Priority, scheduled, ascheduled
 
 if TYPE_CHECKING:
     from litellm import Router  # type: ignore[attr-defined]
@@ -78,7 +80,15 @@ def _get_router() -> "Router":
     return _cached_router
 
 
-async def arouter_completion(model: MODELS, **kwargs: Any) -> Any:
+async def arouter_completion(
+    model: MODELS,
+    *,
+    cache: Optional[str] = None,
+    priority: Optional[Priority] = None,
+    workspace_id: Optional[str] = None,
+    hedge: bool = False,
+    **kwargs: Any,
+) -> Any:
     """
     Async completion via LiteLLM Router with automatic load balancing and failover.
 
@@ -90,6 +100,14 @@ async def arouter_completion(model: MODELS, **kwargs: Any) -> Any:
 
     Args:
         model: The model group to use (MODELS.TEXT_FAST, MODELS.MULTI_MODAL_PRO, etc.)
+        cache: Opt-in response cache site (see dembrane.llm_cache.CACHE_SITE_TTLS).
+            Identical requests within the site's TTL reuse the stored response.
+        priority: Admission class for dembrane.llm_scheduler ("interactive",
+            "standard", "background"). Defaults to the process default.
+        workspace_id: Workspace the call is made for, for fair-share admission.
+        hedge: For short interactive calls: if the first attempt is slower than
+            the group's p95, race a second one (dembrane.llm_routing.hedged).
+            Ignored for streams.
         **kwargs: Arguments passed to litellm.acompletion (messages, temperature, etc.)
 
     Returns:
@@ -104,10 +122,35 @@ async def arouter_completion(model: MODELS, **kwargs: Any) -> Any:
     """
     router = _get_router()
     model_name = MODEL_REGISTRY[model]["settings_attr"]
-    return await router.acompletion(model=model_name, **kwargs)
-
-
-def router_completion(model: MODELS, **kwargs: Any) -> Any:
+    stream = bool(kwargs.get("stream"))
+
+    def _complete() -> Any:
+        return router.acompletion(model=model_name, **kwargs)
+
+    def _call() -> Any:
+        if hedge and not stream:
+            from dembrane.llm_router import get_hedge_delay
+            from dembrane.llm_routing import hedged
+
+            delay = get_hedge_delay(model_name)
+            return ascheduled(
+                model_name, priority, workspace_id, lambda: hedged(_complete, delay)
+            )
+        return ascheduled(model_name, priority, workspace_id, _complete, stream=stream)
+
+    if cache is None or stream:
+        return await _call()
+    return await acached_completion(cache, model.value, kwargs, _call)
+
+
+def router_completion(
+    model: MODELS,
+    *,
+    cache: Optional[str] = None,
+    priority: Optional[Priority] = None,
+    workspace_id: Optional[str] = None,
+    **kwargs: Any,
+) -> Any:
     """
     Sync completion via LiteLLM Router with automatic load balancing and failover.
 
@@ -116,6 +159,9 @@ def router_completion(model: MODELS, **kwargs: Any) -> Any:
 
     Args:
         model: The model group to use (MODELS.TEXT_FAST, MODELS.MULTI_MODAL_PRO, etc.)
+        cache: Opt-in response cache site, as for arouter_completion().
+        priority: Admission class, as for arouter_completion().
+        workspace_id: Workspace the call is made for, as for arouter_completion().
         **kwargs: Arguments passed to litellm.completion (messages, temperature, etc.)
 
     Returns:
@@ -123,7 +169,14 @@ def router_completion(model: MODELS, **kwargs: Any) -> Any:
     """
     router = _get_router()
     model_name = MODEL_REGISTRY[model]["settings_attr"]
-    return router.completion(model=model_name, **kwargs)
+    def _call() -> Any:
+        return scheduled(
+            model_name, priority, workspace_id, lambda: router.completion(model=model_name, **kwargs)
+        )
+
+    if cache is None or kwargs.get("stream"):
+        return _call()
+    return cached_completion(cache, model.value, kwargs, _call)
 
 
 __all__ = ["MODELS", "get_completion_kwargs", "arouter_completion", "router_completion"]
@@ -8,11 +8,23 @@ refreshes even if a publish is missed or pub/sub is briefly unavailable.
 
 Publishing is always best-effort. A failure here must never break a ping, a
 transcription, or a finish, so callers do not need to guard it.
+
+Dirty signals are coalesced per project in Redis, so a 200-participant
+session pinging every few seconds wakes each stream a handful of times per
+second instead of hundreds. The first signal in a window publishes at once
+(leading edge) and opens a gate for DIRTY_COALESCE_INTERVAL_MS; signals
+inside the window only mark the project pending and bump a suppressed
+counter. When the gate lapses, one trailing publish carries everything that
+was suppressed, so a stream never misses the last change of a burst. The
+gate lives in Redis, so the cap holds across API workers; the trailing
+timer is per process and deduplicated by the same gate.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Any, Optional, Awaitable, cast
 
 from dembrane.redis_async import get_redis_client
 
@@ -26,41 +38,83 @@ _CHANNEL_PREFIX = "monitor:project:"
 _ACTIVE_PREFIX = "monitor:active:"
 # Keep the index a little longer than the monitor lookback so a brief gap
 # doesn't drop a session; stale members are pruned on read anyway.
-_ACTIVE_TTL_SECONDS = 2100
+ACTIVE_TTL_SECONDS = 2100
 # Cap the per-project active index so a public flood of unique ids can't grow it
 # unbounded (which would bloat the Directus lookup). Well above any real project.
-_MAX_ACTIVE_MEMBERS = 2000
+MAX_ACTIVE_MEMBERS = 2000
+
+# At most one leading + one trailing publish per project per interval.
+DIRTY_COALESCE_INTERVAL_MS = 250
+_DIRTY_PREFIX = "monitor:dirty:"
+_DIRTY_STATS_TTL_SECONDS = 24 * 60 * 60
+# Trailing flushes re-arm while other workers keep re-opening the gate; stop
+# after a few windows, the stream's poll timeout covers anything left over.
+_MAX_TRAILING_ATTEMPTS = 8
+
+# Shared by the notify script below and the participant ping script
+# (conversation_liveness), which coalesces its publish in the same round trip.
+# Returns -1 when it published, else the gate's remaining ms (the caller then
+# schedules a trailing flush).
+DIRTY_COALESCE_LUA = """
+local function coalesce_dirty(gate, pending, stats, channel, interval_ms)
+    if redis.call("set", gate, "1", "PX", interval_ms, "NX") then
+        redis.call("del", pending)
+        redis.call("publish", channel, "1")
+        redis.call("hincrby", stats, "published", 1)
+        redis.call("expire", stats, %d)
+        return -1
+    end
+    redis.call("set", pending, "1", "PX", tonumber(interval_ms) * 4)
+    redis.call("hincrby", stats, "suppressed", 1)
+    redis.call("expire", stats, %d)
+    local ttl = redis.call("pttl", gate)
+    if ttl < 0 then
+        ttl = 0
+    end
+    return ttl
+end
+""" % (_DIRTY_STATS_TTL_SECONDS, _DIRTY_STATS_TTL_SECONDS)
+
+# KEYS = dirty_keys(project_id); ARGV = dirty_args(project_id)
+_NOTIFY_DIRTY_SCRIPT = (
+    DIRTY_COALESCE_LUA
+    + """
+return coalesce_dirty(KEYS[1], KEYS[2], KEYS[3], ARGV[1], ARGV[2])
+"""
+)
+
+# Trailing edge. Returns -2 when nothing is pending (someone else already
+# published), -1 when it published, else the ms until the gate lapses.
+_FLUSH_DIRTY_SCRIPT = """
+if redis.call("exists", KEYS[2]) == 0 then
+    return -2
+end
+if redis.call("set", KEYS[1], "1", "PX", ARGV[2], "NX") then
+    redis.call("del", KEYS[2])
+    redis.call("publish", ARGV[1], "1")
+    redis.call("hincrby", KEYS[3], "published", 1)
+    return -1
+end
+local ttl = redis.call("pttl", KEYS[1])
+if ttl < 0 then
+    ttl = 0
+end
+return ttl
+"""
+
+_trailing_flushes: dict[str, asyncio.Task] = {}
 
 
 def channel_for_project(project_id: str) -> str:
     return f"{_CHANNEL_PREFIX}{project_id}"
 
 
-def _active_key(project_id: str) -> str:
+def active_index_key(project_id: str) -> str:
+    """Key of the project's active-conversation ZSET (also written by the
+    participant ping script in conversation_liveness)."""
     return f"{_ACTIVE_PREFIX}{project_id}"
 
 
-async def register_active_conversation(
-    project_id: str, conversation_id: str, *, score: float
-) -> None:
-    """Record that a conversation is active (pinged) in its project's index.
-
-    `score` is epoch seconds of the ping. Best-effort. Refreshes the key TTL so
-    the index self-cleans once a project goes quiet.
-    """
-    if not project_id or not conversation_id:
-        return
-    try:
-        client = await get_redis_client()
-        key = _active_key(project_id)
-        await client.zadd(key, {conversation_id: score})
-        await client.expire(key, _ACTIVE_TTL_SECONDS)
-        # Keep only the newest _MAX_ACTIVE_MEMBERS; drop the oldest beyond it.
-        await client.zremrangebyrank(key, 0, -(_MAX_ACTIVE_MEMBERS + 1))
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("monitor active-index add failed for %s: %s", project_id, exc)
-
-
 async def get_active_conversation_ids(
     project_id: str, *, min_score: float
 ) -> list[str]:
@@ -71,7 +125,7 @@ async def get_active_conversation_ids(
     """
     try:
         client = await get_redis_client()
-        key = _active_key(project_id)
+        key = active_index_key(project_id)
         await client.zremrangebyscore(key, "-inf", f"({min_score}")
         members = await client.zrangebyscore(key, min_score, "+inf")
     except Exception as exc:  # noqa: BLE001
@@ -83,15 +137,96 @@ async def get_active_conversation_ids(
     ]
 
 
-async def publish_monitor_dirty(project_id: str) -> None:
+def dirty_keys(project_id: str) -> list[str]:
+    """[gate, pending, stats] keys of the project's dirty coalescer."""
+    base = f"{_DIRTY_PREFIX}{project_id}"
+    return [f"{base}:gate", f"{base}:pending", f"{base}:stats"]
+
+
+def dirty_args(project_id: str, interval_ms: Optional[int] = None) -> list[Any]:
+    """[channel, interval_ms] script args of the project's dirty coalescer."""
+    return [channel_for_project(project_id), interval_ms or DIRTY_COALESCE_INTERVAL_MS]
+
+
+def handle_coalesce_result(
+    project_id: str, result: Any, interval_ms: Optional[int] = None
+) -> None:
+    """Arm the trailing flush when a coalesce call was suppressed.
+
+    `result` is what `coalesce_dirty` returned: -1 (published) needs nothing,
+    a non-negative value is the delay in ms until the gate lapses. One timer
+    per project per process; a timer already armed covers the new signal.
+    """
+    try:
+        delay_ms = int(result)
+    except (TypeError, ValueError):
+        return
+    if delay_ms < 0:
+        return
+    existing = _trailing_flushes.get(project_id)
+    if existing is not None and not existing.done():
+        return
+    _trailing_flushes[project_id] = asyncio.get_running_loop().create_task(
+        _trailing_flush(project_id, delay_ms, interval_ms)
+    )
+
+
+async def _trailing_flush(project_id: str, delay_ms: int, interval_ms: Optional[int]) -> None:
+    try:
+        client = await get_redis_client()
+        for _ in range(_MAX_TRAILING_ATTEMPTS):
+            await asyncio.sleep(max(delay_ms, 1) / 1000)
+            raw = cast(Any, client).eval(
+                _FLUSH_DIRTY_SCRIPT,
+                3,
+                *dirty_keys(project_id),
+                *dirty_args(project_id, interval_ms),
+            )
+            delay_ms = int(await cast(Awaitable[Any], raw))
+            if delay_ms < 0:
+                return
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("monitor trailing publish failed for %s: %s", project_id, exc)
+    finally:
+        if _trailing_flushes.get(project_id) is asyncio.current_task():
+            _trailing_flushes.pop(project_id, None)
+
+
+async def publish_monitor_dirty(project_id: str, *, interval_ms: Optional[int] = None) -> None:
     """Nudge any open monitor streams for this project to recompute.
 
+    Coalesced: publishes immediately unless the project published within
+    `interval_ms` (default DIRTY_COALESCE_INTERVAL_MS), in which case one
+    trailing publish follows when the window closes.
+
     Best-effort: swallows every error (including a missing/unavailable Redis).
     """
     if not project_id:
         return
     try:
         client = await get_redis_client()
-        await client.publish(channel_for_project(project_id), b"1")
+        raw = cast(Any, client).eval(
+            _NOTIFY_DIRTY_SCRIPT,
+            3,
+            *dirty_keys(project_id),
+            *dirty_args(project_id, interval_ms),
+        )
+        handle_coalesce_result(project_id, await cast(Awaitable[Any], raw), interval_ms)
     except Exception as exc:  # noqa: BLE001
         logger.warning("monitor publish failed for %s: %s", project_id, exc)
+
+
+async def get_dirty_stats(project_id: str) -> dict[str, int]:
+    """{"published": n, "suppressed": m} over the last day (best-effort)."""
+    try:
+        client = await get_redis_client()
+        raw = await cast(Awaitable[dict], client.hgetall(dirty_keys(project_id)[2]))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("monitor dirty stats read failed for %s: %s", project_id, exc)
+        raw = {}
+    stats = {"published": 0, "suppressed": 0}
+    for field, value in (raw or {}).items():
+        name = field.decode("utf-8") if isinstance(field, (bytes, bytearray)) else str(field)
+        if name in stats:
+            stats[name] = int(value)
+    return stats
@@ -0,0 +1,180 @@
+"""Unread notification counter for the inbox badge.
+
+The badge used to count unread rows on every poll (`limit: -1`, then
+`len(rows)`). Each user's count now lives in Redis:
+
+- `emit` adds one, `mark_read` subtracts one, `mark_all_read` sets it.
+  Adjustments only apply while the counter exists (a Lua script checks), so
+  a missing counter is never started at a wrong value by INCR.
+- A read that misses rebuilds it from a Directus `aggregate: count`. The
+  counter expires after `UNREAD_TTL_SECONDS`, which also bounds drift from
+  notifications expiring (`expires_at`) while unread.
+- Every change publishes a nudge on the user's badge channel; the
+  `/v2/me/notifications/unread-count/stream` SSE endpoint re-reads the count
+  on a nudge, so clients get pushed updates instead of polling.
+
+Writes use a sync client so `emit_sync` can call them from Dramatiq actors;
+async callers go through the `a`-prefixed wrappers, which run the same write
+in the thread pool instead of blocking the event loop. The reads and the
+subscription run in FastAPI and use the async client.
+Everything here is best-effort: a Redis failure falls back to the Directus
+count, never to an error.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+from logging import getLogger
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
+
+from redis.asyncio.client import PubSub
+
+from dembrane.redis_async import get_redis_client
+from dembrane.coordination import get_shared_sync_redis
+from dembrane.async_helpers import run_in_thread_pool
+from dembrane.directus_async import async_directus
+
+logger = getLogger("dembrane.notification_badge")
+
+UNREAD_TTL_SECONDS = 10 * 60
+
+_KEY_PREFIX = "notifications:unread:v1"
+
+# Adjust an existing counter by ARGV[1], never below zero; nil when missing.
+_ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+  redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+  value = 0
+end
+return value
+"""
+
+
+def unread_key(app_user_id: str) -> str:
+    return f"{_KEY_PREFIX}:{app_user_id}"
+
+
+def badge_channel(app_user_id: str) -> str:
+    return f"notifications:badge:{app_user_id}"
+
+
+def unread_filter(app_user_id: str, now_iso: Optional[str] = None) -> dict:
+    """Directus filter for the rows the badge counts: unread, not expired."""
+    now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+    return {
+        "audience_user_id": {"_eq": app_user_id},
+        "read_at": {"_null": True},
+        "_or": [
+            {"expires_at": {"_null": True}},
+            {"expires_at": {"_gt": now_iso}},
+        ],
+    }
+
+
+def adjust_unread(app_user_id: str, delta: int) -> Optional[int]:
+    """Add `delta` to the user's counter if it exists and nudge the badge.
+    Returns the new count, or None when the counter wasn't there."""
+    try:
+        client = get_shared_sync_redis(decode_responses=False)
+        value = client.eval(_ADJUST_SCRIPT, 1, unread_key(app_user_id), delta)
+        client.publish(badge_channel(app_user_id), b"1")
+        return None if value is None else int(value)
+    except Exception as exc:  # noqa: BLE001 — the badge is best-effort
+        logger.warning("unread counter adjust failed: %s", exc)
+        return None
+
+
+def adjust_unread_many(app_user_ids: list[str]) -> None:
+    """Add one to each listed user's counter (once per occurrence) and nudge
+    their badges, in a single pipelined round trip."""
+    if not app_user_ids:
+        return
+    try:
+        pipe = get_shared_sync_redis(decode_responses=False).pipeline(transaction=False)
+        for app_user_id in app_user_ids:
+            pipe.eval(_ADJUST_SCRIPT, 1, unread_key(app_user_id), 1)
+        for app_user_id in dict.fromkeys(app_user_ids):
+            pipe.publish(badge_channel(app_user_id), b"1")
+        pipe.execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("unread counter bulk adjust failed: %s", exc)
+
+
+def set_unread(app_user_id: str, count: Optional[int]) -> None:
+    """Overwrite the user's counter (None drops it, forcing a rebuild) and nudge."""
+    try:
+        client = get_shared_sync_redis(decode_responses=False)
+        if count is None:
+            client.delete(unread_key(app_user_id))
+        else:
+            client.set(unread_key(app_user_id), count, ex=UNREAD_TTL_SECONDS)
+        client.publish(badge_channel(app_user_id), b"1")
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("unread counter set failed: %s", exc)
+
+
+async def aadjust_unread(app_user_id: str, delta: int) -> Optional[int]:
+    return await run_in_thread_pool(adjust_unread, app_user_id, delta)
+
+
+async def aadjust_unread_many(app_user_ids: list[str]) -> None:
+    if app_user_ids:
+        await run_in_thread_pool(adjust_unread_many, app_user_ids)
+
+
+async def aset_unread(app_user_id: str, count: Optional[int]) -> None:
+    await run_in_thread_pool(set_unread, app_user_id, count)
+
+
+async def count_unread_in_directus(app_user_id: str) -> int:
+    rows = await async_directus.get_items(
+        "notification",
+        {"query": {"filter": unread_filter(app_user_id), "aggregate": {"count": "*"}}},
+    )
+    if not isinstance(rows, list) or not rows:
+        return 0
+    return int(rows[0].get("count") or 0)
+
+
+async def get_unread_count(app_user_id: str) -> int:
+    """The user's unread count: the Redis counter, rebuilt from Directus on a miss."""
+    key = unread_key(app_user_id)
+    client = None
+    try:
+        client = await get_redis_client()
+        cached = await client.get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("unread counter read failed: %s", exc)
+        client = None
+
+    count = await count_unread_in_directus(app_user_id)
+    if client is not None:
+        try:
+            # NX: a concurrent rebuild already stored the same number.
+            await client.set(key, count, ex=UNREAD_TTL_SECONDS, nx=True)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("unread counter rebuild store failed: %s", exc)
+    return count
+
+
+@asynccontextmanager
+async def subscribe_badge(app_user_id: str) -> AsyncIterator[PubSub]:
+    client = await get_redis_client()
+    channel = badge_channel(app_user_id)
+    pubsub = client.pubsub()
+    await pubsub.subscribe(channel)
+    try:
+        yield pubsub
+    finally:
+        try:
+            await pubsub.unsubscribe(channel)
+        finally:
+            await pubsub.aclose()
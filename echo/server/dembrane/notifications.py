@@ -4,7 +4,9 @@ One flat `notification` table, one row per `(event, recipient)`. The
 announcement-pattern split (parent + translations + activity) was
 rejected here because fan-out in this product is almost always 1–3
 people — shared-parent dedup buys less than the JOIN cost on every
-inbox read.
+inbox read. The larger audiences (all staff, a big organisation's
+admins) go through `emit_to_audience`, which writes their rows in
+batches.
 
 ### Channels
 
@@ -13,6 +15,7 @@ rows rather than having their own pipeline:
 
     emit(...) → notification row (one per recipient)
         └── inbox UI reads via /v2/me/notifications
+        └── unread badge counter + push (notification_badge)
         └── (future) digest worker groups by user + sends SendGrid
         └── (future) Slack bridge fans out urgent/mentioned rows
 
@@ -22,14 +25,24 @@ user channel preferences live in the delivery layer, not here.
 
 from __future__ import annotations
 
+import uuid
 from typing import Any, Literal, Optional
 from logging import getLogger
 
 from dembrane.utils import generate_uuid
 from dembrane.directus_async import async_directus
+from dembrane.notification_badge import aadjust_unread, aadjust_unread_many
 
 logger = getLogger("dembrane.notifications")
 
+# Audiences larger than this are written by a worker, not in the request.
+FANOUT_INLINE_MAX = 50
+# Rows per batched insert.
+FANOUT_BATCH_SIZE = 100
+
+# uuid5 namespace for idempotent row ids (see notification_id_for).
+_IDEMPOTENCY_NAMESPACE = uuid.UUID("6f1d7c52-3b0e-4a8e-9a55-2c1e0b7d4f31")
+
 
 NotificationAction = Literal[
     "NONE",
@@ -143,6 +156,62 @@ async def _compute_scope(
     return " \u203a ".join(parts)
 
 
+async def _notification_fields(
+    *,
+    event_code: str,
+    title: str,
+    message: Optional[str] = None,
+    action: NotificationAction = "NONE",
+    severity: Optional[NotificationSeverity] = None,
+    actor_user_id: Optional[str] = None,
+    ref_org_id: Optional[str] = None,
+    ref_workspace_id: Optional[str] = None,
+    ref_project_id: Optional[str] = None,
+    ref_chat_id: Optional[str] = None,
+    ref_report_id: Optional[str] = None,
+    ref_conversation_id: Optional[str] = None,
+    ref_invite_id: Optional[str] = None,
+    params: Optional[dict[str, Any]] = None,
+    scope: Optional[str] = None,
+    expires_at: Optional[str] = None,
+    level: Optional[str] = None,
+) -> dict[str, Any]:
+    """Row fields shared by every recipient of one emission (everything but
+    `id` and `audience_user_id`). Resolves severity and scope."""
+    resolved_severity: NotificationSeverity = severity or severity_for(event_code)
+    # Silently accept `level=` from legacy callers.
+    if level and not severity:
+        # Old "urgent" maps onto action_required in the new spec.
+        resolved_severity = "action_required" if level == "urgent" else "info"
+
+    resolved_scope = scope
+    if resolved_scope is None:
+        resolved_scope = await _compute_scope(
+            ref_org_id=ref_org_id,
+            ref_workspace_id=ref_workspace_id,
+            ref_project_id=ref_project_id,
+        )
+
+    return {
+        "actor_user_id": actor_user_id,
+        "event_code": event_code,
+        "severity": resolved_severity,
+        "action": action,
+        "title": title,
+        "message": message,
+        "scope": resolved_scope,
+        "params": params,
+        "ref_org_id": ref_org_id,
+        "ref_workspace_id": ref_workspace_id,
+        "ref_project_id": ref_project_id,
+        "ref_chat_id": ref_chat_id,
+        "ref_report_id": ref_report_id,
+        "ref_conversation_id": ref_conversation_id,
+        "ref_invite_id": ref_invite_id,
+        "expires_at": expires_at,
+    }
+
+
 async def emit(
     *,
     audience_user_id: str,
@@ -178,44 +247,31 @@ async def emit(
     `params` is forward-compat metadata for client-rendered i18n.
     """
     try:
-        resolved_severity: NotificationSeverity = severity or severity_for(event_code)
-        # Silently accept `level=` from legacy callers.
-        if level and not severity:
-            # Old "urgent" maps onto action_required in the new spec.
-            resolved_severity = "action_required" if level == "urgent" else "info"
-
-        resolved_scope = scope
-        if resolved_scope is None:
-            resolved_scope = await _compute_scope(
-                ref_org_id=ref_org_id,
-                ref_workspace_id=ref_workspace_id,
-                ref_project_id=ref_project_id,
-            )
-
+        fields = await _notification_fields(
+            event_code=event_code,
+            title=title,
+            message=message,
+            action=action,
+            severity=severity,
+            actor_user_id=actor_user_id,
+            ref_org_id=ref_org_id,
+            ref_workspace_id=ref_workspace_id,
+            ref_project_id=ref_project_id,
+            ref_chat_id=ref_chat_id,
+            ref_report_id=ref_report_id,
+            ref_conversation_id=ref_conversation_id,
+            ref_invite_id=ref_invite_id,
+            params=params,
+            scope=scope,
+            expires_at=expires_at,
+            level=level,
+        )
         notification_id = generate_uuid()
         await async_directus.create_item(
             "notification",
-            {
-                "id": notification_id,
-                "audience_user_id": audience_user_id,
-                "actor_user_id": actor_user_id,
-                "event_code": event_code,
-                "severity": resolved_severity,
-                "action": action,
-                "title": title,
-                "message": message,
-                "scope": resolved_scope,
-                "params": params,
-                "ref_org_id": ref_org_id,
-                "ref_workspace_id": ref_workspace_id,
-                "ref_project_id": ref_project_id,
-                "ref_chat_id": ref_chat_id,
-                "ref_report_id": ref_report_id,
-                "ref_conversation_id": ref_conversation_id,
-                "ref_invite_id": ref_invite_id,
-                "expires_at": expires_at,
-            },
+            {"id": notification_id, "audience_user_id": audience_user_id, **fields},
         )
+        await aadjust_unread(audience_user_id, 1)
         return notification_id
     except Exception as exc:  # noqa: BLE001 — notifications must never raise
         # audience_user_id omitted: CodeQL flags it as sensitive.
@@ -227,6 +283,61 @@ async def emit(
         return None
 
 
+def notification_id_for(idempotency_key: str, audience_user_id: str) -> str:
+    """Row id for one recipient of a keyed emission. The same key and
+    recipient always give the same id, so the primary key dedupes retries."""
+    return str(uuid.uuid5(_IDEMPOTENCY_NAMESPACE, f"{idempotency_key}:{audience_user_id}"))
+
+
+async def write_notification_rows(
+    rows: list[dict[str, Any]],
+    *,
+    skip_existing: bool = False,
+) -> list[str]:
+    """Insert prepared notification rows, `FANOUT_BATCH_SIZE` per request,
+    and bump each recipient's unread counter. Returns the ids written.
+
+    With `skip_existing`, ids already in Directus are left out first (rows
+    with deterministic ids from a retry). A batch that fails as a whole —
+    e.g. a concurrent retry inserted one of its ids in between — is retried
+    row by row so the rest still land. Only the existence lookup raises.
+    """
+    written: list[dict[str, Any]] = []
+    for i in range(0, len(rows), FANOUT_BATCH_SIZE):
+        batch = rows[i : i + FANOUT_BATCH_SIZE]
+        if skip_existing:
+            existing = await async_directus.get_items(
+                "notification",
+                {
+                    "query": {
+                        "filter": {"id": {"_in": [row["id"] for row in batch]}},
+                        "fields": ["id"],
+                        "limit": -1,
+                    }
+                },
+            )
+            seen = {row["id"] for row in existing or [] if isinstance(row, dict)}
+            batch = [row for row in batch if row["id"] not in seen]
+        if not batch:
+            continue
+        try:
+            await async_directus.create_item("notification", batch)
+            written.extend(batch)
+            continue
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("batched notification insert failed, inserting one by one: %s", exc)
+        for row in batch:
+            try:
+                await async_directus.create_item("notification", row)
+                written.append(row)
+            except Exception as exc:  # noqa: BLE001 — notifications must never raise
+                logger.warning(
+                    "emit notification failed (event=%s): %s", row.get("event_code"), exc
+                )
+    await aadjust_unread_many([row["audience_user_id"] for row in written])
+    return [row["id"] for row in written]
+
+
 # ── Audience derivation helpers ─────────────────────────────────────────
 
 
@@ -367,22 +478,69 @@ async def audience_billing_account_admins(account: dict) -> list[str]:
 
 async def emit_to_audience(
     audience_user_ids: list[str],
+    idempotency_key: Optional[str] = None,
     **emit_kwargs: Any,
 ) -> list[str]:
     """Fan out the same notification to every user in `audience_user_ids`.
 
     Skips the actor to avoid "you accepted your own invite" self-notifs
-    when `actor_user_id` is in the audience list.
+    when `actor_user_id` is in the audience list, and duplicate ids.
+
+    Scope and severity are resolved once for the whole audience and the
+    rows go out in batched inserts. Audiences over `FANOUT_INLINE_MAX` are
+    queued to `task_emit_notifications` instead, so the parent request
+    doesn't wait on them.
+
+    `idempotency_key` names the parent action (e.g. "WORKSPACE_CREATED:<id>").
+    With it, row ids are derived per recipient, and a retried action skips
+    recipients it already notified instead of notifying them twice.
+
+    Returns the ids written (or queued). Never raises.
     """
     actor = emit_kwargs.get("actor_user_id")
-    created: list[str] = []
-    for uid in audience_user_ids:
-        if actor and uid == actor:
-            continue
-        nid = await emit(audience_user_id=uid, **emit_kwargs)
-        if nid:
-            created.append(nid)
-    return created
+    recipients = [
+        uid for uid in dict.fromkeys(audience_user_ids) if uid and not (actor and uid == actor)
+    ]
+    if not recipients:
+        return []
+
+    try:
+        fields = await _notification_fields(**emit_kwargs)
+        rows = [
+            {
+                "id": (
+                    notification_id_for(idempotency_key, uid)
+                    if idempotency_key
+                    else generate_uuid()
+                ),
+                "audience_user_id": uid,
+                **fields,
+            }
+            for uid in recipients
+        ]
+        if len(rows) > FANOUT_INLINE_MAX and _enqueue_fanout(rows):
+            return [row["id"] for row in rows]
+        return await write_notification_rows(rows, skip_existing=bool(idempotency_key))
+    except Exception as exc:  # noqa: BLE001 — notifications must never raise
+        logger.warning(
+            "emit_to_audience failed (event=%s): %s",
+            emit_kwargs.get("event_code"),
+            exc,
+        )
+        return []
+
+
+def _enqueue_fanout(rows: list[dict[str, Any]]) -> bool:
+    """Hand a large fan-out to the worker. False (write inline) if the broker
+    is unavailable."""
+    try:
+        from dembrane.tasks import task_emit_notifications
+
+        task_emit_notifications.send(rows)
+        return True
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("notification fan-out enqueue failed, writing inline: %s", exc)
+        return False
 
 
 # ── Sync bridge for Dramatiq actors ──────────────────────────────────────
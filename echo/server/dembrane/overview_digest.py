@@ -0,0 +1,371 @@
+"""Per-project overview digest: the ready-made context for overview-mode chat.
+
+Overview chat used to assemble its context inside the request: fetch every
+project conversation twice, summarize any stragglers in batches of five
+(each batch waiting on its slowest call), then token-count and pack
+summaries until 70% of the context window. A project with a few unsummarized
+conversations made the first message wait minutes.
+
+The digest is now kept up to date in the background instead:
+
+- `request_overview_refresh` is called whenever a conversation is summarized
+  (and by overview chat when the digest is missing or old). It debounces via
+  a pending marker and enqueues `task_refresh_overview_digest`.
+- `refresh_overview_digest` re-reads the project's summaries, counts tokens
+  only for conversations whose ``updated_at`` changed since the last digest,
+  and packs them: the newest summaries verbatim up to RECENT_SHARE of the
+  budget, older ones rolled up in groups of ROLLUP_GROUP_SIZE into one LLM
+  summary per group, and groups of rollups rolled up again if they still
+  don't fit. Groups are cut oldest-first, so a new conversation only ever
+  changes the newest group; every other rollup is reused by member key.
+  Conversations that have chunks but no summary yet are queued for
+  summarization, never waited on.
+- Each rebuild bumps ``overview:digest:v1:{project_id}:version``;
+  `aload_overview_digest` returns the packed context and that version.
+
+The digest is best-effort: without it overview chat packs the summaries that
+exist, still without summarizing inline.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+import hashlib
+from typing import Any, Dict, List, Callable, Optional
+from logging import getLogger
+from datetime import datetime, timezone
+
+from dembrane.redis_async import get_redis_client
+from dembrane.coordination import get_shared_sync_redis
+
+logger = getLogger("dembrane.overview_digest")
+
+RECENT_SHARE = 0.75
+ROLLUP_GROUP_SIZE = 20
+MAX_ROLLUP_LEVELS = 3
+MAX_STRAGGLERS_PER_REFRESH = 50
+REFRESH_DEBOUNCE_SECONDS = 10
+DIGEST_MAX_AGE_SECONDS = 15 * 60
+DIGEST_TTL_SECONDS = 14 * 24 * 60 * 60
+
+_KEY_PREFIX = "overview:digest:v1"
+
+
+def _key(project_id: str, suffix: str = "") -> str:
+    return f"{_KEY_PREFIX}:{project_id}{':' + suffix if suffix else ''}"
+
+
+def _decode(raw: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    if raw is None:
+        return None
+    return json.loads(zlib.decompress(raw))
+
+
+def _encode(digest: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(digest, default=str).encode(), 6)
+
+
+def _member_key(entries: List[Dict[str, Any]]) -> str:
+    joined = "|".join(f"{entry['id']}:{entry.get('updated_at')}" for entry in entries)
+    return hashlib.sha256(joined.encode()).hexdigest()[:32]
+
+
+def _context_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": entry.get("name"),
+        "tags": entry.get("tags", ""),
+        "created_at": entry.get("created_at"),
+        "duration": entry.get("duration"),
+        "summary": entry["summary"],
+        "artifacts": [],
+    }
+
+
+def pack_overview(
+    leaves: List[Dict[str, Any]],
+    budget: int,
+    previous_rollups: Dict[str, Dict[str, Any]],
+    summarize_group: Callable[[List[Dict[str, Any]]], Optional[str]],
+    count_tokens: Callable[[str], int],
+) -> tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]], int]:
+    """Pack leaf summaries (newest first) into at most `budget` tokens.
+
+    Returns (context entries, rollups by member key, total tokens).
+    `summarize_group` is only called for groups not in `previous_rollups`.
+    """
+    total = sum(leaf["tokens"] for leaf in leaves)
+    if total <= budget:
+        return [_context_entry(leaf) for leaf in leaves], {}, total
+
+    recent: List[Dict[str, Any]] = []
+    recent_tokens = 0
+    for leaf in leaves:
+        if recent_tokens + leaf["tokens"] > budget * RECENT_SHARE:
+            break
+        recent.append(leaf)
+        recent_tokens += leaf["tokens"]
+
+    rollups: Dict[str, Dict[str, Any]] = {}
+    level = list(reversed(leaves[len(recent) :]))  # oldest first
+    remaining = budget - recent_tokens
+    for depth in range(1, MAX_ROLLUP_LEVELS + 1):
+        grouped: List[Dict[str, Any]] = []
+        for start in range(0, len(level), ROLLUP_GROUP_SIZE):
+            members = level[start : start + ROLLUP_GROUP_SIZE]
+            key = _member_key(members)
+            rollup = previous_rollups.get(key)
+            if rollup is None:
+                text = summarize_group(members)
+                if not text:
+                    # Keep the members instead of dropping the group: they
+                    # go up a level as they are, and the final pass packs as
+                    # many as the budget allows.
+                    grouped.extend(members)
+                    continue
+                count = sum(int(member.get("count", 1)) for member in members)
+                first = members[0].get("first_created_at", members[0].get("created_at"))
+                last = members[-1].get("last_created_at", members[-1].get("created_at"))
+                rollup = {
+                    "id": f"rollup:{key}",
+                    "updated_at": key,
+                    "name": f"{count} earlier conversations",
+                    "created_at": f"{first} - {last}",
+                    "first_created_at": first,
+                    "last_created_at": last,
+                    "duration": sum(float(member.get("duration") or 0) for member in members),
+                    "count": count,
+                    "summary": text,
+                    "tokens": count_tokens(text),
+                }
+            rollups[key] = rollup
+            grouped.append(rollup)
+        level = grouped
+        if sum(entry["tokens"] for entry in level) <= remaining or len(level) <= 1:
+            break
+        logger.info("Overview rollup level %s still over budget; rolling up again", depth)
+
+    context = [_context_entry(leaf) for leaf in recent]
+    used = recent_tokens
+    for rollup in reversed(level):  # newest group first, like the leaves
+        if used + rollup["tokens"] > budget:
+            break
+        context.append(_context_entry(rollup))
+        used += rollup["tokens"]
+    return context, rollups, used
+
+
+def _tag_text(conversation: Dict[str, Any]) -> str:
+    texts = []
+    for tag_entry in conversation.get("tags") or []:
+        project_tag = tag_entry.get("project_tag_id") if isinstance(tag_entry, dict) else None
+        if isinstance(project_tag, dict) and project_tag.get("text"):
+            texts.append(str(project_tag["text"]))
+    return ", ".join(texts)
+
+
+def _default_budget() -> int:
+    from dembrane.chat_utils import MAX_CHAT_CONTEXT_LENGTH
+
+    return int(MAX_CHAT_CONTEXT_LENGTH * 0.7)  # Reserve 30% for messages
+
+
+def _default_count_tokens(text: str) -> int:
+    from litellm.utils import token_counter
+
+    from dembrane.llms import MODELS, get_completion_kwargs
+
+    try:
+        return token_counter(
+            messages=[{"role": "user", "content": text}],
+            model=get_completion_kwargs(MODELS.MULTI_MODAL_PRO)["model"],
+        )
+    except Exception:
+        return len(text) // 4  # Rough estimate
+
+
+def _default_summarize_group(language: str) -> Callable[[List[Dict[str, Any]]], Optional[str]]:
+    from dembrane.llms import MODELS, router_completion
+    from dembrane.prompts import render_prompt
+
+    def _summarize(members: List[Dict[str, Any]]) -> Optional[str]:
+        prompt = render_prompt(
+            "summarize_conversation_group",
+            language,
+            {"conversations": members, "language": language},
+        )
+        try:
+            response = router_completion(
+                MODELS.MULTI_MODAL_FAST,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return (response.choices[0].message.content or "").strip() or None
+        except Exception as exc:
+            logger.warning("Overview rollup of %s summaries failed: %s", len(members), exc)
+            return None
+
+    return _summarize
+
+
+def _fetch_project(project_id: str) -> tuple[str, List[Dict[str, Any]]]:
+    from dembrane.directus import directus
+
+    projects = directus.get_items(
+        "project",
+        {"query": {"filter": {"id": {"_eq": project_id}}, "fields": ["language"], "limit": 1}},
+    )
+    language = (projects[0].get("language") if projects else None) or "en"
+    conversations = directus.get_items(
+        "conversation",
+        {
+            "query": {
+                "filter": {"project_id": {"_eq": project_id}, "deleted_at": {"_null": True}},
+                "fields": [
+                    "id",
+                    "participant_name",
+                    "summary",
+                    "created_at",
+                    "updated_at",
+                    "duration",
+                    "count(chunks)",
+                    "tags.project_tag_id.text",
+                ],
+                "sort": "-created_at",
+                "limit": 1000,
+            },
+        },
+    )
+    return language, conversations or []
+
+
+def _queue_stragglers(conversation_ids: List[str]) -> None:
+    if not conversation_ids:
+        return
+    from dembrane.tasks import task_summarize_conversation
+
+    for conversation_id in conversation_ids[:MAX_STRAGGLERS_PER_REFRESH]:
+        task_summarize_conversation.send(conversation_id)
+    logger.info("Queued %s unsummarized conversations for summary", len(conversation_ids))
+
+
+def refresh_overview_digest(
+    project_id: str,
+    *,
+    budget: Optional[int] = None,
+    summarize_group: Optional[Callable[[List[Dict[str, Any]]], Optional[str]]] = None,
+    count_tokens: Optional[Callable[[str], int]] = None,
+) -> Dict[str, Any]:
+    """Rebuild the project's digest, reusing token counts and rollups from the
+    previous one wherever their inputs are unchanged."""
+    client = get_shared_sync_redis(decode_responses=False)
+    client.delete(_key(project_id, "pending"))
+    previous = _decode(client.get(_key(project_id))) or {}
+    previous_leaves = {leaf["id"]: leaf for leaf in previous.get("leaves", [])}
+
+    language, conversations = _fetch_project(project_id)
+    count_tokens = count_tokens or _default_count_tokens
+
+    leaves: List[Dict[str, Any]] = []
+    stragglers: List[str] = []
+    for conversation in conversations:
+        summary = (conversation.get("summary") or "").strip()
+        if int(conversation.get("chunks_count") or 0) <= 0:
+            continue
+        if not summary:
+            stragglers.append(conversation["id"])
+            continue
+        leaf = {
+            "id": conversation["id"],
+            "updated_at": conversation.get("updated_at"),
+            "name": conversation.get("participant_name"),
+            "tags": _tag_text(conversation),
+            "created_at": conversation.get("created_at"),
+            "duration": conversation.get("duration"),
+            "summary": summary,
+        }
+        cached = previous_leaves.get(leaf["id"])
+        if cached is not None and cached.get("updated_at") == leaf["updated_at"]:
+            leaf["tokens"] = cached["tokens"]
+        else:
+            leaf["tokens"] = count_tokens(summary)
+        leaves.append(leaf)
+
+    context, rollups, total_tokens = pack_overview(
+        leaves,
+        budget if budget is not None else _default_budget(),
+        previous.get("rollups", {}),
+        summarize_group or _default_summarize_group(language),
+        count_tokens,
+    )
+    version = int(client.incr(_key(project_id, "version")))
+    client.expire(_key(project_id, "version"), DIGEST_TTL_SECONDS)
+    digest = {
+        "version": version,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "leaves": leaves,
+        "rollups": rollups,
+        "context": context,
+        "total_tokens": total_tokens,
+        "pending_conversation_ids": stragglers,
+    }
+    client.set(_key(project_id), _encode(digest), ex=DIGEST_TTL_SECONDS)
+    logger.info(
+        "Overview digest v%s for %s: %s summaries, %s rollups, %s tokens, %s pending",
+        version,
+        project_id,
+        len(leaves),
+        len(rollups),
+        total_tokens,
+        len(stragglers),
+    )
+
+    _queue_stragglers(stragglers)
+    return digest
+
+
+def request_overview_refresh(project_id: str) -> bool:
+    """Enqueue a digest rebuild unless one is already pending. Returns whether
+    a task was enqueued."""
+    try:
+        client = get_shared_sync_redis(decode_responses=False)
+        if not client.set(
+            _key(project_id, "pending"), b"1", nx=True, ex=REFRESH_DEBOUNCE_SECONDS * 30
+        ):
+            return False
+        from dembrane.tasks import task_refresh_overview_digest
+
+        task_refresh_overview_digest.send_with_options(
+            args=(project_id,), delay=REFRESH_DEBOUNCE_SECONDS * 1000
+        )
+        return True
+    except Exception as exc:
+        logger.warning("Could not request overview digest refresh for %s: %s", project_id, exc)
+        return False
+
+
+def _is_stale(digest: Dict[str, Any]) -> bool:
+    try:
+        built_at = datetime.fromisoformat(digest["built_at"])
+    except (KeyError, TypeError, ValueError):
+        return True
+    return (datetime.now(timezone.utc) - built_at).total_seconds() > DIGEST_MAX_AGE_SECONDS
+
+
+async def aload_overview_digest(project_id: str) -> Optional[Dict[str, Any]]:
+    """The project's digest (``context``, ``total_tokens``, ``version``...),
+    or None when there is none yet or Redis is unavailable."""
+    try:
+        client = await get_redis_client()
+        digest = _decode(await client.get(_key(project_id)))
+    except Exception as exc:
+        logger.warning("Overview digest unavailable for %s: %s", project_id, exc)
+        return None
+    if digest is not None:
+        digest["stale"] = _is_stale(digest)
+    return digest
+
+
+async def aget_overview_digest_version(project_id: str) -> Optional[int]:
+    client = await get_redis_client()
+    raw = await client.get(_key(project_id, "version"))
+    return int(raw) if raw is not None else None
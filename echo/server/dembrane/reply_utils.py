@@ -441,6 +441,7 @@ async def generate_reply_for_conversation(
                 {"role": "user", "content": message_content},
             ],
             stream=True,
+            priority="interactive",
             thinking={"type": "enabled", "budget_tokens": 2048},
         )
     except ContentPolicyViolationError as e:
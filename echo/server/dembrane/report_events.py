@@ -1,26 +1,47 @@
 """
-Redis pub/sub helpers for real-time report generation progress.
+Redis Streams log for real-time report generation progress.
 
-Follows the pattern from agentic_runtime.py (publish_live_event / subscribe_live_events / read_live_event).
+Progress used to go over plain pub/sub, so a client that reconnected (or
+subscribed a moment late) missed events and the UI stalled on a stale step.
+Events now land in one capped stream per report:
 
-- publish_report_progress: sync, for use in Dramatiq workers
-- subscribe_report_events: async context manager, for use in FastAPI SSE endpoints
-- read_report_event: async, reads a single event from pub/sub
+- ``report:{id}:progress:log`` — entry id assigned by Redis, field ``event``
+  holding ``{"type", "message", "detail"}`` as JSON. The entry id doubles as
+  the SSE event id, so a reconnect with ``Last-Event-ID`` resumes with a plain
+  XREAD past it, and a fresh client replays from the start.
+
+- publish_report_progress: sync, for use in Dramatiq workers (pooled client)
+- read_report_events: async, for use in FastAPI SSE endpoints
+- parse_report_event_id: validates a client-supplied Last-Event-ID
 """
 
+import re
 import json
-from typing import Optional
+from typing import Any, Optional
 from logging import getLogger
-from contextlib import asynccontextmanager
-from collections.abc import AsyncIterator
 
-from redis.asyncio.client import PubSub
+from dembrane.coordination import get_shared_sync_redis
 
 logger = getLogger("dembrane.report_events")
 
+# A report publishes a few events per phase plus one per summarised
+# conversation; the cap only bounds a runaway publisher.
+REPORT_STREAM_MAXLEN = 1000
+REPORT_STREAM_TTL_SECONDS = 24 * 60 * 60
+# XREAD id that replays a stream from its first entry.
+STREAM_START_ID = "0-0"
+
+_EVENT_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
+
+def _stream_key(report_id: int) -> str:
+    return f"report:{report_id}:progress:log"
 
-def _channel(report_id: int) -> str:
-    return f"report:{report_id}:progress"
+
+def _decode(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="ignore")
+    return str(value)
 
 
 def publish_report_progress(
@@ -28,61 +49,51 @@ def publish_report_progress(
     event_type: str,
     message: str,
     detail: Optional[dict] = None,
-) -> None:
+) -> str:
     """
-    Publish a progress event for a report (sync, for Dramatiq workers).
-    Uses _get_sync_redis_client from coordination.py.
+    Append a progress event to the report's stream (sync, for Dramatiq workers).
+    Returns the entry id.
     """
-    from dembrane.coordination import _get_sync_redis_client
-
-    payload = json.dumps({
-        "type": event_type,
-        "message": message,
-        "detail": detail,
-    })
-    client = _get_sync_redis_client()
-    try:
-        client.publish(_channel(report_id), payload)
-    finally:
-        client.close()
-
-
-@asynccontextmanager
-async def subscribe_report_events(report_id: int) -> AsyncIterator[PubSub]:
+    payload = json.dumps(
+        {
+            "type": event_type,
+            "message": message,
+            "detail": detail,
+        }
+    )
+    key = _stream_key(report_id)
+    pipe = get_shared_sync_redis().pipeline(transaction=False)
+    pipe.xadd(key, {"event": payload}, maxlen=REPORT_STREAM_MAXLEN, approximate=True)
+    pipe.expire(key, REPORT_STREAM_TTL_SECONDS)
+    entry_id, _ = pipe.execute()
+    return _decode(entry_id)
+
+
+def parse_report_event_id(value: Optional[str]) -> str:
+    """The stream id to resume after, or STREAM_START_ID for a missing or bogus id."""
+    value = (value or "").strip()
+    return value if _EVENT_ID_PATTERN.match(value) else STREAM_START_ID
+
+
+async def read_report_events(
+    report_id: int,
+    after_id: str = STREAM_START_ID,
+    block_ms: int = 1000,
+    count: int = 100,
+) -> list[tuple[str, str]]:
     """
-    Async context manager to subscribe to report progress events.
-    Uses get_redis_client from redis_async.py (for FastAPI context).
+    Events after `after_id` as (entry id, JSON payload) pairs, waiting up to
+    `block_ms` for the first one. Returns [] on timeout.
     """
     from dembrane.redis_async import get_redis_client
 
     client = await get_redis_client()
-    channel = _channel(report_id)
-    pubsub = client.pubsub()
-    await pubsub.subscribe(channel)
-    try:
-        yield pubsub
-    finally:
-        try:
-            await pubsub.unsubscribe(channel)
-        finally:
-            await pubsub.aclose()
-
-
-async def read_report_event(pubsub: PubSub, timeout_seconds: float = 1.0) -> Optional[str]:
-    """
-    Read a single event from the pub/sub channel.
-    Returns decoded JSON string or None on timeout.
-    """
-    message = await pubsub.get_message(
-        ignore_subscribe_messages=True,
-        timeout=timeout_seconds,
-    )
-    if not message:
-        return None
-
-    data = message.get("data")
-    if data is None:
-        return None
-    if isinstance(data, bytes):
-        return data.decode("utf-8", errors="ignore")
-    return str(data)
+    streams = await client.xread({_stream_key(report_id): after_id}, count=count, block=block_ms)
+
+    events: list[tuple[str, str]] = []
+    for _stream, entries in streams or []:
+        for entry_id, fields in entries:
+            raw = fields.get("event", fields.get(b"event"))
+            if raw is not None:
+                events.append((_decode(entry_id), _decode(raw)))
+    return events
@@ -19,7 +19,7 @@ from dembrane.prompts import render_prompt
 from dembrane.directus import DirectusGenericException, directus
 from dembrane.llm_router import get_min_context_length
 from dembrane.async_helpers import safe_gather, run_in_thread_pool
-from dembrane.summary_utils import safe_summarize_conversation
+from dembrane.summary_utils import SummarizationResult, ensure_conversation_summaries
 from dembrane.api.conversation import get_conversation_transcript
 from dembrane.api.dependency_auth import DirectusSession
 
@@ -72,22 +72,6 @@ async def _call_llm_for_report(prompt: str) -> str:
     return response.choices[0].message.content
 
 
-async def _safe_summarize_conversation(conversation_id: str) -> dict:
-    """
-    Safely summarize a single conversation, catching and logging errors.
-    Returns a dict with 'success' and optionally 'error' fields.
-
-    Note: This is a wrapper around the shared safe_summarize_conversation
-    from summary_utils to maintain backward compatibility with existing code.
-    """
-    result = await safe_summarize_conversation(conversation_id)
-    return {
-        "success": result.success,
-        "conversation_id": result.conversation_id,
-        **({"error": result.error} if result.error else {}),
-    }
-
-
 async def _safe_get_transcript(conversation_id: str) -> Optional[str]:
     """
     Safely get transcript for a conversation, returning None on error.
@@ -195,35 +179,23 @@ async def get_report_content_for_project(
             {"total": len(conversation_with_chunks)},
         )
 
-    # Batch summarization with fault tolerance
-    batch_size = 5
-    total_summary_failures = 0
-    summarized_count = 0
-
-    for i in range(0, len(conversation_with_chunks), batch_size):
-        batch = conversation_with_chunks[i : i + batch_size]
-        tasks = [_safe_summarize_conversation(conv["id"]) for conv in batch]
-
-        # Use return_exceptions=True to prevent one failure from canceling others
-        # Use safe_gather instead of asyncio.gather to avoid "Event loop is closed"
-        # errors under dramatiq-gevent greenlet interleaving
-        results = await safe_gather(*tasks, return_exceptions=True)
-
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Unexpected exception during batch summarization: {result}")
-                total_summary_failures += 1
-            elif isinstance(result, dict) and not result.get("success"):
-                total_summary_failures += 1
-
-        summarized_count = min(i + batch_size, len(conversation_with_chunks))
+    # Sliding-window summarization with fault tolerance: a slow conversation
+    # holds one slot, not a whole batch.
+    def _on_summary(_result: SummarizationResult, done: int, total: int) -> None:
         if progress_callback:
             progress_callback(
                 "summarizing",
-                f"Summarizing conversations ({summarized_count}/{len(conversation_with_chunks)})...",
-                {"current": summarized_count, "total": len(conversation_with_chunks)},
+                f"Summarizing conversations ({done}/{total})...",
+                {"current": done, "total": total},
             )
 
+    summary_result = await ensure_conversation_summaries(
+        [conv["id"] for conv in conversation_with_chunks],
+        skip_existing=False,
+        on_progress=_on_summary,
+    )
+    total_summary_failures = len(summary_result.failed)
+
     if total_summary_failures > 0:
         logger.warning(
             f"Failed to summarize {total_summary_failures}/{len(conversation_with_chunks)} conversations"
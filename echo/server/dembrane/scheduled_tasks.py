@@ -11,26 +11,46 @@ collection does, and it is Postgres-durable underneath.
 
 Lifecycle: scheduled -> processing -> completed | failed (+ cancelled = skip).
 
-Concurrency model (deliberate, not row-locking): the scheduler is a single
-process that dispatches ONE runner message per minute (coalesced), so in
-practice one runner claims at a time. We do NOT use SELECT ... FOR UPDATE
-SKIP LOCKED — that would mean introducing raw SQL into a backend that otherwise
-talks only to Directus. Instead, every handler is idempotent (revoke =
-soft-delete, report = status-guarded dispatch), so a rare double-claim is
-harmless. `claimed_at` exists only so a reconciler can rescue rows stranded in
-`processing` by a crashed runner.
-
-Enqueue from async API code with `schedule_task()`. The runner lives in
-tasks.py (`task_process_scheduled_tasks`) and uses the sync helpers here.
+Dispatch is driven by a Redis due index rather than a poll:
+
+- ``scheduled_task_due`` — sorted set, member = row id, score = scheduled_at
+  as epoch seconds. `schedule_task` / `enqueue_task_sync` add the row and
+  publish on ``scheduled_task_wake``.
+- `run_due_index_runner` (a thread in the scheduler process) sleeps until the
+  lowest score, or until a wake message says an earlier task arrived, then
+  pops every due member in one Lua call, claims those rows in Directus and
+  hands them to `task_run_scheduled_tasks`. The pop is atomic, so several
+  runners can coexist without taking the same id.
+- `rebuild_due_index` re-adds `scheduled` rows due within the next
+  REINDEX_HORIZON_SECONDS. The runner calls it on startup and the backstop
+  actor (`task_process_scheduled_tasks`, every few minutes) on each run, so
+  a lost index entry (Redis flush, failed write) delays a task, never drops
+  it. The backstop also claims rows more than OVERDUE_GRACE_SECONDS late
+  directly, in case no runner is up.
+
+Concurrency model (deliberate, not row-locking): we do NOT use SELECT ... FOR
+UPDATE SKIP LOCKED — that would mean introducing raw SQL into a backend that
+otherwise talks only to Directus. A claim only takes rows still `scheduled`,
+and every handler is idempotent (revoke = soft-delete, report = status-guarded
+dispatch), so the rare double-claim (backstop and runner racing on one
+overdue row) is harmless. `claimed_at` exists only so a reconciler can rescue
+rows stranded in `processing` by a crashed runner.
+
+Enqueue from async API code with `schedule_task()`. The dispatching actors
+live in tasks.py and use the sync helpers here.
 """
 
 from __future__ import annotations
 
-from typing import Any, Optional
+import time
+import threading
+from typing import Any, Callable, Optional
 from logging import getLogger
 from datetime import datetime, timezone, timedelta
 
 from dembrane.utils import generate_uuid
+from dembrane.redis_async import get_redis_client
+from dembrane.coordination import get_shared_sync_redis
 from dembrane.directus_async import async_directus
 
 logger = getLogger("dembrane.scheduled_tasks")
@@ -59,11 +79,149 @@ COLLECTION = "scheduled_task"
 
 _RUNNER_FIELDS = ["id", "task_type", "payload", "attempts", "scheduled_at", "status"]
 
+DUE_INDEX_KEY = "scheduled_task_due"
+WAKE_CHANNEL = "scheduled_task_wake"
+
+# Bound one pop; the runner pops again straight away if more are due.
+_POP_BATCH_SIZE = 50
+# The runner re-checks the index at least this often, wake or no wake.
+RUNNER_IDLE_SECONDS = 30.0
+# Pause before restarting the runner loop after a Redis/Directus error.
+RUNNER_RETRY_SECONDS = 5.0
+# rebuild_due_index looks this far ahead; later rows are indexed when they
+# come within range (or were indexed at enqueue).
+REINDEX_HORIZON_SECONDS = 60 * 60
+# The backstop claims rows this late itself: the runner should have had them.
+OVERDUE_GRACE_SECONDS = 2 * 60
+
+# KEYS[1] = due index; ARGV[1] = now (epoch seconds), ARGV[2] = max members
+_POP_DUE_SCRIPT = """
+local due = redis.call("zrangebyscore", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+if #due > 0 then
+    redis.call("zrem", KEYS[1], unpack(due))
+end
+return due
+"""
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _epoch(scheduled_at_iso: str) -> float:
+    parsed = datetime.fromisoformat(scheduled_at_iso.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+# ── due index (Redis) ───────────────────────────────────────────────────────
+
+
+def index_task(task_id: str, scheduled_at_iso: str) -> None:
+    """Add a row to the due index and wake the runner. Best-effort: a miss is
+    picked up by rebuild_due_index."""
+    try:
+        pipe = get_shared_sync_redis().pipeline(transaction=False)
+        pipe.zadd(DUE_INDEX_KEY, {task_id: _epoch(scheduled_at_iso)})
+        pipe.publish(WAKE_CHANNEL, task_id)
+        pipe.execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("due index add failed for scheduled_task %s: %s", task_id, exc)
+
+
+def unindex_tasks(task_ids: list[str]) -> None:
+    """Drop rows from the due index. Best-effort: the claim skips rows that
+    are no longer `scheduled` anyway."""
+    if not task_ids:
+        return
+    try:
+        get_shared_sync_redis().zrem(DUE_INDEX_KEY, *task_ids)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("due index remove failed: %s", exc)
+
+
+async def _index_task_async(task_id: str, scheduled_at_iso: str) -> None:
+    """index_task for async API code, on the shared async client."""
+    try:
+        client = await get_redis_client()
+        pipe = client.pipeline(transaction=False)
+        pipe.zadd(DUE_INDEX_KEY, {task_id: _epoch(scheduled_at_iso)})
+        pipe.publish(WAKE_CHANNEL, task_id)
+        await pipe.execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("due index add failed for scheduled_task %s: %s", task_id, exc)
+
+
+async def _unindex_tasks_async(task_ids: list[str]) -> None:
+    """unindex_tasks for async API code, on the shared async client."""
+    if not task_ids:
+        return
+    try:
+        client = await get_redis_client()
+        await client.zrem(DUE_INDEX_KEY, *task_ids)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("due index remove failed: %s", exc)
+
+
+def pop_due_task_ids(
+    redis_client: Any, *, now: Optional[float] = None, limit: int = _POP_BATCH_SIZE
+) -> list[str]:
+    """Atomically remove and return ids whose scheduled time has passed."""
+    due = redis_client.eval(
+        _POP_DUE_SCRIPT,
+        1,
+        DUE_INDEX_KEY,
+        repr(now if now is not None else time.time()),
+        limit,
+    )
+    return [str(member) for member in due or []]
+
+
+def seconds_until_next_due(redis_client: Any, *, now: Optional[float] = None) -> float:
+    """How long the runner may sleep: until the lowest score, capped at
+    RUNNER_IDLE_SECONDS."""
+    head = redis_client.zrange(DUE_INDEX_KEY, 0, 0, withscores=True)
+    if not head:
+        return RUNNER_IDLE_SECONDS
+    wait = float(head[0][1]) - (now if now is not None else time.time())
+    return min(max(wait, 0.0), RUNNER_IDLE_SECONDS)
+
+
+def rebuild_due_index(
+    client: Any,
+    redis_client: Optional[Any] = None,
+    horizon_seconds: int = REINDEX_HORIZON_SECONDS,
+) -> int:
+    """Index every `scheduled` row due within `horizon_seconds` (overdue rows
+    included). Returns the number of rows written to the index."""
+    horizon = (datetime.now(timezone.utc) + timedelta(seconds=horizon_seconds)).isoformat()
+    rows = client.get_items(
+        COLLECTION,
+        {
+            "query": {
+                "filter": {
+                    "status": {"_eq": STATUS_SCHEDULED},
+                    "scheduled_at": {"_lte": horizon},
+                },
+                "fields": ["id", "scheduled_at"],
+                "limit": -1,
+            }
+        },
+    )
+    if not isinstance(rows, list) or not rows:
+        return 0
+    mapping = {
+        str(row["id"]): _epoch(row["scheduled_at"]) for row in rows if row.get("scheduled_at")
+    }
+    if not mapping:
+        return 0
+    redis_client = redis_client or get_shared_sync_redis()
+    redis_client.zadd(DUE_INDEX_KEY, mapping)
+    redis_client.publish(WAKE_CHANNEL, "rebuild")
+    return len(mapping)
+
+
 async def schedule_task(
     *,
     task_type: str,
@@ -89,6 +247,7 @@ async def schedule_task(
             "updated_at": now_iso,
         },
     )
+    await _index_task_async(task_id, scheduled_at.isoformat())
     logger.info(
         "enqueued scheduled_task %s type=%s at=%s",
         task_id,
@@ -126,16 +285,17 @@ async def cancel_pending_tasks(
     )
     if not isinstance(rows, list):
         return 0
-    cancelled = 0
-    for row in rows:
-        payload = row.get("payload") or {}
-        if all(payload.get(k) == v for k, v in payload_match.items()):
-            await async_directus.update_item(
-                COLLECTION,
-                str(row["id"]),
-                {"status": STATUS_CANCELLED, "updated_at": _now_iso()},
-            )
-            cancelled += 1
+    matching = [
+        str(row["id"])
+        for row in rows
+        if all((row.get("payload") or {}).get(k) == v for k, v in payload_match.items())
+    ]
+    if matching:
+        await async_directus.update_many(
+            COLLECTION, matching, {"status": STATUS_CANCELLED, "updated_at": _now_iso()}
+        )
+        await _unindex_tasks_async(matching)
+    cancelled = len(matching)
     if cancelled:
         logger.info(
             "cancelled %d scheduled_task(s) type=%s match=%s",
@@ -171,6 +331,7 @@ def enqueue_task_sync(
             "updated_at": now_iso,
         },
     )
+    index_task(task_id, scheduled_at_iso)
     return task_id
 
 
@@ -199,32 +360,57 @@ def reconcile_stale_claims(client: Any, stale_seconds: int = STALE_CLAIM_SECONDS
     )
     if not isinstance(rows, list) or not rows:
         return 0
+    ids = [str(row["id"]) for row in rows]
+    try:
+        client.update_many(
+            COLLECTION,
+            ids,
+            {"status": STATUS_SCHEDULED, "claimed_at": None, "updated_at": _now_iso()},
+        )
+    except Exception:
+        logger.exception("failed to reset %d stale scheduled_task(s)", len(ids))
+        return 0
+    return len(ids)
+
+
+def _claim_rows(client: Any, rows: list[dict]) -> list[dict]:
+    """Flip `rows` to `processing`. Returns the rows claimed, in order."""
     now_iso = _now_iso()
-    reset = 0
+    # One batch PATCH per distinct attempts value (usually just 0).
+    by_attempts: dict[int, list[dict]] = {}
     for row in rows:
+        by_attempts.setdefault(row.get("attempts") or 0, []).append(row)
+    claimed_ids: set[str] = set()
+    for attempts, group in by_attempts.items():
+        ids = [str(row["id"]) for row in group]
         try:
-            client.update_item(
+            client.update_many(
                 COLLECTION,
-                str(row["id"]),
-                {"status": STATUS_SCHEDULED, "claimed_at": None, "updated_at": now_iso},
+                ids,
+                {
+                    "status": STATUS_PROCESSING,
+                    "claimed_at": now_iso,
+                    "attempts": attempts + 1,
+                    "updated_at": now_iso,
+                },
             )
-            reset += 1
+            claimed_ids.update(ids)
         except Exception:
-            logger.exception("failed to reset stale scheduled_task %s", row.get("id"))
-    return reset
+            logger.exception("failed to claim scheduled_task(s) %s", ids)
+    return [row for row in rows if str(row["id"]) in claimed_ids]
 
 
-def claim_due_tasks(client: Any, limit: int = 50) -> list[dict]:
-    """Find due rows (status=scheduled, scheduled_at<=now) and claim each by
-    flipping it to `processing`. Returns the claimed rows (oldest-due first)."""
-    now_iso = _now_iso()
+def claim_due_tasks(client: Any, limit: int = 50, due_before: Optional[str] = None) -> list[dict]:
+    """Find due rows (status=scheduled, scheduled_at<=`due_before`, default
+    now) and claim each by flipping it to `processing`. Returns the claimed
+    rows (oldest-due first)."""
     rows = client.get_items(
         COLLECTION,
         {
             "query": {
                 "filter": {
                     "status": {"_eq": STATUS_SCHEDULED},
-                    "scheduled_at": {"_lte": now_iso},
+                    "scheduled_at": {"_lte": due_before or _now_iso()},
                 },
                 "fields": _RUNNER_FIELDS,
                 "sort": ["scheduled_at"],
@@ -234,23 +420,31 @@ def claim_due_tasks(client: Any, limit: int = 50) -> list[dict]:
     )
     if not isinstance(rows, list) or not rows:
         return []
-    claimed: list[dict] = []
-    for row in rows:
-        try:
-            client.update_item(
-                COLLECTION,
-                str(row["id"]),
-                {
-                    "status": STATUS_PROCESSING,
-                    "claimed_at": now_iso,
-                    "attempts": (row.get("attempts") or 0) + 1,
-                    "updated_at": now_iso,
+    return _claim_rows(client, rows)
+
+
+def claim_tasks_by_id(client: Any, task_ids: list[str]) -> list[dict]:
+    """Claim the listed rows that are still `scheduled` (popped off the due
+    index). Cancelled or already-claimed rows are skipped."""
+    if not task_ids:
+        return []
+    rows = client.get_items(
+        COLLECTION,
+        {
+            "query": {
+                "filter": {
+                    "id": {"_in": task_ids},
+                    "status": {"_eq": STATUS_SCHEDULED},
                 },
-            )
-            claimed.append(row)
-        except Exception:
-            logger.exception("failed to claim scheduled_task %s", row.get("id"))
-    return claimed
+                "fields": _RUNNER_FIELDS,
+                "sort": ["scheduled_at"],
+                "limit": -1,
+            }
+        },
+    )
+    if not isinstance(rows, list) or not rows:
+        return []
+    return _claim_rows(client, rows)
 
 
 def mark_task_completed(client: Any, task_id: str) -> None:
@@ -267,3 +461,49 @@ def mark_task_failed(client: Any, task_id: str, error: str) -> None:
         str(task_id),
         {"status": STATUS_FAILED, "error": error[:5000], "updated_at": _now_iso()},
     )
+
+
+# ── due-index runner (scheduler process) ────────────────────────────────────
+
+
+def run_due_index_runner(
+    dispatch: Callable[[list[dict]], Any],
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Claim indexed tasks the moment they fall due and pass them to
+    `dispatch` (`task_run_scheduled_tasks.send` in production). Runs until
+    `stop` is set; errors restart the loop after RUNNER_RETRY_SECONDS."""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        try:
+            _run_due_index_loop(dispatch, stop)
+        except Exception:
+            logger.exception("scheduled_task due runner failed, restarting")
+            stop.wait(RUNNER_RETRY_SECONDS)
+
+
+def _run_due_index_loop(dispatch: Callable[[list[dict]], Any], stop: threading.Event) -> None:
+    from dembrane.directus import directus_client_context
+
+    redis_client = get_shared_sync_redis()
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(WAKE_CHANNEL)
+        with directus_client_context() as client:
+            indexed = rebuild_due_index(client, redis_client)
+        logger.info("scheduled_task due runner started (%d indexed)", indexed)
+        while not stop.is_set():
+            due_ids = pop_due_task_ids(redis_client)
+            if due_ids:
+                with directus_client_context() as client:
+                    rows = claim_tasks_by_id(client, due_ids)
+                if rows:
+                    logger.info("dispatching %d due scheduled_task(s)", len(rows))
+                    dispatch(rows)
+                continue
+            pubsub.get_message(timeout=seconds_until_next_due(redis_client))
+            # A burst of enqueues is one re-check.
+            while pubsub.get_message(timeout=0) is not None:
+                pass
+    finally:
+        pubsub.close()
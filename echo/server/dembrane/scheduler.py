@@ -1,3 +1,4 @@
+import threading
 from logging import getLogger
 
 from pytz import utc
@@ -24,11 +25,19 @@ settings = get_settings()
 DEBUG_MODE = settings.feature_flags.debug_mode
 
 # Add periodic tasks
+scheduler.add_job(
+    func="dembrane.tasks:task_finish_idle_conversations.send",
+    trigger=CronTrigger(second="*/10"),
+    id="task_finish_idle_conversations",
+    name="Finish conversations past their Redis idle deadline",
+    replace_existing=True,
+)
+
 scheduler.add_job(
     func="dembrane.tasks:task_collect_and_finish_unfinished_conversations.send",
-    trigger=CronTrigger(minute="*/2"),
+    trigger=CronTrigger(minute=7),
     id="task_collect_and_finish_unfinished_conversations",
-    name="Collect and finish unfinished conversations",
+    name="Collect and finish unfinished conversations the idle index missed (backstop)",
     replace_existing=True,
 )
 
@@ -72,11 +81,13 @@ scheduler.add_job(
     replace_existing=True,
 )
 
+# Due tasks are dispatched by the due-index runner started below; this is
+# the backstop (stale claims, lost index entries, overdue rows).
 scheduler.add_job(
     func="dembrane.tasks:task_process_scheduled_tasks.send",
-    trigger=CronTrigger(minute="*"),
+    trigger=CronTrigger(minute="*/5"),
     id="task_process_scheduled_tasks",
-    name="Dispatch due durable scheduled_task rows (revoke support, scheduled reports)",
+    name="Backstop for durable scheduled_task rows (stale claims, due index, overdue rows)",
     replace_existing=True,
 )
 
@@ -128,6 +139,22 @@ scheduler.add_job(
     replace_existing=True,
 )
 
+scheduler.add_job(
+    func="dembrane.tasks:task_reconcile_usage_counters.send",
+    trigger=CronTrigger(minute="*/15"),
+    id="task_reconcile_usage_counters",
+    name="Reconcile usage ledger hour counters against Directus",
+    replace_existing=True,
+)
+
+scheduler.add_job(
+    func="dembrane.tasks:task_check_usage_ledger.send",
+    trigger=CronTrigger(hour=3, minute=15),
+    id="task_check_usage_ledger",
+    name="Nightly usage ledger consistency check",
+    replace_existing=True,
+)
+
 scheduler.add_job(
     func="dembrane.tasks:task_flush_email_digests.send",
     trigger=CronTrigger(hour=9, minute=0),
@@ -144,6 +171,14 @@ scheduler.add_job(
     replace_existing=True,
 )
 
+scheduler.add_job(
+    func="dembrane.tasks:task_flush_agentic_run_events.send",
+    trigger=CronTrigger(second="*/5"),
+    id="task_flush_agentic_run_events",
+    name="Persist buffered agentic run events from Redis to Directus",
+    replace_existing=True,
+)
+
 scheduler.add_job(
     func="dembrane.tasks:task_fail_abandoned_agentic_runs.send",
     trigger=CronTrigger(minute="*/5"),
@@ -154,7 +189,24 @@ scheduler.add_job(
 
 logger = getLogger("dembrane.scheduler")
 
+
+def start_scheduled_task_runner() -> threading.Thread:
+    """Run the scheduled_task due-index runner on a daemon thread."""
+    from dembrane.tasks import task_run_scheduled_tasks
+    from dembrane.scheduled_tasks import run_due_index_runner
+
+    thread = threading.Thread(
+        target=run_due_index_runner,
+        args=(task_run_scheduled_tasks.send,),
+        name="scheduled-task-runner",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
 # Start the scheduler when this module is run directly
 if __name__ == "__main__":
     logger.info("Starting scheduler")
+    start_scheduled_task_runner()
     scheduler.start()
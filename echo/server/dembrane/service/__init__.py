@@ -18,6 +18,7 @@ Usage:
 from typing import Optional
 
 from dembrane.directus import DirectusClient, directus
+from dembrane.agentic_event_log import RunEventLog
 
 from .chat import (
     ChatService,
@@ -54,7 +55,7 @@ def build_chat_service(directus_client: Optional[DirectusClient] = None) -> Chat
 def build_agentic_run_service(
     directus_client: Optional[DirectusClient] = None,
 ) -> AgenticRunService:
-    return AgenticRunService(directus_client=directus_client or directus)
+    return AgenticRunService(directus_client=directus_client or directus, event_log=RunEventLog())
 
 
 def build_conversation_service(
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Literal, Optional
+from typing import TYPE_CHECKING, Any, Literal, Optional
 from logging import getLogger
 from contextlib import AbstractContextManager
 
@@ -12,6 +12,9 @@ from dembrane.directus import (
     directus_client_context,
 )
 
+if TYPE_CHECKING:
+    from dembrane.agentic_event_log import RunEventLog
+
 logger = getLogger("dembrane.service.agentic")
 
 RUN_COLLECTION = "project_agentic_run"
@@ -29,8 +32,16 @@ class AgenticRunNotFoundException(AgenticRunServiceException):
 
 
 class AgenticRunService:
-    def __init__(self, directus_client: Optional[DirectusClient] = None) -> None:
+    def __init__(
+        self,
+        directus_client: Optional[DirectusClient] = None,
+        event_log: Optional[RunEventLog] = None,
+    ) -> None:
         self._directus_client = directus_client or directus
+        # With an event log, events are appended to Redis and flushed to
+        # Directus in batches (see dembrane.agentic_event_log); without one,
+        # every append writes Directus directly.
+        self._event_log = event_log
 
     def _client_context(
         self, override_client: Optional[DirectusClient] = None
@@ -67,6 +78,7 @@ class AgenticRunService:
             logger.error("Failed to create agentic run: %s", exc)
             raise AgenticRunServiceException("Failed to create run") from exc
 
+        self._mirror_status(created["id"], status)
         return created
 
     def get_by_id_or_raise(self, run_id: str) -> dict[str, Any]:
@@ -146,9 +158,20 @@ class AgenticRunService:
             logger.error("Failed to update run %s status to %s: %s", run_id, status, exc)
             raise AgenticRunServiceException("Failed to update run status") from exc
 
+        self._mirror_status(run_id, status)
+        if status in TERMINAL_RUN_STATUSES and self._event_log is not None:
+            # A finished run gets its events into Directus now rather than on
+            # the next flusher tick.
+            try:
+                self.flush_events(run_id)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to flush events for finished run %s: %s", run_id, exc)
         return updated
 
     def append_event(self, run_id: str, event_type: str, payload: dict[str, Any]) -> dict[str, Any]:
+        if self._event_log is not None:
+            return self._append_to_log(run_id, event_type, payload)
+
         seq = self._next_seq(run_id)
         event_payload = {
             "project_agentic_run_id": run_id,
@@ -168,12 +191,76 @@ class AgenticRunService:
 
         return event
 
+    def _append_to_log(
+        self, run_id: str, event_type: str, payload: dict[str, Any]
+    ) -> dict[str, Any]:
+        assert self._event_log is not None
+        timestamp = get_utc_timestamp().isoformat()
+        try:
+            seq = self._event_log.append(run_id, event_type, payload, timestamp)
+            if seq is None:
+                # First append since the log was (re)started: continue from
+                # whatever Directus already holds.
+                seq = self._event_log.append(
+                    run_id,
+                    event_type,
+                    payload,
+                    timestamp,
+                    seed_seq=self._next_seq(run_id) - 1,
+                )
+        except AgenticRunServiceException:
+            raise
+        except Exception as exc:
+            logger.error("Failed to append event for run %s: %s", run_id, exc)
+            raise AgenticRunServiceException("Failed to append event") from exc
+
+        if seq is None:
+            raise AgenticRunServiceException("Failed to append event")
+
+        return {
+            "project_agentic_run_id": run_id,
+            "seq": seq,
+            "event_type": event_type,
+            "payload": payload,
+            "timestamp": timestamp,
+        }
+
     def list_events(
         self,
         run_id: str,
         *,
         after_seq: int = 0,
         limit: int = 500,
+    ) -> list[dict[str, Any]]:
+        if self._event_log is None:
+            return self._list_persisted_events(run_id, after_seq=after_seq, limit=limit)
+
+        try:
+            buffered, latest_seq = self._event_log.read(run_id, after_seq=after_seq, limit=limit)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Run log read failed for %s, using Directus: %s", run_id, exc)
+            return self._list_persisted_events(run_id, after_seq=after_seq, limit=limit)
+
+        if latest_seq is None:
+            return self._list_persisted_events(run_id, after_seq=after_seq, limit=limit)
+        if buffered and int(buffered[0]["seq"]) == after_seq + 1:
+            return buffered
+        if not buffered and latest_seq <= after_seq:
+            return []
+
+        # The requested range starts before the stream does (history from
+        # before the log existed): stitch Directus rows and buffered events.
+        persisted = self._list_persisted_events(run_id, after_seq=after_seq, limit=limit)
+        merged = {int(event.get("seq") or 0): event for event in buffered}
+        merged.update({int(event.get("seq") or 0): event for event in persisted})
+        return [merged[seq] for seq in sorted(merged)][:limit]
+
+    def _list_persisted_events(
+        self,
+        run_id: str,
+        *,
+        after_seq: int = 0,
+        limit: int = 500,
     ) -> list[dict[str, Any]]:
         filter_data: dict[str, Any] = {"project_agentic_run_id": {"_eq": run_id}}
         if after_seq > 0:
@@ -203,6 +290,15 @@ class AgenticRunService:
         *,
         event_type: Optional[str] = None,
     ) -> Optional[dict[str, Any]]:
+        if self._event_log is not None:
+            try:
+                event, complete = self._event_log.latest(run_id, event_type=event_type)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Run log read failed for %s, using Directus: %s", run_id, exc)
+            else:
+                if event is not None or complete:
+                    return event
+
         filter_data: dict[str, Any] = {"project_agentic_run_id": {"_eq": run_id}}
         if event_type is not None:
             filter_data["event_type"] = {"_eq": event_type}
@@ -227,6 +323,74 @@ class AgenticRunService:
             return None
         return rows[0]
 
+    def unflushed_run_ids(self) -> list[str]:
+        if self._event_log is None:
+            return []
+        return self._event_log.unflushed_run_ids()
+
+    def flush_events(self, run_id: str) -> int:
+        """Copy a run's buffered log events into Directus; returns rows written.
+
+        One bulk create and one run update per batch. Seqs already present in
+        Directus are skipped, so a flush that died between the create and the
+        cursor update doesn't duplicate rows when retried.
+        """
+        if self._event_log is None:
+            return 0
+
+        token = generate_uuid()
+        if not self._event_log.claim_flush(run_id, token):
+            return 0
+
+        written = 0
+        try:
+            while True:
+                cursor, events = self._event_log.pending(run_id)
+                if not events:
+                    self._event_log.mark_flushed(run_id, cursor)
+                    break
+
+                last_seq = int(events[-1]["seq"])
+                try:
+                    with self._client_context() as client:
+                        existing = client.get_items(
+                            RUN_EVENT_COLLECTION,
+                            {
+                                "query": {
+                                    "filter": {
+                                        "project_agentic_run_id": {"_eq": run_id},
+                                        "seq": {"_gt": cursor, "_lte": last_seq},
+                                    },
+                                    "fields": ["seq"],
+                                    "limit": -1,
+                                }
+                            },
+                        )
+                        persisted = {int(row.get("seq") or 0) for row in existing or []}
+                        rows = [event for event in events if int(event["seq"]) not in persisted]
+                        if rows:
+                            client.create_item(RUN_EVENT_COLLECTION, rows)
+                        client.update_item(RUN_COLLECTION, run_id, {"last_event_seq": last_seq})
+                except DirectusBadRequest as exc:
+                    logger.error("Failed to flush events for run %s: %s", run_id, exc)
+                    raise AgenticRunServiceException("Failed to flush run events") from exc
+
+                written += len(rows)
+                if self._event_log.mark_flushed(run_id, last_seq):
+                    break
+        finally:
+            self._event_log.release_flush(run_id, token)
+
+        return written
+
+    def _mirror_status(self, run_id: str, status: str) -> None:
+        if self._event_log is None:
+            return
+        try:
+            self._event_log.record_status(run_id, status)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to mirror status for run %s: %s", run_id, exc)
+
     def _next_seq(self, run_id: str) -> int:
         try:
             with self._client_context() as client:
@@ -1,4 +1,5 @@
 # conversation.py
+import time
 from typing import TYPE_CHECKING, Any, List, Iterable, Optional, ContextManager
 from logging import getLogger
 from datetime import datetime, timezone, timedelta
@@ -14,6 +15,11 @@ from dembrane.directus import (
     directus,
     directus_client_context,
 )
+from dembrane.conversation_idle import (
+    clear_idle_deadline,
+    touch_idle_deadline,
+    register_idle_deadline,
+)
 
 logger = getLogger("dembrane.service.conversation")
 
@@ -27,6 +33,13 @@ _UNSET = object()
 # how far ahead of server time a client-supplied timestamp may sit
 _RECORDING_STARTED_AT_SKEW_TOLERANCE = timedelta(minutes=5)
 
+# get_chunk_counts_many: ids per grouped aggregate (keeps the `_in` list and
+# the query string bounded) and how long a sweep's counts are reused
+_CHUNK_COUNTS_BATCH_SIZE = 200
+_CHUNK_COUNTS_CACHE_TTL_SECONDS = 15.0
+# conversation_id -> (monotonic expiry, counts); per process
+_chunk_counts_cache: dict[str, tuple[float, dict]] = {}
+
 
 def _as_utc(value: Any) -> Optional[datetime]:
     """Coerce a datetime or Directus timestamp string to tz-aware UTC."""
@@ -435,6 +448,9 @@ class ConversationService:
                 },
             )["data"]
 
+        # track for auto-finish even if it never records (see conversation_idle)
+        register_idle_deadline(new_conversation["id"])
+
         # Dispatch webhook for conversation.started event
         try:
             from dembrane.service.webhook import dispatch_webhooks_for_event
@@ -509,6 +525,7 @@ class ConversationService:
                 conversation_id,
                 {"deleted_at": datetime.utcnow().isoformat()},
             )
+        clear_idle_deadline(conversation_id)
 
     def get_chunk_by_id_or_raise(
         self,
@@ -645,6 +662,8 @@ class ConversationService:
                 },
             )["data"]
 
+        touch_idle_deadline(conversation["id"])
+
         # only audio chunks; a typed text message is not a recording start
         if has_file:
             self._stamp_recording_started_at(conversation, timestamp)
@@ -825,6 +844,95 @@ class ConversationService:
             "ok": ok,
         }
 
+    def get_chunk_counts_many(
+        self,
+        conversation_ids: Iterable[str],
+        use_cache: bool = True,
+    ) -> dict[str, dict]:
+        """Bulk `get_chunk_counts`: {conversation_id: counts} for every id.
+
+        Three grouped count aggregates per batch of ids (all chunks, errored,
+        transcribed-without-error) instead of reading every chunk row of every
+        conversation; pending is the remainder. Ids without chunks get all
+        zeros. Results are cached per process for a few seconds so the
+        scheduler sweeps can hand one batch to every conversation they touch.
+        """
+        ids = list(dict.fromkeys(cid for cid in conversation_ids if cid))
+        result: dict[str, dict] = {}
+        now = time.monotonic()
+        if use_cache:
+            for cid in ids:
+                cached = _chunk_counts_cache.get(cid)
+                if cached is not None and cached[0] > now:
+                    result[cid] = dict(cached[1])
+        missing = [cid for cid in ids if cid not in result]
+
+        for start in range(0, len(missing), _CHUNK_COUNTS_BATCH_SIZE):
+            batch = missing[start : start + _CHUNK_COUNTS_BATCH_SIZE]
+            totals = self._grouped_chunk_count(batch, {})
+            errors = self._grouped_chunk_count(batch, {"error": {"_nnull": True}})
+            oks = self._grouped_chunk_count(
+                batch, {"error": {"_null": True}, "transcript": {"_nnull": True}}
+            )
+            expires_at = time.monotonic() + _CHUNK_COUNTS_CACHE_TTL_SECONDS
+            for cid in batch:
+                total = totals.get(cid, 0)
+                error = errors.get(cid, 0)
+                ok = oks.get(cid, 0)
+                counts = {
+                    "total": total,
+                    "processed": error + ok,
+                    "error": error,
+                    "pending": max(total - error - ok, 0),
+                    "ok": ok,
+                }
+                _chunk_counts_cache[cid] = (expires_at, counts)
+                result[cid] = dict(counts)
+
+        # drop expired entries so a long-lived worker doesn't accumulate ids
+        for cid in [k for k, (exp, _) in _chunk_counts_cache.items() if exp <= now]:
+            _chunk_counts_cache.pop(cid, None)
+        return result
+
+    def _grouped_chunk_count(
+        self, conversation_ids: List[str], extra_filter: dict[str, Any]
+    ) -> dict[str, int]:
+        try:
+            with self._client_context() as client:
+                rows = client.get_items(
+                    "conversation_chunk",
+                    {
+                        "query": {
+                            "filter": {
+                                "conversation_id": {"_in": conversation_ids},
+                                **extra_filter,
+                            },
+                            "aggregate": {"count": ["id"]},
+                            "groupBy": ["conversation_id"],
+                            # Directus caps grouped rows at its default limit (100).
+                            "limit": -1,
+                        }
+                    },
+                )
+        except DirectusBadRequest as e:
+            raise ConversationServiceException(
+                f"Failed to get chunk counts for {len(conversation_ids)} conversations: {e}"
+            ) from e
+
+        if not isinstance(rows, list):
+            # never report zeros for a failed read: a sweep would treat the
+            # conversation as empty
+            raise ConversationServiceException(f"Unexpected chunk count response: {rows!r}")
+
+        counts: dict[str, int] = {}
+        for row in rows:
+            cid = row.get("conversation_id")
+            if isinstance(cid, dict):
+                cid = cid.get("id")
+            if cid:
+                counts[cid] = int((row.get("count") or {}).get("id") or 0)
+        return counts
+
     def _list_conversations(
         self,
         filter_query: dict[str, Any],
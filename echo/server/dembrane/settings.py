@@ -27,6 +27,7 @@ from pydantic import Field, BaseModel, AliasChoices, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 TranscriptionProvider = Literal["LiteLLM", "Dembrane-26-07"]
+TranscriptionAudioInput = Literal["inline", "url"]
 
 _MODULE_BASE_DIR = Path(__file__).resolve().parent.parent
 _DEFAULT_ENV_PATH = _MODULE_BASE_DIR / ".env"
@@ -127,6 +128,35 @@ class LLMSettings(BaseSettings):
     multi_modal_fast: LLMProviderConfig = Field(default_factory=LLMProviderConfig)
     text_fast: LLMProviderConfig = Field(default_factory=LLMProviderConfig)
 
+    # Per-model-group concurrency for dembrane.llm_scheduler, shared by the
+    # whole fleet. The defaults sit above today's peak concurrency so the
+    # scheduler only orders calls; lower them once a provider quota is known.
+    scheduler_initial_limit: int = Field(
+        default=256,
+        alias="LLM_SCHEDULER_INITIAL_LIMIT",
+        validation_alias=AliasChoices(
+            "LLM_SCHEDULER_INITIAL_LIMIT", "LLM__SCHEDULER_INITIAL_LIMIT"
+        ),
+    )
+    scheduler_min_limit: int = Field(
+        default=8,
+        alias="LLM_SCHEDULER_MIN_LIMIT",
+        validation_alias=AliasChoices("LLM_SCHEDULER_MIN_LIMIT", "LLM__SCHEDULER_MIN_LIMIT"),
+    )
+    scheduler_max_limit: int = Field(
+        default=256,
+        alias="LLM_SCHEDULER_MAX_LIMIT",
+        validation_alias=AliasChoices("LLM_SCHEDULER_MAX_LIMIT", "LLM__SCHEDULER_MAX_LIMIT"),
+    )
+    # A call (or a stream's first chunk) slower than this shrinks the limit.
+    scheduler_slow_call_seconds: float = Field(
+        default=60.0,
+        alias="LLM_SCHEDULER_SLOW_CALL_SECONDS",
+        validation_alias=AliasChoices(
+            "LLM_SCHEDULER_SLOW_CALL_SECONDS", "LLM__SCHEDULER_SLOW_CALL_SECONDS"
+        ),
+    )
+
     def get_deployments_for_group(
         self, group: str
     ) -> List[Tuple[Optional[int], LLMProviderConfig]]:
@@ -508,6 +538,14 @@ class AgenticSettings(BaseSettings):
             "AGENTIC__RUN_LOCK_REFRESH_SECONDS",
         ),
     )
+    history_token_budget: int = Field(
+        default=120_000,
+        alias="AGENTIC_HISTORY_TOKEN_BUDGET",
+        validation_alias=AliasChoices(
+            "AGENTIC_HISTORY_TOKEN_BUDGET",
+            "AGENTIC__HISTORY_TOKEN_BUDGET",
+        ),
+    )
 
 
 class TranscriptionSettings(BaseSettings):
@@ -551,6 +589,22 @@ class TranscriptionSettings(BaseSettings):
             "LITELLM_TRANSCRIPTION_API_VERSION", "TRANSCRIPTION__LITELLM__API_VERSION"
         ),
     )
+    # "url" hands https signed URLs to Gemini as file references instead of
+    # inlining base64 audio; see dembrane/audio_input.py.
+    audio_input: TranscriptionAudioInput = Field(
+        default="inline",
+        alias="TRANSCRIPTION_AUDIO_INPUT",
+        validation_alias=AliasChoices("TRANSCRIPTION_AUDIO_INPUT", "TRANSCRIPTION__AUDIO_INPUT"),
+    )
+    # Verification merges this many (or more) untranscribed clips into one mp3
+    # part instead of attaching each clip; 0 always attaches them separately.
+    verify_merge_audio_min_chunks: int = Field(
+        default=4,
+        alias="VERIFY_MERGE_AUDIO_MIN_CHUNKS",
+        validation_alias=AliasChoices(
+            "VERIFY_MERGE_AUDIO_MIN_CHUNKS", "TRANSCRIPTION__VERIFY_MERGE_AUDIO_MIN_CHUNKS"
+        ),
+    )
 
     @field_validator("gcp_sa_json", mode="before")
     @classmethod
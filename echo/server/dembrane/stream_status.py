@@ -4,18 +4,33 @@ Stream status utilities for real-time user notifications.
 This module provides utilities to emit status events during LLM streaming,
 allowing the frontend to show notifications when requests take longer
 than expected (e.g., due to high load or failover scenarios).
+
+`stream_with_status` is also where chat responses get their flow control:
+a bounded queue between the LLM and the client, coalesced writes, and
+closing the LLM stream when the client disconnects.
 """
 
 from __future__ import annotations
 
 import json
+import time
 import asyncio
+import logging
 from enum import Enum
 from typing import Any, Optional, AsyncGenerator
+from dataclasses import field, dataclass
+
+logger = logging.getLogger("stream_status")
 
 # Default delay before showing high load notification (seconds)
 DEFAULT_DELAY_THRESHOLD_SECONDS = 20.0
 
+# Chunks held between the LLM stream and a client that reads slower than it.
+STREAM_QUEUE_MAXSIZE = 64
+# Token deltas are joined into one write per interval, or earlier at this size.
+COALESCE_INTERVAL_SECONDS = 0.03
+COALESCE_MAX_BYTES = 1024
+
 
 class StreamStatusType(str, Enum):
     """Status event types for stream notifications."""
@@ -56,99 +71,168 @@ def format_status_event(
     return f"2:{json.dumps([payload])}\n"
 
 
+@dataclass
+class StreamMetrics:
+    """What one wrapped stream did; logged when it ends."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    # Seconds until the upstream produced its first chunk.
+    ttft_seconds: Optional[float] = None
+    chunks_in: int = 0
+    writes: int = 0
+    bytes_out: int = 0
+    # Times the upstream found the queue full (the client reads slower than
+    # the model writes), and how long it waited in total.
+    stalls: int = 0
+    stall_seconds: float = 0.0
+    # False when the stream ended on an error or a client disconnect.
+    completed: bool = False
+
+
 async def stream_with_status(
     stream_generator: AsyncGenerator[str, None],
     delay_threshold_seconds: float = DEFAULT_DELAY_THRESHOLD_SECONDS,
     protocol: str = "data",
+    *,
+    queue_maxsize: int = STREAM_QUEUE_MAXSIZE,
+    flush_interval_seconds: float = COALESCE_INTERVAL_SECONDS,
+    flush_bytes: int = COALESCE_MAX_BYTES,
+    metrics: Optional[StreamMetrics] = None,
+    name: str = "stream",
 ) -> AsyncGenerator[str, None]:
     """
-    Wrap a stream generator to emit status events if response is delayed.
+    Wrap a stream generator with backpressure, write coalescing and status events.
+
+    The upstream is read by a background task into a queue of at most
+    `queue_maxsize` chunks, so a slow client makes it wait instead of the
+    whole response piling up in memory. The first chunk is passed through as
+    soon as it arrives; after that chunks are joined into one write every
+    `flush_interval_seconds` or `flush_bytes`, whichever comes first (both
+    protocols are line/text based, so joined chunks read the same). When the
+    consumer goes away (client disconnect) the upstream is closed right away.
 
-    If no content is received within `delay_threshold_seconds`, emits a
-    "high_load" status event to notify the user.
+    With the "data" protocol, a "high_load" status event is emitted if no
+    content arrives within `delay_threshold_seconds`.
 
     Args:
         stream_generator: The underlying stream generator
         delay_threshold_seconds: Seconds to wait before emitting status
         protocol: "data" or "text" - only "data" supports status events
+        queue_maxsize: Chunks buffered between the upstream and the client
+        flush_interval_seconds: Longest a chunk waits to be joined with others
+        flush_bytes: Write size that triggers an early flush
+        metrics: Filled in as the stream runs (a fresh one is used if omitted)
+        name: Label for the metrics log line
 
     Yields:
         Stream chunks with optional status events prepended
     """
-    if protocol != "data":
-        # Text protocol doesn't support status events
-        async for chunk in stream_generator:
-            yield chunk
-        return
-
-    status_emitted = False
-    first_chunk_received = False
-
-    # Create an async iterator from the generator
-    stream_iter = stream_generator.__aiter__()
-
-    # Queue to hold chunks from the stream
-    chunk_queue: asyncio.Queue[tuple[str | None, Exception | None]] = asyncio.Queue()
+    metrics = metrics if metrics is not None else StreamMetrics()
+    loop = asyncio.get_running_loop()
+    chunk_queue: asyncio.Queue[tuple[str | None, Exception | None]] = asyncio.Queue(
+        maxsize=queue_maxsize
+    )
 
     async def stream_reader() -> None:
         """Read from the stream and put chunks in queue."""
         try:
-            async for chunk in stream_iter:
-                await chunk_queue.put((chunk, None))
+            async for chunk in stream_generator:
+                if metrics.ttft_seconds is None:
+                    metrics.ttft_seconds = time.monotonic() - metrics.started_at
+                metrics.chunks_in += 1
+                if chunk_queue.full():
+                    metrics.stalls += 1
+                    stall_started = time.monotonic()
+                    await chunk_queue.put((chunk, None))
+                    metrics.stall_seconds += time.monotonic() - stall_started
+                else:
+                    chunk_queue.put_nowait((chunk, None))
+            metrics.completed = True
             await chunk_queue.put((None, None))  # Signal end of stream
         except Exception as e:
             await chunk_queue.put((None, e))
+        finally:
+            # Ends the upstream (and its LLM call) when this task is cancelled
+            # while the generator is suspended between chunks.
+            try:
+                await stream_generator.aclose()
+            except Exception as e:
+                logger.debug("Closing %s upstream failed: %s", name, e)
 
     # Start reading stream in background
     reader_task = asyncio.create_task(stream_reader())
 
+    buffer: list[str] = []
+    buffered = 0
+    flush_at: Optional[float] = None
+    status_deadline: Optional[float] = (
+        loop.time() + delay_threshold_seconds if protocol == "data" else None
+    )
+    first_chunk_received = False
+
+    def flush() -> str:
+        nonlocal buffered, flush_at
+        data = "".join(buffer)
+        buffer.clear()
+        buffered = 0
+        flush_at = None
+        metrics.writes += 1
+        metrics.bytes_out += len(data.encode("utf-8"))
+        return data
+
     try:
         while True:
-            try:
-                # Wait for next chunk with timeout
-                if not first_chunk_received:
-                    timeout = delay_threshold_seconds
+            if flush_at is not None and loop.time() >= flush_at:
+                yield flush()
+
+            if not chunk_queue.empty():
+                chunk_data, error_data = chunk_queue.get_nowait()
+            else:
+                if flush_at is not None:
+                    timeout: Optional[float] = max(flush_at - loop.time(), 0.0)
+                elif status_deadline is not None:
+                    timeout = max(status_deadline - loop.time(), 0.0)
                 else:
-                    timeout = None  # No timeout after first chunk
-
-                result = await asyncio.wait_for(
-                    chunk_queue.get(),
-                    timeout=timeout,
-                )
-                chunk_data: str | None
-                error_data: Exception | None
-                chunk_data, error_data = result
-
-                if error_data is not None:
-                    raise error_data from error_data
-
-                if chunk_data is None:
-                    # End of stream
-                    break
-
-                first_chunk_received = True
-                yield chunk_data
-
-            except asyncio.TimeoutError:
-                # No chunk received within threshold - emit status
-                if not status_emitted and not first_chunk_received:
-                    status_emitted = True
-                    yield format_status_event(
-                        StreamStatusType.HIGH_LOAD,
-                        "High demand. Still working on your request...",
-                    )
-
-                # Now wait indefinitely for the first chunk
-                chunk_result, error_result = await chunk_queue.get()
-
-                if error_result is not None:
-                    raise error_result from error_result
-
-                if chunk_result is None:
-                    break
-
+                    timeout = None  # Nothing pending: wait for the next chunk
+
+                try:
+                    chunk_data, error_data = await asyncio.wait_for(chunk_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    if buffer:
+                        yield flush()
+                    else:
+                        # No chunk received within threshold - emit status
+                        status_deadline = None
+                        yield format_status_event(
+                            StreamStatusType.HIGH_LOAD,
+                            "High demand. Still working on your request...",
+                        )
+                    continue
+
+            if error_data is not None:
+                if buffer:
+                    yield flush()
+                raise error_data from error_data
+
+            if chunk_data is None:
+                # End of stream
+                if buffer:
+                    yield flush()
+                break
+
+            if not first_chunk_received:
                 first_chunk_received = True
-                yield chunk_result
+                status_deadline = None
+                buffer.append(chunk_data)
+                yield flush()
+                continue
+
+            buffer.append(chunk_data)
+            buffered += len(chunk_data)
+            if flush_at is None:
+                flush_at = loop.time() + flush_interval_seconds
+            if buffered >= flush_bytes:
+                yield flush()
 
     finally:
         reader_task.cancel()
@@ -156,10 +240,22 @@ async def stream_with_status(
             await reader_task
         except asyncio.CancelledError:
             pass
+        logger.info(
+            "%s: ttft=%s chunks=%d writes=%d bytes=%d stalls=%d (%.2fs) completed=%s",
+            name,
+            f"{metrics.ttft_seconds:.3f}s" if metrics.ttft_seconds is not None else "n/a",
+            metrics.chunks_in,
+            metrics.writes,
+            metrics.bytes_out,
+            metrics.stalls,
+            metrics.stall_seconds,
+            metrics.completed,
+        )
 
 
 __all__ = [
     "DEFAULT_DELAY_THRESHOLD_SECONDS",
+    "StreamMetrics",
     "StreamStatusType",
     "format_status_event",
     "stream_with_status",
@@ -141,6 +141,7 @@ async def generate_suggestions(
     chat_id: str,
     chat_mode: Optional[str],
     language: str,
+    use_cache: bool = True,
 ) -> List[Suggestion]:
     """
     Generate contextual question suggestions for a chat.
@@ -150,6 +151,8 @@ async def generate_suggestions(
         chat_id: The current chat ID
         chat_mode: "overview" or "deep_dive" (or None)
         language: Language code (e.g., "en", "nl")
+        use_cache: Serve recent suggestions for the same inputs; off when the user
+            asks for new ones
 
     Returns:
         List of Suggestion objects (max 3)
@@ -229,7 +232,7 @@ async def generate_suggestions(
 
         # Only use cache for fresh chats (no history) - these have stable inputs
         # Chats with history have dynamic inputs (last_response, recent_queries)
-        if not has_chat_history:
+        if use_cache and not has_chat_history:
             cached = await _get_cached_suggestions(cache_key)
             if cached:
                 return [Suggestion(**s) for s in cached]
@@ -292,6 +295,8 @@ async def generate_suggestions(
             ],
             response_format=SUGGESTIONS_RESPONSE_SCHEMA,
             timeout=30,  # 30 seconds - suggestions should be fast
+            cache="chat_suggestions" if use_cache else None,
+            hedge=True,
         )
 
         # Parse response - format guaranteed by structured outputs
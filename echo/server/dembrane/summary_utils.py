@@ -6,15 +6,19 @@ various parts of the application (reports, chat overview mode, etc.).
 
 import asyncio
 import logging
-from typing import List, Optional
+from typing import List, Callable, Optional, Awaitable
+from collections import deque
 from dataclasses import field, dataclass
 
 from dembrane.directus import directus
-from dembrane.async_helpers import run_in_thread_pool
+from dembrane.async_helpers import safe_gather, run_in_thread_pool
 from dembrane.api.dependency_auth import DirectusSession
 
 logger = logging.getLogger("dembrane.summary_utils")
 
+DEFAULT_SUMMARY_CONCURRENCY = 5
+DEFAULT_SUMMARY_TIMEOUT_SECONDS = 300.0
+
 
 @dataclass
 class SummarizationResult:
@@ -33,6 +37,7 @@ class BatchSummarizationResult:
     succeeded: List[str] = field(default_factory=list)
     failed: List[str] = field(default_factory=list)
     errors: dict = field(default_factory=dict)  # conversation_id -> error message
+    cancelled: List[str] = field(default_factory=list)  # never started
 
     @property
     def total_processed(self) -> int:
@@ -45,6 +50,9 @@ class BatchSummarizationResult:
         return len(self.succeeded) / self.total_processed
 
 
+SummaryProgressCallback = Callable[[SummarizationResult, int, int], None]
+
+
 async def safe_summarize_conversation(conversation_id: str) -> SummarizationResult:
     """
     Safely summarize a single conversation, catching and logging errors.
@@ -59,10 +67,10 @@ async def safe_summarize_conversation(conversation_id: str) -> SummarizationResu
         SummarizationResult with success status and any error details.
     """
     # Import here to avoid circular imports
-    from dembrane.api.conversation import summarize_conversation
+    from dembrane.api.conversation import run_conversation_summary
 
     try:
-        result = await summarize_conversation(
+        result = await run_conversation_summary(
             conversation_id, auth=DirectusSession(user_id="none", is_admin=True)
         )
         summary = result.get("summary") if isinstance(result, dict) else None
@@ -82,21 +90,112 @@ async def safe_summarize_conversation(conversation_id: str) -> SummarizationResu
         )
 
 
+async def summarize_conversations(
+    conversation_ids: List[str],
+    concurrency: int = DEFAULT_SUMMARY_CONCURRENCY,
+    item_timeout: Optional[float] = DEFAULT_SUMMARY_TIMEOUT_SECONDS,
+    on_progress: Optional[SummaryProgressCallback] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    summarize: Optional[Callable[[str], Awaitable[SummarizationResult]]] = None,
+) -> BatchSummarizationResult:
+    """
+    Summarize conversations through a sliding window of `concurrency` workers.
+
+    Each worker takes the next id as soon as its previous call finishes, so
+    one slow LLM call holds up a single slot rather than a whole batch.
+
+    Args:
+        conversation_ids: Conversations to summarize, in order.
+        concurrency: Maximum number of summaries in flight.
+        item_timeout: Seconds before a single summary counts as failed and its
+            slot is freed (None disables). The underlying thread-pool call is
+            not interrupted; its result is simply no longer waited for.
+        on_progress: Called after every finished item with
+            (result, done, total).
+        should_cancel: Checked before each item is started; once it returns
+            True no new items start, in-flight ones finish, and the rest are
+            reported in `cancelled`.
+        summarize: Summarizer to use (defaults to safe_summarize_conversation).
+
+    Returns:
+        BatchSummarizationResult with details about successes and failures.
+    """
+    result = BatchSummarizationResult()
+    if not conversation_ids:
+        return result
+
+    summarize_one = summarize or safe_summarize_conversation
+    pending = deque(conversation_ids)
+    total = len(conversation_ids)
+
+    async def _run_one(conversation_id: str) -> SummarizationResult:
+        try:
+            if item_timeout is None:
+                return await summarize_one(conversation_id)
+            return await asyncio.wait_for(summarize_one(conversation_id), timeout=item_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Summarizing conversation {conversation_id} timed out after {item_timeout}s"
+            )
+            return SummarizationResult(
+                conversation_id=conversation_id,
+                success=False,
+                error=f"Timed out after {item_timeout}s",
+            )
+        except Exception as e:
+            # summarize_one is expected to catch its own errors; never let one
+            # item take its worker down with it.
+            logger.error(f"Unexpected exception summarizing {conversation_id}: {e}")
+            return SummarizationResult(conversation_id=conversation_id, success=False, error=str(e))
+
+    async def _worker() -> None:
+        while pending:
+            if should_cancel is not None and should_cancel():
+                return
+            item = await _run_one(pending.popleft())
+            if item.success:
+                result.succeeded.append(item.conversation_id)
+            else:
+                result.failed.append(item.conversation_id)
+                if item.error:
+                    result.errors[item.conversation_id] = item.error
+            if on_progress is not None:
+                try:
+                    on_progress(item, result.total_processed, total)
+                except Exception as e:
+                    logger.warning(f"Summary progress callback failed: {e}")
+
+    # safe_gather: workers are created on the worker's own loop (dramatiq-gevent)
+    await safe_gather(*[_worker() for _ in range(max(1, min(concurrency, total)))])
+
+    result.cancelled.extend(pending)
+    if result.cancelled:
+        logger.info(f"Summarization cancelled with {len(result.cancelled)} conversations left")
+    return result
+
+
 async def ensure_conversation_summaries(
     conversation_ids: List[str],
-    batch_size: int = 5,
+    concurrency: int = DEFAULT_SUMMARY_CONCURRENCY,
     skip_existing: bool = True,
+    item_timeout: Optional[float] = DEFAULT_SUMMARY_TIMEOUT_SECONDS,
+    on_progress: Optional[SummaryProgressCallback] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
 ) -> BatchSummarizationResult:
     """
     Ensure all specified conversations have summaries, generating missing ones.
 
     This function checks which conversations already have summaries and only
     generates summaries for those that don't (unless skip_existing is False).
+    Generation runs through `summarize_conversations`.
 
     Args:
         conversation_ids: List of conversation IDs to process.
-        batch_size: Number of conversations to summarize concurrently.
+        concurrency: Number of conversations to summarize concurrently.
         skip_existing: If True, skip conversations that already have summaries.
+        item_timeout: Per-conversation timeout in seconds (None disables).
+        on_progress: Called with (result, done, total) after each generated summary.
+        should_cancel: Stops starting new summaries once it returns True.
 
     Returns:
         BatchSummarizationResult with details about successes and failures.
@@ -104,7 +203,7 @@ async def ensure_conversation_summaries(
     if not conversation_ids:
         return BatchSummarizationResult()
 
-    result = BatchSummarizationResult()
+    existing: List[str] = []
 
     # Determine which conversations need summarization
     ids_to_summarize = conversation_ids
@@ -133,7 +232,7 @@ async def ensure_conversation_summaries(
                 ids_to_summarize = [cid for cid in conversation_ids if cid not in ids_with_summary]
 
                 # Mark existing summaries as succeeded
-                result.succeeded.extend(list(ids_with_summary))
+                existing.extend(list(ids_with_summary))
 
                 logger.info(
                     f"Skipping {len(ids_with_summary)} conversations with existing summaries, "
@@ -144,30 +243,18 @@ async def ensure_conversation_summaries(
 
     if not ids_to_summarize:
         logger.info("All conversations already have summaries")
-        return result
+        return BatchSummarizationResult(succeeded=existing)
 
     logger.info(f"Generating summaries for {len(ids_to_summarize)} conversations")
 
-    # Process in batches
-    for i in range(0, len(ids_to_summarize), batch_size):
-        batch = ids_to_summarize[i : i + batch_size]
-        tasks = [safe_summarize_conversation(conv_id) for conv_id in batch]
-
-        # Use return_exceptions=True to prevent one failure from canceling others
-        batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for batch_result in batch_results:
-            if isinstance(batch_result, Exception):
-                # This shouldn't happen since safe_summarize_conversation catches exceptions
-                logger.error(f"Unexpected exception during batch summarization: {batch_result}")
-                # We don't know which conversation failed, so we can't track it
-            elif isinstance(batch_result, SummarizationResult):
-                if batch_result.success:
-                    result.succeeded.append(batch_result.conversation_id)
-                else:
-                    result.failed.append(batch_result.conversation_id)
-                    if batch_result.error:
-                        result.errors[batch_result.conversation_id] = batch_result.error
+    result = await summarize_conversations(
+        ids_to_summarize,
+        concurrency=concurrency,
+        item_timeout=item_timeout,
+        on_progress=on_progress,
+        should_cancel=should_cancel,
+    )
+    result.succeeded[:0] = existing
 
     logger.info(
         f"Summarization complete: {len(result.succeeded)} succeeded, "
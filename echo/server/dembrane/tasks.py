@@ -198,6 +198,27 @@ class SkipRetryOnUnrecoverableError(dramatiq.Middleware):
 broker.add_middleware(SkipRetryOnUnrecoverableError())
 
 
+# ── Middleware: background LLM priority in workers ─────────────────────
+
+
+class BackgroundLLMPriority(dramatiq.Middleware):
+    """
+    LLM calls made from worker processes (summaries, reports, canvas ticks)
+    default to background admission in dembrane.llm_scheduler, so they yield
+    to live chat. Chunk transcription passes priority="standard" itself. Only
+    fires in worker processes, never in the API process that merely enqueues
+    messages.
+    """
+
+    def after_process_boot(self, broker: dramatiq.Broker) -> None:  # noqa: ARG002
+        from dembrane.llm_scheduler import set_default_priority
+
+        set_default_priority("background")
+
+
+broker.add_middleware(BackgroundLLMPriority())
+
+
 # Transcription Task
 @dramatiq.actor(queue_name="network", priority=0)
 def task_transcribe_chunk(
@@ -296,10 +317,16 @@ def _on_chunk_transcription_done(
 
 
 @dramatiq.actor(queue_name="network", priority=20)
-def task_finalize_conversation(conversation_id: str) -> None:
+def task_finalize_conversation(
+    conversation_id: str, chunk_counts: Optional[dict] = None
+) -> None:
     """
     Finalize a conversation after all chunks are transcribed.
 
+    `chunk_counts` is passed by the reconcile sweep, which already fetched the
+    counts for its whole batch (get_chunk_counts_many); other callers omit it
+    and the counts are read fresh.
+
     This task is triggered when:
     1. All pending chunks have been transcribed (counter == 0)
     2. The conversation is_finished (user clicked finish or scheduler triggered)
@@ -338,7 +365,7 @@ def task_finalize_conversation(conversation_id: str) -> None:
             return
 
         pending = get_pending_chunks(conversation_id)
-        counts = conversation_service.get_chunk_counts(conversation_id)
+        counts = chunk_counts or conversation_service.get_chunk_counts(conversation_id)
 
         if pending > 0 or counts["pending"] > 0:
             logger.warning(
@@ -410,11 +437,15 @@ def task_finalize_conversation(conversation_id: str) -> None:
 
 
 @dramatiq.actor(queue_name="network", priority=30)
-def task_summarize_conversation(conversation_id: str) -> None:
+def task_summarize_conversation(
+    conversation_id: str, chunk_counts: Optional[dict] = None
+) -> None:
     """
     Summarize a conversation. The results are not returned. You can find it in
     conversation["summary"] after the task is finished.
 
+    `chunk_counts` (only used for logging) is passed by the catch-up sweep.
+
     This task is resilient to partial data - it will generate a summary from
     whatever transcripts are available, logging any chunks that were skipped.
 
@@ -447,7 +478,7 @@ def task_summarize_conversation(conversation_id: str) -> None:
 
         # Log chunk status before summarizing
         try:
-            counts = conversation_service.get_chunk_counts(conversation_id)
+            counts = chunk_counts or conversation_service.get_chunk_counts(conversation_id)
             if counts["error"] > 0:
                 logger.info(
                     f"Summarizing conversation {conversation_id} with partial data: "
@@ -462,7 +493,7 @@ def task_summarize_conversation(conversation_id: str) -> None:
         except Exception as e:
             logger.warning(f"Could not get chunk counts for logging: {e}")
 
-        from dembrane.api.conversation import summarize_conversation
+        from dembrane.api.conversation import run_conversation_summary
 
         def _run_summary() -> None:
             with ProcessingStatusContext(
@@ -470,7 +501,7 @@ def task_summarize_conversation(conversation_id: str) -> None:
                 event_prefix="task_summarize_conversation",
             ):
                 run_async_in_new_loop(
-                    lambda: summarize_conversation(
+                    lambda: run_conversation_summary(
                         conversation_id=conversation_id,
                         auth=DependencyDirectusSession(user_id="none", is_admin=True),
                     )
@@ -501,7 +532,7 @@ def task_summarize_conversation(conversation_id: str) -> None:
         clear_summarize_in_progress(conversation_id)
         return
     except Exception as e:
-        # Tier-locked (free tier): summarize_conversation raises HTTPException 402
+        # Tier-locked (free tier): run_conversation_summary raises HTTPException 402
         # when the conversation is locked. Retrying is pointless — the lock only
         # lifts on upgrade, and dramatiq retries would just churn and eventually
         # dead-letter the message (lost). Skip retries and CLEAR the lock so the
@@ -521,6 +552,17 @@ def task_summarize_conversation(conversation_id: str) -> None:
         raise e from e
 
 
+@dramatiq.actor(queue_name="network", priority=40, max_retries=3)
+def task_refresh_overview_digest(project_id: str) -> None:
+    """
+    Rebuild the project's overview chat digest (see dembrane.overview_digest).
+    Enqueued, debounced, by request_overview_refresh.
+    """
+    from dembrane.overview_digest import refresh_overview_digest
+
+    refresh_overview_digest(project_id)
+
+
 @dramatiq.actor(store_results=True, queue_name="cpu", priority=10)
 def task_merge_conversation_chunks(conversation_id: str) -> None:
     """
@@ -615,37 +657,12 @@ def _stamp_over_cap(conversation_id: str, logger: Any) -> None:
         account = client.get_item("billing_account", account_id) if account_id else None
     tier = (account or {}).get("tier", "") if account else ""
 
-    # Sum all conversation durations in this workspace (includes deleted rows
-    # because deletions preserve billable duration).
-    with directus_client_context(directus) as client:
-        projects = client.get_items(
-            "project",
-            {
-                "query": {
-                    "filter": {"workspace_id": {"_eq": workspace_id}},
-                    "fields": ["id"],
-                    "limit": -1,
-                }
-            },
-        )
-    if not isinstance(projects, list) or not projects:
-        return
-    project_ids = [p["id"] for p in projects]
+    # Workspace hours from the usage ledger's lifetime counter (includes
+    # deleted rows because deletions preserve billable duration). One GET when
+    # warm, a DB-side sum when cold; no conversation rows cross the wire.
+    from dembrane.usage_ledger import get_lifetime_seconds
 
-    with directus_client_context(directus) as client:
-        conversations = client.get_items(
-            "conversation",
-            {
-                "query": {
-                    "filter": {"project_id": {"_in": project_ids}},
-                    "fields": ["duration"],
-                    "limit": -1,
-                }
-            },
-        )
-    if not isinstance(conversations, list):
-        conversations = []
-    total_seconds = sum(c.get("duration") or 0 for c in conversations)
+    total_seconds = run_async_in_new_loop(lambda: get_lifetime_seconds(workspace_id))
     workspace_audio_hours = total_seconds / 3600
 
     conversation_duration_hours = (conversation.get("duration") or 0) / 3600
@@ -660,10 +677,15 @@ def _stamp_over_cap(conversation_id: str, logger: Any) -> None:
 
 
 @dramatiq.actor(queue_name="network", priority=30)
-def task_finish_conversation_hook(conversation_id: str) -> None:
+def task_finish_conversation_hook(
+    conversation_id: str, chunk_counts: Optional[dict] = None
+) -> None:
     """
     Handle user/scheduler signal that a conversation is finished.
 
+    `chunk_counts` is passed by the unfinished-conversations sweep from its
+    batch read (get_chunk_counts_many); other callers omit it.
+
     This task:
     1. Sets is_finished = True
     2. Checks if all chunks are already transcribed
@@ -678,6 +700,7 @@ def task_finish_conversation_hook(conversation_id: str) -> None:
 
     from dembrane.service import conversation_service
     from dembrane.coordination import get_pending_chunks, mark_finish_in_progress
+    from dembrane.conversation_idle import clear_idle_deadline
     from dembrane.service.conversation import ConversationNotFoundException
 
     try:
@@ -687,6 +710,8 @@ def task_finish_conversation_hook(conversation_id: str) -> None:
 
         if conversation_obj["is_finished"]:
             logger.info(f"Conversation {conversation_id} already finished, skipping")
+            # A ping re-registered it in the idle index; keep it out from now on.
+            clear_idle_deadline(conversation_id)
             return
 
         # Prevent duplicate processing - only first task proceeds
@@ -699,6 +724,7 @@ def task_finish_conversation_hook(conversation_id: str) -> None:
         # Mark as finished (user intent)
         conversation_service.update(conversation_id=conversation_id, is_finished=True)
         logger.info(f"Marked conversation {conversation_id} as is_finished=True")
+        clear_idle_deadline(conversation_id)
 
         # Stamp is_over_cap (ADR 0001) — must run after is_finished is set.
         # Let errors propagate so Dramatiq retries the stamp.
@@ -706,7 +732,7 @@ def task_finish_conversation_hook(conversation_id: str) -> None:
 
         # Check if all chunks are already transcribed
         pending = get_pending_chunks(conversation_id)
-        counts = conversation_service.get_chunk_counts(conversation_id)
+        counts = chunk_counts or conversation_service.get_chunk_counts(conversation_id)
 
         logger.info(
             f"Conversation {conversation_id} state: "
@@ -747,6 +773,8 @@ def task_finish_conversation_hook(conversation_id: str) -> None:
 
     except ConversationNotFoundException:
         logger.error(f"NO RETRY: Conversation not found: {conversation_id}")
+        # Deleted: drop it from the idle index for good.
+        clear_idle_deadline(conversation_id)
         # Clear lock on non-retriable error
         try:
             from dembrane.coordination import clear_finish_in_progress
@@ -863,8 +891,65 @@ def task_process_conversation_chunk(
         raise e from e
 
 
+def _prefetch_chunk_counts(conversation_ids: list[str], logger: logging.Logger) -> dict:
+    """Chunk counts for a sweep's whole candidate batch in a few grouped queries.
+
+    Returns {} on failure, in which case each dispatched task reads its own.
+    """
+    if not conversation_ids:
+        return {}
+    from dembrane.service import conversation_service
+
+    try:
+        return conversation_service.get_chunk_counts_many(conversation_ids)
+    except Exception as e:
+        logger.warning(f"Bulk chunk counts failed, tasks will read their own: {e}")
+        return {}
+
+
+@dramatiq.actor(queue_name="network")
+def task_finish_idle_conversations() -> None:
+    """
+    Finish conversations whose idle deadline passed (no chunk for
+    IDLE_FINISH_SECONDS). Pops them off the Redis index (conversation_idle), so
+    a tick costs one ZRANGEBYSCORE no matter how many conversations exist.
+
+    Runs every few seconds via the scheduler.
+    """
+    logger = getLogger("dembrane.tasks.task_finish_idle_conversations")
+
+    from dembrane.conversation_idle import pop_expired_conversations
+
+    try:
+        conversation_ids = pop_expired_conversations()
+        if not conversation_ids:
+            return
+
+        logger.info(f"Finishing {len(conversation_ids)} idle conversations: {conversation_ids}")
+        chunk_counts = _prefetch_chunk_counts(conversation_ids, logger)
+
+        group(
+            [
+                task_finish_conversation_hook.message(
+                    conversation_id, chunk_counts.get(conversation_id)
+                )
+                for conversation_id in conversation_ids
+            ]
+        ).run()
+
+        return
+    except Exception as e:
+        logger.error(f"Error finishing idle conversations: {e}")
+        raise e from e
+
+
 @dramatiq.actor(queue_name="network")
 def task_collect_and_finish_unfinished_conversations() -> None:
+    """
+    Backstop for task_finish_idle_conversations: finds unfinished, idle
+    conversations in Directus that the Redis idle index never saw (created
+    before it existed, or lost in a Redis flush). Runs hourly.
+    """
     logger = getLogger("dembrane.tasks.task_collect_and_finish_unfinished_conversations")
 
     try:
@@ -874,10 +959,13 @@ def task_collect_and_finish_unfinished_conversations() -> None:
 
         unfinished_conversation_ids = collect_unfinished_conversations()
         logger.info(f"Unfinished conversation ids: {unfinished_conversation_ids}")
+        chunk_counts = _prefetch_chunk_counts(unfinished_conversation_ids, logger)
 
         group(
             [
-                task_finish_conversation_hook.message(conversation_id)
+                task_finish_conversation_hook.message(
+                    conversation_id, chunk_counts.get(conversation_id)
+                )
                 for conversation_id in unfinished_conversation_ids
                 if conversation_id is not None
             ]
@@ -920,10 +1008,14 @@ def task_reconcile_transcribed_flag() -> None:
             f"{conversation_ids}"
         )
 
+        chunk_counts = _prefetch_chunk_counts(conversation_ids, logger)
+
         # Trigger finalization for each - it will set the flag and downstream tasks
         group(
             [
-                task_finalize_conversation.message(conversation_id)
+                task_finalize_conversation.message(
+                    conversation_id, chunk_counts.get(conversation_id)
+                )
                 for conversation_id in conversation_ids
                 if conversation_id is not None
             ]
@@ -961,9 +1053,13 @@ def task_catch_up_unsummarized_conversations() -> None:
             f"Found {len(unsummarized_conversation_ids)} unsummarized conversations: {unsummarized_conversation_ids}"
         )
 
+        chunk_counts = _prefetch_chunk_counts(unsummarized_conversation_ids, logger)
+
         group(
             [
-                task_summarize_conversation.message(conversation_id)
+                task_summarize_conversation.message(
+                    conversation_id, chunk_counts.get(conversation_id)
+                )
                 for conversation_id in unsummarized_conversation_ids
                 if conversation_id is not None
             ]
@@ -1170,6 +1266,51 @@ def task_create_project_library(project_id: str, language: str) -> None:
         return
 
 
+@dramatiq.actor(queue_name="network", priority=20, max_retries=0)
+def task_generate_verification_artifact(job_id: str, conversation_id: str, topic_key: str) -> None:
+    """
+    Generate a verification artifact for POST /verify/generate and report
+    progress on the job's channel (dembrane.verify_jobs). Not retried: the
+    participant sees the failure and can generate again.
+    """
+    from fastapi import HTTPException
+
+    from dembrane.api.verify import GenerateArtifactsResponse, generate_verification_artifact
+    from dembrane.verify_jobs import finish_job, publish_job_progress
+
+    logger = getLogger("dembrane.tasks.task_generate_verification_artifact")
+
+    def progress(event_type: str, message: str, detail: Optional[dict] = None) -> None:
+        try:
+            publish_job_progress(job_id, event_type, message, detail)
+        except Exception as e:
+            logger.warning(f"Failed to publish progress for verify job {job_id}: {e}")
+
+    progress("started", "Reading the conversation")
+    try:
+        artifact = run_async_in_new_loop(
+            lambda: generate_verification_artifact(conversation_id, topic_key, progress)
+        )
+    except HTTPException as e:
+        logger.warning(f"Verify job {job_id} rejected: {e.detail}")
+        progress(
+            "failed",
+            "Failed to generate verification artifact",
+            {"status_code": e.status_code, "detail": e.detail},
+        )
+    except Exception as e:
+        logger.error(f"Verify job {job_id} failed: {e}", exc_info=True)
+        progress("failed", "Failed to generate verification artifact")
+    else:
+        progress(
+            "completed",
+            "Artifact ready",
+            GenerateArtifactsResponse(artifact_list=[artifact]).model_dump(),
+        )
+    finally:
+        finish_job(job_id, conversation_id, topic_key)
+
+
 @dramatiq.actor(queue_name="network", priority=50)
 def task_report_summarization_done(report_id: int) -> None:
     """
@@ -1783,39 +1924,65 @@ def task_reconcile_canvas_tick_tasks() -> None:
 
 
 # ── Generic durable scheduled-task runner (ECHO-863) ─────────────────────────
-# Polls the scheduled_task collection for due one-shot tasks, claims them, and
-# dispatches by task_type. See dembrane/scheduled_tasks.py for the model. Fired
-# once a minute by the scheduler; handlers must be idempotent.
+# The due-index runner in the scheduler process claims rows the moment they fall
+# due and sends them to task_run_scheduled_tasks, which dispatches by task_type.
+# task_process_scheduled_tasks is the periodic backstop. See
+# dembrane/scheduled_tasks.py for the model; handlers must be idempotent.
+
+
+@dramatiq.actor(queue_name="network", priority=50, max_retries=0)
+def task_run_scheduled_tasks(rows: list[dict]) -> None:
+    """Run the handlers for scheduled_task rows the due-index runner claimed.
+
+    No retries: the rows are already `processing`, and a worker that dies here
+    leaves them to reconcile_stale_claims like any other crashed claim.
+    """
+    _run_claimed_scheduled_tasks(rows, getLogger("dembrane.tasks.task_run_scheduled_tasks"))
 
 
 @dramatiq.actor(queue_name="network", priority=50)
 def task_process_scheduled_tasks() -> None:
-    """Claim and dispatch every scheduled_task whose time has come.
+    """Backstop for the due-index runner.
 
-    Reconciles stale `processing` rows first (crash recovery), then claims due
-    rows and runs each handler. A handler raising marks that one row `failed`
-    (with the error) and moves on; it does not abort the batch.
+    Reconciles stale `processing` rows first (crash recovery), re-indexes
+    `scheduled` rows coming due (repairs a lost index entry), and claims and
+    runs rows the runner should already have taken (more than
+    OVERDUE_GRACE_SECONDS late, e.g. while no scheduler process was up).
     """
     from dembrane.scheduled_tasks import (
+        OVERDUE_GRACE_SECONDS,
         claim_due_tasks,
-        mark_task_failed,
-        mark_task_completed,
+        rebuild_due_index,
         reconcile_stale_claims,
     )
 
     task_logger = getLogger("dembrane.tasks.task_process_scheduled_tasks")
 
+    overdue_before = (
+        datetime.now(timezone.utc) - timedelta(seconds=OVERDUE_GRACE_SECONDS)
+    ).isoformat()
     with directus_client_context() as client:
         reset = reconcile_stale_claims(client)
         if reset:
             task_logger.info("reset %d stale scheduled_task claim(s)", reset)
-        due = claim_due_tasks(client, limit=50)
+        due = claim_due_tasks(client, limit=50, due_before=overdue_before)
+        try:
+            rebuild_due_index(client)
+        except Exception:
+            task_logger.exception("failed to rebuild the scheduled_task due index")
+
+    if due:
+        task_logger.warning("claimed %d overdue scheduled_task(s) the runner missed", len(due))
+        _run_claimed_scheduled_tasks(due, task_logger)
 
-    if not due:
-        return
 
-    task_logger.info("processing %d due scheduled_task(s)", len(due))
-    for row in due:
+def _run_claimed_scheduled_tasks(rows: list[dict], task_logger: logging.Logger) -> None:
+    """Run each claimed row's handler. A handler raising marks that one row
+    `failed` (with the error) and moves on; it does not abort the batch."""
+    from dembrane.scheduled_tasks import mark_task_failed, mark_task_completed
+
+    task_logger.info("processing %d due scheduled_task(s)", len(rows))
+    for row in rows:
         task_id = str(row.get("id"))
         try:
             _dispatch_scheduled_task(row)
@@ -2436,6 +2603,19 @@ def task_send_invite_email(
         raise RuntimeError(f"invite email send failed: {to}")
 
 
+@dramatiq.actor(queue_name="network", priority=10, max_retries=3)
+def task_emit_notifications(rows: list[dict]) -> None:
+    """Write a large notification fan-out queued by
+    notifications.emit_to_audience.
+
+    Row ids are fixed when the job is queued, so a retry skips the rows an
+    earlier attempt already wrote instead of notifying anyone twice.
+    """
+    from dembrane.notifications import write_notification_rows
+
+    run_async_in_new_loop(write_notification_rows(rows, skip_existing=True))
+
+
 @dramatiq.actor(queue_name="network")
 def task_expire_workspace_tiers() -> None:
     """Hourly cron: downgrade workspaces whose tier_expires_at has elapsed.
@@ -2801,6 +2981,8 @@ def _send_tier_expiring_soon(
     run_async_in_new_loop(
         lambda: emit_to_audience(
             audience_user_ids=audience,
+            # One pre-warning per expiry date, even if the cron retries.
+            idempotency_key=f"TIER_EXPIRING_SOON:{workspace_id}:{expires_at_raw}",
             event_code="TIER_EXPIRING_SOON",
             title=f"{workspace_name} tier expires {expires_date}",
             message=f"Your {current_tier} tier expires on {expires_date}. Request an upgrade to keep full features.",
@@ -2950,6 +3132,42 @@ def task_reconcile_subscription_seats() -> None:
             task_logger.exception("Failed seat-sync for billing account %s", acc.get("id"))
 
 
+@dramatiq.actor(queue_name="network")
+def task_reconcile_usage_counters() -> None:
+    """Rewrite the usage ledger's warm Redis hour counters from Directus.
+
+    The request path reads those counters in O(1) (Pilot hard-block, usage
+    page lifetime hours); this bounds any drift from skipped or racing
+    deltas to one reconcile interval. Idempotent."""
+    task_logger = getLogger("dembrane.tasks.task_reconcile_usage_counters")
+    from dembrane.usage_ledger import reconcile_usage_counters
+
+    rewritten = run_async_in_new_loop(reconcile_usage_counters)
+    task_logger.info("Reconciled %d usage counter(s)", rewritten)
+
+
+@dramatiq.actor(queue_name="network")
+def task_check_usage_ledger() -> None:
+    """Nightly consistency check of the usage ledger against Directus.
+
+    Rewrites the current, previous and lifetime counters and logs each one
+    that had drifted; over-cap stamps read the lifetime counter, so drift is
+    worth a warning. Idempotent."""
+    task_logger = getLogger("dembrane.tasks.task_check_usage_ledger")
+    from dembrane.usage_ledger import check_ledger_consistency
+
+    drifted = run_async_in_new_loop(check_ledger_consistency)
+    for entry in drifted:
+        task_logger.warning(
+            "Usage ledger drift ws=%s cycle=%s counter=%s directus=%s",
+            entry["workspace_id"],
+            entry["cycle"],
+            entry["counter_seconds"],
+            entry["directus_seconds"],
+        )
+    task_logger.info("Usage ledger check: %d drifted counter(s) corrected", len(drifted))
+
+
 @dramatiq.actor(queue_name="network")
 def task_flush_email_digests() -> None:
     """Daily digest flush — sends one summary email per recipient.
@@ -3143,6 +3361,27 @@ def task_fail_abandoned_agentic_runs() -> None:
             task_logger.warning("could not sweep agentic run %s", run_id, exc_info=True)
 
 
+@dramatiq.actor(queue_name="network", priority=30)
+def task_flush_agentic_run_events() -> None:
+    """Persist buffered agentic run events from Redis to Directus.
+
+    Appends only touch the run's Redis Stream (dembrane.agentic_event_log);
+    this tick copies them over in one bulk create per run batch. Runs that
+    reach a terminal status are flushed immediately by set_status, so this
+    mostly catches in-flight turns.
+    """
+    task_logger = getLogger("dembrane.tasks.task_flush_agentic_run_events")
+
+    run_ids = agentic_run_service.unflushed_run_ids()
+    for run_id in run_ids:
+        try:
+            written = agentic_run_service.flush_events(run_id)
+            if written:
+                task_logger.debug("flushed %s events for run %s", written, run_id)
+        except Exception:
+            task_logger.warning("could not flush events for run %s", run_id, exc_info=True)
+
+
 @dramatiq.actor(queue_name="network", priority=100)
 def task_capture_chat_insights() -> None:
     """Summarize idle agentic chats into anonymized usage insights.
@@ -148,44 +148,19 @@ async def _clear_over_cap_stamps(workspace_id: str) -> None:
     only, at their finish time.
     """
     try:
-        project_rows = await async_directus.get_items(
-            "project",
-            {
-                "query": {
-                    "filter": {"workspace_id": {"_eq": workspace_id}},
-                    "fields": ["id"],
-                    "limit": -1,
-                }
-            },
-        )
-        if not isinstance(project_rows, list) or not project_rows:
-            return
-
-        project_ids = [p["id"] for p in project_rows if p.get("id")]
-        if not project_ids:
-            return
-
-        stamped = await async_directus.get_items(
+        cleared = await async_directus.update_by_filter(
             "conversation",
             {
-                "query": {
-                    "filter": {
-                        "project_id": {"_in": project_ids},
-                        "is_over_cap": {"_eq": True},
-                    },
-                    "fields": ["id"],
-                    "limit": -1,
-                }
+                "project_id": {"workspace_id": {"_eq": workspace_id}},
+                "is_over_cap": {"_eq": True},
             },
+            {"is_over_cap": False},
         )
-        if not isinstance(stamped, list) or not stamped:
+        if not cleared:
             return
 
-        for conv in stamped:
-            await async_directus.update_item("conversation", conv["id"], {"is_over_cap": False})
-
         logger.info(
-            f"Cleared is_over_cap on {len(stamped)} conversations "
+            f"Cleared is_over_cap on {len(cleared)} conversations "
             f"in workspace {workspace_id} during downgrade"
         )
     except Exception:
@@ -198,8 +173,14 @@ async def recalculate_over_cap_on_upgrade(workspace_id: str, new_tier: str) -> N
     For overage tiers (pioneer+), no action needed -- live lock formula
     already returns False. For non-overage tiers (free, pilot), clear
     stamps for conversations now within the new tier's included hours.
+
+    compute_is_over_cap is false exactly when a conversation's duration
+    exceeds (workspace hours - included hours), so the affected set is a
+    single duration filter: the workspace total comes from the usage
+    ledger's lifetime counter and the clear is one filtered bulk PATCH.
     """
-    from dembrane.tier_capacity import get_capacity, compute_is_over_cap, tier_allows_overage
+    from dembrane.usage_ledger import get_lifetime_seconds
+    from dembrane.tier_capacity import get_capacity, tier_allows_overage
 
     if tier_allows_overage(new_tier):
         return
@@ -209,51 +190,25 @@ async def recalculate_over_cap_on_upgrade(workspace_id: str, new_tier: str) -> N
         return
 
     try:
-        project_rows = await async_directus.get_items(
-            "project",
-            {
-                "query": {
-                    "filter": {"workspace_id": {"_eq": workspace_id}},
-                    "fields": ["id"],
-                    "limit": -1,
-                }
-            },
+        total_seconds = await get_lifetime_seconds(workspace_id)
+        threshold_seconds = total_seconds - cap.included_hours * 3600
+
+        query_filter: dict = {
+            "project_id": {"workspace_id": {"_eq": workspace_id}},
+            "is_over_cap": {"_eq": True},
+        }
+        # Below zero every stamp clears, including rows with a null duration.
+        if threshold_seconds >= 0:
+            query_filter["duration"] = {"_gt": threshold_seconds}
+
+        cleared = await async_directus.update_by_filter(
+            "conversation", query_filter, {"is_over_cap": False}
         )
-        if not isinstance(project_rows, list) or not project_rows:
-            return
-
-        project_ids = [p["id"] for p in project_rows if p.get("id")]
-        if not project_ids:
-            return
-
-        all_convs = await async_directus.get_items(
-            "conversation",
-            {
-                "query": {
-                    "filter": {"project_id": {"_in": project_ids}},
-                    "fields": ["id", "duration", "is_over_cap"],
-                    "limit": -1,
-                }
-            },
-        )
-        if not isinstance(all_convs, list) or not all_convs:
-            return
-
-        total_hours = sum((int(c.get("duration") or 0) / 3600.0) for c in all_convs)
-
-        cleared = 0
-        for conv in all_convs:
-            if not conv.get("is_over_cap"):
-                continue
-            conv_hours = int(conv.get("duration") or 0) / 3600.0
-            if not compute_is_over_cap(new_tier, total_hours, conv_hours):
-                await async_directus.update_item("conversation", conv["id"], {"is_over_cap": False})
-                cleared += 1
 
         if cleared:
             logger.info(
                 "Cleared is_over_cap on %d conversations in workspace %s after upgrade to %s",
-                cleared,
+                len(cleared),
                 workspace_id,
                 new_tier,
             )
@@ -5,24 +5,21 @@ But it is probably not needed.
 """
 
 # transcribe.py
-import io
-import os
 import json
 import logging
-import mimetypes
-from base64 import b64encode
 from typing import Any, List, Literal, Optional
+from contextlib import ExitStack
 
 import litellm
-import requests
 
-from dembrane.s3 import get_signed_url, get_stream_from_s3
+from dembrane.s3 import get_signed_url
 from dembrane.llms import MODELS, router_completion
 from dembrane.prompts import render_prompt
-from dembrane.service import file_service, conversation_service
+from dembrane.service import conversation_service
 from dembrane.directus import directus
 from dembrane.settings import get_settings
 from dembrane.analytics import capture_event_sync
+from dembrane.audio_input import audio_task, open_audio_upload, audio_content_part
 
 logger = logging.getLogger("transcribe")
 
@@ -46,61 +43,41 @@ def transcribe_audio_litellm(
     """Transcribe audio through LiteLLM"""
     logger = logging.getLogger("transcribe.transcribe_audio_litellm")
 
-    try:
-        audio_stream = get_stream_from_s3(audio_file_uri)
-        audio_bytes = audio_stream.read()
-        filename = os.path.basename(audio_file_uri)
-        mime_type, _ = mimetypes.guess_type(filename)
-        file_upload = (filename, io.BytesIO(audio_bytes), mime_type)
-    except Exception as exc:
-        logger.error(f"Failed to get audio stream from S3 for {audio_file_uri}: {exc}")
-        raise TranscriptionError(f"Failed to get audio stream from S3: {exc}") from exc
-
-    try:
-        if not LITELLM_TRANSCRIPTION_MODEL or not LITELLM_TRANSCRIPTION_API_KEY:
-            raise TranscriptionError("LiteLLM transcription configuration is incomplete.")
-
-        request_kwargs: dict[str, Any] = {
-            "model": LITELLM_TRANSCRIPTION_MODEL,
-            "file": file_upload,
-            "language": language,
-            "prompt": whisper_prompt,
-            "api_key": LITELLM_TRANSCRIPTION_API_KEY,
-        }
-
-        if LITELLM_TRANSCRIPTION_API_BASE:
-            request_kwargs["api_base"] = LITELLM_TRANSCRIPTION_API_BASE
-        if LITELLM_TRANSCRIPTION_API_VERSION:
-            request_kwargs["api_version"] = LITELLM_TRANSCRIPTION_API_VERSION
-
-        response = litellm.transcription(**request_kwargs)
-        return response["text"]
-    except Exception as e:
-        logger.error(f"LiteLLM transcription failed: {e}")
-        raise TranscriptionError(f"LiteLLM transcription failed: {e}") from e
+    with ExitStack() as stack:
+        stack.enter_context(audio_task(audio_file_uri))
+        try:
+            # Spooled to a temp file and streamed into the multipart upload.
+            file_upload = stack.enter_context(open_audio_upload(audio_file_uri))
+        except Exception as exc:
+            logger.error(f"Failed to get audio stream from S3 for {audio_file_uri}: {exc}")
+            raise TranscriptionError(f"Failed to get audio stream from S3: {exc}") from exc
+
+        try:
+            if not LITELLM_TRANSCRIPTION_MODEL or not LITELLM_TRANSCRIPTION_API_KEY:
+                raise TranscriptionError("LiteLLM transcription configuration is incomplete.")
+
+            request_kwargs: dict[str, Any] = {
+                "model": LITELLM_TRANSCRIPTION_MODEL,
+                "file": file_upload,
+                "language": language,
+                "prompt": whisper_prompt,
+                "api_key": LITELLM_TRANSCRIPTION_API_KEY,
+            }
+
+            if LITELLM_TRANSCRIPTION_API_BASE:
+                request_kwargs["api_base"] = LITELLM_TRANSCRIPTION_API_BASE
+            if LITELLM_TRANSCRIPTION_API_VERSION:
+                request_kwargs["api_version"] = LITELLM_TRANSCRIPTION_API_VERSION
+
+            response = litellm.transcription(**request_kwargs)
+            return response["text"]
+        except Exception as e:
+            logger.error(f"LiteLLM transcription failed: {e}")
+            raise TranscriptionError(f"LiteLLM transcription failed: {e}") from e
 
 
 def _get_audio_file_object(audio_file_uri: str) -> Any:
-    try:
-        audio_stream = file_service.get_stream(audio_file_uri)
-        encoded_data = b64encode(audio_stream.read()).decode("utf-8")
-        return {
-            "type": "file",
-            "file": {
-                "file_data": "data:audio/mp3;base64,{}".format(encoded_data),
-            },
-        }
-    except Exception as e:
-        logger.warning(f"failed to get audio bytes for {audio_file_uri} using file service: {e}")
-        logger.info("trying to get audio bytes naively")
-        audio_bytes = requests.get(audio_file_uri).content
-        encoded_data = b64encode(audio_bytes).decode("utf-8")
-        return {
-            "type": "file",
-            "file": {
-                "file_data": "data:audio/mp3;base64,{}".format(encoded_data),
-            },
-        }
+    return audio_content_part(audio_file_uri)
 
 
 def _transcribe_audio_gemini(
@@ -148,6 +125,8 @@ def _transcribe_audio_gemini(
             {"role": "user", "content": [_get_audio_file_object(audio_file_uri)]},
         ],
         response_format={"type": "json_object", "response_schema": response_schema},
+        # Live transcription outranks the background work of its worker.
+        priority="standard",
     )
 
     json_response = json.loads(response.choices[0].message.content)
@@ -207,6 +186,7 @@ def _transcript_correction_workflow(
             },
         ],
         response_format={"type": "json_object", "response_schema": response_schema},
+        priority="standard",
     )
 
     json_response = json.loads(response.choices[0].message.content)
@@ -245,23 +225,25 @@ def transcribe_audio_dembrane_26_07(
     """
     pii_on = use_pii_redaction or anonymize_transcripts
 
-    # Pass 1: transcription only, no redaction.
-    transcript, note = _transcribe_audio_gemini(
-        audio_file_uri, language, hotwords, False, custom_guidance_prompt, prompt_override
-    )
+    # Both passes share one fetch (and in inline mode one encoding) of the audio.
+    with audio_task(audio_file_uri):
+        # Pass 1: transcription only, no redaction.
+        transcript, note = _transcribe_audio_gemini(
+            audio_file_uri, language, hotwords, False, custom_guidance_prompt, prompt_override
+        )
 
-    # Regex runs before correction, matching the old pipeline order.
-    if anonymize_transcripts:
-        from dembrane.pii_regex import regex_redact_pii
+        # Regex runs before correction, matching the old pipeline order.
+        if anonymize_transcripts:
+            from dembrane.pii_regex import regex_redact_pii
 
-        transcript = regex_redact_pii(transcript)
+            transcript = regex_redact_pii(transcript)
 
-    # Never pass keyterms: an empty allow-list is load-bearing so all PII (including
-    # hotword names) is redacted, not exempted.
-    if pii_on:
-        transcript, note = _transcript_correction_workflow(
-            audio_file_uri, transcript, hotwords, True, custom_guidance_prompt
-        )
+        # Never pass keyterms: an empty allow-list is load-bearing so all PII (including
+        # hotword names) is redacted, not exempted.
+        if pii_on:
+            transcript, note = _transcript_correction_workflow(
+                audio_file_uri, transcript, hotwords, True, custom_guidance_prompt
+            )
 
     if transcript == "":
         transcript = "[Nothing to transcribe]"
@@ -0,0 +1,391 @@
+"""Append-only usage ledger with incremental per-workspace hour counters.
+
+Every time a conversation's billable `duration` is set (audio merge,
+retranscribe clone, stateless transcription) we:
+
+1. Apply the *delta* against the duration last recorded for that
+   conversation to two Redis counters: the workspace's calendar-month
+   counter (bucketed by conversation.created_at, matching every usage
+   surface) and its lifetime counter. One Lua script, one round trip —
+   re-recording the same duration is a zero delta, so retried merges
+   never double-count.
+2. Append a `usage_event` row to Directus (conversation, cycle, new
+   duration, delta, source). Append-only; it is the audit trail and the
+   cheap grouped-aggregate source for future billing work.
+
+Reads (`get_cycle_seconds`, `get_lifetime_seconds`) are a single GET on
+the request path. A missing counter is rebuilt from Directus with DB-side
+aggregates (no conversation rows cross the wire) and seeded with SET NX.
+Deltas only ever land on counters that already exist, so a cold counter
+is never initialised from a partial sum.
+
+Drift sources (Redis flush between a rebuild and a re-merge, a delta
+landing in the window between a rebuild's aggregate and its SET) are
+bounded by `reconcile_usage_counters`, which the scheduler runs
+periodically to overwrite every active counter with the Directus truth.
+`check_ledger_consistency` runs nightly over a wider window and reports
+the counters that had drifted.
+
+The lifetime counter also drives the ADR 0001 `is_over_cap` stamp and its
+recomputation on tier changes (`tier_downgrade`), so neither sums
+conversation rows in Python.
+
+Soft-deleted conversations and projects count: PRD §270, delete
+preserves billable duration.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional, Awaitable, cast
+from logging import getLogger
+from datetime import datetime, timezone
+
+from dembrane.redis_async import get_redis_client
+from dembrane.directus_async import async_directus
+
+logger = getLogger("dembrane.usage_ledger")
+
+_KEY_PREFIX = "usage_ledger"
+
+# Counters outlive the month they describe so last month's number stays warm
+# for the usage page's month_offset=1 view; a cold key simply rebuilds.
+COUNTER_TTL_SECONDS = 62 * 24 * 60 * 60
+
+LIFETIME_CYCLE = "lifetime"
+
+USAGE_EVENT_COLLECTION = "usage_event"
+
+# KEYS[1] = per-conversation recorded duration
+# KEYS[2..n] = counters to move by the delta (only if they already exist)
+# ARGV[1] = new duration seconds, ARGV[2] = ttl seconds
+# Returns the applied delta as a string (Lua numbers truncate to int on return).
+_RECORD_DURATION_SCRIPT = """
+local previous = tonumber(redis.call("get", KEYS[1]) or "0")
+local current = tonumber(ARGV[1])
+local delta = current - previous
+redis.call("set", KEYS[1], ARGV[1], "EX", ARGV[2])
+if delta ~= 0 then
+    for i = 2, #KEYS do
+        if redis.call("exists", KEYS[i]) == 1 then
+            redis.call("incrbyfloat", KEYS[i], delta)
+        end
+    end
+end
+return tostring(delta)
+"""
+
+
+def cycle_for(moment: datetime) -> str:
+    """Calendar-month bucket ("YYYY-MM", UTC) a timestamp bills into."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m")
+
+
+def cycle_bounds(cycle: str) -> tuple[str, str]:
+    """(iso_start, iso_end_exclusive) for a "YYYY-MM" cycle."""
+    year, month = (int(part) for part in cycle.split("-", 1))
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = (
+        datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+        if month == 12
+        else start.replace(month=month + 1)
+    )
+    return start.isoformat(), end.isoformat()
+
+
+def counter_key(workspace_id: str, cycle: str) -> str:
+    return f"{_KEY_PREFIX}:ws:{workspace_id}:{cycle}"
+
+
+def conversation_key(conversation_id: str) -> str:
+    return f"{_KEY_PREFIX}:conv:{conversation_id}"
+
+
+def active_workspaces_key(cycle: str) -> str:
+    """Set of workspaces holding a warm counter for `cycle` (reconcile scope)."""
+    return f"{_KEY_PREFIX}:active:{cycle}"
+
+
+def _parse_created_at(value: object) -> Optional[datetime]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _decode_float(raw: object) -> Optional[float]:
+    if raw is None:
+        return None
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8", errors="ignore")
+    try:
+        return float(cast(Any, raw))
+    except (TypeError, ValueError):
+        return None
+
+
+# ── Write path ─────────────────────────────────────────────────────────
+
+
+async def record_conversation_duration(
+    conversation_id: str,
+    duration_seconds: Optional[float],
+    *,
+    source: str,
+) -> Optional[float]:
+    """Record that `conversation_id` now bills `duration_seconds`.
+
+    Call right after the duration is written to Directus. Resolves the
+    workspace + billing cycle in one relational GET, applies the delta to
+    the warm counters atomically, then appends the ledger row. Returns the
+    applied delta, or None when the conversation has no workspace (legacy
+    pre-workspace data) or Redis is unavailable.
+
+    Best-effort: never raises. A skipped record is corrected by the next
+    reconcile, so callers don't need their own try/except.
+    """
+    seconds = float(duration_seconds or 0)
+    try:
+        conv = await async_directus.get_item(
+            "conversation",
+            conversation_id,
+            params={"fields": "created_at,project_id.id,project_id.workspace_id"},
+        )
+    except Exception as exc:
+        logger.warning("usage ledger lookup failed for %s: %s", conversation_id, exc)
+        return None
+
+    project = (conv or {}).get("project_id") if isinstance(conv, dict) else None
+    if not isinstance(project, dict):
+        return None
+    workspace_id = project.get("workspace_id")
+    if isinstance(workspace_id, dict):
+        workspace_id = workspace_id.get("id")
+    if not workspace_id:
+        return None
+
+    created_at = _parse_created_at(conv.get("created_at")) or datetime.now(timezone.utc)
+    cycle = cycle_for(created_at)
+
+    delta: Optional[float] = None
+    try:
+        client = await get_redis_client()
+        raw_result = cast(Any, client).eval(
+            _RECORD_DURATION_SCRIPT,
+            3,
+            conversation_key(conversation_id),
+            counter_key(workspace_id, cycle),
+            counter_key(workspace_id, LIFETIME_CYCLE),
+            repr(seconds),
+            COUNTER_TTL_SECONDS,
+        )
+        delta = _decode_float(await cast(Awaitable[Any], raw_result))
+    except Exception as exc:
+        logger.warning("usage ledger counter update failed for %s: %s", conversation_id, exc)
+
+    try:
+        await async_directus.create_item(
+            USAGE_EVENT_COLLECTION,
+            {
+                "workspace_id": workspace_id,
+                "project_id": project.get("id"),
+                "conversation_id": conversation_id,
+                "cycle": cycle,
+                "duration_seconds": seconds,
+                "delta_seconds": delta,
+                "source": source,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    except Exception as exc:
+        logger.warning("usage_event append failed for %s: %s", conversation_id, exc)
+
+    return delta
+
+
+# ── Read path ──────────────────────────────────────────────────────────
+
+
+async def _workspace_project_ids(workspace_id: str) -> Optional[list[str]]:
+    projects = await async_directus.get_items(
+        "project",
+        {
+            "query": {
+                "filter": {"workspace_id": {"_eq": workspace_id}},
+                "fields": ["id"],
+                "limit": -1,
+            }
+        },
+    )
+    if not isinstance(projects, list):
+        return None
+    return [p["id"] for p in projects if p.get("id")]
+
+
+async def compute_seconds_from_directus(workspace_id: str, cycle: str) -> Optional[float]:
+    """Directus truth for a counter: DB-side `sum(duration)`.
+
+    `cycle` is "YYYY-MM" or LIFETIME_CYCLE. Returns None on a Directus
+    error so callers never seed a counter from a failure.
+    """
+    project_ids = await _workspace_project_ids(workspace_id)
+    if project_ids is None:
+        return None
+    if not project_ids:
+        return 0.0
+
+    conv_filter: dict[str, Any] = {"project_id": {"_in": project_ids}}
+    if cycle != LIFETIME_CYCLE:
+        start, end = cycle_bounds(cycle)
+        conv_filter["created_at"] = {"_gte": start, "_lt": end}
+
+    rows = await async_directus.get_items(
+        "conversation",
+        {"query": {"filter": conv_filter, "aggregate": {"sum": ["duration"]}}},
+    )
+    if not isinstance(rows, list):
+        return None
+    if not rows:
+        return 0.0
+    return float((rows[0].get("sum") or {}).get("duration") or 0)
+
+
+async def _seed_counter(workspace_id: str, cycle: str, seconds: float, *, force: bool) -> None:
+    try:
+        client = await get_redis_client()
+        key = counter_key(workspace_id, cycle)
+        if force:
+            await client.set(key, repr(seconds), ex=COUNTER_TTL_SECONDS)
+        else:
+            await client.set(key, repr(seconds), ex=COUNTER_TTL_SECONDS, nx=True)
+        await cast(Awaitable[int], client.sadd(active_workspaces_key(cycle), workspace_id))
+        await client.expire(active_workspaces_key(cycle), COUNTER_TTL_SECONDS)
+    except Exception as exc:
+        logger.debug("usage ledger seed failed ws=%s cycle=%s err=%s", workspace_id, cycle, exc)
+
+
+async def get_seconds(workspace_id: str, cycle: str) -> float:
+    """O(1) counter read with a Directus-aggregate rebuild on miss.
+
+    Redis-down and Directus-error both degrade to the uncached path / 0.0,
+    never to an exception — usage checks sit on hot request paths.
+    """
+    try:
+        client = await get_redis_client()
+        cached = _decode_float(await client.get(counter_key(workspace_id, cycle)))
+    except Exception as exc:
+        logger.debug("usage ledger read failed ws=%s cycle=%s err=%s", workspace_id, cycle, exc)
+        cached = None
+    if cached is not None:
+        return max(cached, 0.0)
+
+    seconds = await compute_seconds_from_directus(workspace_id, cycle)
+    if seconds is None:
+        return 0.0
+    await _seed_counter(workspace_id, cycle, seconds, force=False)
+    return seconds
+
+
+async def get_cycle_seconds(workspace_id: str, now: Optional[datetime] = None) -> float:
+    """Recorded seconds for the calendar month containing `now`."""
+    return await get_seconds(workspace_id, cycle_for(now or datetime.now(timezone.utc)))
+
+
+async def get_lifetime_seconds(workspace_id: str) -> float:
+    """Recorded seconds across the workspace's whole history."""
+    return await get_seconds(workspace_id, LIFETIME_CYCLE)
+
+
+async def prime_counter(workspace_id: str, cycle: str, seconds: float) -> None:
+    """Seed a cold counter from a sum the caller already computed (e.g. the
+    usage endpoint's per-project aggregate). No-op when the counter is warm."""
+    await _seed_counter(workspace_id, cycle, seconds, force=False)
+
+
+# ── Reconcile ──────────────────────────────────────────────────────────
+
+
+# A nightly check treats a counter within this many seconds of Directus as
+# consistent (float accumulation of many deltas).
+DRIFT_TOLERANCE_SECONDS = 1.0
+
+
+def previous_cycle(cycle: str) -> str:
+    """The "YYYY-MM" cycle before `cycle`."""
+    year, month = (int(part) for part in cycle.split("-", 1))
+    return f"{year - 1}-12" if month == 1 else f"{year}-{month - 1:02d}"
+
+
+async def _reconcile_cycles(cycles: list[str]) -> list[tuple[str, str, Optional[float], float]]:
+    """Overwrite every warm counter of `cycles` with the Directus aggregate.
+
+    Returns (workspace_id, cycle, counter_before, directus_seconds) for each
+    counter rewritten. Scope is the active set, so the cost tracks
+    workspaces that recorded or read usage recently, not every workspace
+    that ever existed.
+    """
+    client = await get_redis_client()
+    rewritten: list[tuple[str, str, Optional[float], float]] = []
+    for cycle in cycles:
+        members = await cast(Awaitable[set], client.smembers(active_workspaces_key(cycle)))
+        workspace_ids = sorted(
+            m.decode("utf-8") if isinstance(m, bytes) else str(m) for m in members or []
+        )
+        for workspace_id in workspace_ids:
+            try:
+                before = _decode_float(await client.get(counter_key(workspace_id, cycle)))
+                seconds = await compute_seconds_from_directus(workspace_id, cycle)
+            except Exception as exc:
+                logger.warning(
+                    "usage reconcile failed ws=%s cycle=%s err=%s", workspace_id, cycle, exc
+                )
+                continue
+            if seconds is None:
+                continue
+            await _seed_counter(workspace_id, cycle, seconds, force=True)
+            rewritten.append((workspace_id, cycle, before, seconds))
+            # Yield between workspaces so one reconcile can't monopolise the loop.
+            await asyncio.sleep(0)
+    return rewritten
+
+
+async def reconcile_usage_counters(now: Optional[datetime] = None) -> int:
+    """Overwrite every warm current-cycle + lifetime counter with the
+    Directus aggregate. Returns the number of counters rewritten."""
+    cycles = [cycle_for(now or datetime.now(timezone.utc)), LIFETIME_CYCLE]
+    return len(await _reconcile_cycles(cycles))
+
+
+async def check_ledger_consistency(
+    now: Optional[datetime] = None,
+    tolerance_seconds: float = DRIFT_TOLERANCE_SECONDS,
+) -> list[dict[str, Any]]:
+    """Nightly consistency check of the hour counters against Directus.
+
+    Covers the previous cycle as well as the current one and lifetime (the
+    periodic reconcile skips last month, which the usage page still shows),
+    rewrites every warm counter, and returns the ones that had drifted by
+    more than `tolerance_seconds` so the caller can log them. Over-cap
+    stamps are computed from the lifetime counter, so drift here is worth
+    surfacing rather than silently absorbing.
+    """
+    current = cycle_for(now or datetime.now(timezone.utc))
+    drifted: list[dict[str, Any]] = []
+    for workspace_id, cycle, before, seconds in await _reconcile_cycles(
+        [current, previous_cycle(current), LIFETIME_CYCLE]
+    ):
+        if before is None or abs(before - seconds) <= tolerance_seconds:
+            continue
+        drifted.append(
+            {
+                "workspace_id": workspace_id,
+                "cycle": cycle,
+                "counter_seconds": before,
+                "directus_seconds": seconds,
+            }
+        )
+    return drifted
@@ -54,6 +54,11 @@ def get_safe_filename(filename: str) -> str:
     return filename.replace("/", "_").replace("\\", "_").replace(" ", "_")
 
 
+def utf16_length(text: str) -> int:
+    """Length as JavaScript counts it, so offsets match the client's `string.length`."""
+    return len(text.encode("utf-16-le")) // 2
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -0,0 +1,161 @@
+"""
+Redis job state for background verification artifact generation.
+
+Generating an artifact reads the conversation, prepares its audio and makes a
+thinking-enabled multimodal call; that takes minutes, so the endpoint claims a
+job here, enqueues task_generate_verification_artifact and the participant
+follows it over SSE. Follows the pub/sub pattern from agentic_runtime.py, plus an
+in-flight claim per conversation/topic so a double-click on "generate" joins
+the running job instead of starting a second one.
+
+- start_job: async, claims the conversation/topic and returns (job_id, created)
+- publish_job_progress: sync, for the Dramatiq worker; stores the event as the
+  job state and publishes it
+- finish_job: sync, releases the claim if this job still holds it
+- get_job_state / subscribe_job_events / read_job_event: async, for the SSE endpoint
+"""
+
+import json
+from typing import Any, Optional
+from logging import getLogger
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
+
+from redis.asyncio.client import PubSub
+
+from dembrane.utils import generate_uuid
+from dembrane.coordination import get_shared_sync_redis
+
+logger = getLogger("dembrane.verify_jobs")
+
+TERMINAL_EVENT_TYPES = ("completed", "failed")
+
+JOB_TTL_SECONDS = 60 * 60
+# Outlives the slowest generation; the claim of a crashed worker lapses by itself.
+INFLIGHT_TTL_SECONDS = 15 * 60
+
+# Delete the claim only if it still names this job.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _state_key(job_id: str) -> str:
+    return f"verify:job:{job_id}"
+
+
+def _channel(job_id: str) -> str:
+    return f"verify:job:{job_id}:progress"
+
+
+def _inflight_key(conversation_id: str, topic_key: str) -> str:
+    return f"verify:inflight:{conversation_id}:{topic_key}"
+
+
+def _event(event_type: str, message: str, detail: Optional[dict] = None) -> str:
+    return json.dumps({"type": event_type, "message": message, "detail": detail})
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+async def start_job(conversation_id: str, topic_key: str) -> tuple[str, bool]:
+    """
+    Claim generation of `topic_key` for `conversation_id`.
+    Returns (job_id, True) for a new job the caller must enqueue, or the
+    running job's id and False when the pair is already being generated.
+    """
+    from dembrane.redis_async import get_redis_client
+
+    client = await get_redis_client()
+    job_id = generate_uuid()
+    inflight_key = _inflight_key(conversation_id, topic_key)
+
+    # State first, so a joining request never sees a job without one.
+    await client.set(_state_key(job_id), _event("queued", "Queued"), ex=JOB_TTL_SECONDS)
+    while not await client.set(inflight_key, job_id, nx=True, ex=INFLIGHT_TTL_SECONDS):
+        existing = await client.get(inflight_key)
+        if existing:
+            await client.delete(_state_key(job_id))
+            return _decode(existing), False
+        # The claim lapsed between SET and GET; try again.
+    return job_id, True
+
+
+def publish_job_progress(
+    job_id: str,
+    event_type: str,
+    message: str,
+    detail: Optional[dict] = None,
+) -> None:
+    """Store the event as the job state and publish it (sync, for Dramatiq workers)."""
+    payload = _event(event_type, message, detail)
+    pipe = get_shared_sync_redis().pipeline()
+    pipe.set(_state_key(job_id), payload, ex=JOB_TTL_SECONDS)
+    pipe.publish(_channel(job_id), payload)
+    pipe.execute()
+
+
+def finish_job(job_id: str, conversation_id: str, topic_key: str) -> None:
+    """Release the conversation/topic claim held by `job_id` (sync, for Dramatiq workers)."""
+    try:
+        get_shared_sync_redis().eval(
+            _RELEASE_SCRIPT, 1, _inflight_key(conversation_id, topic_key), job_id
+        )
+    except Exception as exc:
+        # The claim expires on its own; a failed release only delays the next job.
+        logger.warning("Failed to release verify job %s: %s", job_id, exc)
+
+
+async def get_job_state(job_id: str) -> Optional[dict]:
+    """Latest event of the job, or None for an unknown or expired job."""
+    from dembrane.redis_async import get_redis_client
+
+    client = await get_redis_client()
+    raw = await client.get(_state_key(job_id))
+    if raw is None:
+        return None
+    try:
+        return json.loads(_decode(raw))
+    except json.JSONDecodeError:
+        return None
+
+
+@asynccontextmanager
+async def subscribe_job_events(job_id: str) -> AsyncIterator[PubSub]:
+    """Async context manager to subscribe to a job's progress events."""
+    from dembrane.redis_async import get_redis_client
+
+    client = await get_redis_client()
+    channel = _channel(job_id)
+    pubsub = client.pubsub()
+    await pubsub.subscribe(channel)
+    try:
+        yield pubsub
+    finally:
+        try:
+            await pubsub.unsubscribe(channel)
+        finally:
+            await pubsub.aclose()
+
+
+async def read_job_event(pubsub: PubSub, timeout_seconds: float = 1.0) -> Optional[str]:
+    """
+    Read a single event from the pub/sub channel.
+    Returns decoded JSON string or None on timeout.
+    """
+    message = await pubsub.get_message(
+        ignore_subscribe_messages=True,
+        timeout=timeout_seconds,
+    )
+    if not message:
+        return None
+
+    data = message.get("data")
+    if data is None:
+        return None
+    return _decode(data)
@@ -0,0 +1,164 @@
+"""Idempotent migration: add the append-only `usage_event` ledger collection.
+
+One row per time a conversation's billable duration is set (audio merge,
+stateless transcription). Written by dembrane/usage_ledger.py alongside the
+incremental Redis hour counters; never updated. Ids are denormalised plain
+uuids (no relations) so a row keeps describing what was billed even after
+the project moves or is deleted.
+
+Guarded by collection_exists / field_exists so re-running is a no-op. Run
+this, then pull the schema snapshot (directus/sync.sh) and commit
+directus/sync/snapshot/{collections,fields}/usage_event*.
+
+Usage:
+    DIRECTUS_URL=http://directus:8055 \
+    DIRECTUS_EMAIL=admin@dembrane.com \
+    DIRECTUS_PASSWORD=admin \
+    uv run python scripts/add_usage_event_collection.py
+"""
+
+import os
+import sys
+
+import requests
+
+URL = os.environ.get("DIRECTUS_URL", "http://directus:8055").rstrip("/")
+EMAIL = os.environ.get("DIRECTUS_EMAIL", "admin@dembrane.com")
+PASSWORD = os.environ.get("DIRECTUS_PASSWORD", "admin")
+
+COLLECTION = "usage_event"
+
+
+def login() -> str:
+    res = requests.post(
+        f"{URL}/auth/login",
+        json={"email": EMAIL, "password": PASSWORD},
+        timeout=15,
+    )
+    res.raise_for_status()
+    return res.json()["data"]["access_token"]
+
+
+def _headers(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def collection_exists(token: str, collection: str) -> bool:
+    res = requests.get(f"{URL}/collections/{collection}", headers=_headers(token), timeout=15)
+    if res.status_code == 200:
+        return True
+    if res.status_code in (403, 404):
+        return False
+    res.raise_for_status()
+    return False
+
+
+def field_exists(token: str, collection: str, field: str) -> bool:
+    res = requests.get(f"{URL}/fields/{collection}", headers=_headers(token), timeout=15)
+    if res.status_code in (403, 404):
+        return False
+    res.raise_for_status()
+    return any(f["field"] == field for f in res.json()["data"])
+
+
+def _field(field: str, type_: str, interface: str, note: str, indexed: bool = False) -> dict:
+    return {
+        "field": field,
+        "type": type_,
+        "meta": {"interface": interface, "note": note, "width": "half"},
+        "schema": {"is_nullable": True, "is_indexed": indexed},
+    }
+
+
+FIELDS = [
+    _field(
+        "workspace_id",
+        "uuid",
+        "input",
+        "Workspace billed (denormalised; rows outlive project moves).",
+        indexed=True,
+    ),
+    _field("project_id", "uuid", "input", "Project the conversation belonged to when recorded."),
+    _field(
+        "conversation_id", "uuid", "input", "Conversation whose duration was set.", indexed=True
+    ),
+    _field(
+        "cycle",
+        "string",
+        "input",
+        "Calendar month billed, YYYY-MM (from conversation.created_at).",
+        indexed=True,
+    ),
+    _field("duration_seconds", "float", "input", "Conversation duration after this event."),
+    _field(
+        "delta_seconds",
+        "float",
+        "input",
+        "Change applied to the workspace counters (null if Redis was unavailable).",
+    ),
+    _field("source", "string", "input", "What set the duration: merge, STATELESS_TRANSCRIPTION, ..."),
+    _field("created_at", "timestamp", "datetime", "When the event was recorded."),
+]
+
+
+def ensure_collection(token: str) -> None:
+    if collection_exists(token, COLLECTION):
+        print(f"  {COLLECTION} collection already exists")
+    else:
+        res = requests.post(
+            f"{URL}/collections",
+            headers=_headers(token),
+            json={
+                "collection": COLLECTION,
+                "meta": {
+                    "note": (
+                        "Append-only usage ledger. One row each time a conversation's "
+                        "billable duration is set (merge, stateless transcription). "
+                        "Written by the API; never updated."
+                    ),
+                    "icon": "receipt_long",
+                    "hidden": False,
+                    "singleton": False,
+                },
+                "schema": {"name": COLLECTION},
+                "fields": [
+                    {
+                        "field": "id",
+                        "type": "uuid",
+                        "meta": {
+                            "hidden": True,
+                            "readonly": True,
+                            "interface": "input",
+                            "special": ["uuid"],
+                        },
+                        "schema": {"is_primary_key": True, "is_nullable": False, "is_unique": True},
+                    }
+                ],
+            },
+            timeout=15,
+        )
+        res.raise_for_status()
+        print(f"  created {COLLECTION} collection")
+
+    for payload in FIELDS:
+        name = payload["field"]
+        if field_exists(token, COLLECTION, name):
+            print(f"    {COLLECTION}.{name} already exists")
+            continue
+        res = requests.post(
+            f"{URL}/fields/{COLLECTION}", headers=_headers(token), json=payload, timeout=15
+        )
+        res.raise_for_status()
+        print(f"    created {COLLECTION}.{name}")
+
+
+def main() -> int:
+    token = login()
+    print("usage_event collection:")
+    ensure_collection(token)
+    print("done")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
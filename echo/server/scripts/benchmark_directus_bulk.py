@@ -0,0 +1,149 @@
+"""Benchmark: per-row vs batch Directus updates for a 1,000-row mark-all-read.
+
+Starts a local fake Directus (an in-process HTTP server holding one
+`notification` collection) and marks every unread row read in four ways:
+
+* `sync loop`   — `DirectusClient.update_item` per row, the old pattern.
+* `sync batch`  — `DirectusClient.update_many` (batch PATCH, 100 keys each).
+* `async loop`  — `AsyncDirectusClient.update_item` per row, as
+  `api/v2/notifications.mark_all_read` used to.
+* `async batch` — `AsyncDirectusClient.update_many`.
+
+Every request to the fake sleeps `--rtt` ms first, standing in for the
+network and Directus's own per-request overhead. Prints requests made and
+wall time for each mode. Importing dembrane loads settings, so run it from
+echo/server with the usual .env; nothing is sent anywhere but localhost.
+
+Usage:
+    uv run python scripts/benchmark_directus_bulk.py
+    uv run python scripts/benchmark_directus_bulk.py --rows 5000 --rtt 8
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from typing import Any
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dembrane.directus import DirectusClient  # noqa: E402
+from dembrane.directus_async import AsyncDirectusClient  # noqa: E402
+
+PREFIX = "/items/notification"
+
+
+class _FakeDirectus:
+    def __init__(self, rows: int, rtt_seconds: float) -> None:
+        self.rtt_seconds = rtt_seconds
+        self.rows: dict[str, dict[str, Any]] = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.reset(rows)
+
+    def reset(self, rows: int) -> None:
+        self.rows = {f"n{i}": {"id": f"n{i}", "read_at": None} for i in range(rows)}
+        self.requests = 0
+
+    def unread(self) -> list[str]:
+        return [key for key, row in self.rows.items() if row["read_at"] is None]
+
+    def handle(self, method: str, path: str, body: Any) -> tuple[int, Any]:
+        time.sleep(self.rtt_seconds)
+        with self.lock:
+            self.requests += 1
+            if method == "PATCH" and path.startswith(PREFIX + "/"):
+                key = path[len(PREFIX) + 1 :]
+                self.rows[key].update(body)
+                return 200, {"data": self.rows[key]}
+            if method == "PATCH" and path == PREFIX:
+                for key in body["keys"]:
+                    self.rows[key].update(body["data"])
+                return 200, {"data": [{"id": key} for key in body["keys"]]}
+        return 404, {"errors": [{"message": f"{method} {path} not faked"}]}
+
+
+def _handler(fake: _FakeDirectus) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_PATCH(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"null")
+            status, payload = fake.handle("PATCH", self.path.split("?", 1)[0], body)
+            encoded = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def log_message(self, *_args: Any) -> None:
+            return None
+
+    return Handler
+
+
+async def _async_modes(url: str, fake: _FakeDirectus, rows: int) -> list[tuple[str, int, float]]:
+    client = AsyncDirectusClient(url=url, token="benchmark")
+    results = []
+    try:
+        fake.reset(rows)
+        started = time.monotonic()
+        for key in fake.unread():
+            await client.update_item("notification", key, {"read_at": "now"})
+        results.append(("async loop", fake.requests, time.monotonic() - started))
+
+        fake.reset(rows)
+        started = time.monotonic()
+        await client.update_many("notification", fake.unread(), {"read_at": "now"})
+        results.append(("async batch", fake.requests, time.monotonic() - started))
+    finally:
+        await client.close()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--rtt", type=float, default=4.0, help="per-request latency, ms")
+    args = parser.parse_args()
+
+    fake = _FakeDirectus(args.rows, args.rtt / 1000)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(fake))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results: list[tuple[str, int, float]] = []
+    client = DirectusClient(url=url, token="benchmark")
+
+    fake.reset(args.rows)
+    started = time.monotonic()
+    for key in fake.unread():
+        client.update_item("notification", key, {"read_at": "now"})
+    results.append(("sync loop", fake.requests, time.monotonic() - started))
+    assert not fake.unread()
+
+    fake.reset(args.rows)
+    started = time.monotonic()
+    client.update_many("notification", fake.unread(), {"read_at": "now"})
+    results.append(("sync batch", fake.requests, time.monotonic() - started))
+    assert not fake.unread()
+
+    results.extend(asyncio.run(_async_modes(url, fake, args.rows)))
+    server.shutdown()
+
+    print(f"{args.rows} unread notifications, {args.rtt:.1f} ms per request")
+    print(f"{'mode':<12} {'requests':>9} {'wall':>9}")
+    for name, requests_made, wall in results:
+        print(f"{name:<12} {requests_made:>9} {wall:>8.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Simulation benchmark for latency-aware LLM routing: reports p50/p95/p99.
+
+Runs a local fake deployment set through three policies and prints the
+latency a caller sees:
+
+* `static`   — simple-shuffle over the env-suffix weights (10, 9, 8, ...),
+  i.e. the router before latency-aware weights.
+* `latency`  — the same weighted shuffle, with weights rewritten by
+  `dembrane.llm_routing.LatencyAwareWeights` from recorded samples.
+* `hedged`   — `latency`, plus `hedged()` after the group's p95, the mode
+  used for short interactive calls.
+
+The default deployment set mirrors the production failure mode: three
+healthy regions, one of which turns slow-but-healthy (never erroring, so
+never cooled down) a third of the way through the run. Latencies are
+lognormal per deployment and scaled by `--time-scale` so a run takes seconds.
+
+Nothing leaves the process: samples go to an in-memory store, no LLM or
+Redis is called.
+
+Usage:
+    uv run python scripts/benchmark_llm_routing.py
+    uv run python scripts/benchmark_llm_routing.py --requests 3000 --concurrency 64
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+from typing import Any
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dembrane import llm_routing  # noqa: E402
+from dembrane.llm_routing import LatencyAwareWeights, InMemoryLatencyStore, hedged  # noqa: E402
+
+GROUP = "multi_modal_pro"
+
+# (median seconds, sigma, slow median seconds once degraded or None)
+_DEPLOYMENTS: list[tuple[float, float, float | None]] = [
+    (2.0, 0.35, 9.0),  # primary region, degrades mid-run
+    (2.4, 0.35, None),
+    (2.6, 0.40, None),
+]
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class _FakeRouter:
+    def __init__(self) -> None:
+        self.model_list = [
+            {
+                "model_name": GROUP,
+                "litellm_params": {"model": f"fake/{i}", "weight": max(1, 10 - i)},
+                "model_info": {"id": f"{GROUP}:{i}"},
+            }
+            for i in range(len(_DEPLOYMENTS))
+        ]
+
+    def pick(self) -> dict[str, Any]:
+        weights = [d["litellm_params"]["weight"] for d in self.model_list]
+        return random.choices(self.model_list, weights=weights)[0]
+
+
+class _Simulation:
+    def __init__(self, policy: str, total: int, time_scale: float) -> None:
+        self.policy = policy
+        self.total = total
+        self.time_scale = time_scale
+        self.router = _FakeRouter()
+        self.weights = LatencyAwareWeights(self.router, InMemoryLatencyStore())
+        self.started = 0
+        self.completions = 0
+        self.latencies: list[float] = []
+
+    def _duration(self, index: int) -> float:
+        median, sigma, slow = _DEPLOYMENTS[index]
+        if slow is not None and self.started > self.total / 3:
+            median = slow
+        return random.lognormvariate(0, sigma) * median
+
+    async def _attempt(self) -> float:
+        deployment = self.router.pick()
+        index = int(deployment["model_info"]["id"].rsplit(":", 1)[1])
+        seconds = self._duration(index)
+        self.completions += 1
+        await asyncio.sleep(seconds * self.time_scale)
+        if self.policy != "static":
+            self.weights._record(
+                {"litellm_params": {"model_info": deployment["model_info"]}}, 0.0, seconds, False
+            )
+        return seconds
+
+    async def _request(self) -> None:
+        self.started += 1
+        begin = time.monotonic()
+        if self.policy == "hedged":
+            delay = self.weights.hedge_delay(GROUP) * self.time_scale
+            await hedged(self._attempt, delay)
+        else:
+            await self._attempt()
+        self.latencies.append((time.monotonic() - begin) / self.time_scale)
+
+    async def run(self, concurrency: int) -> None:
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for n in range(self.total):
+            queue.put_nowait(n)
+
+        async def _worker() -> None:
+            while not queue.empty():
+                queue.get_nowait()
+                await self._request()
+
+        await asyncio.gather(*[_worker() for _ in range(concurrency)])
+
+
+async def _main(args: argparse.Namespace) -> None:
+    # Refresh weights often relative to the compressed clock.
+    llm_routing.STATS_REFRESH_SECONDS = 0.0
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"{len(_DEPLOYMENTS)} deployments (primary degrades after 1/3)"
+    )
+    print(f"{'policy':<8} {'p50':>7} {'p95':>7} {'p99':>7} {'calls/req':>10}")
+    for policy in ("static", "latency", "hedged"):
+        random.seed(args.seed)
+        simulation = _Simulation(policy, args.requests, args.time_scale)
+        await simulation.run(args.concurrency)
+        ordered = sorted(simulation.latencies)
+        print(
+            f"{policy:<8} {_percentile(ordered, 50):>6.2f}s {_percentile(ordered, 95):>6.2f}s "
+            f"{_percentile(ordered, 99):>6.2f}s {simulation.completions / args.requests:>10.2f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--requests", type=int, default=1500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--time-scale", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(_main(parser.parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
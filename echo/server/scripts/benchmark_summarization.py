@@ -0,0 +1,129 @@
+"""Benchmark: fixed-batch vs sliding-window conversation summarization.
+
+Runs a fake summarizer with a heavy-tailed latency distribution (most calls
+lognormal around --median seconds, --tail-share of them 5-30x slower, like a
+long transcript or a congested deployment) through:
+
+* `batched` — the previous `ensure_conversation_summaries` loop: batches of
+  `--concurrency` via gather, each batch waiting on its slowest call.
+* `window`  — `summary_utils.summarize_conversations`: `--concurrency`
+  workers, each taking the next conversation as soon as it is free.
+* `window+timeout` — the same with `--timeout`, so a pathological call frees
+  its slot (and counts as failed).
+
+Prints wall time, throughput and the p50/p95 time until each conversation's
+summary is done. Latencies are scaled by --time-scale so a run takes seconds.
+Nothing leaves the process, but importing dembrane loads settings, so run it
+from echo/server with the usual .env.
+
+Usage:
+    uv run python scripts/benchmark_summarization.py
+    uv run python scripts/benchmark_summarization.py --conversations 400 --concurrency 10
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+from typing import Callable, Optional, Awaitable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dembrane.summary_utils import SummarizationResult, summarize_conversations  # noqa: E402
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _latencies(args: argparse.Namespace) -> dict[str, float]:
+    rng = random.Random(args.seed)
+    latencies = {}
+    for n in range(args.conversations):
+        seconds = rng.lognormvariate(0, 0.4) * args.median
+        if rng.random() < args.tail_share:
+            seconds *= rng.uniform(5, 30)
+        latencies[f"conv-{n}"] = seconds
+    return latencies
+
+
+def _fake_summarizer(
+    latencies: dict[str, float], time_scale: float, done_at: dict[str, float], started: float
+) -> Callable[[str], Awaitable[SummarizationResult]]:
+    async def _summarize(conversation_id: str) -> SummarizationResult:
+        await asyncio.sleep(latencies[conversation_id] * time_scale)
+        done_at[conversation_id] = time.monotonic() - started
+        return SummarizationResult(conversation_id=conversation_id, success=True, summary="...")
+
+    return _summarize
+
+
+async def _batched(
+    ids: list[str], concurrency: int, summarize: Callable[[str], Awaitable[SummarizationResult]]
+) -> None:
+    for i in range(0, len(ids), concurrency):
+        await asyncio.gather(*[summarize(cid) for cid in ids[i : i + concurrency]])
+
+
+async def _run(
+    name: str, args: argparse.Namespace, latencies: dict[str, float], timeout: Optional[float]
+) -> None:
+    ids = list(latencies)
+    done_at: dict[str, float] = {}
+    started = time.monotonic()
+    summarize = _fake_summarizer(latencies, args.time_scale, done_at, started)
+    failed = 0
+    if name == "batched":
+        await _batched(ids, args.concurrency, summarize)
+    else:
+        result = await summarize_conversations(
+            ids,
+            concurrency=args.concurrency,
+            item_timeout=timeout * args.time_scale if timeout else None,
+            summarize=summarize,
+        )
+        failed = len(result.failed)
+    wall = (time.monotonic() - started) / args.time_scale
+    finished = sorted(value / args.time_scale for value in done_at.values())
+    print(
+        f"{name:<15} {wall:>8.0f}s {len(ids) / wall * 60:>9.1f}/min "
+        f"{_percentile(finished, 50):>7.0f}s {_percentile(finished, 95):>7.0f}s {failed:>7}"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    latencies = _latencies(args)
+    ordered = sorted(latencies.values())
+    print(
+        f"{args.conversations} conversations, concurrency {args.concurrency}, "
+        f"call p50 {_percentile(ordered, 50):.1f}s p95 {_percentile(ordered, 95):.1f}s "
+        f"max {ordered[-1]:.1f}s"
+    )
+    print(
+        f"{'mode':<15} {'wall':>9} {'throughput':>13} {'p50 done':>8} {'p95 done':>8} {'failed':>7}"
+    )
+    await _run("batched", args, latencies, None)
+    await _run("window", args, latencies, None)
+    await _run("window+timeout", args, latencies, args.timeout)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--median", type=float, default=8.0, help="median call seconds")
+    parser.add_argument("--tail-share", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-item timeout seconds")
+    parser.add_argument("--time-scale", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(_main(parser.parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Load test for the participant liveness ping: reports p50/p95/p99 latency.
+
+Simulates many concurrent participants, each pinging every `--interval`
+seconds with realistic telemetry (state changes, client_ts ordering, a
+project_id so the monitor active index + publish path is exercised).
+
+Two targets:
+
+* `redis` (default) drives `mark_conversation_seen` directly against the
+  Redis in REDIS_URL — measures the ping pipeline itself (one Lua
+  round trip per ping) without HTTP/uvicorn noise.
+* `http` POSTs to a running API's `/participant/conversations/{id}/ping`
+  — end-to-end, including the per-IP rate limiter (run it against a local
+  stack with a raised limit, or from many IPs).
+
+Keys are namespaced under a random run id (conversation ids `lt-<run>-N`,
+project `lt-<run>`); liveness keys expire on their own TTL.
+
+Usage:
+    uv run python scripts/loadtest_participant_ping.py --participants 2000 --duration 30
+    uv run python scripts/loadtest_participant_ping.py --target http \\
+        --url http://localhost:8000/api --participants 500
+"""
+
+import sys
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from typing import Any, Optional
+
+_STATES = ("waiting", "recording", "recording", "recording", "paused", "backgrounded")
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _telemetry(seq: int) -> dict[str, Any]:
+    return {
+        "state": random.choice(_STATES),
+        "mode": "voice",
+        "audio_level": round(random.random(), 2),
+        "recorded_seconds": float(seq * 5),
+        "client_ts": int(time.time() * 1000),
+        "network": {"effective_type": "4g", "online": True},
+    }
+
+
+async def _participant_redis(
+    conversation_id: str, project_id: str, deadline: float, interval: float, out: list[float]
+) -> int:
+    from dembrane.conversation_liveness import mark_conversation_seen
+
+    errors = 0
+    seq = 0
+    # Spread the first pings so participants don't all fire in lockstep.
+    await asyncio.sleep(random.random() * interval)
+    while time.monotonic() < deadline:
+        seq += 1
+        started = time.perf_counter()
+        try:
+            await mark_conversation_seen(
+                conversation_id, telemetry=_telemetry(seq), project_id=project_id
+            )
+            out.append(time.perf_counter() - started)
+        except Exception:  # noqa: BLE001
+            errors += 1
+        await asyncio.sleep(interval)
+    return errors
+
+
+async def _participant_http(
+    client: Any,
+    url: str,
+    conversation_id: str,
+    project_id: str,
+    deadline: float,
+    interval: float,
+    out: list[float],
+) -> int:
+    errors = 0
+    seq = 0
+    await asyncio.sleep(random.random() * interval)
+    while time.monotonic() < deadline:
+        seq += 1
+        body = {"project_id": project_id, **_telemetry(seq)}
+        started = time.perf_counter()
+        try:
+            res = await client.post(
+                f"{url}/participant/conversations/{conversation_id}/ping", json=body
+            )
+            out.append(time.perf_counter() - started)
+            if res.status_code != 200 or not res.json().get("ok"):
+                errors += 1
+        except Exception:  # noqa: BLE001
+            errors += 1
+        await asyncio.sleep(interval)
+    return errors
+
+
+async def run(args: argparse.Namespace) -> int:
+    run_id = uuid.uuid4().hex[:8]
+    project_id = f"lt-{run_id}"
+    conversation_ids = [f"lt-{run_id}-{i}" for i in range(args.participants)]
+    latencies: list[float] = []
+    deadline = time.monotonic() + args.duration
+
+    client: Optional[Any] = None
+    if args.target == "http":
+        import httpx
+
+        client = httpx.AsyncClient(
+            timeout=10,
+            limits=httpx.Limits(max_connections=args.max_connections),
+        )
+        tasks = [
+            _participant_http(
+                client, args.url.rstrip("/"), cid, project_id, deadline, args.interval, latencies
+            )
+            for cid in conversation_ids
+        ]
+    else:
+        tasks = [
+            _participant_redis(cid, project_id, deadline, args.interval, latencies)
+            for cid in conversation_ids
+        ]
+
+    wall_start = time.monotonic()
+    try:
+        errors = sum(await asyncio.gather(*tasks))
+    finally:
+        if client is not None:
+            await client.aclose()
+    wall = time.monotonic() - wall_start
+
+    if args.target == "redis":
+        from dembrane.redis_async import get_redis_client
+        from dembrane.monitor_stream import active_index_key
+
+        redis_client = await get_redis_client()
+        await redis_client.delete(active_index_key(project_id))
+
+    values = sorted(latencies)
+    print(
+        f"target={args.target} participants={args.participants} "
+        f"interval={args.interval}s duration={args.duration}s"
+    )
+    print(f"pings={len(values)} errors={errors} throughput={len(values) / wall:.0f}/s")
+    if values:
+        print(
+            "latency ms: "
+            f"p50={_percentile(values, 50) * 1000:.2f} "
+            f"p95={_percentile(values, 95) * 1000:.2f} "
+            f"p99={_percentile(values, 99) * 1000:.2f} "
+            f"max={values[-1] * 1000:.2f}"
+        )
+    return 1 if errors else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", choices=("redis", "http"), default="redis")
+    parser.add_argument("--url", default="http://localhost:8000/api")
+    parser.add_argument("--participants", type=int, default=1000)
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between pings")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--max-connections", type=int, default=200)
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
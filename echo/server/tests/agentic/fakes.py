@@ -17,7 +17,14 @@ class InMemoryDirectus:
             "project_agentic_run_event": 0,
         }
 
-    def create_item(self, collection: str, item_data: dict[str, Any]) -> dict[str, Any]:
+    def create_item(
+        self, collection: str, item_data: dict[str, Any] | list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        if isinstance(item_data, list):
+            return {"data": [self._create_one(collection, item) for item in item_data]}
+        return {"data": self._create_one(collection, item_data)}
+
+    def _create_one(self, collection: str, item_data: dict[str, Any]) -> dict[str, Any]:
         if collection not in self._collections:
             self._collections[collection] = {}
             self._counters[collection] = 0
@@ -28,7 +35,7 @@ class InMemoryDirectus:
             record["id"] = f"{collection}-{self._counters[collection]}"
 
         self._collections[collection][record["id"]] = record
-        return {"data": deepcopy(record)}
+        return deepcopy(record)
 
     def update_item(self, collection: str, item_id: str, item_data: dict[str, Any]) -> dict[str, Any]:
         table = self._collections.get(collection, {})
@@ -53,7 +60,7 @@ class InMemoryDirectus:
             rows.sort(key=lambda row: row.get(field), reverse=reverse)
 
         limit = query.get("limit")
-        if isinstance(limit, int):
+        if isinstance(limit, int) and limit >= 0:
             rows = rows[:limit]
 
         return rows
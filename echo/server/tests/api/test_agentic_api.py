@@ -1034,7 +1034,8 @@ async def test_history_replay_drops_stale_focus_from_earlier_turns() -> None:
     "prioritize these conversations" standing with nothing superseding it, so the
     agent kept narrowing."""
     from dembrane.api.agentic import _build_initial_agent_prompt_content
-    from dembrane.agentic_worker import _build_message_history
+    from dembrane.agentic_worker import _load_history_entries
+    from dembrane.agentic_history import window_history
 
     run_service = AgenticRunService(directus_client=InMemoryDirectus())
     run = run_service.create_run(
@@ -1073,7 +1074,8 @@ async def test_history_replay_drops_stale_focus_from_earlier_turns() -> None:
         {"content": "now look at ALL conversations"},
     )
 
-    history = await _build_message_history(svc=run_service, run_id=run["id"])
+    entries = await _load_history_entries(svc=run_service, run_id=run["id"])
+    history = window_history(entries, None)
 
     assert [message["role"] for message in history] == ["user", "assistant", "user"]
     assert "<focused_conversations>" not in history[0]["content"]
@@ -1089,7 +1091,8 @@ async def test_history_replay_drops_stale_focus_from_earlier_turns() -> None:
 @pytest.mark.asyncio
 async def test_history_replay_keeps_focus_on_the_current_turn() -> None:
     from dembrane.api.agentic import _build_followup_agent_prompt_content
-    from dembrane.agentic_worker import _build_message_history
+    from dembrane.agentic_worker import _load_history_entries
+    from dembrane.agentic_history import window_history
 
     run_service = AgenticRunService(directus_client=InMemoryDirectus())
     run = run_service.create_run(
@@ -1117,7 +1120,8 @@ async def test_history_replay_keeps_focus_on_the_current_turn() -> None:
         },
     )
 
-    history = await _build_message_history(svc=run_service, run_id=run["id"])
+    entries = await _load_history_entries(svc=run_service, run_id=run["id"])
+    history = window_history(entries, None)
 
     assert history[-1]["content"] == current_turn_prompt
     assert "<focused_conversations>" in history[-1]["content"]
@@ -3040,6 +3044,12 @@ async def test_stream_live_events_forwards_drafts_without_cursor_advance(monkeyp
     async def _no_db_events(_run_id: str, after_seq: int) -> list[dict[str, Any]]:  # noqa: ARG001
         return []
 
+    async def _no_run_log(_run_id: str, _after_seq: int) -> None:
+        return None
+
+    async def _no_run_log_status(_run_id: str) -> None:
+        return None
+
     # After the queue drains, report the run terminal so the loop exits.
     def _fake_get_run(_run_id: str) -> dict[str, Any]:
         return {"id": run_id, "status": "completed" if not live_queue else "running"}
@@ -3048,6 +3058,8 @@ async def test_stream_live_events_forwards_drafts_without_cursor_advance(monkeyp
     monkeypatch.setattr(agentic_api, "read_live_event", _fake_read)
     monkeypatch.setattr(agentic_api, "_list_events_after", _no_db_events)
     monkeypatch.setattr(agentic_api, "_get_run_or_404", _fake_get_run)
+    monkeypatch.setattr(agentic_api, "read_run_log_after", _no_run_log)
+    monkeypatch.setattr(agentic_api, "get_run_log_status", _no_run_log_status)
 
     frames = []
     async for frame in agentic_api._stream_live_events(run_id, after_seq=0):
@@ -3093,6 +3105,12 @@ async def test_stream_live_events_forwards_drafts_to_reconnecting_clients(monkey
     async def _no_db_events(_run_id: str, after_seq: int) -> list[dict[str, Any]]:  # noqa: ARG001
         return []
 
+    async def _no_run_log(_run_id: str, _after_seq: int) -> None:
+        return None
+
+    async def _no_run_log_status(_run_id: str) -> None:
+        return None
+
     def _fake_get_run(_run_id: str) -> dict[str, Any]:
         return {"id": run_id, "status": "completed" if not live_queue else "running"}
 
@@ -3100,6 +3118,8 @@ async def test_stream_live_events_forwards_drafts_to_reconnecting_clients(monkey
     monkeypatch.setattr(agentic_api, "read_live_event", _fake_read)
     monkeypatch.setattr(agentic_api, "_list_events_after", _no_db_events)
     monkeypatch.setattr(agentic_api, "_get_run_or_404", _fake_get_run)
+    monkeypatch.setattr(agentic_api, "read_run_log_after", _no_run_log)
+    monkeypatch.setattr(agentic_api, "get_run_log_status", _no_run_log_status)
 
     frames = []
     async for frame in agentic_api._stream_live_events(run_id, after_seq=42):
@@ -3108,3 +3128,61 @@ async def test_stream_live_events_forwards_drafts_to_reconnecting_clients(monkey
     draft_frames = [f for f in frames if "assistant.draft" in f]
     assert len(draft_frames) == 1
     assert '"text": "Full text so far, resent whole"' in draft_frames[0]
+
+
+@pytest.mark.asyncio
+async def test_stream_live_events_holds_back_draft_deltas_until_a_checkpoint(monkeypatch) -> None:
+    """A watcher that joined mid-message (or lost a frame) only gets deltas
+    that extend text it already has; the next checkpoint resyncs it."""
+    run_id = "run-draft-delta"
+
+    def _frame(event_type: str, **payload: Any) -> str:
+        return json.dumps({"event_type": event_type, "payload": {"message_id": "m-1", **payload}})
+
+    live_queue = [
+        _frame("assistant.draft.delta", offset=5, text=" wor"),  # joined late: no base
+        # Offsets count UTF-16 units: the emoji is 2, its variation selector 1.
+        _frame("assistant.draft", text="Hi 🎙️ wor"),
+        _frame("assistant.draft.delta", offset=10, text="ld"),
+        _frame("assistant.draft.delta", offset=20, text="??"),  # gap: dropped frame
+        _frame("assistant.draft", text="Hello world, again"),
+        _frame("assistant.draft.delta", offset=18, text="!"),
+    ]
+
+    class _FakePubSub:
+        pass
+
+    @asynccontextmanager
+    async def _fake_subscribe(_run_id: str):
+        yield _FakePubSub()
+
+    async def _fake_read(_pubsub: Any, timeout_seconds: float = 1.0) -> str | None:  # noqa: ARG001
+        if live_queue:
+            return live_queue.pop(0)
+        return None
+
+    async def _no_db_events(_run_id: str, after_seq: int) -> list[dict[str, Any]]:  # noqa: ARG001
+        return []
+
+    async def _no_run_log(_run_id: str, _after_seq: int) -> None:
+        return None
+
+    async def _terminal_status(_run_id: str) -> str:
+        return "completed"
+
+    monkeypatch.setattr(agentic_api, "subscribe_live_events", _fake_subscribe)
+    monkeypatch.setattr(agentic_api, "read_live_event", _fake_read)
+    monkeypatch.setattr(agentic_api, "_list_events_after", _no_db_events)
+    monkeypatch.setattr(agentic_api, "read_run_log_after", _no_run_log)
+    monkeypatch.setattr(agentic_api, "get_run_log_status", _terminal_status)
+
+    frames = [frame async for frame in agentic_api._stream_live_events(run_id, after_seq=0)]
+
+    forwarded = [json.loads(frame.split("data: ", 1)[1]) for frame in frames if "draft" in frame]
+    assert [(f["event_type"], f["payload"]["text"]) for f in forwarded] == [
+        ("assistant.draft", "Hi 🎙️ wor"),
+        ("assistant.draft.delta", "ld"),
+        ("assistant.draft", "Hello world, again"),
+        ("assistant.draft.delta", "!"),
+    ]
+    assert frames[1].startswith("event: assistant.draft.delta\n")
@@ -53,7 +53,7 @@ def _bypass_rate_limits(monkeypatch):
 def test_ping_conversation_returns_ok(monkeypatch) -> None:
     seen: list[tuple[str, object]] = []
 
-    async def _fake_mark(conversation_id: str, *, telemetry: Any = None) -> None:
+    async def _fake_mark(conversation_id: str, *, telemetry: Any = None, **_kwargs: Any) -> None:
         seen.append((conversation_id, telemetry))
 
     monkeypatch.setattr(participant, "mark_conversation_seen", _fake_mark)
@@ -66,23 +66,21 @@ def test_ping_conversation_returns_ok(monkeypatch) -> None:
 
 def test_ping_conversation_persists_and_publishes_telemetry(monkeypatch) -> None:
     seen: list[tuple[str, object]] = []
+    projects: list[Optional[str]] = []
     published: list[str] = []
-    registered: list[tuple[str, str]] = []
 
-    async def _fake_mark(conversation_id: str, *, telemetry: Any = None) -> None:
+    async def _fake_mark(
+        conversation_id: str, *, telemetry: Any = None, project_id: Any = None, score: Any = None
+    ) -> None:
         seen.append((conversation_id, telemetry))
+        projects.append(project_id)
+        assert isinstance(score, float)
 
     async def _fake_publish(project_id: str) -> None:
         published.append(project_id)
 
-    async def _fake_register(
-        project_id: str, conversation_id: str, *, score: float
-    ) -> None:  # noqa: ARG001
-        registered.append((project_id, conversation_id))
-
     monkeypatch.setattr(participant, "mark_conversation_seen", _fake_mark)
     monkeypatch.setattr(participant, "publish_monitor_dirty", _fake_publish)
-    monkeypatch.setattr(participant, "register_active_conversation", _fake_register)
 
     body = participant.ConversationPingRequest(
         project_id="proj-9",
@@ -100,14 +98,32 @@ def test_ping_conversation_persists_and_publishes_telemetry(monkeypatch) -> None
     assert telemetry["mode"] == "voice"
     assert telemetry["network"] == {"effective_type": "3g", "online": True}
     assert telemetry["battery"] == {"level": 0.4, "charging": False}
-    assert published == ["proj-9"]
-    assert registered == [("proj-9", "conv-1")]
+    # Active-index update + dirty publish ride the same atomic liveness call.
+    assert projects == ["proj-9"]
+    assert published == []
+
+
+def test_ping_conversation_ignores_absurd_project_id(monkeypatch) -> None:
+    projects: list[Optional[str]] = []
+
+    async def _fake_mark(conversation_id: str, *, project_id: Any = None, **_kwargs: Any) -> None:
+        projects.append(project_id)
+
+    monkeypatch.setattr(participant, "mark_conversation_seen", _fake_mark)
+
+    body = participant.ConversationPingRequest(
+        project_id="p" * (participant._MAX_PING_ID_LEN + 1)
+    )
+    result = _run(participant.ping_conversation("conv-1", _FakeRequest(), body))
+
+    assert result == {"ok": True}
+    assert projects == [None]
 
 
 def test_ping_conversation_clamps_audio_level(monkeypatch) -> None:
     captured: list[Any] = []
 
-    async def _fake_mark(conversation_id: str, *, telemetry: Any = None) -> None:  # noqa: ARG001
+    async def _fake_mark(conversation_id: str, *, telemetry: Any = None, **_kwargs: Any) -> None:  # noqa: ARG001
         captured.append(telemetry)
 
     monkeypatch.setattr(participant, "mark_conversation_seen", _fake_mark)
@@ -132,7 +148,7 @@ def test_ping_conversation_clamps_audio_level(monkeypatch) -> None:
 def test_ping_conversation_sanitises_recorder_timers(monkeypatch) -> None:
     captured: list[Any] = []
 
-    async def _fake_mark(conversation_id: str, *, telemetry: Any = None) -> None:  # noqa: ARG001
+    async def _fake_mark(conversation_id: str, *, telemetry: Any = None, **_kwargs: Any) -> None:  # noqa: ARG001
         captured.append(telemetry)
 
     monkeypatch.setattr(participant, "mark_conversation_seen", _fake_mark)
@@ -158,7 +174,7 @@ def test_ping_conversation_sanitises_recorder_timers(monkeypatch) -> None:
 def test_ping_conversation_drops_unknown_state(monkeypatch) -> None:
     seen: list[Any] = []
 
-    async def _fake_mark(conversation_id: str, *, telemetry: Any = None) -> None:  # noqa: ARG001
+    async def _fake_mark(conversation_id: str, *, telemetry: Any = None, **_kwargs: Any) -> None:  # noqa: ARG001
         seen.append(telemetry)
 
     monkeypatch.setattr(participant, "mark_conversation_seen", _fake_mark)
@@ -174,7 +190,7 @@ def test_ping_conversation_best_effort_on_redis_error(monkeypatch) -> None:
     """A Redis blip must never raise into the participant's recording loop —
     the endpoint always returns a clean JSON response instead."""
 
-    async def _boom(conversation_id: str, *, telemetry: Any = None) -> None:  # noqa: ARG001
+    async def _boom(conversation_id: str, *, telemetry: Any = None, **_kwargs: Any) -> None:  # noqa: ARG001
         raise RuntimeError("redis down")
 
     monkeypatch.setattr(participant, "mark_conversation_seen", _boom)
@@ -189,7 +205,7 @@ def test_ping_conversation_rate_limited_drops_silently(monkeypatch) -> None:
     never touch Redis liveness state."""
     calls: list[str] = []
 
-    async def _fake_mark(conversation_id: str, *, telemetry: Any = None) -> None:  # noqa: ARG001
+    async def _fake_mark(conversation_id: str, *, telemetry: Any = None, **_kwargs: Any) -> None:  # noqa: ARG001
         calls.append(conversation_id)
 
     async def _deny(_identifier: str) -> bool:
@@ -207,7 +223,7 @@ def test_ping_conversation_rate_limited_drops_silently(monkeypatch) -> None:
 def test_ping_conversation_absurd_id_length_drops_silently(monkeypatch) -> None:
     calls: list[str] = []
 
-    async def _fake_mark(conversation_id: str, *, telemetry: Any = None) -> None:  # noqa: ARG001
+    async def _fake_mark(conversation_id: str, *, telemetry: Any = None, **_kwargs: Any) -> None:  # noqa: ARG001
         calls.append(conversation_id)
 
     monkeypatch.setattr(participant, "mark_conversation_seen", _fake_mark)
@@ -223,7 +239,7 @@ def test_ping_conversation_monitor_disabled_drops_silently(monkeypatch) -> None:
     """Server-side kill switch: the beacon no-ops (no Redis write) and reports ok."""
     calls: list[str] = []
 
-    async def _fake_mark(conversation_id: str, *, telemetry: Any = None) -> None:  # noqa: ARG001
+    async def _fake_mark(conversation_id: str, *, telemetry: Any = None, **_kwargs: Any) -> None:  # noqa: ARG001
         calls.append(conversation_id)
 
     monkeypatch.setattr(participant, "mark_conversation_seen", _fake_mark)
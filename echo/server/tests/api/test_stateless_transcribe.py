@@ -8,6 +8,7 @@ import pytest
 from httpx import AsyncClient, ASGITransport
 from fastapi import FastAPI, HTTPException
 
+import dembrane.usage_ledger as usage_ledger
 import dembrane.api.stateless as stateless_api
 import dembrane.api.conversation as conversation_api
 from dembrane.api.v2.bff import _access as bff_access
@@ -111,6 +112,11 @@ def fake_directus(monkeypatch: pytest.MonkeyPatch) -> _FakeDirectus:
     monkeypatch.setattr(
         conversation_api, "_invalidate_usage_cache_for_conversation", _no_cache_bust
     )
+
+    async def _no_ledger(*_args: Any, **_kwargs: Any) -> None:
+        return None
+
+    monkeypatch.setattr(usage_ledger, "record_conversation_duration", _no_ledger)
     return directus
 
 
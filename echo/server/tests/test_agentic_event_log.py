@@ -0,0 +1,226 @@
+"""Agentic run event log: Redis Stream appends, stitched reads, write-behind flush."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+import dembrane.agentic_event_log as event_log
+from tests.agentic.fakes import InMemoryDirectus
+from dembrane.service.agentic import RUN_EVENT_COLLECTION, AgenticRunService
+
+
+def _seq(entry_id: str) -> int:
+    return int(entry_id.split("-", 1)[0])
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeSyncRedis") -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, tuple, dict]] = []
+
+    def xrange(self, *args: Any, **kwargs: Any) -> None:
+        self._calls.append(("xrange", args, kwargs))
+
+    def get(self, *args: Any, **kwargs: Any) -> None:
+        self._calls.append(("get", args, kwargs))
+
+    def execute(self) -> list[Any]:
+        return [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+
+
+class _FakeSyncRedis:
+    """Sync Redis stand-in: strings, streams keyed by seq, a zset, and `eval`
+    emulating the append / mark-flushed / release-lock scripts."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self.unflushed: dict[str, float] = {}
+        self.evals = 0
+
+    def get(self, key: str) -> str | None:
+        return self.store.get(key)
+
+    def set(self, key: str, value: Any, nx: bool = False, ex: int | None = None) -> bool:  # noqa: ARG002
+        if nx and key in self.store:
+            return False
+        self.store[key] = str(value)
+        return True
+
+    def xrange(self, key: str, min: str = "-", max: str = "+", count: int | None = None) -> list:  # noqa: A002, ARG002
+        low = 0 if min == "-" else int(min)
+        entries = [e for e in self.streams.get(key, []) if _seq(e[0]) >= low]
+        return entries[:count] if count else entries
+
+    def xrevrange(self, key: str, max: str = "+", min: str = "-", count: int | None = None) -> list:  # noqa: A002, ARG002
+        high = float("inf") if max == "+" else int(max)
+        entries = [e for e in reversed(self.streams.get(key, [])) if _seq(e[0]) <= high]
+        return entries[:count] if count else entries
+
+    def zrange(self, key: str, start: int, end: int) -> list[str]:
+        assert key == event_log.UNFLUSHED_RUNS_KEY
+        ordered = sorted(self.unflushed, key=self.unflushed.__getitem__)
+        return ordered[start : end + 1]
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:  # noqa: ARG002
+        return _FakePipeline(self)
+
+    def eval(self, script: str, numkeys: int, *args: Any) -> int:
+        self.evals += 1
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == event_log._APPEND_SCRIPT:
+            seq_key, log_key, _index = keys
+            seed, event_json, _ttl, now, run_id = argv
+            if seq_key in self.store:
+                seq = int(self.store[seq_key]) + 1
+            elif seed == "":
+                return 0
+            else:
+                seq = int(seed) + 1
+            self.store[seq_key] = str(seq)
+            self.streams.setdefault(log_key, []).append((f"{seq}-0", {"event": event_json}))
+            self.unflushed.setdefault(run_id, float(now))
+            return seq
+        if script == event_log._MARK_FLUSHED_SCRIPT:
+            flushed_key, seq_key, _index = keys
+            flushed, _ttl, run_id = argv
+            self.store[flushed_key] = str(flushed)
+            if int(self.store.get(seq_key, "0")) <= int(flushed):
+                self.unflushed.pop(run_id, None)
+                return 1
+            return 0
+        assert script == event_log._RELEASE_LOCK_SCRIPT
+        if self.store.get(keys[0]) == argv[0]:
+            del self.store[keys[0]]
+            return 1
+        return 0
+
+
+class _CountingDirectus(InMemoryDirectus):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    def create_item(self, collection: str, item_data: Any) -> dict[str, Any]:
+        self.calls.append(f"create:{collection}")
+        return super().create_item(collection, item_data)
+
+    def update_item(
+        self, collection: str, item_id: str, item_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        self.calls.append(f"update:{collection}")
+        return super().update_item(collection, item_id, item_data)
+
+    def get_items(self, collection: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        self.calls.append(f"get:{collection}")
+        return super().get_items(collection, params)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> _FakeSyncRedis:
+    client = _FakeSyncRedis()
+    monkeypatch.setattr(event_log, "get_shared_sync_redis", lambda **_: client)
+    return client
+
+
+@pytest.fixture
+def service(fake_redis) -> tuple[AgenticRunService, _CountingDirectus]:  # noqa: ARG001
+    directus = _CountingDirectus()
+    svc = AgenticRunService(directus_client=directus, event_log=event_log.RunEventLog())  # type: ignore[arg-type]
+    return svc, directus
+
+
+def test_appends_cost_one_redis_call_and_no_directus(service, fake_redis) -> None:
+    svc, directus = service
+    run = svc.create_run(project_id="project-1", directus_user_id="user-1")
+    svc.append_event(run["id"], "user.message", {"content": "hi"})
+    directus.calls.clear()
+    fake_redis.evals = 0
+
+    seqs = [svc.append_event(run["id"], "agent.event", {"n": n})["seq"] for n in range(50)]
+
+    assert seqs == list(range(2, 52))
+    assert fake_redis.evals == 50
+    assert directus.calls == []
+    assert [e["seq"] for e in svc.list_events(run["id"], after_seq=49)] == [50, 51]
+    assert directus.calls == []
+
+
+def test_first_append_continues_from_directus_history(service, fake_redis) -> None:
+    svc, directus = service
+    run = svc.create_run(project_id="project-1", directus_user_id="user-1")
+    for seq in (1, 2, 3):
+        directus.create_item(
+            RUN_EVENT_COLLECTION,
+            {"project_agentic_run_id": run["id"], "seq": seq, "event_type": "old", "payload": {}},
+        )
+
+    event = svc.append_event(run["id"], "user.message", {"content": "again"})
+
+    assert event["seq"] == 4
+    # Older history lives only in Directus; reads stitch it onto the stream.
+    assert [e["seq"] for e in svc.list_events(run["id"])] == [1, 2, 3, 4]
+    assert svc.get_latest_event(run["id"], event_type="old")["seq"] == 3
+    assert svc.get_latest_event(run["id"])["seq"] == 4
+
+
+def test_flush_persists_in_one_batch_and_clears_the_index(service, fake_redis) -> None:
+    svc, directus = service
+    run = svc.create_run(project_id="project-1", directus_user_id="user-1")
+    for n in range(5):
+        svc.append_event(run["id"], "agent.event", {"n": n})
+    directus.calls.clear()
+
+    assert svc.unflushed_run_ids() == [run["id"]]
+    assert svc.flush_events(run["id"]) == 5
+
+    assert directus.calls.count(f"create:{RUN_EVENT_COLLECTION}") == 1
+    assert svc.get_by_id_or_raise(run["id"])["last_event_seq"] == 5
+    assert svc.unflushed_run_ids() == []
+    assert svc.flush_events(run["id"]) == 0
+
+
+def test_flush_skips_rows_a_crashed_flush_already_wrote(service, fake_redis) -> None:
+    svc, directus = service
+    run = svc.create_run(project_id="project-1", directus_user_id="user-1")
+    for n in range(3):
+        svc.append_event(run["id"], "agent.event", {"n": n})
+    # Rows 1-2 landed, but the cursor update never happened.
+    for event in svc.list_events(run["id"])[:2]:
+        directus.create_item(RUN_EVENT_COLLECTION, event)
+
+    assert svc.flush_events(run["id"]) == 1
+    persisted = directus.get_items(
+        RUN_EVENT_COLLECTION, {"query": {"filter": {"project_agentic_run_id": run["id"]}}}
+    )
+    assert sorted(row["seq"] for row in persisted) == [1, 2, 3]
+
+
+def test_terminal_status_flushes_and_is_mirrored(service, fake_redis) -> None:
+    svc, directus = service
+    run = svc.create_run(project_id="project-1", directus_user_id="user-1")
+    assert fake_redis.store[event_log.run_status_key(run["id"])] == "queued"
+    svc.append_event(run["id"], "assistant.message", {"content": "done"})
+
+    svc.set_status(run["id"], "completed")
+
+    assert fake_redis.store[event_log.run_status_key(run["id"])] == "completed"
+    assert svc.unflushed_run_ids() == []
+    assert directus.calls.count(f"create:{RUN_EVENT_COLLECTION}") == 1
+
+
+def test_flusher_actor_drains_every_unflushed_run(service, fake_redis, monkeypatch) -> None:
+    import dembrane.tasks as tasks
+
+    svc, directus = service
+    runs = [svc.create_run(project_id="project-1", directus_user_id="user-1") for _ in range(3)]
+    for run in runs:
+        svc.append_event(run["id"], "agent.event", {})
+    monkeypatch.setattr(tasks, "agentic_run_service", svc)
+
+    tasks.task_flush_agentic_run_events.fn()
+
+    assert svc.unflushed_run_ids() == []
+    assert directus.calls.count(f"create:{RUN_EVENT_COLLECTION}") == 3
@@ -0,0 +1,168 @@
+"""Per-run model history cache: incremental folding, CAS extend, token windowing."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+import dembrane.agentic_worker as worker
+import dembrane.agentic_history as agentic_history
+from tests.agentic.fakes import InMemoryDirectus
+from dembrane.agentic_focus import FOCUS_BLOCK_OPEN, FOCUS_BLOCK_CLOSE
+from dembrane.service.agentic import AgenticRunService
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._reads: list[tuple[str, str]] = []
+
+    def get(self, key: str) -> None:
+        self._reads.append(("get", key))
+
+    def lrange(self, key: str, _start: int, _end: int) -> None:
+        self._reads.append(("lrange", key))
+
+    async def execute(self) -> list[Any]:
+        return [
+            self._redis.store.get(key) if op == "get" else list(self._redis.lists.get(key, []))
+            for op, key in self._reads
+        ]
+
+
+class _FakeRedis:
+    """Async Redis stand-in whose `eval` emulates the CAS extend script."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+        self.lists: dict[str, list[bytes]] = {}
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:  # noqa: ARG002
+        return _FakePipeline(self)
+
+    async def eval(self, script: str, numkeys: int, *args: Any) -> int:
+        assert script == agentic_history._EXTEND_SCRIPT and numkeys == 2
+        list_key, cursor_key = args[0], args[1]
+        expected, new_cursor, _ttl = args[2], args[3], args[4]
+        current = self.store.get(cursor_key, b"0").decode()
+        if current != expected:
+            return 0
+        if current == "0":
+            self.lists.pop(list_key, None)
+        self.lists.setdefault(list_key, []).extend(raw.encode() for raw in args[5:])
+        self.store[cursor_key] = new_cursor.encode()
+        return 1
+
+
+class _CountingService(AgenticRunService):
+    def __init__(self) -> None:
+        super().__init__(directus_client=InMemoryDirectus())  # type: ignore[arg-type]
+        self.list_calls: list[int] = []
+
+    def list_events(self, run_id: str, *, after_seq: int = 0, limit: int = 500) -> list:
+        self.list_calls.append(after_seq)
+        return super().list_events(run_id, after_seq=after_seq, limit=limit)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> _FakeRedis:
+    client = _FakeRedis()
+
+    async def _get_client() -> _FakeRedis:
+        return client
+
+    monkeypatch.setattr(agentic_history, "get_redis_client", _get_client)
+    return client
+
+
+async def _history(svc: AgenticRunService, run_id: str) -> list[dict[str, str]]:
+    entries = await worker._load_history_entries(svc=svc, run_id=run_id)
+    return agentic_history.window_history(entries, None)
+
+
+def _turn(svc: AgenticRunService, run_id: str, index: int) -> None:
+    svc.append_event(run_id, "user.message", {"content": f"question {index}"})
+    svc.append_event(run_id, "agent.tool_start", {"name": "grepDocs"})
+    svc.append_event(run_id, "agent.tool_end", {"name": "grepDocs", "output": "x" * 500})
+    svc.append_event(run_id, "assistant.message", {"content": f"answer {index}"})
+
+
+@pytest.mark.asyncio
+async def test_second_turn_folds_only_new_events(fake_redis: _FakeRedis) -> None:
+    svc = _CountingService()
+    run = svc.create_run(project_id="project-1", directus_user_id="user-1")
+    _turn(svc, run["id"], 1)
+
+    first = await _history(svc, run["id"])
+    _turn(svc, run["id"], 2)
+    svc.list_calls.clear()
+    second = await _history(svc, run["id"])
+
+    assert [m["content"] for m in first] == ["question 1", "answer 1"]
+    assert [m["content"] for m in second] == ["question 1", "answer 1", "question 2", "answer 2"]
+    # Only the events after the cached cursor are read again.
+    assert svc.list_calls == [4]
+    cached = fake_redis.lists[agentic_history.history_key(run["id"])]
+    assert [json.loads(raw)["role"] for raw in cached] == ["user", "assistant"] * 2
+
+
+@pytest.mark.asyncio
+async def test_cached_user_turn_drops_focus_once_superseded(fake_redis: _FakeRedis) -> None:  # noqa: ARG001
+    svc = AgenticRunService(directus_client=InMemoryDirectus())  # type: ignore[arg-type]
+    run = svc.create_run(project_id="project-1", directus_user_id="user-1")
+    focused = f"{FOCUS_BLOCK_OPEN}\n- id: conv-1\n{FOCUS_BLOCK_CLOSE}\n\nUser Message: hi"
+    svc.append_event(run["id"], "user.message", {"content": "hi", "agent_prompt_content": focused})
+
+    first = await _history(svc, run["id"])
+    svc.append_event(run["id"], "user.message", {"content": "and everyone else?"})
+    second = await _history(svc, run["id"])
+
+    assert first[0]["content"] == focused
+    assert second[0]["content"] == "User Message: hi"
+    assert second[1]["content"] == "and everyone else?"
+
+
+@pytest.mark.asyncio
+async def test_extend_refuses_a_stale_cursor(fake_redis: _FakeRedis) -> None:
+    entry: agentic_history.HistoryEntry = {"role": "user", "content": "a", "tokens": 1}
+    assert await agentic_history.extend_history(
+        "r1", expected_cursor=0, new_cursor=3, entries=[entry]
+    )
+    assert not await agentic_history.extend_history(
+        "r1", expected_cursor=0, new_cursor=5, entries=[entry]
+    )
+    entries, cursor = await agentic_history.load_history("r1")
+    assert (len(entries), cursor) == (1, 3)
+
+
+@pytest.mark.asyncio
+async def test_history_falls_back_to_the_event_log_without_redis(monkeypatch) -> None:
+    async def _down() -> Any:
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(agentic_history, "get_redis_client", _down)
+    svc = AgenticRunService(directus_client=InMemoryDirectus())  # type: ignore[arg-type]
+    run = svc.create_run(project_id="project-1", directus_user_id="user-1")
+    _turn(svc, run["id"], 1)
+
+    history = await _history(svc, run["id"])
+
+    assert [m["content"] for m in history] == ["question 1", "answer 1"]
+
+
+def test_window_keeps_the_newest_messages_that_fit() -> None:
+    entries: list[agentic_history.HistoryEntry] = [
+        {"role": "user", "content": "old question", "tokens": 40},
+        {"role": "assistant", "content": "old answer", "tokens": 40},
+        {"role": "user", "content": "new question", "tokens": 30},
+    ]
+
+    assert [m["content"] for m in agentic_history.window_history(entries, 75)] == [
+        "old answer",
+        "new question",
+    ]
+    assert len(agentic_history.window_history(entries, None)) == 3
+    # The newest message survives even when it alone is over budget.
+    assert [m["content"] for m in agentic_history.window_history(entries, 5)] == ["new question"]
@@ -1,4 +1,5 @@
 import json
+from typing import Any
 
 import pytest
 
@@ -10,11 +11,8 @@ from dembrane.agentic_worker import (
     TOOL_LIMIT_SAFETY_MESSAGE,
     AGENT_CANCELLED_ERROR_CODE,
     RUN_TOOL_LIMIT_SAFETY_MESSAGE,
-    DRAFT_PUBLISH_INTERVAL_SECONDS,
-    DRAFT_PUBLISH_LONG_INTERVAL_SECONDS,
-    DRAFT_PUBLISH_MEDIUM_INTERVAL_SECONDS,
     process_agentic_run,
-    _draft_publish_interval,
+    _triggering_message_id,
     _sanitize_host_visible_assistant_content,
 )
 from dembrane.service.agentic import AgenticRunService
@@ -24,12 +22,25 @@ def _build_service() -> AgenticRunService:
     return AgenticRunService(directus_client=InMemoryDirectus())
 
 
-def test_draft_publish_interval_backs_off_as_text_grows() -> None:
-    assert _draft_publish_interval(0) == DRAFT_PUBLISH_INTERVAL_SECONDS
-    assert _draft_publish_interval(1_999) == DRAFT_PUBLISH_INTERVAL_SECONDS
-    assert _draft_publish_interval(2_000) == DRAFT_PUBLISH_MEDIUM_INTERVAL_SECONDS
-    assert _draft_publish_interval(7_999) == DRAFT_PUBLISH_MEDIUM_INTERVAL_SECONDS
-    assert _draft_publish_interval(8_000) == DRAFT_PUBLISH_LONG_INTERVAL_SECONDS
+def _draft_frames(published_events: list[str]) -> list[dict[str, str]]:
+    """Full draft text after each published draft frame, applying deltas the
+    way the stream consumer does (and asserting they line up)."""
+    texts: dict[str, str] = {}
+    frames: list[dict[str, str]] = []
+    for raw in published_events:
+        event = json.loads(raw)
+        payload = event.get("payload") or {}
+        message_id = payload.get("message_id")
+        if event.get("event_type") == "assistant.draft":
+            texts[message_id] = payload["text"]
+        elif event.get("event_type") == "assistant.draft.delta":
+            # Offsets count UTF-16 units, like the JS `string.length` they are checked against.
+            assert payload["offset"] == len(texts[message_id].encode("utf-16-le")) // 2
+            texts[message_id] += payload["text"]
+        else:
+            continue
+        frames.append({"message_id": message_id, "text": texts[message_id]})
+    return frames
 
 
 def test_sanitize_host_visible_content_strips_stray_token_and_successfully() -> None:
@@ -43,6 +54,26 @@ def test_sanitize_host_visible_content_strips_stray_token_and_successfully() ->
     )
 
 
+@pytest.mark.asyncio
+async def test_triggering_message_id_is_the_same_before_and_after_a_flush() -> None:
+    class _Svc:
+        def __init__(self, event: dict) -> None:
+            self.event = event
+
+        def list_events(self, _run_id: str, *, after_seq: int, limit: int) -> list[dict]:
+            return [self.event]
+
+    async def _resolve(event: dict) -> str | None:
+        svc: Any = _Svc(event)
+        return await _triggering_message_id(svc=svc, run_id="run-1", turn_seq=3)
+
+    buffered = {"seq": 3, "event_type": "user.message"}
+    flushed = {**buffered, "id": "row-17"}
+
+    assert await _resolve(buffered) == await _resolve(flushed) == "run-1:3"
+    assert await _resolve({"seq": 3, "event_type": "on_tool_start"}) is None
+
+
 class _FakeChatService:
     def __init__(self) -> None:
         self.created_messages: list[dict[str, str]] = []
@@ -1475,6 +1506,10 @@ async def test_process_agentic_run_retries_once_on_context_overflow(monkeypatch)
     async def _clear_cancel(run_id: str, turn_seq: int) -> None:  # noqa: ARG001
         return None
 
+    # One token per message: the 31-message history exactly fills the budget,
+    # so only the retry's half budget trims it.
+    monkeypatch.setattr("dembrane.agentic_worker._count_tokens", lambda _text: 1)
+    monkeypatch.setattr("dembrane.agentic_worker.HISTORY_TOKEN_BUDGET", 31)
     monkeypatch.setattr("dembrane.agentic_worker.stream_agent_events", _fake_stream)
     monkeypatch.setattr("dembrane.agentic_worker.publish_live_event", _fake_publish)
     monkeypatch.setattr("dembrane.agentic_worker.is_cancel_requested", _never_cancel)
@@ -1491,8 +1526,9 @@ async def test_process_agentic_run_retries_once_on_context_overflow(monkeypatch)
     )
 
     assert len(histories) == 2
-    assert len(histories[1]) == 24
-    assert histories[1] == histories[0][-24:]
+    assert len(histories[0]) == 31
+    assert len(histories[1]) == 15
+    assert histories[1] == histories[0][-15:]
     stored_run = service.get_by_id_or_raise(run["id"])
     assert stored_run["status"] == "completed"
     assert stored_run["latest_output"] == "retry success"
@@ -1989,17 +2025,13 @@ async def test_process_agentic_run_streams_drafts_without_persisting_chunks(
     assert all(event["event_type"] != "on_chat_model_stream" for event in events)
     assert all(event["event_type"] != "assistant.draft" for event in events)
 
-    drafts = [
-        json.loads(raw)
-        for raw in published_events
-        if json.loads(raw).get("event_type") == "assistant.draft"
-    ]
-    # Snapshots, not increments: each draft carries the full text so far.
-    assert [draft["payload"]["text"] for draft in drafts] == [
+    drafts = _draft_frames(published_events)
+    # A checkpoint, then an increment that extends it to the full text.
+    assert [draft["text"] for draft in drafts] == [
         "Here is what",
         "Here is what the transcripts show.",
     ]
-    assert all(draft["payload"]["message_id"] == model_run_id for draft in drafts)
+    assert all(draft["message_id"] == model_run_id for draft in drafts)
 
     # The durable message carries the same message_id so the frontend can
     # swap the draft bubble atomically.
@@ -2074,17 +2106,89 @@ async def test_process_agentic_run_throttles_draft_snapshots(monkeypatch) -> Non
         run_service=service,
     )
 
-    drafts = [
-        json.loads(raw)
-        for raw in published_events
-        if json.loads(raw).get("event_type") == "assistant.draft"
-    ]
-    assert [draft["payload"]["text"] for draft in drafts] == [
+    drafts = _draft_frames(published_events)
+    assert [draft["text"] for draft in drafts] == [
         "word0",
         "".join(words).strip(),
     ]
 
 
+@pytest.mark.asyncio
+async def test_process_agentic_run_draft_bandwidth_is_linear(monkeypatch) -> None:
+    """Unthrottled, a long answer costs one checkpoint plus deltas whose text
+    adds up to the message once, not a full snapshot per chunk."""
+    service = _build_service()
+    run = service.create_run(
+        project_id="project-1",
+        project_chat_id="chat-1",
+        directus_user_id="user-1",
+    )
+    published_events: list[str] = []
+    model_run_id = "model-run-long"
+    # Non-BMP characters are one code point here but two UTF-16 units in the browser.
+    words = [f"sentence number {i} of a long answer 🎙️. " for i in range(300)]
+    full_text = "".join(words).strip()
+
+    async def _fake_stream(
+        *,
+        project_id: str,
+        user_message: str,
+        bearer_token: str,
+        thread_id: str,
+        message_history: list[dict[str, str]] | None = None,
+        **_context: object,
+    ):
+        _ = (project_id, user_message, bearer_token, thread_id, message_history)
+        for word in words:
+            yield {
+                "event": "on_chat_model_stream",
+                "run_id": model_run_id,
+                "data": {"chunk": {"kwargs": {"content": word}}},
+            }
+        yield {
+            "event": "on_chat_model_end",
+            "run_id": model_run_id,
+            "data": {"output": {"kwargs": {"content": full_text, "additional_kwargs": {}}}},
+        }
+
+    async def _fake_publish(run_id: str, event_json: str) -> None:  # noqa: ARG001
+        published_events.append(event_json)
+
+    async def _never_cancel(run_id: str, turn_seq: int) -> bool:  # noqa: ARG001
+        return False
+
+    async def _clear_cancel(run_id: str, turn_seq: int) -> None:  # noqa: ARG001
+        return None
+
+    monkeypatch.setattr("dembrane.agentic_worker.DRAFT_PUBLISH_INTERVAL_SECONDS", 0.0)
+    monkeypatch.setattr("dembrane.agentic_worker.DRAFT_CHECKPOINT_INTERVAL_SECONDS", 3600.0)
+    monkeypatch.setattr("dembrane.agentic_worker.stream_agent_events", _fake_stream)
+    monkeypatch.setattr("dembrane.agentic_worker.chat_service", _FakeChatService())
+    monkeypatch.setattr("dembrane.agentic_worker.publish_live_event", _fake_publish)
+    monkeypatch.setattr("dembrane.agentic_worker.is_cancel_requested", _never_cancel)
+    monkeypatch.setattr("dembrane.agentic_worker.clear_cancel", _clear_cancel)
+
+    await process_agentic_run(
+        run_id=run["id"],
+        project_id="project-1",
+        user_message="hello",
+        bearer_token="token-1",
+        turn_seq=1,
+        owner_token="owner-1",
+        run_service=service,
+    )
+
+    raw_drafts = [
+        event
+        for event in map(json.loads, published_events)
+        if str(event.get("event_type")).startswith("assistant.draft")
+    ]
+    assert [e["event_type"] for e in raw_drafts].count("assistant.draft") == 1
+    assert len(raw_drafts) == len(words)
+    assert sum(len(e["payload"]["text"]) for e in raw_drafts) == len(full_text)
+    assert _draft_frames(published_events)[-1]["text"] == full_text
+
+
 @pytest.mark.asyncio
 async def test_process_agentic_run_progress_turn_draft_resolves_into_tool_output(
     monkeypatch,
@@ -2175,16 +2279,12 @@ async def test_process_agentic_run_progress_turn_draft_resolves_into_tool_output
 
     events = service.list_events(run["id"])
     assistant_events = [event for event in events if event["event_type"] == "assistant.message"]
-    drafts = [
-        json.loads(raw)
-        for raw in published_events
-        if json.loads(raw).get("event_type") == "assistant.draft"
-    ]
+    drafts = _draft_frames(published_events)
 
     # The narration streamed as a draft under the model turn's id...
     assert drafts
-    assert all(draft["payload"]["message_id"] == model_run_id for draft in drafts)
-    assert drafts[-1]["payload"]["text"] == narration
+    assert all(draft["message_id"] == model_run_id for draft in drafts)
+    assert drafts[-1]["text"] == narration
     # ...but the durable message is the tool output with the same id, so the
     # frontend swaps the draft for it. The narration itself is never persisted.
     assert len(assistant_events) == 1
@@ -2284,19 +2384,15 @@ async def test_process_agentic_run_never_streams_placeholder_prefixes(monkeypatc
         run_service=service,
     )
 
-    drafts = [
-        json.loads(raw)
-        for raw in published_events
-        if json.loads(raw).get("event_type") == "assistant.draft"
-    ]
+    drafts = _draft_frames(published_events)
     # No draft from the mimic turn, not even a prefix of the placeholder.
-    assert all(draft["payload"]["message_id"] != "model-run-mimic" for draft in drafts)
-    assert all(not draft["payload"]["text"].startswith("(calling t") for draft in drafts)
-    assert all(draft["payload"]["text"] != "(calling" for draft in drafts)
+    assert all(draft["message_id"] != "model-run-mimic" for draft in drafts)
+    assert all(not draft["text"].startswith("(calling t") for draft in drafts)
+    assert all(draft["text"] != "(calling" for draft in drafts)
     # The real answer still streams once it diverges from the placeholder.
-    answer_drafts = [d for d in drafts if d["payload"]["message_id"] == "model-run-answer"]
+    answer_drafts = [d for d in drafts if d["message_id"] == "model-run-answer"]
     assert answer_drafts
-    assert answer_drafts[-1]["payload"]["text"] == "(calling all participants early is key.)"
+    assert answer_drafts[-1]["text"] == "(calling all participants early is key.)"
 
 
 def _patch_worker_runtime(monkeypatch) -> None:
@@ -67,3 +67,35 @@ class TestWorkspaceCreate:
 
         assert result.name == "Test WS"
         assert result.org_id == "org-1"
+
+    @pytest.mark.asyncio
+    async def test_same_name_creations_both_notify(self):
+        # Two workspaces may share a name; each creation is its own event.
+        from dembrane.api.v2.schemas import CreateWorkspaceRequest
+        from dembrane.api.v2.workspaces import create_workspace
+
+        body = CreateWorkspaceRequest(name="Research", org_id="org-1")
+        auth = MagicMock()
+        auth.is_admin = True
+        auth.user_id = "directus-staff-1"
+
+        with (
+            patch("dembrane.api.v2.workspaces.get_app_user_or_raise", new_callable=AsyncMock, return_value={"id": "staff-1"}),
+            patch("dembrane.api.v2.workspaces.async_directus") as mock_directus,
+            patch("dembrane.directus_async.async_directus") as mock_ba,
+            patch("dembrane.inheritance.on_workspace_created", new_callable=AsyncMock),
+            patch("dembrane.notifications.emit_to_audience", new_callable=AsyncMock) as emit,
+            patch("dembrane.notifications.audience_organisation_admins", new_callable=AsyncMock, return_value=["a1"]),
+        ):
+            mock_directus.create_item = AsyncMock(return_value={"data": {}})
+            mock_directus.get_item = AsyncMock(return_value={"display_name": "Staff"})
+            mock_ba.get_items = AsyncMock(return_value=[])
+            mock_ba.create_item = AsyncMock(return_value={"data": {}})
+            mock_ba.update_item = AsyncMock()
+
+            first = await create_workspace(body, auth)
+            second = await create_workspace(body, auth)
+
+        keys = [call.kwargs["idempotency_key"] for call in emit.await_args_list]
+        assert keys == [f"WORKSPACE_CREATED:{first.id}", f"WORKSPACE_CREATED:{second.id}"]
+        assert first.id != second.id
@@ -0,0 +1,155 @@
+"""Transcription audio input: spooled streaming encode, signed-URL passthrough, accounting."""
+
+from __future__ import annotations
+
+import io
+import tracemalloc
+from base64 import b64decode, b64encode
+
+import pytest
+
+import dembrane.audio_input as audio_input
+
+AUDIO = bytes(range(256)) * (12 * 1024 + 7)  # ~3 MB, length not a multiple of 3
+
+
+class _FakeFileService:
+    def __init__(self, data: bytes = AUDIO) -> None:
+        self.data = data
+        self.fetched: list[str] = []
+
+    def get_stream(self, key: str) -> io.BytesIO:
+        self.fetched.append(key)
+        return io.BytesIO(self.data)
+
+
+@pytest.fixture
+def files(monkeypatch) -> _FakeFileService:
+    service = _FakeFileService()
+    monkeypatch.setattr(audio_input, "file_service", service)
+    return service
+
+
+def _decode(part: dict) -> bytes:
+    prefix, encoded = part["file"]["file_data"].split(",", 1)
+    assert prefix == "data:audio/mp3;base64"
+    return b64decode(encoded)
+
+
+def test_inline_part_is_encoded_from_the_spool(files) -> None:
+    with audio_input.audio_task("s3://bucket/chunk.ogg") as task:
+        part = audio_input.audio_content_part("https://s3/chunk.ogg?sig=1", mode="inline")
+
+    assert _decode(part) == AUDIO
+    assert task.mode == "inline" and task.source_bytes == len(AUDIO)
+    # Spool went to disk; the encode buffer and the data URI overlap only briefly.
+    encoded = len(part["file"]["file_data"])
+    assert task.peak_bytes <= 2 * encoded + audio_input.READ_CHUNK_BYTES
+    assert task.held_bytes == encoded
+
+
+def test_inline_encode_does_not_peak_above_the_old_path(monkeypatch) -> None:
+    class _NetworkStream:
+        """Allocates what it returns, like a socket-backed body."""
+
+        def __init__(self) -> None:
+            self.offset = 0
+
+        def read(self, size: int = -1) -> bytes:
+            end = len(AUDIO) if size < 0 else self.offset + size
+            piece, self.offset = AUDIO[self.offset : end], min(end, len(AUDIO))
+            return piece
+
+        def close(self) -> None:
+            return None
+
+    class _Service:
+        def get_stream(self, key: str) -> _NetworkStream:
+            return _NetworkStream()
+
+    monkeypatch.setattr(audio_input, "file_service", _Service())
+
+    def _old() -> str:
+        data = _NetworkStream().read()
+        return "data:audio/mp3;base64,{}".format(b64encode(data).decode("utf-8"))
+
+    tracemalloc.start()
+    try:
+        old_uri = _old()
+        _, old_peak = tracemalloc.get_traced_memory()
+        del old_uri
+        tracemalloc.reset_peak()
+        part = audio_input.audio_content_part("chunk.mp3", mode="inline")
+        _, new_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert _decode(part) == AUDIO
+    # Both end at buffer + str (or encoded bytes + str); only the raw copy is gone.
+    assert new_peak <= old_peak * 1.02
+
+
+def test_url_mode_passes_https_signed_urls_through(files) -> None:
+    url = "https://s3.example/bucket/chunk.ogg?X-Amz-Signature=abc"
+
+    part = audio_input.audio_content_part(url, mode="url")
+
+    assert part == {"type": "file", "file": {"file_id": url, "format": "audio/ogg"}}
+    assert files.fetched == []
+
+
+def test_url_mode_inlines_plain_http_urls(files) -> None:
+    part = audio_input.audio_content_part("http://minio:9000/bucket/chunk.mp3", mode="url")
+
+    assert _decode(part) == AUDIO
+
+
+def test_parts_are_shared_within_a_task(files) -> None:
+    with audio_input.audio_task("chunk.mp3"):
+        first = audio_input.audio_content_part("chunk.mp3", mode="inline")
+        second = audio_input.audio_content_part("chunk.mp3", mode="inline")
+
+    audio_input.audio_content_part("chunk.mp3", mode="inline")
+
+    assert first is second
+    assert files.fetched == ["chunk.mp3", "chunk.mp3"]
+
+
+def test_naive_fetch_is_the_fallback_for_content_parts(monkeypatch) -> None:
+    class _Broken:
+        def get_stream(self, key: str) -> io.BytesIO:
+            raise RuntimeError("not an s3 url")
+
+    class _Response:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_exc) -> None:
+            return None
+
+        def raise_for_status(self) -> None:
+            return None
+
+        def iter_content(self, size: int):
+            return (AUDIO[i : i + size] for i in range(0, len(AUDIO), size))
+
+    monkeypatch.setattr(audio_input, "file_service", _Broken())
+    monkeypatch.setattr(audio_input.requests, "get", lambda *_a, **_kw: _Response())
+
+    part = audio_input.audio_content_part("https://elsewhere/chunk.mp3", mode="inline")
+    assert _decode(part) == AUDIO
+
+    with pytest.raises(RuntimeError):
+        with audio_input.open_audio_upload("chunk.mp3"):
+            pass
+
+
+def test_upload_streams_from_a_spooled_file(files) -> None:
+    with audio_input.audio_task("audio/chunk.mp3") as task:
+        with audio_input.open_audio_upload("audio/chunk.mp3") as (name, fileobj, mime):
+            assert (name, mime) == ("chunk.mp3", "audio/mpeg")
+            assert fileobj.read() == AUDIO
+        assert fileobj.closed
+
+    assert task.mode == "upload" and task.held_bytes == 0
+    assert task.peak_bytes <= audio_input.SPOOL_MAX_BYTES + audio_input.READ_CHUNK_BYTES
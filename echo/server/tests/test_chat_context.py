@@ -0,0 +1,193 @@
+"""Per-chat memoized system-message prefix and provider cache markers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+import dembrane.chat_utils as chat_utils
+import dembrane.chat_context as chat_context
+import dembrane.overview_digest as overview_digest
+from dembrane.chat_context import with_cache_markers, get_chat_system_messages
+
+
+class _FakeDirectus:
+    """Answers the fingerprint queries from in-memory version data."""
+
+    def __init__(self) -> None:
+        self.project_updated_at = "2026-01-01T00:00:00"
+        self.conversations = {
+            "c1": {"updated_at": "2026-01-02T00:00:00", "chunks": ["2026-01-02T00:00:00"]},
+            "c2": {"updated_at": "2026-01-03T00:00:00", "chunks": ["2026-01-03T00:00:00"]},
+        }
+        self.calls = 0
+
+    async def get_items(self, collection: str, params: dict) -> list[dict[str, Any]]:
+        self.calls += 1
+        query = params["query"]
+        if collection == "project":
+            return [{"updated_at": self.project_updated_at}]
+        if collection == "conversation" and "aggregate" in query:
+            latest = max(c["updated_at"] for c in self.conversations.values())
+            return [{"count": {"id": len(self.conversations)}, "max": {"updated_at": latest}}]
+        if collection == "conversation":
+            return [
+                {
+                    "id": cid,
+                    "updated_at": data["updated_at"],
+                    "chunks_count": len(data["chunks"]),
+                    "tags": [],
+                }
+                for cid, data in self.conversations.items()
+                if "id" not in query["filter"] or cid in query["filter"]["id"]["_in"]
+            ]
+        if collection == "conversation_chunk" and "groupBy" not in query:
+            chunks = [chunk for c in self.conversations.values() for chunk in c["chunks"]]
+            return [{"count": {"id": len(chunks)}, "max": {"updated_at": max(chunks)}}]
+        if collection == "conversation_chunk":
+            ids = query["filter"]["conversation_id"]["_in"]
+            return [
+                {
+                    "conversation_id": cid,
+                    "count": {"id": len(self.conversations[cid]["chunks"])},
+                    "max": {"updated_at": max(self.conversations[cid]["chunks"])},
+                }
+                for cid in ids
+            ]
+        assert collection == "conversation_artifact"
+        return []
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> bool:  # noqa: ARG002
+        self.data[key] = value
+        return True
+
+
+@pytest.fixture
+def directus(monkeypatch) -> _FakeDirectus:
+    fake = _FakeDirectus()
+    monkeypatch.setattr(chat_context, "async_directus", fake)
+    return fake
+
+
+@pytest.fixture
+def redis(monkeypatch) -> _FakeRedis:
+    fake = _FakeRedis()
+
+    async def _get_client() -> _FakeRedis:
+        return fake
+
+    monkeypatch.setattr(chat_context, "get_redis_client", _get_client)
+    monkeypatch.setattr(overview_digest, "get_redis_client", _get_client)
+    return fake
+
+
+@pytest.fixture
+def builds(monkeypatch) -> list[list[str]]:
+    calls: list[list[str]] = []
+
+    async def _create(ids: list[str], language: str, project_id: str, chat_mode=None):  # noqa: ARG001
+        calls.append(list(ids))
+        return [
+            {"type": "text", "text": "system prompt"},
+            {"type": "text", "text": f"project {project_id}"},
+            {
+                "type": "text",
+                "text": f"transcripts {len(calls)}",
+                "cache_control": {"type": "ephemeral"},
+            },
+        ]
+
+    monkeypatch.setattr(chat_utils, "create_system_messages_for_chat", _create)
+    return calls
+
+
+async def _turn(ids: list[str], chat_mode: str | None = "deep_dive") -> list[dict[str, Any]]:
+    return await get_chat_system_messages("chat-1", ids, "en", "project-1", chat_mode=chat_mode)
+
+
+@pytest.mark.asyncio
+async def test_second_turn_reuses_the_rendered_prefix(directus, redis, builds) -> None:
+    first = await _turn(["c1", "c2"])
+    second = await _turn(["c2", "c1"])
+
+    assert builds == [["c1", "c2"]]
+    assert second == first
+    assert list(redis.data) == ["chat:context:v1:chat-1"]
+
+
+@pytest.mark.asyncio
+async def test_new_transcript_chunk_rebuilds_the_prefix(directus, redis, builds) -> None:
+    await _turn(["c1", "c2"])
+    directus.conversations["c2"]["chunks"].append("2026-01-04T00:00:00")
+
+    rebuilt = await _turn(["c1", "c2"])
+
+    assert len(builds) == 2
+    assert rebuilt[2]["text"] == "transcripts 2"
+
+
+@pytest.mark.asyncio
+async def test_changing_the_locked_set_or_project_rebuilds(directus, redis, builds) -> None:
+    await _turn(["c1", "c2"])
+    await _turn(["c1"])
+    directus.project_updated_at = "2026-02-01T00:00:00"
+    await _turn(["c1"])
+
+    assert builds == [["c1", "c2"], ["c1"], ["c1"]]
+
+
+@pytest.mark.asyncio
+async def test_overview_prefix_follows_the_digest_version(directus, redis, builds) -> None:
+    await _turn([], chat_mode="overview")
+    await _turn([], chat_mode="overview")
+    assert len(builds) == 1
+
+    redis.data["overview:digest:v1:project-1:version"] = b"2"
+    await _turn([], chat_mode="overview")
+
+    assert len(builds) == 2
+
+
+@pytest.mark.asyncio
+async def test_overview_prefix_follows_project_conversations(directus, redis, builds) -> None:
+    await _turn([], chat_mode="overview")
+    directus.conversations["c2"]["chunks"].append("2026-01-04T00:00:00")
+    await _turn([], chat_mode="overview")
+    directus.conversations["c3"] = {"updated_at": "2025-12-01T00:00:00", "chunks": []}
+    await _turn([], chat_mode="overview")
+    await _turn([], chat_mode="overview")
+
+    assert len(builds) == 3
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_builds_the_prefix_directly(directus, builds, monkeypatch) -> None:
+    async def _down() -> Any:
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(chat_context, "get_redis_client", _down)
+
+    messages = await _turn(["c1"])
+    await _turn(["c1"])
+
+    assert messages[1]["text"] == "project project-1"
+    assert len(builds) == 2
+
+
+def test_every_system_part_is_marked_for_provider_caching() -> None:
+    formatted = with_cache_markers(
+        [{"type": "text", "text": "a"}, {"type": "text", "text": "b", "cache_control": {"x": 1}}]
+    )
+
+    assert [m["role"] for m in formatted] == ["system", "system"]
+    assert [m["content"][0]["text"] for m in formatted] == ["a", "b"]
+    assert all(m["content"][0]["cache_control"] == {"type": "ephemeral"} for m in formatted)
@@ -0,0 +1,121 @@
+"""get_chunk_counts_many: grouped aggregates per batch, short TTL cache, sweep fan-out."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+import dembrane.tasks as tasks
+import dembrane.service.conversation as conversation_module
+from dembrane.service import conversation_service
+from dembrane.service.conversation import ConversationService, ConversationServiceException
+
+# conversation_id -> list of (error, transcript) per chunk
+_CHUNKS: dict[str, list[tuple[Any, Any]]] = {
+    "c1": [(None, "hi"), (None, None), ("boom", None)],
+    "c2": [(None, "a"), (None, "b")],
+}
+
+
+class _FakeDirectus:
+    """Answers grouped count aggregates over _CHUNKS; refuses row scans."""
+
+    def __init__(self) -> None:
+        self.queries: list[dict] = []
+
+    def get_items(self, collection: str, params: dict) -> Any:
+        assert collection == "conversation_chunk"
+        query = params["query"]
+        assert query["groupBy"] == ["conversation_id"] and query["limit"] == -1
+        self.queries.append(query)
+        filt = query["filter"]
+        rows = []
+        for cid in filt["conversation_id"]["_in"]:
+            chunks = _CHUNKS.get(cid, [])
+            if "error" in filt:
+                want_error = "_nnull" in filt["error"]
+                chunks = [c for c in chunks if (c[0] is not None) == want_error]
+            if "transcript" in filt:
+                chunks = [c for c in chunks if c[1] is not None]
+            if chunks:
+                rows.append({"conversation_id": cid, "count": {"id": str(len(chunks))}})
+        return rows
+
+
+@pytest.fixture
+def service(monkeypatch) -> tuple[ConversationService, _FakeDirectus]:
+    monkeypatch.setattr(conversation_module, "_chunk_counts_cache", {})
+    fake = _FakeDirectus()
+    return ConversationService(directus_client=fake), fake  # type: ignore[arg-type]
+
+
+def test_counts_match_per_conversation_semantics(service) -> None:
+    svc, fake = service
+    counts = svc.get_chunk_counts_many(["c1", "c2", "c3"])
+
+    assert counts["c1"] == {"total": 3, "processed": 2, "error": 1, "pending": 1, "ok": 1}
+    assert counts["c2"] == {"total": 2, "processed": 2, "error": 0, "pending": 0, "ok": 2}
+    assert counts["c3"] == {"total": 0, "processed": 0, "error": 0, "pending": 0, "ok": 0}
+    # One batch: total, error and ok aggregates, regardless of how many ids.
+    assert len(fake.queries) == 3
+
+
+def test_batches_large_id_lists(service, monkeypatch) -> None:
+    svc, fake = service
+    monkeypatch.setattr(conversation_module, "_CHUNK_COUNTS_BATCH_SIZE", 2)
+    svc.get_chunk_counts_many(["c1", "c2", "c3", "c4", "c5"])
+    assert len(fake.queries) == 9
+
+
+def test_cache_serves_repeat_reads(service) -> None:
+    svc, fake = service
+    svc.get_chunk_counts_many(["c1", "c2"])
+    svc.get_chunk_counts_many(["c2", "c1"])
+    assert len(fake.queries) == 3
+
+    svc.get_chunk_counts_many(["c1"], use_cache=False)
+    assert len(fake.queries) == 6
+
+
+def test_failed_read_raises_instead_of_reporting_zeros(service, monkeypatch) -> None:
+    svc, fake = service
+    monkeypatch.setattr(fake, "get_items", lambda *_args, **_kwargs: {"error": "boom"})
+    with pytest.raises(ConversationServiceException):
+        svc.get_chunk_counts_many(["c1"])
+
+
+def test_reconcile_sweep_hands_batch_counts_to_finalize(monkeypatch) -> None:
+    dispatched: list[tuple] = []
+    bulk_calls: list[list[str]] = []
+
+    def _bulk(conversation_ids: list[str]) -> dict:
+        bulk_calls.append(list(conversation_ids))
+        return {
+            cid: {"total": 1, "processed": 1, "error": 0, "pending": 0, "ok": 1}
+            for cid in conversation_ids
+        }
+
+    class _Group:
+        def __init__(self, messages: list) -> None:
+            dispatched.extend(m.args for m in messages)
+
+        def run(self) -> None:
+            return None
+
+    monkeypatch.setattr(
+        tasks, "collect_conversations_needing_transcribed_flag", lambda: ["c1", "c2"]
+    )
+    monkeypatch.setattr(conversation_service, "get_chunk_counts_many", _bulk)
+    monkeypatch.setattr(
+        conversation_service,
+        "get_chunk_counts",
+        lambda _cid: pytest.fail("sweep must not read counts per conversation"),
+    )
+    monkeypatch.setattr(tasks, "group", _Group)
+
+    tasks.task_reconcile_transcribed_flag.fn()
+
+    assert bulk_calls == [["c1", "c2"]]
+    assert [args[0] for args in dispatched] == ["c1", "c2"]
+    assert all(args[1]["ok"] == 1 for args in dispatched)
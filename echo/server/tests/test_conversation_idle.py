@@ -0,0 +1,164 @@
+"""Idle-deadline index: chunk/ping/creation writes, atomic pop, timer actor."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+import dembrane.tasks as tasks
+import dembrane.conversation_idle as idle
+from dembrane.service import conversation_service
+
+T0 = 1_800_000_000.0
+
+
+class _FakeSyncRedis:
+    """Sync Redis stand-in: zadd (nx/gt), zrem, set/delete, a pipeline that
+    runs commands as they are queued, and `eval` emulating the pop script."""
+
+    def __init__(self) -> None:
+        self.zset: dict[str, float] = {}
+        self.store: dict[str, str] = {}
+
+    def pipeline(self, transaction: bool = True) -> "_FakeSyncRedis":
+        return self
+
+    def execute(self) -> list:
+        return []
+
+    def set(self, key: str, value: str, ex: int | None = None) -> bool:
+        self.store[key] = value
+        return True
+
+    def delete(self, *keys: str) -> int:
+        return sum(1 for k in keys if self.store.pop(k, None) is not None)
+
+    def zadd(self, key: str, mapping: dict[str, float], nx: bool = False, gt: bool = False) -> int:
+        assert key == idle.IDLE_DEADLINES_KEY
+        added = 0
+        for member, score in mapping.items():
+            if member in self.zset:
+                if nx or (gt and score <= self.zset[member]):
+                    continue
+            else:
+                added += 1
+            self.zset[member] = score
+        return added
+
+    def zrem(self, key: str, *members: str) -> int:
+        return sum(1 for m in members if self.zset.pop(m, None) is not None)
+
+    def eval(self, script: str, numkeys: int, *args: Any) -> list[str]:
+        assert script == idle._POP_EXPIRED_SCRIPT and numkeys == 1
+        now, limit = float(args[1]), int(args[2])
+        due = sorted((m for m, s in self.zset.items() if s <= now), key=self.zset.__getitem__)
+        due = due[:limit]
+        for member in due:
+            del self.zset[member]
+        return due
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> _FakeSyncRedis:
+    client = _FakeSyncRedis()
+    monkeypatch.setattr(idle, "get_shared_sync_redis", lambda **_: client)
+    return client
+
+
+def test_chunks_push_the_deadline_and_registration_never_does(fake_redis) -> None:
+    idle.register_idle_deadline("c1", now=T0)
+    assert fake_redis.zset["c1"] == T0 + idle.IDLE_FINISH_SECONDS
+
+    idle.touch_idle_deadline("c1", now=T0 + 100)
+    idle.register_idle_deadline("c1", now=T0 + 200)
+    # An out-of-order touch can't pull the deadline back either.
+    idle.touch_idle_deadline("c1", now=T0 + 50)
+    assert fake_redis.zset["c1"] == T0 + 100 + idle.IDLE_FINISH_SECONDS
+
+
+def test_pop_returns_only_expired_and_removes_them(fake_redis) -> None:
+    idle.touch_idle_deadline("old", now=T0)
+    idle.touch_idle_deadline("fresh", now=T0 + 290)
+
+    popped = idle.pop_expired_conversations(now=T0 + idle.IDLE_FINISH_SECONDS + 1)
+
+    assert popped == ["old"]
+    assert list(fake_redis.zset) == ["fresh"]
+    # A second tick doesn't see it again.
+    assert idle.pop_expired_conversations(now=T0 + idle.IDLE_FINISH_SECONDS + 1) == []
+
+
+def test_finish_closes_the_conversation_until_the_next_chunk(fake_redis) -> None:
+    idle.touch_idle_deadline("c1", now=T0)
+
+    idle.clear_idle_deadline("c1")
+    assert fake_redis.zset == {}
+    assert idle.closed_key("c1") in fake_redis.store
+
+    # A new chunk reopens it.
+    idle.touch_idle_deadline("c1", now=T0 + 600)
+    assert fake_redis.zset == {"c1": T0 + 600 + idle.IDLE_FINISH_SECONDS}
+    assert fake_redis.store == {}
+
+
+def test_finish_hook_closes_an_already_finished_conversation(fake_redis, monkeypatch) -> None:
+    monkeypatch.setattr(
+        conversation_service, "get_by_id_or_raise", lambda _cid: {"is_finished": True}
+    )
+
+    tasks.task_finish_conversation_hook.fn("c1")
+
+    assert idle.closed_key("c1") in fake_redis.store
+
+
+def test_index_writes_are_best_effort(monkeypatch) -> None:
+    def _down(**_: Any) -> Any:
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(idle, "get_shared_sync_redis", _down)
+    idle.touch_idle_deadline("c1")
+    idle.register_idle_deadline("c1")
+    idle.clear_idle_deadline("c1")
+
+
+def test_timer_actor_finishes_popped_conversations(fake_redis, monkeypatch) -> None:
+    idle.touch_idle_deadline("c1", now=0)
+    idle.touch_idle_deadline("c2", now=0)
+    dispatched: list[tuple] = []
+
+    class _Group:
+        def __init__(self, messages: list) -> None:
+            dispatched.extend(m.args for m in messages)
+
+        def run(self) -> None:
+            return None
+
+    monkeypatch.setattr(tasks, "group", _Group)
+    monkeypatch.setattr(
+        conversation_service,
+        "get_chunk_counts_many",
+        lambda ids: {cid: {"total": 0, "pending": 0} for cid in ids},
+    )
+
+    tasks.task_finish_idle_conversations.fn()
+
+    assert sorted(args[0] for args in dispatched) == ["c1", "c2"]
+    assert fake_redis.zset == {}
+
+
+def test_timer_actor_is_cheap_when_nothing_expired(fake_redis, monkeypatch) -> None:
+    idle.register_idle_deadline("c1")
+    monkeypatch.setattr(tasks, "group", lambda _messages: pytest.fail("nothing to dispatch"))
+
+    tasks.task_finish_idle_conversations.fn()
+
+    assert "c1" in fake_redis.zset
+
+
+def test_scheduler_runs_timer_every_few_seconds() -> None:
+    from dembrane import scheduler
+
+    job = scheduler.scheduler.get_job("task_finish_idle_conversations")
+    assert job is not None
+    assert str(job.trigger.fields[-1]) == "*/10"  # second field
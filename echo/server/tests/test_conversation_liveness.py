@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Optional
+import json
+from typing import Any, Optional
 from datetime import datetime, timezone, timedelta
 
 import pytest
@@ -9,11 +10,15 @@ import dembrane.conversation_liveness as liveness
 
 
 class _FakeRedis:
-    """Minimal async Redis stand-in: set with ex, mget."""
+    """Minimal async Redis stand-in: set with ex, mget, and an `eval` that
+    emulates _PING_SCRIPT (ordering check, sticky merge, active index, publish)."""
 
     def __init__(self) -> None:
         self.store: dict[str, bytes] = {}
         self.expires: dict[str, int] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.published: list[tuple[str, bytes]] = []
+        self.evals = 0
 
     async def set(self, key: str, value: str, ex: Optional[int] = None) -> None:
         self.store[key] = value.encode("utf-8")
@@ -26,6 +31,45 @@ class _FakeRedis:
     async def mget(self, keys: list[str]) -> list[Optional[bytes]]:
         return [self.store.get(k) for k in keys]
 
+    async def eval(self, script: str, numkeys: int, *args: Any) -> list[int]:
+        assert script == liveness._PING_SCRIPT
+        self.evals += 1
+        keys, argv = list(args[:numkeys]), [str(a) for a in args[numkeys:]]
+        existing = None
+        try:
+            existing = json.loads(self.store[keys[0]].decode())
+        except (KeyError, ValueError):
+            pass
+        if not isinstance(existing, dict):
+            existing = None
+
+        result = 1
+        existing_ts = existing.get("client_ts") if existing else None
+        if argv[2] and isinstance(existing_ts, int) and int(argv[2]) < existing_ts:
+            result = 0
+        if result:
+            payload = json.loads(argv[0])
+            started = existing.get("recording_started_at") if existing else None
+            if not started and argv[4] == "1":
+                started, result = argv[3], 2
+            if started:
+                payload["recording_started_at"] = started
+            self.store[keys[0]] = json.dumps(payload).encode("utf-8")
+            self.expires[keys[0]] = int(argv[1])
+        if keys[2] not in self.store:
+            self.zsets.setdefault(keys[1], {}).setdefault(argv[5], float(argv[11]))
+        if len(keys) > 3:
+            zset = self.zsets.setdefault(keys[3], {})
+            zset[argv[5]] = float(argv[6])
+            self.expires[keys[3]] = int(argv[7])
+            keep = sorted(zset, key=zset.__getitem__)[-int(argv[8]) :]
+            self.zsets[keys[3]] = {m: zset[m] for m in keep}
+            if result:
+                # Coalescing itself is covered in test_monitor_stream.py.
+                self.published.append((argv[9], b"1"))
+                return [result, -1]
+        return [result, -2]
+
 
 @pytest.fixture
 def fake_redis(monkeypatch) -> _FakeRedis:
@@ -261,3 +305,65 @@ def test_get_last_seen_many_parses_and_skips_missing(fake_redis: _FakeRedis) ->
 
 def test_get_last_seen_many_empty_input_short_circuits(fake_redis: _FakeRedis) -> None:
     assert _run(liveness.get_last_seen_many([])) == {}
+
+
+def test_ping_with_project_indexes_and_publishes_in_one_round_trip(
+    fake_redis: _FakeRedis,
+) -> None:
+    now = datetime(2026, 7, 3, 10, 0, 0, tzinfo=timezone.utc)
+    _run(
+        liveness.mark_conversation_seen(
+            "c1", now=now, telemetry={"state": "waiting"}, project_id="p1", score=123.0
+        )
+    )
+
+    assert fake_redis.evals == 1
+    assert fake_redis.zsets["monitor:active:p1"] == {"c1": 123.0}
+    assert fake_redis.expires["monitor:active:p1"] == liveness.ACTIVE_TTL_SECONDS
+    assert fake_redis.published == [("monitor:project:p1", b"1")]
+
+
+def test_stale_ping_refreshes_index_without_publishing(fake_redis: _FakeRedis) -> None:
+    now = datetime(2026, 7, 3, 10, 0, 0, tzinfo=timezone.utc)
+    _run(
+        liveness.mark_conversation_seen(
+            "c1", now=now, telemetry={"state": "left", "client_ts": 2000}, project_id="p1"
+        )
+    )
+    _run(
+        liveness.mark_conversation_seen(
+            "c1", now=now, telemetry={"state": "recording", "client_ts": 1000}, project_id="p1"
+        )
+    )
+
+    assert json.loads(fake_redis.store["conversation_liveness:c1"])["state"] == "left"
+    assert "c1" in fake_redis.zsets["monitor:active:p1"]
+    assert len(fake_redis.published) == 1
+
+
+def test_ping_without_project_skips_monitor_keys(fake_redis: _FakeRedis) -> None:
+    _run(liveness.mark_conversation_seen("c1", telemetry={"state": "waiting"}))
+    assert set(fake_redis.zsets) == {"conversation_idle_deadlines"}
+    assert fake_redis.published == []
+
+
+def test_ping_registers_idle_deadline_without_extending_it(fake_redis: _FakeRedis) -> None:
+    t0 = datetime(2026, 7, 3, 10, 0, 0, tzinfo=timezone.utc)
+    for offset in (0, 60, 120):
+        _run(
+            liveness.mark_conversation_seen(
+                "c1", now=t0 + timedelta(seconds=offset), telemetry={"state": "paused"}
+            )
+        )
+    deadlines = fake_redis.zsets["conversation_idle_deadlines"]
+    assert deadlines == {"c1": t0.timestamp() + 300}
+
+
+def test_ping_does_not_reregister_a_closed_conversation(fake_redis: _FakeRedis) -> None:
+    from dembrane.conversation_idle import closed_key
+
+    fake_redis.store[closed_key("c1")] = b"1"  # finished or deleted
+    _run(liveness.mark_conversation_seen("c1", telemetry={"state": "paused"}, project_id="p1"))
+
+    assert "conversation_idle_deadlines" not in fake_redis.zsets
+    assert "c1" in fake_redis.zsets["monitor:active:p1"]
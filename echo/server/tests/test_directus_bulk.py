@@ -0,0 +1,114 @@
+"""Batch PATCH / DELETE helpers on the sync and async Directus clients."""
+
+import json
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from dembrane.directus import DirectusClient
+from dembrane.directus_async import AsyncDirectusClient
+
+
+class _Recorder(httpx.AsyncBaseTransport):
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, Any]] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else None
+        self.calls.append((request.method, str(request.url), body))
+        if request.method == "DELETE":
+            return httpx.Response(204)
+        keys = body.get("keys") or ["q1", "q2"]
+        return httpx.Response(200, json={"data": [{"id": key} for key in keys]})
+
+
+def _async_client() -> tuple[AsyncDirectusClient, _Recorder]:
+    recorder = _Recorder()
+    client = AsyncDirectusClient(url="http://directus.test", token="t")
+    client._client = httpx.AsyncClient(  # noqa: SLF001 — inject recording transport
+        base_url="http://directus.test", transport=recorder
+    )
+    return client, recorder
+
+
+@pytest.mark.asyncio
+async def test_async_update_many_chunks_keys_into_batch_patches() -> None:
+    client, recorder = _async_client()
+    keys = [f"k{i}" for i in range(250)]
+
+    updated = await client.update_many("notification", keys, {"read_at": "now"})
+
+    assert [len(body["keys"]) for _, _, body in recorder.calls] == [100, 100, 50]
+    assert all(method == "PATCH" for method, _, _ in recorder.calls)
+    assert all(
+        url.startswith("http://directus.test/items/notification?fields=id")
+        for _, url, _ in recorder.calls
+    )
+    assert recorder.calls[0][2]["data"] == {"read_at": "now"}
+    assert [row["id"] for row in updated] == keys
+
+
+@pytest.mark.asyncio
+async def test_async_update_by_filter_is_one_unpaged_patch() -> None:
+    client, recorder = _async_client()
+
+    updated = await client.update_by_filter(
+        "conversation", {"is_over_cap": {"_eq": True}}, {"is_over_cap": False}
+    )
+
+    assert recorder.calls == [
+        (
+            "PATCH",
+            "http://directus.test/items/conversation?fields=id",
+            {
+                "query": {"filter": {"is_over_cap": {"_eq": True}}, "limit": -1},
+                "data": {"is_over_cap": False},
+            },
+        )
+    ]
+    assert len(updated) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_delete_many_and_empty_inputs() -> None:
+    client, recorder = _async_client()
+
+    await client.delete_many("notification", ["a", "b", "c"], interval=2)
+    assert await client.update_many("notification", [], {"read_at": "now"}) == []
+
+    assert [(method, body) for method, _, body in recorder.calls] == [
+        ("DELETE", ["a", "b"]),
+        ("DELETE", ["c"]),
+    ]
+
+
+class _Response:
+    def __init__(self, status_code: int, payload: Any = None) -> None:
+        self.status_code = status_code
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self) -> Any:
+        return self._payload
+
+
+def test_sync_update_many_is_retried_like_other_writes() -> None:
+    client = DirectusClient(url="http://directus.test", token="t")
+    responses = [_Response(503, {"errors": []}), _Response(200, {"data": [{"id": "a"}]})]
+    sent: list[tuple[str, str, Any]] = []
+
+    def _fake_request(method: str, url: str, **kwargs: Any) -> _Response:
+        sent.append((method, url, kwargs["json"]))
+        return responses.pop(0)
+
+    with (
+        patch("dembrane.directus.requests.request", side_effect=_fake_request),
+        patch("dembrane.directus.time.sleep"),
+    ):
+        updated = client.update_many("scheduled_task", ["a"], {"status": "cancelled"})
+
+    assert updated == [{"id": "a"}]
+    batch = {"keys": ["a"], "data": {"status": "cancelled"}}
+    assert sent == [("PATCH", "http://directus.test/items/scheduled_task", batch)] * 2
@@ -13,12 +13,16 @@ Covers:
 """
 
 import json
+import asyncio
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from dembrane.email_throttle import (
     _KEY_PREFIX,
+    _RECORD_SCRIPT,
+    _SORTED_SET_TTL,
     _WINDOW_SECONDS,
     _DIGEST_KEY_PREFIX,
     THROTTLE_THRESHOLD,
@@ -81,77 +85,80 @@ class TestKeyHelpers:
 # ── record_and_check_throttle (async, mocked Redis) ─────────────────
 
 
-def _make_mock_redis(zcard_return: int = 0) -> AsyncMock:
-    mock = AsyncMock()
-    mock.zremrangebyscore = AsyncMock()
-    mock.zcard = AsyncMock(return_value=zcard_return)
-    mock.zadd = AsyncMock()
-    mock.expire = AsyncMock()
-    return mock
+class _FakeThrottleRedis:
+    """Async Redis stand-in that runs ``_RECORD_SCRIPT`` the way Redis does:
+    as one indivisible step, after yielding to the loop like a round trip."""
+
+    def __init__(self) -> None:
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.ttls: dict[str, int] = {}
+        self.evals: list[tuple[Any, ...]] = []
+
+    def seed(self, key: str, *scores: float) -> None:
+        self.zsets.setdefault(key, {}).update({f"seed-{i}": s for i, s in enumerate(scores)})
+
+    async def eval(self, script: str, numkeys: int, key: str, *argv: Any) -> int:
+        assert script == _RECORD_SCRIPT and numkeys == 1
+        self.evals.append((key, *argv))
+        await asyncio.sleep(0)
+        cutoff, now, member, ttl = argv
+        zset = self.zsets.setdefault(key, {})
+        for old in [m for m, score in zset.items() if score <= float(cutoff)]:
+            del zset[old]
+        count = len(zset)
+        zset[member] = float(now)
+        self.ttls[key] = int(ttl)
+        return count
+
+
+async def _record(fake: _FakeThrottleRedis, recipient: str = "r@test.com", now: float | None = None):
+    from dembrane.email_throttle import record_and_check_throttle
+
+    with patch("dembrane.redis_async.get_redis_client", AsyncMock(return_value=fake)):
+        if now is None:
+            return await record_and_check_throttle(recipient, "EVT")
+        with patch("dembrane.email_throttle.time") as mock_time:
+            mock_time.time.return_value = now
+            return await record_and_check_throttle(recipient, "EVT")
 
 
 class TestRecordAndCheckThrottle:
     @pytest.mark.asyncio
     async def test_returns_individual_when_under_threshold(self):
-        mock_redis = _make_mock_redis(zcard_return=2)
-        mock_get = AsyncMock(return_value=mock_redis)
+        fake = _FakeThrottleRedis()
+        fake.seed(_throttle_key("EVT", "r@test.com"), 999_000.0, 999_500.0)
 
-        with patch("dembrane.redis_async.get_redis_client", mock_get):
-            from dembrane.email_throttle import record_and_check_throttle
-            result = await record_and_check_throttle("r@test.com", "EVT")
-
-        assert result == "individual"
-        mock_redis.zadd.assert_called_once()
-        mock_redis.zremrangebyscore.assert_called_once()
+        assert await _record(fake, now=1_000_000.0) == "individual"
+        assert len(fake.evals) == 1
 
     @pytest.mark.asyncio
     async def test_returns_queue_when_at_threshold(self):
-        mock_redis = _make_mock_redis(zcard_return=5)
-        mock_get = AsyncMock(return_value=mock_redis)
+        fake = _FakeThrottleRedis()
+        fake.seed(_throttle_key("EVT", "r@test.com"), *[999_000.0 + i for i in range(5)])
 
-        with patch("dembrane.redis_async.get_redis_client", mock_get):
-            from dembrane.email_throttle import record_and_check_throttle
-            result = await record_and_check_throttle("r@test.com", "EVT")
-
-        assert result == "queue_for_digest"
+        assert await _record(fake, now=1_000_000.0) == "queue_for_digest"
 
     @pytest.mark.asyncio
     async def test_prunes_old_entries(self):
-        mock_redis = _make_mock_redis(zcard_return=0)
-        mock_get = AsyncMock(return_value=mock_redis)
+        fake = _FakeThrottleRedis()
         now = 1_000_000.0
+        key = _throttle_key("EVT", "r@test.com")
+        fake.seed(key, now - _WINDOW_SECONDS - 10, *[now - 60 - i for i in range(4)])
 
-        with (
-            patch("dembrane.redis_async.get_redis_client", mock_get),
-            patch("dembrane.email_throttle.time") as mock_time,
-        ):
-            mock_time.time.return_value = now
-            from dembrane.email_throttle import record_and_check_throttle
-            await record_and_check_throttle("r@test.com", "EVT")
-
-        call_args = mock_redis.zremrangebyscore.call_args[0]
-        _key, low, high = call_args
-        assert low == "-inf"
-        assert float(high) == pytest.approx(now - _WINDOW_SECONDS, abs=1)
+        # Five recorded, but one is outside the window: still individual.
+        assert await _record(fake, now=now) == "individual"
+        assert min(fake.zsets[key].values()) > now - _WINDOW_SECONDS
 
     @pytest.mark.asyncio
     async def test_records_current_timestamp(self):
-        mock_redis = _make_mock_redis(zcard_return=0)
-        mock_get = AsyncMock(return_value=mock_redis)
+        fake = _FakeThrottleRedis()
         now = 1_000_000.0
 
-        with (
-            patch("dembrane.redis_async.get_redis_client", mock_get),
-            patch("dembrane.email_throttle.time") as mock_time,
-        ):
-            mock_time.time.return_value = now
-            from dembrane.email_throttle import record_and_check_throttle
-            await record_and_check_throttle("r@test.com", "EVT")
+        await _record(fake, now=now)
 
-        zadd_args = mock_redis.zadd.call_args[0]
-        _key, mapping = zadd_args
-        assert str(now) in mapping
-        assert mapping[str(now)] == now
+        ((member, score),) = fake.zsets[_throttle_key("EVT", "r@test.com")].items()
+        assert member.startswith(str(now))
+        assert score == now
 
     @pytest.mark.asyncio
     async def test_defaults_to_individual_on_redis_error(self):
@@ -165,14 +172,41 @@ class TestRecordAndCheckThrottle:
 
     @pytest.mark.asyncio
     async def test_sets_ttl_on_sorted_set(self):
-        mock_redis = _make_mock_redis(zcard_return=0)
-        mock_get = AsyncMock(return_value=mock_redis)
+        fake = _FakeThrottleRedis()
 
-        with patch("dembrane.redis_async.get_redis_client", mock_get):
-            from dembrane.email_throttle import record_and_check_throttle
-            await record_and_check_throttle("r@test.com", "EVT")
+        await _record(fake)
 
-        mock_redis.expire.assert_called_once()
+        assert fake.ttls == {_throttle_key("EVT", "r@test.com"): _SORTED_SET_TTL}
+
+
+class TestConcurrentSends:
+    @pytest.mark.asyncio
+    async def test_exactly_threshold_individual_under_concurrency(self):
+        fake = _FakeThrottleRedis()
+
+        decisions = await asyncio.gather(*(_record(fake) for _ in range(40)))
+
+        assert decisions.count("individual") == THROTTLE_THRESHOLD
+        assert decisions.count("queue_for_digest") == 40 - THROTTLE_THRESHOLD
+
+    @pytest.mark.asyncio
+    async def test_same_instant_sends_are_counted_separately(self):
+        fake = _FakeThrottleRedis()
+
+        decisions = await asyncio.gather(*(_record(fake, now=1_000_000.0) for _ in range(12)))
+
+        assert decisions.count("individual") == THROTTLE_THRESHOLD
+        assert len(fake.zsets[_throttle_key("EVT", "r@test.com")]) == 12
+
+    @pytest.mark.asyncio
+    async def test_recipients_are_throttled_independently(self):
+        fake = _FakeThrottleRedis()
+
+        decisions = await asyncio.gather(
+            *(_record(fake, recipient=f"r{i % 2}") for i in range(20))
+        )
+
+        assert decisions.count("individual") == 2 * THROTTLE_THRESHOLD
 
 
 # ── queue_digest_item (async, mocked Redis) ──────────────────────────
@@ -225,46 +259,86 @@ class TestQueueDigestItem:
 # ── flush_all_digests_sync (mocked sync Redis) ──────────────────────
 
 
-class TestFlushAllDigestsSync:
-    def test_drains_queues_and_returns_grouped(self):
-        items_a = [
-            json.dumps({"summary": "req 1", "timestamp": "10:00"}),
-            json.dumps({"summary": "req 2", "timestamp": "10:05"}),
-        ]
-        items_b = [
-            json.dumps({"summary": "req 3", "timestamp": "11:00"}),
-        ]
+class _FakeDigestRedis:
+    """Sync Redis stand-in for the digest lists, pending set and MULTI."""
 
-        mock_redis = MagicMock()
-        mock_redis.smembers.return_value = {"alice@test.com", "bob@test.com"}
+    def __init__(self, queues: dict[str, list[str]]) -> None:
+        self.lists = {_digest_queue_key(rid): list(items) for rid, items in queues.items()}
+        self.pending = set(queues)
+        self.round_trips = 0
+        self.closed = False
 
-        lpop_queues: dict[str, list] = {
-            _digest_queue_key("alice@test.com"): items_a + [None],
-            _digest_queue_key("bob@test.com"): items_b + [None],
-        }
-        lpop_state: dict[str, int] = {}
-
-        def lpop_side_effect(key: str):
-            if key not in lpop_state:
-                lpop_state[key] = 0
-            idx = lpop_state[key]
-            items = lpop_queues.get(key, [None])
-            if idx < len(items):
-                lpop_state[key] = idx + 1
-                return items[idx]
-            return None
-
-        mock_redis.lpop.side_effect = lpop_side_effect
-        mock_redis.srem = MagicMock()
-        mock_redis.close = MagicMock()
+    def smembers(self, key: str) -> set[str]:
+        assert key == _DIGEST_RECIPIENTS_KEY
+        self.round_trips += 1
+        return set(self.pending)
 
-        with patch("dembrane.email_throttle._get_sync_redis", return_value=mock_redis):
+    def pipeline(self, transaction: bool = True) -> "_FakeDigestPipeline":
+        assert transaction
+        return _FakeDigestPipeline(self)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeDigestPipeline:
+    def __init__(self, redis: _FakeDigestRedis) -> None:
+        self.redis = redis
+        self.calls: list[tuple[str, tuple[Any, ...]]] = []
+
+    def __getattr__(self, name: str):
+        return lambda *args: self.calls.append((name, args))
+
+    def execute(self) -> list[Any]:
+        self.redis.round_trips += 1
+        results: list[Any] = []
+        for name, args in self.calls:
+            if name == "lrange":
+                key, start, end = args
+                assert (start, end) == (0, -1)
+                results.append(list(self.redis.lists.get(key, [])))
+            elif name == "delete":
+                results.append(int(self.redis.lists.pop(args[0], None) is not None))
+            elif name == "srem":
+                assert args[0] == _DIGEST_RECIPIENTS_KEY
+                results.append(int(args[1] in self.redis.pending))
+                self.redis.pending.discard(args[1])
+            else:
+                raise AssertionError(f"unexpected pipeline call {name}")
+        return results
+
+
+class TestFlushAllDigestsSync:
+    def test_drains_queues_and_returns_grouped(self):
+        fake = _FakeDigestRedis(
+            {
+                "alice@test.com": [
+                    json.dumps({"summary": "req 1", "timestamp": "10:00"}),
+                    json.dumps({"summary": "req 2", "timestamp": "10:05"}),
+                ],
+                "bob@test.com": [json.dumps({"summary": "req 3", "timestamp": "11:00"})],
+            }
+        )
+
+        with patch("dembrane.email_throttle._get_sync_redis", return_value=fake):
             result = flush_all_digests_sync()
 
         assert len(result["alice@test.com"]) == 2
         assert len(result["bob@test.com"]) == 1
         assert result["alice@test.com"][0]["summary"] == "req 1"
-        assert mock_redis.srem.call_count == 2
+        assert fake.lists == {} and fake.pending == set()
+        assert fake.closed
+
+    def test_one_round_trip_per_recipient(self):
+        fake = _FakeDigestRedis(
+            {f"r{i}": [json.dumps({"summary": str(n)}) for n in range(50)] for i in range(3)}
+        )
+
+        with patch("dembrane.email_throttle._get_sync_redis", return_value=fake):
+            result = flush_all_digests_sync()
+
+        assert sum(len(items) for items in result.values()) == 150
+        assert fake.round_trips == 1 + 3  # SMEMBERS + one MULTI each
 
     def test_empty_queue_returns_empty(self):
         mock_redis = MagicMock()
@@ -277,22 +351,11 @@ class TestFlushAllDigestsSync:
         assert result == {}
 
     def test_corrupt_json_skipped(self):
-        mock_redis = MagicMock()
-        mock_redis.smembers.return_value = {"r@test.com"}
-
-        items = ["not-valid-json{{{", json.dumps({"summary": "good"}), None]
-        state = {"idx": 0}
-
-        def lpop_fn(_key: str):
-            idx = state["idx"]
-            state["idx"] = idx + 1
-            return items[idx] if idx < len(items) else None
+        fake = _FakeDigestRedis(
+            {"r@test.com": ["not-valid-json{{{", json.dumps({"summary": "good"})]}
+        )
 
-        mock_redis.lpop.side_effect = lpop_fn
-        mock_redis.srem = MagicMock()
-        mock_redis.close = MagicMock()
-
-        with patch("dembrane.email_throttle._get_sync_redis", return_value=mock_redis):
+        with patch("dembrane.email_throttle._get_sync_redis", return_value=fake):
             result = flush_all_digests_sync()
 
         assert len(result["r@test.com"]) == 1
@@ -308,16 +371,12 @@ class TestFlushAllDigestsSync:
         assert result == {}
 
     def test_recipient_removed_from_pending_set(self):
-        mock_redis = MagicMock()
-        mock_redis.smembers.return_value = {"r@test.com"}
-        mock_redis.lpop.side_effect = [json.dumps({"s": "x"}), None]
-        mock_redis.srem = MagicMock()
-        mock_redis.close = MagicMock()
+        fake = _FakeDigestRedis({"r@test.com": [json.dumps({"s": "x"})]})
 
-        with patch("dembrane.email_throttle._get_sync_redis", return_value=mock_redis):
+        with patch("dembrane.email_throttle._get_sync_redis", return_value=fake):
             flush_all_digests_sync()
 
-        mock_redis.srem.assert_called_once_with(_DIGEST_RECIPIENTS_KEY, "r@test.com")
+        assert fake.pending == set()
 
 
 # ── task_flush_email_digests actor ───────────────────────────────────
@@ -425,21 +484,13 @@ class TestSlidingWindowSemantics:
     @pytest.mark.asyncio
     async def test_pruning_cutoff_uses_24h_window(self):
         """record_and_check_throttle prunes using now - 24h as the cutoff."""
-        mock_redis = _make_mock_redis(zcard_return=0)
-        mock_get = AsyncMock(return_value=mock_redis)
+        fake = _FakeThrottleRedis()
         now = 1_700_000_000.0
 
-        with (
-            patch("dembrane.redis_async.get_redis_client", mock_get),
-            patch("dembrane.email_throttle.time") as mock_time,
-        ):
-            mock_time.time.return_value = now
-            from dembrane.email_throttle import record_and_check_throttle
-            await record_and_check_throttle("r", "E")
+        await _record(fake, recipient="r", now=now)
 
-        call_args = mock_redis.zremrangebyscore.call_args[0]
-        cutoff = float(call_args[2])
-        assert cutoff == pytest.approx(now - _WINDOW_SECONDS, abs=1)
+        _key, cutoff, *_rest = fake.evals[0]
+        assert float(cutoff) == pytest.approx(now - _WINDOW_SECONDS, abs=1)
 
 
 # ── Email template rendering ─────────────────────────────────────────
@@ -0,0 +1,148 @@
+"""Listing endpoints make a fixed number of Directus calls, however many rows.
+
+Per-row counts come from grouped aggregates (dembrane.directus_aggregates);
+these tests fail when a listing endpoint goes back to one query per org or
+workspace.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from dembrane.api.v2 import orgs, workspaces, access_requests
+from dembrane.api.v2.schemas import WorkspaceUsage
+from dembrane.api.dependency_auth import DirectusSession
+from dembrane.directus_aggregates import count_grouped
+
+_AUTH = DirectusSession(user_id="du-1", is_admin=False)
+_APP_USER = {"id": "au-1", "email": "u@example.com"}
+
+
+class _FakeDirectus:
+    """Answers every collection with `n` orgs / workspaces and records calls."""
+
+    def __init__(self, n: int) -> None:
+        self.org_ids = [f"org-{i}" for i in range(n)]
+        self.ws_ids = [f"ws-{i}" for i in range(n)]
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    async def get_items(self, collection: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        query = params.get("query") or {}
+        self.calls.append((collection, query))
+        filt = query.get("filter") or {}
+        if query.get("groupBy"):
+            (field,) = query["groupBy"]
+            return [{field: key, "count": {"id": 2}} for key in filt[field]["_in"]]
+        if collection == "org_membership":
+            if "org_id" in filt:
+                return [{"org_id": filt["org_id"]["_eq"], "role": "owner"}]
+            return [{"org_id": org_id, "role": "owner"} for org_id in self.org_ids]
+        if collection == "org":
+            return [{"id": org_id, "name": org_id} for org_id in self.org_ids]
+        if collection == "workspace":
+            return [
+                {"id": ws_id, "name": ws_id, "org_id": self.org_ids[0], "tier": "pioneer"}
+                for ws_id in self.ws_ids
+            ]
+        if collection == "workspace_membership":
+            return [
+                {"workspace_id": ws_id, "user_id": "au-1", "role": "admin", "source": "direct"}
+                for ws_id in self.ws_ids
+            ]
+        return []
+
+
+async def _calls_for(n: int, module: Any, endpoint: Any) -> tuple[list[str], Any]:
+    fake = _FakeDirectus(n)
+    with patch.object(module, "async_directus", fake):
+        result = await endpoint()
+    return [collection for collection, _ in fake.calls], result
+
+
+@pytest.mark.asyncio
+async def test_list_my_orgs() -> None:
+    async def endpoint() -> Any:
+        return await orgs.list_my_orgs(_AUTH)
+
+    with patch.object(orgs, "get_app_user_or_raise", AsyncMock(return_value=_APP_USER)):
+        few, _ = await _calls_for(2, orgs, endpoint)
+        many, result = await _calls_for(12, orgs, endpoint)
+
+    assert few == many
+    assert [(o.member_count, o.workspace_count) for o in result] == [(2, 2)] * 12
+
+
+@pytest.mark.asyncio
+async def test_list_organisation_workspaces() -> None:
+    async def endpoint() -> Any:
+        return await orgs.list_organisation_workspaces("org-0", _AUTH)
+
+    with (
+        patch.object(orgs, "get_app_user_or_raise", AsyncMock(return_value=_APP_USER)),
+        patch.object(orgs, "is_org_external_only", AsyncMock(return_value=False)),
+        # Unlimited tiers skip the per-workspace seat state.
+        patch.object(orgs, "get_capacity", lambda *_a, **_k: None),
+    ):
+        few, _ = await _calls_for(2, orgs, endpoint)
+        many, result = await _calls_for(12, orgs, endpoint)
+
+    assert few == many
+    assert [(w.project_count, w.member_count) for w in result] == [(2, 2)] * 12
+
+
+@pytest.mark.asyncio
+async def test_list_discoverable_workspaces() -> None:
+    async def endpoint() -> Any:
+        return await access_requests.list_discoverable_workspaces("org-0", _AUTH)
+
+    with (
+        patch.object(access_requests, "get_app_user_or_raise", AsyncMock(return_value=_APP_USER)),
+        patch.object(access_requests, "is_org_external_only", AsyncMock(return_value=False)),
+    ):
+        few, _ = await _calls_for(2, access_requests, endpoint)
+        many, result = await _calls_for(12, access_requests, endpoint)
+
+    assert few == many
+    assert [w.member_count for w in result.workspaces] == [2] * 12
+
+
+@pytest.mark.asyncio
+async def test_list_workspaces() -> None:
+    async def endpoint() -> Any:
+        return await workspaces.list_workspaces(_AUTH)
+
+    with (
+        patch.object(workspaces, "resolve_app_user", AsyncMock(return_value=_APP_USER)),
+        # Usage is cached per workspace and previews come from the membership
+        # resolver; neither goes through this module's client.
+        patch.object(workspaces, "_get_workspace_usage", AsyncMock(return_value=WorkspaceUsage())),
+        patch.object(workspaces, "_get_member_previews", AsyncMock(return_value=[])),
+    ):
+        few, _ = await _calls_for(2, workspaces, endpoint)
+        many, result = await _calls_for(12, workspaces, endpoint)
+
+    assert few == many
+    assert [(w.project_count, w.member_count) for w in result.workspaces] == [(2, 2)] * 12
+    assert result.organisations[0].total_members == 1
+
+
+@pytest.mark.asyncio
+async def test_count_grouped_fills_missing_keys_and_skips_empty_input() -> None:
+    client = SimpleNamespace(
+        get_items=AsyncMock(return_value=[{"workspace_id": "a", "count": {"id": "3"}}])
+    )
+
+    assert await count_grouped(client, "project", "workspace_id", []) == {}
+    counts = await count_grouped(
+        client, "project", "workspace_id", ["a", "b", "a"], {"deleted_at": {"_null": True}}
+    )
+
+    assert counts == {"a": 3, "b": 0}
+    client.get_items.assert_awaited_once()
+    query = client.get_items.await_args.args[1]["query"]
+    assert query["filter"] == {"deleted_at": {"_null": True}, "workspace_id": {"_in": ["a", "b"]}}
+    assert query["groupBy"] == ["workspace_id"] and query["limit"] == -1
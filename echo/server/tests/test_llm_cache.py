@@ -0,0 +1,266 @@
+"""Opt-in LLM response cache: exact-match hits, single flight, per-site stats."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from litellm import ModelResponse
+
+import dembrane.llms as llms
+import dembrane.llm_cache as llm_cache
+from dembrane.llms import MODELS, router_completion, arouter_completion
+
+
+class _Store:
+    """Sync Redis stand-in over bytes: strings, one stats hash, release `eval`."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.stats: dict[bytes, int] = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    def set(
+        self, key: str, value: Any, nx: bool = False, px: int | None = None, ex: int | None = None
+    ) -> bool:  # noqa: ARG002
+        if nx and key in self.data:
+            return False
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+
+    def exists(self, key: str) -> int:
+        return int(key in self.data)
+
+    def eval(self, script: str, numkeys: int, key: str, token: str) -> int:
+        assert script == llm_cache._RELEASE_FLIGHT_SCRIPT and numkeys == 1
+        if self.data.get(key) == token.encode():
+            del self.data[key]
+            return 1
+        return 0
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        assert key == llm_cache.STATS_KEY
+        return {field: str(value).encode() for field, value in self.stats.items()}
+
+    def pipeline(self, transaction: bool = True) -> "_Pipeline":  # noqa: ARG002
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, store: _Store) -> None:
+        self._store = store
+
+    def hincrby(self, key: str, field: str, amount: int) -> None:
+        assert key == llm_cache.STATS_KEY
+        name = field.encode()
+        self._store.stats[name] = self._store.stats.get(name, 0) + amount
+
+    def expire(self, _key: str, _ttl: int) -> None:
+        return None
+
+    def execute(self) -> list:
+        return []
+
+
+class _AsyncPipeline(_Pipeline):
+    async def execute(self) -> list:  # type: ignore[override]
+        return []
+
+
+class _AsyncStore:
+    def __init__(self, store: _Store) -> None:
+        self._store = store
+
+    async def get(self, key: str) -> bytes | None:
+        return self._store.get(key)
+
+    async def set(self, key: str, value: Any, **kwargs: Any) -> bool:
+        return self._store.set(key, value, **kwargs)
+
+    async def exists(self, key: str) -> int:
+        return self._store.exists(key)
+
+    async def eval(self, *args: Any) -> int:
+        return self._store.eval(*args)
+
+    def pipeline(self, transaction: bool = True) -> _AsyncPipeline:  # noqa: ARG002
+        return _AsyncPipeline(self._store)
+
+
+def _response(content: str | None) -> ModelResponse:
+    return ModelResponse(
+        id="resp-1",
+        model="fake",
+        choices=[
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    )
+
+
+class _FakeRouter:
+    def __init__(self, content: str | None = "Kitchen Renovation", delay: float = 0.0) -> None:
+        self.calls: list[dict[str, Any]] = []
+        self._content = content
+        self._delay = delay
+
+    def completion(self, **kwargs: Any) -> ModelResponse:
+        self.calls.append(kwargs)
+        return _response(self._content)
+
+    async def acompletion(self, **kwargs: Any) -> ModelResponse:
+        self.calls.append(kwargs)
+        await asyncio.sleep(self._delay)
+        return _response(self._content)
+
+
+@pytest.fixture
+def store(monkeypatch) -> _Store:
+    backing = _Store()
+    async_store = _AsyncStore(backing)
+
+    async def _get_client() -> _AsyncStore:
+        return async_store
+
+    monkeypatch.setattr(llm_cache, "get_shared_sync_redis", lambda **_: backing)
+    monkeypatch.setattr(llm_cache, "get_redis_client", _get_client)
+    monkeypatch.setattr(llm_cache, "_FLIGHT_POLL_SECONDS", 0.01)
+    return backing
+
+
+def _use_router(monkeypatch, router: _FakeRouter) -> _FakeRouter:
+    monkeypatch.setattr(llms, "_get_router", lambda: router)
+    return router
+
+
+MESSAGES = [{"role": "user", "content": "Summarize: we talked about the kitchen."}]
+
+
+def test_repeat_call_is_served_from_the_cache(store, monkeypatch) -> None:
+    router = _use_router(monkeypatch, _FakeRouter())
+
+    first = router_completion(
+        MODELS.MULTI_MODAL_FAST, cache="conversation_title", messages=MESSAGES
+    )
+    second = router_completion(
+        MODELS.MULTI_MODAL_FAST, cache="conversation_title", messages=MESSAGES, timeout=5
+    )
+
+    assert len(router.calls) == 1
+    assert "cache" not in router.calls[0]
+    assert second.choices[0].message.content == first.choices[0].message.content
+    stats = llm_cache.get_cache_stats()["conversation_title"]
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_key_covers_model_group_and_sampling(store, monkeypatch) -> None:
+    router = _use_router(monkeypatch, _FakeRouter())
+
+    router_completion(MODELS.MULTI_MODAL_FAST, cache="conversation_title", messages=MESSAGES)
+    router_completion(
+        MODELS.MULTI_MODAL_FAST, cache="conversation_title", messages=MESSAGES, temperature=0.2
+    )
+    router_completion(MODELS.TEXT_FAST, cache="conversation_title", messages=MESSAGES)
+    router_completion(MODELS.MULTI_MODAL_FAST, messages=MESSAGES)
+
+    assert len(router.calls) == 4
+
+
+def test_empty_answers_are_not_cached(store, monkeypatch) -> None:
+    router = _use_router(monkeypatch, _FakeRouter(content=""))
+
+    router_completion(MODELS.MULTI_MODAL_FAST, cache="conversation_tags", messages=MESSAGES)
+    router_completion(MODELS.MULTI_MODAL_FAST, cache="conversation_tags", messages=MESSAGES)
+
+    assert len(router.calls) == 2
+    assert not any(key.endswith(":flight") for key in store.data)
+
+
+def test_cached_values_are_compressed_with_the_site_ttl(store, monkeypatch) -> None:
+    _use_router(monkeypatch, _FakeRouter(content="word " * 2000))
+
+    router_completion(MODELS.MULTI_MODAL_PRO, cache="conversation_summary", messages=MESSAGES)
+
+    (key,) = store.data
+    assert key.startswith("llm:cache:v1:conversation_summary:")
+    assert len(store.data[key]) < 2000
+    assert llm_cache.decode_response(store.data[key]).choices[0].message.content == "word " * 2000
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_completion(store, monkeypatch) -> None:
+    router = _use_router(monkeypatch, _FakeRouter(delay=0.05))
+
+    responses = await asyncio.gather(
+        *[
+            arouter_completion(MODELS.MULTI_MODAL_FAST, cache="chat_insight", messages=MESSAGES)
+            for _ in range(5)
+        ]
+    )
+
+    assert len(router.calls) == 1
+    assert {r.choices[0].message.content for r in responses} == {"Kitchen Renovation"}
+    stats = llm_cache.get_cache_stats()["chat_insight"]
+    assert (stats["misses"], stats["coalesced"]) == (1, 4)
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_calls_the_model_directly(monkeypatch) -> None:
+    async def _down() -> Any:
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(llm_cache, "get_redis_client", _down)
+    router = _use_router(monkeypatch, _FakeRouter())
+
+    response = await arouter_completion(
+        MODELS.MULTI_MODAL_FAST, cache="chat_suggestions", messages=MESSAGES
+    )
+
+    assert response.choices[0].message.content == "Kitchen Renovation"
+    assert len(router.calls) == 1
+
+
+def test_unknown_site_is_rejected(store, monkeypatch) -> None:
+    _use_router(monkeypatch, _FakeRouter())
+
+    with pytest.raises(ValueError):
+        router_completion(MODELS.MULTI_MODAL_FAST, cache="nope", messages=MESSAGES)
+
+
+def test_explicit_regenerate_bypasses_the_cache(store, monkeypatch) -> None:
+    from dembrane.api.stateless import generate_summary, generate_conversation_title
+
+    router = _use_router(monkeypatch, _FakeRouter())
+
+    generate_summary("we talked about the kitchen", "en")
+    generate_summary("we talked about the kitchen", "en", use_cache=False)
+    generate_summary("we talked about the kitchen", "en", use_cache=False)
+    generate_conversation_title("A kitchen talk.", "en", use_cache=False)
+    generate_conversation_title("A kitchen talk.", "en", use_cache=False)
+
+    assert len(router.calls) == 5
+    assert [key for key in store.data if key.endswith(":flight")] == []
+
+
+@pytest.mark.asyncio
+async def test_summarize_endpoint_does_not_use_the_cache(monkeypatch) -> None:
+    from dembrane.api import conversation
+
+    calls: list[dict[str, Any]] = []
+
+    async def _run(conversation_id: str, auth: Any, *, use_cache: bool = True) -> dict:
+        calls.append({"conversation_id": conversation_id, "use_cache": use_cache})
+        return {"status": "success"}
+
+    monkeypatch.setattr(conversation, "run_conversation_summary", _run)
+
+    await conversation.summarize_conversation("conv-1", auth=None)  # type: ignore[arg-type]
+    await conversation.summarize_conversation("conv-1", auth=None)  # type: ignore[arg-type]
+
+    assert calls == [{"conversation_id": "conv-1", "use_cache": False}] * 2
@@ -0,0 +1,196 @@
+"""Latency-aware router weights and hedged calls."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import dembrane.llm_routing as routing
+from dembrane.llm_routing import LatencyAwareWeights, InMemoryLatencyStore, hedged
+
+GROUP = "multi_modal_pro"
+
+
+class _FakeRouter:
+    def __init__(self, count: int = 3) -> None:
+        self.model_list = [
+            {
+                "model_name": GROUP,
+                "litellm_params": {"model": f"fake/{i}", "weight": max(1, 10 - i)},
+                "model_info": {"id": f"{GROUP}:{i}"},
+            }
+            for i in range(count)
+        ]
+
+    def weights(self) -> list[float]:
+        return [d["litellm_params"]["weight"] for d in self.model_list]
+
+
+def _kwargs(index: int, **extra: object) -> dict:
+    return {"litellm_params": {"model_info": {"id": f"{GROUP}:{index}"}}, **extra}
+
+
+def _feed(weights: LatencyAwareWeights, index: int, seconds: float, n: int = 10) -> None:
+    for _ in range(n):
+        weights._record(_kwargs(index), 0.0, seconds, failed=False)
+
+
+def test_slow_deployment_loses_its_share() -> None:
+    router = _FakeRouter()
+    weights = LatencyAwareWeights(router, InMemoryLatencyStore())
+    _feed(weights, 0, 9.0)
+    _feed(weights, 1, 2.0)
+    _feed(weights, 2, 2.2)
+
+    weights.refresh(force=True)
+
+    primary, second, third = router.weights()
+    assert primary < 1.0 < third < second
+    assert second > 9
+
+
+def test_unmeasured_deployment_keeps_its_static_weight() -> None:
+    router = _FakeRouter()
+    weights = LatencyAwareWeights(router, InMemoryLatencyStore())
+    _feed(weights, 0, 3.0)
+    _feed(weights, 1, 1.0)
+    _feed(weights, 2, 1.0, n=routing.MIN_SAMPLES - 1)
+
+    weights.refresh(force=True)
+
+    assert router.weights()[2] == 8
+    assert router.weights()[0] < 10 < router.weights()[1] / 9 * 10
+
+
+def test_failures_count_as_a_latency_penalty() -> None:
+    store = InMemoryLatencyStore()
+    weights = LatencyAwareWeights(_FakeRouter(), store)
+
+    weights._record(_kwargs(1), 0.0, 0.5, failed=True)
+
+    summary = store.summaries([f"{GROUP}:1"])[f"{GROUP}:1"]["latency"]
+    assert summary.p50 == routing.FAILURE_PENALTY_SECONDS
+
+
+def test_time_to_first_token_is_recorded_for_streams_only() -> None:
+    store = InMemoryLatencyStore()
+    weights = LatencyAwareWeights(_FakeRouter(), store)
+    start = datetime(2026, 1, 1)
+
+    weights._record(
+        _kwargs(0, completion_start_time=start + timedelta(seconds=0.4), stream=True),
+        start,
+        start + timedelta(seconds=3),
+        failed=False,
+    )
+    weights._record(
+        _kwargs(1, completion_start_time=start + timedelta(seconds=3)),
+        start,
+        start + timedelta(seconds=3),
+        failed=False,
+    )
+    weights._record({"litellm_params": {}}, start, start, failed=False)
+
+    summaries = store.summaries([f"{GROUP}:0", f"{GROUP}:1"])
+    assert summaries[f"{GROUP}:0"]["ttft"].p50 == pytest.approx(0.4)
+    assert summaries[f"{GROUP}:0"]["latency"].p50 == pytest.approx(3.0)
+    assert "ttft" not in summaries[f"{GROUP}:1"]
+
+
+def test_hedge_delay_follows_the_best_p95_within_bounds() -> None:
+    weights = LatencyAwareWeights(_FakeRouter(), InMemoryLatencyStore())
+    assert weights.hedge_delay(GROUP) == routing.HEDGE_MAX_DELAY_SECONDS
+
+    _feed(weights, 0, 2.5)
+    _feed(weights, 1, 30.0)
+    weights.refresh(force=True)
+    assert weights.hedge_delay(GROUP) == pytest.approx(2.5)
+
+    _feed(weights, 2, 0.1, n=50)
+    weights.refresh(force=True)
+    assert weights.hedge_delay(GROUP) == routing.HEDGE_MIN_DELAY_SECONDS
+
+
+def test_hedge_delay_reads_only_cached_stats() -> None:
+    class _CountingStore(InMemoryLatencyStore):
+        reads = 0
+
+        def summaries(self, deployment_ids: list[str]) -> dict:
+            self.reads += 1
+            return super().summaries(deployment_ids)
+
+    store = _CountingStore()
+    weights = LatencyAwareWeights(_FakeRouter(), store)
+    weights.hedge_delay(GROUP)
+    assert store.reads == 0
+
+    # Recording samples (off the event loop) is what refreshes the stats,
+    # at most once per STATS_REFRESH_SECONDS.
+    _feed(weights, 0, 2.5)
+    assert store.reads == 1
+    assert weights.hedge_delay(GROUP) == pytest.approx(2.5)
+    assert store.reads == 1
+
+
+def test_store_errors_leave_weights_static() -> None:
+    class _Broken:
+        def record(self, *_args: object) -> None:
+            raise ConnectionError("redis down")
+
+        def summaries(self, *_args: object) -> dict:
+            raise ConnectionError("redis down")
+
+    router = _FakeRouter()
+    weights = LatencyAwareWeights(router, _Broken())
+
+    weights._record(_kwargs(0), 0.0, 1.0, failed=False)
+    weights.refresh(force=True)
+
+    assert router.weights() == [10, 9, 8]
+
+
+@pytest.mark.asyncio
+async def test_hedged_returns_the_faster_attempt_and_cancels_the_other() -> None:
+    durations = iter([1.0, 0.02])
+    cancelled: list[float] = []
+
+    async def _call() -> float:
+        seconds = next(durations)
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            cancelled.append(seconds)
+            raise
+        return seconds
+
+    assert await hedged(_call, 0.02) == 0.02
+    await asyncio.sleep(0)
+    assert cancelled == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_hedged_does_not_duplicate_a_fast_call() -> None:
+    calls: list[int] = []
+
+    async def _call() -> str:
+        calls.append(1)
+        return "ok"
+
+    assert await hedged(_call, 0.5) == "ok"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_falls_back_when_one_attempt_fails() -> None:
+    attempts = iter(["slow-fail", "ok"])
+
+    async def _call() -> str:
+        outcome = next(attempts)
+        if outcome == "slow-fail":
+            await asyncio.sleep(0.05)
+            raise TimeoutError("deployment timed out")
+        return outcome
+
+    assert await hedged(_call, 0.01) == "ok"
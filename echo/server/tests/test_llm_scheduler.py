@@ -0,0 +1,293 @@
+"""LLM admission scheduler: priority classes, workspace fair share, AIMD limit."""
+
+from __future__ import annotations
+
+import math
+import asyncio
+from typing import Any
+
+import pytest
+
+import dembrane.llm_scheduler as sched
+
+GROUP = "multi_modal_pro"
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, tuple]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any) -> None:
+            self._calls.append((name, args))
+
+        return _queue
+
+    def execute(self) -> list[Any]:
+        return [getattr(self._redis, name)(*args) for name, args in self._calls]
+
+
+class _FakeRedis:
+    """Sync Redis stand-in whose `eval` emulates the admit and release scripts."""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, str] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[str, int]] = {}
+        self.now_ms = 0
+
+    def get(self, key: str) -> str | None:
+        return self.strings.get(key)
+
+    def zcard(self, key: str) -> int:
+        return len(self.zsets.get(key, {}))
+
+    def zrem(self, key: str, member: str) -> int:
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+    def hincrby(self, key: str, field: str, amount: int) -> int:
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = bucket.get(field, 0) + amount
+        return bucket[field]
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return {field: str(value) for field, value in self.hashes.get(key, {}).items()}
+
+    def expire(self, _key: str, _ttl: int) -> None:
+        return None
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:  # noqa: ARG002
+        return _FakePipeline(self)
+
+    def eval(self, script: str, numkeys: int, *args: Any) -> Any:
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == sched._ADMIT_SCRIPT:
+            return self._admit(keys, argv)
+        assert script == sched._RELEASE_SCRIPT
+        return self._release(keys, argv)
+
+    def _admit(self, keys: tuple, argv: tuple) -> int:
+        active, limit_key, ws_key, *waiting = keys
+        _now, lease, member, ws, rank, share, ws_share, initial, waiter, ttl = argv
+        slots = self.zsets.setdefault(active, {})
+        queue = self.zsets.setdefault(waiting[rank], {})
+
+        def _wait() -> int:
+            queue[waiter] = self.now_ms + ttl
+            return 0
+
+        if any(self.zcard(key) for key in waiting[:rank]):
+            return _wait()
+        limit = float(self.strings.get(limit_key, initial))
+        if len(slots) >= max(1, math.floor(limit * share)):
+            return _wait()
+        held = self.hashes.get(ws_key, {}).get(ws, 0)
+        if ws and ws_share > 0 and held >= max(1, math.floor(limit * ws_share)):
+            return _wait()
+        queue.pop(waiter, None)
+        slots[member] = self.now_ms + lease
+        if ws:
+            self.hincrby(ws_key, ws, 1)
+        return 1
+
+    def _release(self, keys: tuple, argv: tuple) -> str:
+        active, limit_key, ws_key, backoff = keys
+        member, ws, outcome, initial, low, high = argv
+        if self.zsets.get(active, {}).pop(member, None) is not None and ws:
+            self.hincrby(ws_key, ws, -1)
+        limit = float(self.strings.get(limit_key, initial))
+        if outcome in ("throttled", "slow"):
+            if backoff not in self.strings:
+                self.strings[backoff] = "1"
+                limit = max(low, limit * (0.5 if outcome == "throttled" else 0.8))
+        elif outcome == "ok":
+            limit = min(high, limit + 1 / limit)
+        self.strings[limit_key] = str(limit)
+        return str(limit)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> _FakeRedis:
+    client = _FakeRedis()
+    monkeypatch.setattr(sched, "get_shared_sync_redis", lambda **_: client)
+    monkeypatch.setattr(sched, "INITIAL_LIMIT", 10)
+    monkeypatch.setattr(sched, "MIN_LIMIT", 2)
+    monkeypatch.setattr(sched, "MAX_LIMIT", 64)
+    monkeypatch.setattr(sched, "_POLL_MIN_SECONDS", 0.001)
+    monkeypatch.setattr(sched, "_POLL_MAX_SECONDS", 0.001)
+    return client
+
+
+def _queued(client: _FakeRedis, priority: str) -> int:
+    return client.zcard(sched._key(GROUP, f"waiting:{priority}"))
+
+
+def test_background_leaves_headroom_for_live_chat(fake_redis, monkeypatch) -> None:
+    monkeypatch.setitem(sched.MAX_WAIT_SECONDS, "background", 0.0)
+
+    background = [sched.acquire_slot(GROUP, "background") for _ in range(8)]
+    interactive = [sched.acquire_slot(GROUP, "interactive") for _ in range(4)]
+
+    # 60% of a limit of 10: the 7th and 8th background calls overflow.
+    assert sum(slot is not None for slot in background) == 6
+    assert all(slot is not None for slot in interactive)
+    stats = sched.get_scheduler_stats(GROUP)
+    assert stats["in_use"] == 10
+    assert stats["classes"]["background"]["overflow"] == 2
+
+
+def test_lower_class_waits_while_a_higher_class_is_queued(fake_redis, monkeypatch) -> None:
+    monkeypatch.setitem(sched.MAX_WAIT_SECONDS, "standard", 0.0)
+    monkeypatch.setitem(sched.MAX_WAIT_SECONDS, "background", 0.0)
+    held = [sched.acquire_slot(GROUP, "interactive") for _ in range(8)]
+    assert all(held)
+
+    # Standard may fill 8 of 10, so it queues; background must not jump it.
+    assert sched.acquire_slot(GROUP, "standard") is None
+    fake_redis.zsets[sched._key(GROUP, "waiting:standard")]["w"] = 1e18
+    assert sched.acquire_slot(GROUP, "background") is None
+    assert _queued(fake_redis, "standard") == 1
+
+    sched.release_slot(held[0], "ok")
+    fake_redis.zsets[sched._key(GROUP, "waiting:standard")].clear()
+    assert sched.acquire_slot(GROUP, "background") is None  # 7 held >= 6
+    assert sched.acquire_slot(GROUP, "standard") is not None
+
+
+def test_one_workspace_cannot_take_every_slot(fake_redis, monkeypatch) -> None:
+    monkeypatch.setitem(sched.MAX_WAIT_SECONDS, "standard", 0.0)
+
+    report = [sched.acquire_slot(GROUP, "standard", "ws-big") for _ in range(7)]
+    other = sched.acquire_slot(GROUP, "standard", "ws-small")
+
+    assert sum(slot is not None for slot in report) == 5
+    assert other is not None
+    for slot in report:
+        sched.release_slot(slot, "ok")
+    assert fake_redis.hashes[sched._key(GROUP, "ws")]["ws-big"] == 0
+
+
+def test_limit_backs_off_on_rate_limits_and_recovers_additively(fake_redis) -> None:
+    class RateLimitError(Exception):
+        status_code = 429
+
+    slot = sched.acquire_slot(GROUP, "standard")
+    sched.release_slot(slot, sched.classify_outcome(RateLimitError(), 1.0))
+    assert sched.get_scheduler_stats(GROUP)["limit"] == 5.0
+
+    # A burst of 429s only halves the limit once per cooldown window.
+    sched.release_slot(sched.acquire_slot(GROUP, "standard"), "throttled")
+    assert sched.get_scheduler_stats(GROUP)["limit"] == 5.0
+
+    sched.release_slot(sched.acquire_slot(GROUP, "standard"), "ok")
+    assert sched.get_scheduler_stats(GROUP)["limit"] == pytest.approx(5.2)
+    assert sched.classify_outcome(None, sched.SLOW_CALL_SECONDS + 1) == "slow"
+    assert sched.get_scheduler_stats(GROUP)["throttled"] == 2
+
+
+def test_waiter_is_admitted_once_a_slot_frees(fake_redis) -> None:
+    held = [sched.acquire_slot(GROUP, "interactive") for _ in range(10)]
+    calls: list[str] = []
+
+    def _release_soon() -> None:
+        sched.release_slot(held[0], "ok")
+
+    import threading
+
+    threading.Timer(0.05, _release_soon).start()
+    result = sched.scheduled(GROUP, "interactive", None, lambda: calls.append("ran") or "done")
+
+    assert result == "done" and calls == ["ran"]
+    assert sched.get_scheduler_stats(GROUP)["classes"]["interactive"]["avg_wait_ms"] > 0
+
+
+def test_scheduler_outage_lets_calls_through(monkeypatch) -> None:
+    def _down(**_: Any) -> Any:
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(sched, "get_shared_sync_redis", _down)
+
+    assert sched.scheduled(GROUP, None, "ws-1", lambda: "answer") == "answer"
+
+
+class _AsyncFacade:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self._redis = redis
+
+    async def eval(self, *args: Any) -> Any:
+        return self._redis.eval(*args)
+
+    async def zrem(self, *args: Any) -> int:
+        return self._redis.zrem(*args)
+
+    async def hincrby(self, *args: Any) -> int:
+        return self._redis.hincrby(*args)
+
+    def pipeline(self, transaction: bool = True) -> Any:  # noqa: ARG002
+        pipe = self._redis.pipeline()
+
+        class _AsyncPipe:
+            def __getattr__(self, name: str) -> Any:
+                return getattr(pipe, name)
+
+            async def execute(self) -> list[Any]:
+                return pipe.execute()
+
+        return _AsyncPipe()
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_holds_its_slot_until_drained(fake_redis, monkeypatch) -> None:
+    facade = _AsyncFacade(fake_redis)
+
+    async def _get_client() -> _AsyncFacade:
+        return facade
+
+    monkeypatch.setattr(sched, "get_redis_client", _get_client)
+
+    async def _chunks() -> Any:
+        for piece in ("a", "b"):
+            await asyncio.sleep(0)
+            yield piece
+
+    async def _call() -> Any:
+        return _chunks()
+
+    stream = await sched.ascheduled(GROUP, "interactive", None, _call, stream=True)
+    assert sched.get_scheduler_stats(GROUP)["in_use"] == 1
+
+    assert [chunk async for chunk in stream] == ["a", "b"]
+    assert sched.get_scheduler_stats(GROUP)["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_streams_are_judged_by_time_to_first_chunk(fake_redis, monkeypatch) -> None:
+    facade = _AsyncFacade(fake_redis)
+
+    async def _get_client() -> _AsyncFacade:
+        return facade
+
+    monkeypatch.setattr(sched, "get_redis_client", _get_client)
+    monkeypatch.setattr(sched, "SLOW_CALL_SECONDS", 0.05)
+
+    async def _chunks(first_delay: float, then: float) -> Any:
+        await asyncio.sleep(first_delay)
+        yield "a"
+        await asyncio.sleep(then)
+        yield "b"
+
+    async def _drain(first_delay: float, then: float) -> None:
+        async def _call() -> Any:
+            return _chunks(first_delay, then)
+
+        stream = await sched.ascheduled(GROUP, "interactive", None, _call, stream=True)
+        assert [chunk async for chunk in stream] == ["a", "b"]
+
+    # A long answer from a prompt provider is a healthy call.
+    await _drain(0, 0.1)
+    assert sched.get_scheduler_stats(GROUP)["limit"] == pytest.approx(10.1)
+
+    # A provider that takes long to start answering is slow.
+    await _drain(0.1, 0)
+    assert sched.get_scheduler_stats(GROUP)["limit"] == pytest.approx(10.1 * 0.8)
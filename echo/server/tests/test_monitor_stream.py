@@ -0,0 +1,126 @@
+"""Coalesced monitor dirty notifications: leading + trailing edge per project."""
+
+from __future__ import annotations
+
+import time
+import asyncio
+from typing import Any, Optional
+
+import pytest
+
+import dembrane.monitor_stream as monitor_stream
+
+
+class _FakeRedis:
+    """Async Redis stand-in whose `eval` emulates the notify / flush scripts
+    (SET NX PX gate, pending flag, stats hash, publish) against a real clock."""
+
+    def __init__(self) -> None:
+        self.expiry: dict[str, float] = {}
+        self.store: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, int]] = {}
+        self.published: list[str] = []
+
+    def _alive(self, key: str) -> bool:
+        if key in self.store and self.expiry.get(key, float("inf")) <= time.monotonic():
+            del self.store[key]
+        return key in self.store
+
+    def _set_px(self, key: str, ms: float) -> None:
+        self.store[key] = "1"
+        self.expiry[key] = time.monotonic() + ms / 1000
+
+    def _pttl(self, key: str) -> int:
+        if not self._alive(key):
+            return 0
+        return max(0, int((self.expiry[key] - time.monotonic()) * 1000))
+
+    def _publish(self, gate: str, pending: str, stats: str, channel: str, ms: float) -> None:
+        self._set_px(gate, ms)
+        self.store.pop(pending, None)
+        self.published.append(channel)
+        bucket = self.hashes.setdefault(stats, {})
+        bucket["published"] = bucket.get("published", 0) + 1
+
+    async def eval(self, script: str, numkeys: int, *args: Any) -> int:
+        gate, pending, stats = args[:numkeys]
+        channel, interval_ms = args[numkeys], float(args[numkeys + 1])
+        if script == monitor_stream._FLUSH_DIRTY_SCRIPT:
+            if not self._alive(pending):
+                return -2
+            if self._alive(gate):
+                return self._pttl(gate)
+            self._publish(gate, pending, stats, channel, interval_ms)
+            return -1
+        assert script == monitor_stream._NOTIFY_DIRTY_SCRIPT
+        if not self._alive(gate):
+            self._publish(gate, pending, stats, channel, interval_ms)
+            return -1
+        self._set_px(pending, interval_ms * 4)
+        bucket = self.hashes.setdefault(stats, {})
+        bucket["suppressed"] = bucket.get("suppressed", 0) + 1
+        return self._pttl(gate)
+
+    async def hgetall(self, key: str) -> dict[bytes, bytes]:
+        return {k.encode(): str(v).encode() for k, v in self.hashes.get(key, {}).items()}
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> _FakeRedis:
+    client = _FakeRedis()
+
+    async def _get_client() -> _FakeRedis:
+        return client
+
+    monkeypatch.setattr(monitor_stream, "get_redis_client", _get_client)
+    monkeypatch.setattr(monitor_stream, "_trailing_flushes", {})
+    return client
+
+
+async def _settle(interval_ms: int) -> None:
+    await asyncio.sleep(interval_ms / 1000 * 3)
+
+
+@pytest.mark.asyncio
+async def test_burst_collapses_to_leading_and_trailing_publish(fake_redis: _FakeRedis) -> None:
+    for _ in range(200):
+        await monitor_stream.publish_monitor_dirty("p1", interval_ms=40)
+
+    # Leading edge went out immediately; everything else waits for the window.
+    assert fake_redis.published == ["monitor:project:p1"]
+
+    await _settle(40)
+    assert fake_redis.published == ["monitor:project:p1"] * 2
+    assert await monitor_stream.get_dirty_stats("p1") == {"published": 2, "suppressed": 199}
+
+
+@pytest.mark.asyncio
+async def test_single_signal_has_no_trailing_publish(fake_redis: _FakeRedis) -> None:
+    await monitor_stream.publish_monitor_dirty("p1", interval_ms=40)
+    await _settle(40)
+
+    assert fake_redis.published == ["monitor:project:p1"]
+    assert monitor_stream._trailing_flushes == {}
+
+
+@pytest.mark.asyncio
+async def test_projects_are_coalesced_independently(fake_redis: _FakeRedis) -> None:
+    await monitor_stream.publish_monitor_dirty("p1", interval_ms=40)
+    await monitor_stream.publish_monitor_dirty("p2", interval_ms=40)
+    await monitor_stream.publish_monitor_dirty("p1", interval_ms=40)
+
+    assert fake_redis.published == ["monitor:project:p1", "monitor:project:p2"]
+    await _settle(40)
+    assert fake_redis.published.count("monitor:project:p1") == 2
+    assert fake_redis.published.count("monitor:project:p2") == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_swallows_redis_errors(monkeypatch) -> None:
+    async def _down() -> Optional[Any]:
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(monitor_stream, "get_redis_client", _down)
+
+    await monitor_stream.publish_monitor_dirty("p1")
+    assert await monitor_stream.get_dirty_stats("p1") == {"published": 0, "suppressed": 0}
@@ -0,0 +1,183 @@
+"""Unread badge counter: Redis-held count, aggregate rebuild, push nudges."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import dembrane.notifications as notifications
+import dembrane.notification_badge as badge
+from dembrane.api.v2 import notifications as notifications_api
+
+
+class _FakeSyncRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, int] = {}
+        self.published: list[str] = []
+
+    def eval(self, script: str, numkeys: int, key: str, delta: int) -> int | None:  # noqa: ARG002
+        assert script == badge._ADJUST_SCRIPT  # noqa: SLF001
+        if key not in self.store:
+            return None
+        self.store[key] = max(0, self.store[key] + int(delta))
+        return self.store[key]
+
+    def set(self, key: str, value: int, ex: int | None = None) -> None:  # noqa: ARG002
+        self.store[key] = int(value)
+
+    def delete(self, key: str) -> None:
+        self.store.pop(key, None)
+
+    def publish(self, channel: str, message: bytes) -> None:  # noqa: ARG002
+        self.published.append(channel)
+
+
+class _FakeAsyncRedis:
+    def __init__(self, store: dict[str, int]) -> None:
+        self.store = store
+
+    async def get(self, key: str) -> bytes | None:
+        value = self.store.get(key)
+        return None if value is None else str(value).encode()
+
+    async def set(self, key: str, value: int, ex: int | None = None, nx: bool = False) -> bool:  # noqa: ARG002
+        if nx and key in self.store:
+            return False
+        self.store[key] = int(value)
+        return True
+
+
+@pytest.fixture
+def redis(monkeypatch) -> _FakeSyncRedis:
+    client = _FakeSyncRedis()
+    monkeypatch.setattr(badge, "get_shared_sync_redis", lambda **_: client)
+    monkeypatch.setattr(
+        badge, "get_redis_client", AsyncMock(return_value=_FakeAsyncRedis(client.store))
+    )
+    return client
+
+
+def test_adjust_leaves_a_missing_counter_alone(redis) -> None:
+    assert badge.adjust_unread("u1", 1) is None
+    assert redis.store == {}
+    assert redis.published == [badge.badge_channel("u1")]
+
+
+def test_adjust_never_goes_below_zero(redis) -> None:
+    badge.set_unread("u1", 1)
+    assert badge.adjust_unread("u1", -1) == 0
+    assert badge.adjust_unread("u1", -1) == 0
+
+
+@pytest.mark.asyncio
+async def test_miss_rebuilds_from_a_count_aggregate_once(redis) -> None:
+    get_items = AsyncMock(return_value=[{"count": "7"}])
+    with patch.object(badge.async_directus, "get_items", get_items):
+        assert await badge.get_unread_count("u1") == 7
+        badge.adjust_unread("u1", 1)
+        assert await badge.get_unread_count("u1") == 8
+
+    get_items.assert_awaited_once()
+    query = get_items.await_args.args[1]["query"]
+    assert query["aggregate"] == {"count": "*"}
+    assert query["filter"]["audience_user_id"] == {"_eq": "u1"}
+    assert "limit" not in query and "fields" not in query
+
+
+@pytest.mark.asyncio
+async def test_emit_increments_the_recipients_counter(redis) -> None:
+    badge.set_unread("u1", 2)
+    with patch.object(notifications.async_directus, "create_item", AsyncMock()):
+        await notifications.emit(audience_user_id="u1", event_code="test.event", title="Hi")
+
+    assert redis.store[badge.unread_key("u1")] == 3
+
+
+@pytest.mark.asyncio
+async def test_mark_read_and_mark_all_read_update_the_counter(redis) -> None:
+    badge.set_unread("u1", 3)
+    auth = SimpleNamespace(user_id="d1")
+    directus = SimpleNamespace(
+        get_item=AsyncMock(
+            side_effect=[
+                {"id": "n1", "audience_user_id": "u1", "read_at": None},
+                {"id": "n2", "audience_user_id": "u1", "read_at": None, "expires_at": "2000-01-01"},
+            ]
+        ),
+        update_item=AsyncMock(),
+        get_items=AsyncMock(return_value=[{"id": "n3"}]),
+        update_many=AsyncMock(return_value=[{"id": "n3"}]),
+    )
+    with (
+        patch.object(notifications_api, "async_directus", directus),
+        patch.object(
+            notifications_api, "get_app_user_or_raise", AsyncMock(return_value={"id": "u1"})
+        ),
+    ):
+        await notifications_api.mark_read("n1", auth)
+        assert redis.store[badge.unread_key("u1")] == 2
+        # Expired rows were never counted.
+        await notifications_api.mark_read("n2", auth)
+        assert redis.store[badge.unread_key("u1")] == 2
+
+        assert await notifications_api.mark_all_read(auth) == {"status": "read", "marked": 1}
+        assert redis.store[badge.unread_key("u1")] == 0
+
+        directus.get_items.return_value = [{"id": f"n{i}"} for i in range(500)]
+        directus.update_many.return_value = directus.get_items.return_value
+        await notifications_api.mark_all_read(auth)
+        assert badge.unread_key("u1") not in redis.store
+
+
+class _FakePubSub:
+    def __init__(self, nudges: list[Any]) -> None:
+        self.nudges = nudges
+
+    async def get_message(self, ignore_subscribe_messages: bool, timeout: float) -> Any:  # noqa: ARG002
+        return self.nudges.pop(0) if self.nudges and timeout else None
+
+
+class _Request:
+    def __init__(self, polls: int) -> None:
+        self.polls = polls
+
+    async def is_disconnected(self) -> bool:
+        self.polls -= 1
+        return self.polls < 0
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_the_count_on_connect_and_after_a_nudge(redis) -> None:
+    counts = iter([4, 5, 5])
+
+    async def _count(_uid: str) -> int:
+        return next(counts)
+
+    pubsub = _FakePubSub([{"data": b"1"}, {"data": b"1"}])
+
+    class _Subscribe:
+        async def __aenter__(self) -> _FakePubSub:
+            return pubsub
+
+        async def __aexit__(self, *_exc: Any) -> None:
+            return None
+
+    with (
+        patch.object(notifications_api, "get_unread_count", _count),
+        patch.object(notifications_api, "subscribe_badge", lambda _uid: _Subscribe()),
+        patch.object(
+            notifications_api, "get_app_user_or_raise", AsyncMock(return_value={"id": "u1"})
+        ),
+    ):
+        response = await notifications_api.unread_count_stream(
+            _Request(polls=3), SimpleNamespace(user_id="d1")
+        )
+        chunks = [chunk async for chunk in response.body_iterator]
+
+    events = [json.loads(chunk.split("data: ", 1)[1]) for chunk in chunks]
+    assert events == [{"unread": 4}, {"unread": 5}]
+    assert all(chunk.startswith("event: unread\n") for chunk in chunks)
@@ -0,0 +1,107 @@
+"""emit_to_audience: one scope lookup, batched inserts, idempotent retries."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import dembrane.notifications as notifications
+
+
+class _FakeDirectus:
+    def __init__(self) -> None:
+        self.rows: dict[str, dict[str, Any]] = {}
+        self.creates: list[int] = []
+        self.lookups = 0
+
+    async def get_item(self, collection: str, item_id: str) -> dict[str, Any]:
+        self.lookups += 1
+        return {"id": item_id, "name": f"{collection} {item_id}"}
+
+    async def get_items(self, collection: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        assert collection == "notification"
+        wanted = params["query"]["filter"]["id"]["_in"]
+        return [{"id": key} for key in wanted if key in self.rows]
+
+    async def create_item(self, collection: str, data: Any) -> dict[str, Any]:
+        assert collection == "notification"
+        batch = data if isinstance(data, list) else [data]
+        self.creates.append(len(batch))
+        for row in batch:
+            if row["id"] in self.rows:
+                raise RuntimeError("duplicate key")
+        for row in batch:
+            self.rows[row["id"]] = row
+        return {"data": data}
+
+
+@pytest.fixture
+def directus(monkeypatch) -> _FakeDirectus:
+    fake = _FakeDirectus()
+    monkeypatch.setattr(notifications, "async_directus", fake)
+    monkeypatch.setattr(notifications, "aadjust_unread_many", AsyncMock())
+    return fake
+
+
+EMIT = {
+    "actor_user_id": "actor",
+    "event_code": "WORKSPACE_CREATED",
+    "title": "New workspace",
+    "ref_org_id": "o1",
+    "ref_workspace_id": "w1",
+}
+
+
+@pytest.mark.asyncio
+async def test_fan_out_resolves_scope_once_and_inserts_in_one_batch(directus) -> None:
+    created = await notifications.emit_to_audience(["u1", "actor", "u2", "u1", "u3"], **EMIT)
+
+    assert len(created) == 3
+    assert directus.lookups == 2  # org + workspace, not per recipient
+    assert directus.creates == [3]
+    rows = list(directus.rows.values())
+    assert [row["audience_user_id"] for row in rows] == ["u1", "u2", "u3"]
+    assert {row["scope"] for row in rows} == {"org o1 › workspace w1"}
+    notifications.aadjust_unread_many.assert_awaited_once_with(["u1", "u2", "u3"])
+
+
+@pytest.mark.asyncio
+async def test_retry_with_the_same_key_notifies_nobody_twice(directus) -> None:
+    first = await notifications.emit_to_audience(["u1", "u2"], idempotency_key="k", **EMIT)
+    # The retried action reaches one more admin; only they get a new row.
+    second = await notifications.emit_to_audience(["u1", "u2", "u3"], idempotency_key="k", **EMIT)
+
+    assert len(directus.rows) == 3
+    assert second == [notifications.notification_id_for("k", "u3")]
+    assert set(first) < set(directus.rows)
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_single_inserts(directus) -> None:
+    rows = [
+        {"id": notifications.notification_id_for("k", uid), "audience_user_id": uid}
+        for uid in ("u1", "u2", "u3")
+    ]
+    # A concurrent retry inserted u2's row after the existence check.
+    directus.rows[rows[1]["id"]] = rows[1]
+
+    written = await notifications.write_notification_rows(rows)
+
+    assert directus.creates == [3, 1, 1, 1]
+    assert written == [rows[0]["id"], rows[2]["id"]]
+    notifications.aadjust_unread_many.assert_awaited_once_with(["u1", "u3"])
+
+
+@pytest.mark.asyncio
+async def test_large_audiences_are_queued_for_the_worker(directus) -> None:
+    audience = [f"u{i}" for i in range(notifications.FANOUT_INLINE_MAX + 1)]
+
+    with patch("dembrane.tasks.task_emit_notifications") as task:
+        created = await notifications.emit_to_audience(audience, **EMIT)
+
+    (rows,) = task.send.call_args.args
+    assert [row["id"] for row in rows] == created
+    assert len(rows) == len(audience)
+    assert directus.creates == []
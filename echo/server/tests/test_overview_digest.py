@@ -0,0 +1,226 @@
+"""Overview digest: packing with hierarchical rollups, incremental refresh, debounce."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+import dembrane.tasks as tasks
+import dembrane.overview_digest as digest_mod
+from dembrane.overview_digest import pack_overview
+
+
+def _leaf(n: int, tokens: int = 10) -> dict[str, Any]:
+    return {
+        "id": f"c{n}",
+        "updated_at": f"2026-01-{n:02d}",
+        "name": f"Participant {n}",
+        "tags": "",
+        "created_at": f"2026-01-{n:02d}",
+        "duration": 60,
+        "summary": f"summary {n}",
+        "tokens": tokens,
+    }
+
+
+def _newest_first(count: int) -> list[dict[str, Any]]:
+    return [_leaf(n) for n in range(count, 0, -1)]
+
+
+class _Summarizer:
+    def __init__(self) -> None:
+        self.groups: list[list[str]] = []
+
+    def __call__(self, members: list[dict[str, Any]]) -> str:
+        self.groups.append([member["id"] for member in members])
+        return f"rollup of {len(members)}"
+
+
+def _tokens(_text: str) -> int:
+    return 5
+
+
+def test_everything_fits_without_rollups() -> None:
+    summarize = _Summarizer()
+
+    context, rollups, total = pack_overview(_newest_first(4), 100, {}, summarize, _tokens)
+
+    assert [entry["name"] for entry in context][0] == "Participant 4"
+    assert len(context) == 4 and rollups == {} and total == 40
+    assert summarize.groups == []
+
+
+def test_older_summaries_are_rolled_up_in_groups(monkeypatch) -> None:
+    monkeypatch.setattr(digest_mod, "ROLLUP_GROUP_SIZE", 3)
+    summarize = _Summarizer()
+
+    # Budget 50: 3 recent leaves (30 <= 0.75 * 50), 7 older ones in groups of 3.
+    context, rollups, total = pack_overview(_newest_first(10), 50, {}, summarize, _tokens)
+
+    assert [entry["name"] for entry in context[:3]] == [
+        "Participant 10",
+        "Participant 9",
+        "Participant 8",
+    ]
+    assert summarize.groups == [["c1", "c2", "c3"], ["c4", "c5", "c6"], ["c7"]]
+    # Newest group right after the verbatim summaries.
+    assert [entry["name"] for entry in context[3:]] == [
+        "1 earlier conversations",
+        "3 earlier conversations",
+        "3 earlier conversations",
+    ]
+    assert context[4]["created_at"] == "2026-01-04 - 2026-01-06"
+    assert total == 45 and len(rollups) == 3
+
+
+def test_new_conversation_only_resummarizes_the_newest_group(monkeypatch) -> None:
+    monkeypatch.setattr(digest_mod, "ROLLUP_GROUP_SIZE", 3)
+    first = _Summarizer()
+    _, rollups, _ = pack_overview(_newest_first(10), 50, {}, first, _tokens)
+
+    second = _Summarizer()
+    pack_overview(_newest_first(11), 50, rollups, second, _tokens)
+
+    # c8 drifted out of the verbatim set; only the group it joined is new.
+    assert second.groups == [["c7", "c8"]]
+
+
+def test_failed_rollup_keeps_its_members_within_the_budget(monkeypatch) -> None:
+    monkeypatch.setattr(digest_mod, "ROLLUP_GROUP_SIZE", 3)
+
+    def summarize(members: list[dict[str, Any]]) -> str | None:
+        return None if members[0]["id"] == "c4" else f"rollup of {len(members)}"
+
+    # Budget 80: 6 recent leaves (60), then c1-c3 rolled up and c4's group failed.
+    context, rollups, total = pack_overview(_newest_first(10), 80, {}, summarize, _tokens)
+
+    assert [entry["name"] for entry in context[6:]] == [
+        "Participant 4",
+        "3 earlier conversations",
+    ]
+    assert total == 75 and len(rollups) == 1
+
+
+def test_rollups_are_rolled_up_again_when_still_over_budget(monkeypatch) -> None:
+    monkeypatch.setattr(digest_mod, "ROLLUP_GROUP_SIZE", 2)
+    summarize = _Summarizer()
+
+    context, rollups, total = pack_overview(_newest_first(12), 13, {}, summarize, _tokens)
+
+    # Level 1: 12 leaves in 6 pairs (30 tokens); level 2: 3 groups (15);
+    # level 3: 2 groups (10) fits the 13-token budget.
+    assert len(summarize.groups) == 6 + 3 + 2
+    assert [len(group) for group in summarize.groups[-2:]] == [2, 1]
+    assert all(member.startswith("rollup:") for member in summarize.groups[-1])
+    assert [entry["name"] for entry in context] == [
+        "4 earlier conversations",
+        "8 earlier conversations",
+    ]
+    assert total == 10
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    def set(self, key: str, value: bytes, nx: bool = False, ex: int | None = None) -> bool:  # noqa: ARG002
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def delete(self, key: str) -> int:
+        return int(self.data.pop(key, None) is not None)
+
+    def incr(self, key: str) -> int:
+        value = int(self.data.get(key, b"0")) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    def expire(self, _key: str, _ttl: int) -> None:
+        return None
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> _FakeRedis:
+    client = _FakeRedis()
+    monkeypatch.setattr(digest_mod, "get_shared_sync_redis", lambda **_: client)
+    return client
+
+
+def _conversation(n: int, summary: str | None = "text", updated: str = "v1") -> dict[str, Any]:
+    return {
+        "id": f"c{n}",
+        "participant_name": f"P{n}",
+        "summary": summary,
+        "created_at": f"2026-01-{n:02d}",
+        "updated_at": updated,
+        "duration": 30,
+        "chunks_count": 2,
+        "tags": [{"project_tag_id": {"text": "housing"}}],
+    }
+
+
+def test_refresh_counts_only_changed_summaries_and_queues_stragglers(
+    fake_redis, monkeypatch
+) -> None:
+    conversations = [_conversation(2), _conversation(1), _conversation(3, summary=None)]
+    queued: list[list[str]] = []
+    counted: list[str] = []
+    monkeypatch.setattr(digest_mod, "_fetch_project", lambda _pid: ("nl", conversations))
+    monkeypatch.setattr(digest_mod, "_queue_stragglers", lambda ids: queued.append(ids))
+
+    def _count(text: str) -> int:
+        counted.append(text)
+        return 7
+
+    first = digest_mod.refresh_overview_digest("p1", budget=1000, count_tokens=_count)
+    conversations[0] = _conversation(2, summary="edited", updated="v2")
+    second = digest_mod.refresh_overview_digest("p1", budget=1000, count_tokens=_count)
+
+    assert (first["version"], second["version"]) == (1, 2)
+    assert counted == ["text", "text", "edited"]
+    assert queued == [["c3"], ["c3"]]
+    assert [entry["summary"] for entry in second["context"]] == ["edited", "text"]
+    assert second["context"][0]["tags"] == "housing"
+
+
+@pytest.mark.asyncio
+async def test_digest_is_loaded_with_its_version(fake_redis, monkeypatch) -> None:
+    monkeypatch.setattr(digest_mod, "_fetch_project", lambda _pid: ("en", [_conversation(1)]))
+    monkeypatch.setattr(digest_mod, "_queue_stragglers", lambda _ids: None)
+    digest_mod.refresh_overview_digest("p1", budget=1000, count_tokens=len)
+
+    class _Async:
+        async def get(self, key: str) -> bytes | None:
+            return fake_redis.get(key)
+
+    async def _client() -> _Async:
+        return _Async()
+
+    monkeypatch.setattr(digest_mod, "get_redis_client", _client)
+
+    loaded = await digest_mod.aload_overview_digest("p1")
+    assert loaded is not None and loaded["version"] == 1 and loaded["stale"] is False
+    assert await digest_mod.aget_overview_digest_version("p1") == 1
+    assert await digest_mod.aload_overview_digest("p2") is None
+
+
+def test_refresh_requests_are_debounced(fake_redis, monkeypatch) -> None:
+    sent: list[tuple] = []
+    monkeypatch.setattr(
+        tasks.task_refresh_overview_digest,
+        "send_with_options",
+        lambda **kwargs: sent.append(kwargs["args"]),
+    )
+
+    assert digest_mod.request_overview_refresh("p1") is True
+    assert digest_mod.request_overview_refresh("p1") is False
+    # The refresh itself clears the marker, so later summaries enqueue again.
+    fake_redis.delete(digest_mod._key("p1", "pending"))
+    assert digest_mod.request_overview_refresh("p1") is True
+    assert sent == [("p1",), ("p1",)]
@@ -0,0 +1,180 @@
+"""Report progress: a capped Redis Stream per report, resumed by Last-Event-ID."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import dembrane.directus as directus_module
+import dembrane.redis_async as redis_async
+import dembrane.coordination as coordination
+import dembrane.report_events as report_events
+from dembrane.api import project
+from dembrane.api.dependency_auth import DirectusSession
+
+
+def _id_key(entry_id: str) -> tuple[int, int]:
+    ms, seq = entry_id.split("-")
+    return int(ms), int(seq)
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeStreams") -> None:
+        self.redis = redis
+        self.ops: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def queue(*args: Any, **kwargs: Any) -> "_FakePipeline":
+            self.ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list[Any]:
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.ops]
+
+
+class _FakeStreams:
+    """Sync side (decode_responses=True) as the worker sees it."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self.ttls: dict[str, int] = {}
+        self._seq = 0
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    def xadd(
+        self,
+        key: str,
+        fields: dict[str, str],
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+    ) -> str:
+        self._seq += 1
+        entry_id = f"1700000000000-{self._seq}"
+        entries = self.streams.setdefault(key, [])
+        entries.append((entry_id, dict(fields)))
+        if maxlen is not None:
+            del entries[:-maxlen]
+        return entry_id
+
+    def expire(self, key: str, seconds: int) -> bool:
+        self.ttls[key] = seconds
+        return True
+
+
+class _AsyncStreams:
+    """Async side (raw bytes) as the API sees it; XREAD never blocks."""
+
+    def __init__(self, redis: _FakeStreams) -> None:
+        self.redis = redis
+
+    async def xread(
+        self, streams: dict[str, str], count: Optional[int] = None, block: Optional[int] = None
+    ) -> list[Any]:
+        ((key, after),) = streams.items()
+        entries = [
+            (entry_id.encode(), {k.encode(): v.encode() for k, v in fields.items()})
+            for entry_id, fields in self.redis.streams.get(key, [])
+            if _id_key(entry_id) > _id_key(after)
+        ][:count]
+        return [(key.encode(), entries)] if entries else []
+
+
+@pytest.fixture
+def redis(monkeypatch) -> _FakeStreams:
+    fake = _FakeStreams()
+    monkeypatch.setattr(report_events, "get_shared_sync_redis", lambda **_: fake)
+    monkeypatch.setattr(
+        redis_async, "get_redis_client", AsyncMock(return_value=_AsyncStreams(fake))
+    )
+    return fake
+
+
+def _request(last_event_id: Optional[str] = None) -> MagicMock:
+    request = MagicMock()
+    request.headers = {"last-event-id": last_event_id} if last_event_id else {}
+    request.is_disconnected = AsyncMock(return_value=False)
+    return request
+
+
+async def _open(request: MagicMock) -> Any:
+    with patch.object(project, "_verify_project_access", AsyncMock()):
+        response = await project.stream_report_progress(
+            "p1", 7, request, DirectusSession(user_id="u1", is_admin=False)
+        )
+    return response.body_iterator
+
+
+def _parse(frame: str) -> tuple[Optional[str], dict[str, Any]]:
+    lines = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+    return lines.get("id"), json.loads(lines["data"])
+
+
+@pytest.fixture(autouse=True)
+def draft_report():
+    with patch.object(directus_module.directus, "get_item", return_value={"status": "draft"}):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_reconnect_mid_report_resumes_without_gaps(redis) -> None:
+    published = [
+        report_events.publish_report_progress(7, "summarizing", f"Summarising {i}/3")
+        for i in range(1, 4)
+    ]
+
+    first = await _open(_request())
+    assert _parse(await first.__anext__())[1]["type"] == "connected"
+    seen = [_parse(await first.__anext__())[0] for _ in range(2)]
+    await first.aclose()  # the client drops mid-report
+
+    published += [
+        report_events.publish_report_progress(7, "fetching_transcripts", "Fetching transcripts..."),
+        report_events.publish_report_progress(7, "generating", "Generating report..."),
+        report_events.publish_report_progress(7, "completed", "Report ready"),
+    ]
+
+    second = await _open(_request(last_event_id=seen[-1]))
+    frames = [_parse(frame) async for frame in second]
+
+    assert frames[0][1]["type"] == "connected"
+    seen += [event_id for event_id, _ in frames[1:]]
+    assert seen == published
+    assert frames[-1][1]["type"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_late_client_replays_from_the_start(redis) -> None:
+    report_events.publish_report_progress(7, "summarizing", "Summarising 1/1")
+    report_events.publish_report_progress(7, "failed", "boom")
+
+    # An unparseable id is treated as no id at all.
+    frames = [_parse(frame) async for frame in await _open(_request("garbage"))]
+
+    assert [event["type"] for _, event in frames] == ["connected", "summarizing", "failed"]
+    assert all(event_id for event_id, _ in frames[1:])
+
+
+def test_publisher_reuses_one_capped_expiring_stream(monkeypatch) -> None:
+    fake = _FakeStreams()
+    from_url = MagicMock(return_value=fake)
+    monkeypatch.setattr(coordination, "_shared_sync_clients", {})
+    monkeypatch.setattr("redis.from_url", from_url)
+    monkeypatch.setattr(report_events, "REPORT_STREAM_MAXLEN", 2)
+
+    for i in range(3):
+        report_events.publish_report_progress(7, "summarizing", f"Summarising {i}")
+
+    from_url.assert_called_once()
+    (key,) = fake.streams
+    assert [json.loads(f["event"])["message"] for _, f in fake.streams[key]] == [
+        "Summarising 1",
+        "Summarising 2",
+    ]
+    assert fake.ttls[key] == report_events.REPORT_STREAM_TTL_SECONDS
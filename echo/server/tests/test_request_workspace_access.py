@@ -91,3 +91,49 @@ async def test_billing_can_request():
 @pytest.mark.asyncio
 async def test_external_only_rejected():
     assert await _post(org_role="member", is_external=True) == 403
+
+
+async def _submit(*, pending: list[dict[str, Any]]) -> tuple[dict[str, Any], AsyncMock, AsyncMock]:
+    mock = _mock(org_role="member")
+    plain_get_items = mock.get_items.side_effect
+
+    async def get_items(collection: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        if collection == "access_request":
+            return pending
+        return await plain_get_items(collection, params)
+
+    mock.get_items = AsyncMock(side_effect=get_items)
+    emit = AsyncMock()
+    with (
+        patch("dembrane.api.v2.access_requests.async_directus", mock),
+        patch("dembrane.directus_async.async_directus", _ba_mock()),
+        patch("dembrane.api.v2.access_requests._request_access_rate_limiter.check", AsyncMock()),
+        patch("dembrane.api.v2.access_requests.get_app_user_or_raise", AsyncMock(return_value=_APP_USER)),
+        patch("dembrane.api.v2.access_requests.is_org_external_only", AsyncMock(return_value=False)),
+        patch("dembrane.notifications.emit_to_audience", emit),
+        patch("dembrane.notifications.audience_workspace_admins", AsyncMock(return_value=["a1"])),
+        patch("dembrane.notifications.audience_organisation_admins", AsyncMock(return_value=[])),
+    ):
+        app = _build_app()
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            res = await client.post(f"/v2/workspaces/{_WS_ID}/access-requests")
+    assert res.status_code == 200
+    return res.json(), mock.create_item, emit
+
+
+@pytest.mark.asyncio
+async def test_new_request_notifies_keyed_on_its_row():
+    body, create_item, emit = await _submit(pending=[])
+
+    req_id = create_item.await_args.args[1]["id"]
+    assert body["request_id"] == req_id
+    assert emit.await_args.kwargs["idempotency_key"] == f"MEMBERSHIP_REQUESTED:{req_id}"
+
+
+@pytest.mark.asyncio
+async def test_double_submit_joins_the_pending_request_without_notifying():
+    body, create_item, emit = await _submit(pending=[{"id": "req-0"}])
+
+    assert body == {"status": "already_pending", "request_id": "req-0"}
+    create_item.assert_not_awaited()
+    emit.assert_not_awaited()
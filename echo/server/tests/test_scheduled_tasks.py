@@ -1,13 +1,17 @@
 """Unit tests for the durable scheduled_task queue (ECHO-863).
 
 Covers the sync runner primitives (claim / reconcile / mark), the async
-enqueue + cancel helpers, and the runner's task_type dispatch routing. A small
-in-memory FakeClient mimics the Directus filter operators the helpers rely on.
+enqueue + cancel helpers, the Redis due index and its runner, and the runner's
+task_type dispatch routing. A small in-memory FakeClient mimics the Directus
+filter operators the helpers rely on; FakeRedis covers the due index.
 """
 
 from __future__ import annotations
 
+import threading
+from typing import Any
 from datetime import datetime, timezone, timedelta
+from contextlib import contextmanager
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -61,11 +65,105 @@ class FakeClient:
         self.rows[str(item_id)].update(patch)
         return {"data": self.rows[str(item_id)]}
 
+    def update_many(self, collection: str, keys: list[str], patch: dict) -> list[dict]:
+        return [self.update_item(collection, key, patch)["data"] for key in keys]
+
     def create_item(self, collection: str, payload: dict) -> dict:
         self.rows[str(payload["id"])] = dict(payload)
         return {"data": payload}
 
 
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+
+    def subscribe(self, channel: str) -> None:
+        assert channel == st.WAKE_CHANNEL
+
+    def get_message(self, timeout: float) -> Any:
+        if timeout:
+            self.redis.sleeps.append(timeout)
+            if self.redis.stop_after_sleep is not None:
+                self.redis.stop_after_sleep.set()
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class FakeRedis:
+    """Sorted sets + publish log; eval runs the due-index pop script."""
+
+    def __init__(self) -> None:
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.published: list[tuple[str, str]] = []
+        self.sleeps: list[float] = []
+        self.stop_after_sleep: threading.Event | None = None
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> None:
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key: str, *members: str) -> None:
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    def zrange(self, key: str, start: int, end: int, withscores: bool = False) -> list:
+        assert (start, end, withscores) == (0, 0, True)
+        ordered = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return ordered[:1]
+
+    def eval(self, script: str, numkeys: int, key: str, now: str, limit: int) -> list[str]:
+        assert script == st._POP_DUE_SCRIPT and numkeys == 1
+        zset = self.zsets.get(key, {})
+        due = sorted((m for m, score in zset.items() if score <= float(now)), key=zset.get)
+        due = due[: int(limit)]
+        for member in due:
+            del zset[member]
+        return due
+
+    def publish(self, channel: str, message: str) -> None:
+        self.published.append((channel, message))
+
+    def pipeline(self, transaction: bool = True) -> "FakeRedis":
+        return self
+
+    def execute(self) -> list:
+        return []
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        return FakePubSub(self)
+
+
+class FakeAsyncRedis:
+    """The async client over the same FakeRedis, as schedule_task sees it."""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+
+    def pipeline(self, transaction: bool = True) -> "FakeAsyncRedis":
+        return self
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> None:
+        self.redis.zadd(key, mapping)
+
+    def publish(self, channel: str, message: str) -> None:
+        self.redis.publish(channel, message)
+
+    async def execute(self) -> list:
+        return []
+
+    async def zrem(self, key: str, *members: str) -> None:
+        self.redis.zrem(key, *members)
+
+
+@pytest.fixture(autouse=True)
+def redis(monkeypatch) -> FakeRedis:
+    fake = FakeRedis()
+    monkeypatch.setattr(st, "get_shared_sync_redis", lambda **_: fake)
+    monkeypatch.setattr(st, "get_redis_client", AsyncMock(return_value=FakeAsyncRedis(fake)))
+    return fake
+
+
 def _iso(dt: datetime) -> str:
     return dt.isoformat()
 
@@ -161,6 +259,7 @@ def _async_directus_over(fake: FakeClient) -> AsyncMock:
     m.get_items = AsyncMock(side_effect=lambda c, p=None: fake.get_items(c, p))
     m.create_item = AsyncMock(side_effect=lambda c, p: fake.create_item(c, p))
     m.update_item = AsyncMock(side_effect=lambda c, i, p: fake.update_item(c, i, p))
+    m.update_many = AsyncMock(side_effect=lambda c, k, p: fake.update_many(c, k, p))
     return m
 
 
@@ -203,6 +302,125 @@ async def test_cancel_pending_tasks_matches_payload_and_status():
     assert fake.rows["t4"]["status"] == "completed"  # already terminal
 
 
+@pytest.mark.asyncio
+async def test_schedule_task_indexes_the_row_and_wakes_the_runner(redis):
+    when = _NOW + timedelta(minutes=3)
+    with patch("dembrane.scheduled_tasks.async_directus", _async_directus_over(FakeClient())):
+        task_id = await st.schedule_task(task_type=st.TASK_CANVAS_TICK, scheduled_at=when)
+
+    assert redis.zsets[st.DUE_INDEX_KEY] == {task_id: when.timestamp()}
+    assert redis.published == [(st.WAKE_CHANNEL, task_id)]
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending_tasks_drops_index_entries(redis):
+    fake = FakeClient(
+        [{"id": "t1", "task_type": st.TASK_GENERATE_REPORT, "status": "scheduled", "payload": {}}]
+    )
+    redis.zadd(st.DUE_INDEX_KEY, {"t1": 1.0, "t2": 2.0})
+    with patch("dembrane.scheduled_tasks.async_directus", _async_directus_over(fake)):
+        await st.cancel_pending_tasks(task_type=st.TASK_GENERATE_REPORT, payload_match={})
+
+    assert redis.zsets[st.DUE_INDEX_KEY] == {"t2": 2.0}
+
+
+# ── due index ────────────────────────────────────────────────────────────────
+
+
+def test_enqueue_task_sync_indexes_naive_iso_as_utc(redis):
+    task_id = st.enqueue_task_sync(
+        FakeClient(), task_type=st.TASK_GENERATE_REPORT, scheduled_at_iso="2026-01-01T09:00:05"
+    )
+    expected = datetime(2026, 1, 1, 9, 0, 5, tzinfo=timezone.utc).timestamp()
+    assert redis.zsets[st.DUE_INDEX_KEY] == {task_id: expected}
+
+
+def test_pop_due_takes_each_due_id_once(redis):
+    now = _NOW.timestamp()
+    redis.zadd(st.DUE_INDEX_KEY, {"late": now - 60, "due": now - 1, "later": now + 20})
+
+    assert st.pop_due_task_ids(redis, now=now) == ["late", "due"]
+    assert st.pop_due_task_ids(redis, now=now) == []
+    assert st.seconds_until_next_due(redis, now=now) == pytest.approx(20)
+
+
+def test_seconds_until_next_due_is_capped(redis):
+    assert st.seconds_until_next_due(redis) == st.RUNNER_IDLE_SECONDS
+    redis.zadd(st.DUE_INDEX_KEY, {"far": _NOW.timestamp() + 86400})
+    assert st.seconds_until_next_due(redis) == st.RUNNER_IDLE_SECONDS
+
+
+def test_claim_tasks_by_id_skips_rows_no_longer_scheduled():
+    client = FakeClient(
+        [
+            {"id": "a", "status": "scheduled", "scheduled_at": _PAST, "attempts": 0},
+            {"id": "b", "status": "cancelled", "scheduled_at": _PAST, "attempts": 0},
+            {"id": "c", "status": "processing", "scheduled_at": _PAST, "attempts": 1},
+        ]
+    )
+    claimed = st.claim_tasks_by_id(client, ["a", "b", "c"])
+    assert [r["id"] for r in claimed] == ["a"]
+    assert client.rows["a"]["status"] == "processing"
+    assert client.rows["b"]["status"] == "cancelled"
+
+
+def test_rebuild_due_index_covers_the_horizon_only(redis):
+    soon = _NOW + timedelta(minutes=30)
+    client = FakeClient(
+        [
+            {"id": "overdue", "status": "scheduled", "scheduled_at": _PAST},
+            {"id": "soon", "status": "scheduled", "scheduled_at": _iso(soon)},
+            {"id": "far", "status": "scheduled", "scheduled_at": _iso(_NOW + timedelta(days=2))},
+            {"id": "busy", "status": "processing", "scheduled_at": _PAST},
+        ]
+    )
+    assert st.rebuild_due_index(client) == 2
+    assert set(redis.zsets[st.DUE_INDEX_KEY]) == {"overdue", "soon"}
+
+
+def test_claim_due_tasks_due_before_leaves_recent_rows_to_the_runner():
+    client = FakeClient(
+        [
+            {"id": "overdue", "status": "scheduled", "scheduled_at": _PAST, "attempts": 0},
+            {"id": "recent", "status": "scheduled", "scheduled_at": _iso(_NOW), "attempts": 0},
+        ]
+    )
+    cutoff = _iso(_NOW - timedelta(seconds=st.OVERDUE_GRACE_SECONDS))
+    claimed = st.claim_due_tasks(client, due_before=cutoff)
+    assert [r["id"] for r in claimed] == ["overdue"]
+
+
+def test_runner_dispatches_due_rows_then_sleeps_until_the_next(redis):
+    # Relative to the test's own clock: _NOW is taken at import, and a slow
+    # run would otherwise make "next" due as well.
+    next_at = datetime.now(timezone.utc) + timedelta(seconds=20)
+    client = FakeClient(
+        [
+            {"id": "due", "status": "scheduled", "scheduled_at": _PAST, "attempts": 0},
+            {"id": "next", "status": "scheduled", "scheduled_at": _iso(next_at), "attempts": 0},
+            {"id": "gone", "status": "cancelled", "scheduled_at": _PAST, "attempts": 0},
+        ]
+    )
+    redis.zadd(st.DUE_INDEX_KEY, {"gone": _NOW.timestamp() - 600})
+    dispatched: list[list[dict]] = []
+    stop = threading.Event()
+    redis.stop_after_sleep = stop
+
+    @contextmanager
+    def _context():
+        yield client
+
+    with patch("dembrane.directus.directus_client_context", _context):
+        st.run_due_index_runner(dispatched.append, stop)
+
+    # Startup rebuild indexed both rows; the due one went out claimed.
+    assert [[row["id"] for row in batch] for batch in dispatched] == [["due"]]
+    assert client.rows["due"]["status"] == "processing"
+    assert client.rows["gone"]["status"] == "cancelled"
+    assert list(redis.zsets[st.DUE_INDEX_KEY]) == ["next"]
+    assert len(redis.sleeps) == 1 and 0 < redis.sleeps[0] <= 20
+
+
 # ── dispatch routing ─────────────────────────────────────────────────────────
 
 
@@ -7,7 +7,7 @@ is_over_cap stamp, using mocked Directus calls.
 from __future__ import annotations
 
 import logging
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -81,12 +81,13 @@ def _setup_mocks(
 class TestStampOverCapWiring:
     """Tests that _stamp_over_cap correctly fetches data and applies the stamp."""
 
+    @patch("dembrane.usage_ledger.get_lifetime_seconds", new_callable=AsyncMock)
     @patch("dembrane.directus.directus_client_context")
     @patch("dembrane.directus.directus")
     @patch("dembrane.service.project_service")
     @patch("dembrane.service.conversation_service")
     def test_free_over_cap_stamps_true(
-        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_logger
+        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_lifetime, mock_logger
     ):
         """Free workspace at 1.5h lifetime, 0.3h conversation → stamps True."""
         mock_conv_svc.get_by_id_or_raise.return_value = _make_conversation(duration=1080)
@@ -94,10 +95,7 @@ class TestStampOverCapWiring:
 
         mock_client = MagicMock()
         mock_client.get_item.side_effect = _get_item_for("free")
-        mock_client.get_items.side_effect = [
-            [{"id": "proj-1"}],
-            [{"duration": 5400}],  # 1.5h total
-        ]
+        mock_lifetime.return_value = 5400  # 1.5h total
         mock_ctx = MagicMock()
         mock_ctx.__enter__ = MagicMock(return_value=mock_client)
         mock_ctx.__exit__ = MagicMock(return_value=False)
@@ -107,12 +105,13 @@ class TestStampOverCapWiring:
 
         mock_conv_svc.update.assert_called_once_with(conversation_id="conv-1", is_over_cap=True)
 
+    @patch("dembrane.usage_ledger.get_lifetime_seconds", new_callable=AsyncMock)
     @patch("dembrane.directus.directus_client_context")
     @patch("dembrane.directus.directus")
     @patch("dembrane.service.project_service")
     @patch("dembrane.service.conversation_service")
     def test_free_under_cap_no_stamp(
-        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_logger
+        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_lifetime, mock_logger
     ):
         """Free workspace at 0.6h lifetime, 0.3h conversation → persists is_over_cap=False."""
         mock_conv_svc.get_by_id_or_raise.return_value = _make_conversation(duration=1080)
@@ -120,10 +119,7 @@ class TestStampOverCapWiring:
 
         mock_client = MagicMock()
         mock_client.get_item.side_effect = _get_item_for("free")
-        mock_client.get_items.side_effect = [
-            [{"id": "proj-1"}],
-            [{"duration": 2160}],  # 0.6h total
-        ]
+        mock_lifetime.return_value = 2160  # 0.6h total
         mock_ctx = MagicMock()
         mock_ctx.__enter__ = MagicMock(return_value=mock_client)
         mock_ctx.__exit__ = MagicMock(return_value=False)
@@ -133,12 +129,13 @@ class TestStampOverCapWiring:
 
         mock_conv_svc.update.assert_called_once_with(conversation_id="conv-1", is_over_cap=False)
 
+    @patch("dembrane.usage_ledger.get_lifetime_seconds", new_callable=AsyncMock)
     @patch("dembrane.directus.directus_client_context")
     @patch("dembrane.directus.directus")
     @patch("dembrane.service.project_service")
     @patch("dembrane.service.conversation_service")
     def test_pioneer_never_stamps(
-        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_logger
+        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_lifetime, mock_logger
     ):
         """Pioneer workspace at 999h → stamp False (overage tier, never locked)."""
         mock_conv_svc.get_by_id_or_raise.return_value = _make_conversation(duration=3600)
@@ -146,10 +143,7 @@ class TestStampOverCapWiring:
 
         mock_client = MagicMock()
         mock_client.get_item.side_effect = _get_item_for("pioneer")
-        mock_client.get_items.side_effect = [
-            [{"id": "proj-1"}],
-            [{"duration": 3596400}],
-        ]
+        mock_lifetime.return_value = 3596400
         mock_ctx = MagicMock()
         mock_ctx.__enter__ = MagicMock(return_value=mock_client)
         mock_ctx.__exit__ = MagicMock(return_value=False)
@@ -159,12 +153,13 @@ class TestStampOverCapWiring:
 
         mock_conv_svc.update.assert_called_once_with(conversation_id="conv-1", is_over_cap=False)
 
+    @patch("dembrane.usage_ledger.get_lifetime_seconds", new_callable=AsyncMock)
     @patch("dembrane.directus.directus_client_context")
     @patch("dembrane.directus.directus")
     @patch("dembrane.service.project_service")
     @patch("dembrane.service.conversation_service")
     def test_soft_edge_crossed_cap_during_recording(
-        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_logger
+        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_lifetime, mock_logger
     ):
         """Free at 1.1h after 0.6h recording → soft edge: stamp False (ADR 0001)."""
         mock_conv_svc.get_by_id_or_raise.return_value = _make_conversation(duration=2160)
@@ -172,10 +167,7 @@ class TestStampOverCapWiring:
 
         mock_client = MagicMock()
         mock_client.get_item.side_effect = _get_item_for("free")
-        mock_client.get_items.side_effect = [
-            [{"id": "proj-1"}],
-            [{"duration": 3960}],  # 1.1h
-        ]
+        mock_lifetime.return_value = 3960  # 1.1h
         mock_ctx = MagicMock()
         mock_ctx.__enter__ = MagicMock(return_value=mock_client)
         mock_ctx.__exit__ = MagicMock(return_value=False)
@@ -214,12 +206,13 @@ class TestStampOverCapWiring:
 
         mock_conv_svc.update.assert_not_called()
 
+    @patch("dembrane.usage_ledger.get_lifetime_seconds", new_callable=AsyncMock)
     @patch("dembrane.directus.directus_client_context")
     @patch("dembrane.directus.directus")
     @patch("dembrane.service.project_service")
     @patch("dembrane.service.conversation_service")
     def test_free_started_at_cap_stamps_true(
-        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_logger
+        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_lifetime, mock_logger
     ):
         """Free at 1.5h after 0.5h recording → started at 1.0h, exactly at the 1h cap."""
         mock_conv_svc.get_by_id_or_raise.return_value = _make_conversation(duration=1800)
@@ -227,10 +220,7 @@ class TestStampOverCapWiring:
 
         mock_client = MagicMock()
         mock_client.get_item.side_effect = _get_item_for("free")
-        mock_client.get_items.side_effect = [
-            [{"id": "proj-1"}],
-            [{"duration": 5400}],  # 1.5h
-        ]
+        mock_lifetime.return_value = 5400  # 1.5h
         mock_ctx = MagicMock()
         mock_ctx.__enter__ = MagicMock(return_value=mock_client)
         mock_ctx.__exit__ = MagicMock(return_value=False)
@@ -240,27 +230,21 @@ class TestStampOverCapWiring:
 
         mock_conv_svc.update.assert_called_once_with(conversation_id="conv-1", is_over_cap=True)
 
+    @patch("dembrane.usage_ledger.get_lifetime_seconds", new_callable=AsyncMock)
     @patch("dembrane.directus.directus_client_context")
     @patch("dembrane.directus.directus")
     @patch("dembrane.service.project_service")
     @patch("dembrane.service.conversation_service")
-    def test_multi_project_workspace_sums_all(
-        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_logger
+    def test_workspace_hours_come_from_the_ledger(
+        self, mock_conv_svc, mock_proj_svc, _mock_directus, mock_ctx_fn, mock_lifetime, mock_logger
     ):
-        """Workspace with multiple projects sums hours across all of them."""
+        """Workspace hours are the ledger's lifetime total across all projects."""
         mock_conv_svc.get_by_id_or_raise.return_value = _make_conversation(duration=1080)
         mock_proj_svc.get_by_id_or_raise.return_value = _make_project()
 
         mock_client = MagicMock()
         mock_client.get_item.side_effect = _get_item_for("free")
-        mock_client.get_items.side_effect = [
-            [{"id": "proj-1"}, {"id": "proj-2"}],
-            [
-                {"duration": 1800},
-                {"duration": 3600},
-                {"duration": 1080},
-            ],  # total 1.8h
-        ]
+        mock_lifetime.return_value = 6480  # total 1.8h
         mock_ctx = MagicMock()
         mock_ctx.__enter__ = MagicMock(return_value=mock_client)
         mock_ctx.__exit__ = MagicMock(return_value=False)
@@ -270,6 +254,8 @@ class TestStampOverCapWiring:
 
         # 1.8h - 0.3h = 1.5h >= 1h cap → stamps True
         mock_conv_svc.update.assert_called_once_with(conversation_id="conv-1", is_over_cap=True)
+        mock_lifetime.assert_awaited_once_with("ws-1")
+        mock_client.get_items.assert_not_called()
 
 
 def test_get_by_id_or_raise_deleted_at_filter():
@@ -321,3 +307,39 @@ def test_get_by_id_or_raise_deleted_at_filter():
         assert "filter" in query_arg["query"]
         assert query_arg["query"]["filter"]["id"] == "conv-1"
         assert "deleted_at" not in query_arg["query"]["filter"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("lifetime_seconds", "duration_filter"),
+    [
+        # 1.5h used, 1h included: stamps on conversations longer than 0.5h clear.
+        (5400, {"_gt": 1800}),
+        # Back under the cap: every stamp clears, null durations included.
+        (1800, None),
+    ],
+)
+async def test_upgrade_recalculation_is_one_ledger_driven_bulk_clear(
+    lifetime_seconds, duration_filter
+):
+    from dembrane import tier_downgrade
+
+    directus = MagicMock()
+    directus.update_by_filter = AsyncMock(return_value=[{"id": "c1"}])
+    directus.get_items = AsyncMock()
+    with (
+        patch.object(tier_downgrade, "async_directus", directus),
+        patch(
+            "dembrane.usage_ledger.get_lifetime_seconds",
+            AsyncMock(return_value=lifetime_seconds),
+        ),
+    ):
+        await tier_downgrade.recalculate_over_cap_on_upgrade("ws-1", "free")
+
+    directus.get_items.assert_not_called()
+    directus.update_by_filter.assert_awaited_once()
+    collection, query_filter, data = directus.update_by_filter.await_args.args
+    assert (collection, data) == ("conversation", {"is_over_cap": False})
+    assert query_filter["project_id"] == {"workspace_id": {"_eq": "ws-1"}}
+    assert query_filter["is_over_cap"] == {"_eq": True}
+    assert query_filter.get("duration") == duration_filter
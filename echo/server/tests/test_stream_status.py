@@ -0,0 +1,138 @@
+"""stream_with_status: bounded buffering, coalesced writes, disconnects, metrics."""
+
+from __future__ import annotations
+
+import json
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+
+from dembrane.stream_status import StreamMetrics, stream_with_status
+
+
+class FakeTokens:
+    """Token generator standing in for the LLM stream; records how far it got."""
+
+    def __init__(self, count: int, delay: float = 0.0, first_delay: float = 0.0) -> None:
+        self.count = count
+        self.delay = delay
+        self.first_delay = first_delay
+        self.produced = 0
+        self.closed = False
+
+    async def __call__(self) -> AsyncGenerator[str, None]:
+        try:
+            if self.first_delay:
+                await asyncio.sleep(self.first_delay)
+            for i in range(self.count):
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                self.produced += 1
+                yield f"0:{json.dumps(f't{i} ')}\n"
+        finally:
+            self.closed = True
+
+
+def _expected(count: int) -> str:
+    return "".join(f"0:{json.dumps(f't{i} ')}\n" for i in range(count))
+
+
+@pytest.mark.asyncio
+async def test_fast_tokens_are_coalesced_after_the_first() -> None:
+    tokens = FakeTokens(300)
+    metrics = StreamMetrics()
+
+    writes = [w async for w in stream_with_status(tokens(), metrics=metrics, flush_bytes=256)]
+
+    assert "".join(writes) == _expected(300)
+    assert writes[0] == _expected(1)  # not held back for coalescing
+    assert len(writes) < 300 / 10
+    assert all(len(w) < 256 + 16 for w in writes)
+    assert metrics.completed and metrics.chunks_in == 300
+    assert metrics.writes == len(writes)
+    assert metrics.bytes_out == len(_expected(300).encode())
+    assert metrics.ttft_seconds is not None
+
+
+@pytest.mark.asyncio
+async def test_slow_tokens_are_flushed_within_the_interval() -> None:
+    tokens = FakeTokens(4, delay=0.1)
+
+    writes = [w async for w in stream_with_status(tokens(), flush_interval_seconds=0.01)]
+
+    # Each token is written on its own, long before the next one arrives.
+    assert writes == [_expected(i + 1)[len(_expected(i)) :] for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_slow_reader_holds_the_upstream_back() -> None:
+    tokens = FakeTokens(1000)
+    metrics = StreamMetrics()
+    stream = stream_with_status(tokens(), queue_maxsize=8, flush_bytes=64, metrics=metrics)
+
+    received = []
+    for _ in range(3):
+        received.append(await stream.__anext__())
+        await asyncio.sleep(0.05)  # a client that reads slowly
+
+    # Only what the queue and one pending write can hold was pulled upstream.
+    consumed = sum(w.count("\n") for w in received)
+    assert tokens.produced - consumed <= 8 + 64 // 8 + 2
+    assert metrics.stalls > 0
+
+    received += [w async for w in stream]
+    assert "".join(received) == _expected(1000)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_closes_the_upstream_promptly() -> None:
+    tokens = FakeTokens(10_000, delay=0.005)
+    metrics = StreamMetrics()
+    stream = stream_with_status(tokens(), metrics=metrics)
+
+    await stream.__anext__()
+    await stream.__anext__()
+    await stream.aclose()  # what Starlette does when the client goes away
+
+    assert tokens.closed
+    produced = tokens.produced
+    await asyncio.sleep(0.05)
+    assert tokens.produced == produced
+    assert not metrics.completed
+
+
+@pytest.mark.asyncio
+async def test_high_load_status_before_the_first_token() -> None:
+    tokens = FakeTokens(2, first_delay=0.1)
+
+    writes = [w async for w in stream_with_status(tokens(), delay_threshold_seconds=0.02)]
+
+    assert writes[0].startswith("2:") and "high_load" in writes[0]
+    assert "".join(writes[1:]) == _expected(2)
+
+
+@pytest.mark.asyncio
+async def test_text_protocol_gets_no_status_event() -> None:
+    tokens = FakeTokens(2, first_delay=0.05)
+
+    writes = [
+        w async for w in stream_with_status(tokens(), delay_threshold_seconds=0.01, protocol="text")
+    ]
+
+    assert "".join(writes) == _expected(2)
+
+
+@pytest.mark.asyncio
+async def test_upstream_error_is_raised_after_the_buffered_text() -> None:
+    async def failing() -> AsyncGenerator[str, None]:
+        yield '0:"a"\n'
+        yield '0:"b"\n'
+        raise RuntimeError("provider went away")
+
+    stream = stream_with_status(failing(), flush_interval_seconds=10)
+    received = [await stream.__anext__(), await stream.__anext__()]
+
+    with pytest.raises(RuntimeError, match="provider went away"):
+        await stream.__anext__()
+    assert "".join(received) == '0:"a"\n0:"b"\n'
@@ -0,0 +1,125 @@
+"""Sliding-window conversation summarization: bound, timeouts, progress, cancellation."""
+
+from __future__ import annotations
+
+import time
+import asyncio
+
+import pytest
+
+import dembrane.summary_utils as summary_utils
+from dembrane.summary_utils import (
+    SummarizationResult,
+    summarize_conversations,
+    ensure_conversation_summaries,
+)
+
+
+class _FakeSummarizer:
+    def __init__(self, delays: dict[str, float], fail: frozenset[str] = frozenset()) -> None:
+        self.delays = delays
+        self.fail = fail
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started: list[str] = []
+
+    async def __call__(self, conversation_id: str) -> SummarizationResult:
+        self.started.append(conversation_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(conversation_id, 0.001))
+        finally:
+            self.in_flight -= 1
+        if conversation_id in self.fail:
+            return SummarizationResult(conversation_id, success=False, error="llm error")
+        return SummarizationResult(conversation_id, success=True, summary="s")
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_every_item_is_processed() -> None:
+    ids = [f"c{n}" for n in range(12)]
+    summarize = _FakeSummarizer({}, fail=frozenset({"c3"}))
+
+    result = await summarize_conversations(ids, concurrency=4, summarize=summarize)
+
+    assert summarize.max_in_flight == 4
+    assert sorted(result.succeeded + result.failed) == sorted(ids)
+    assert result.failed == ["c3"] and result.errors == {"c3": "llm error"}
+
+
+@pytest.mark.asyncio
+async def test_a_slow_item_does_not_hold_up_the_others() -> None:
+    # Fixed batches of 2 would take 3 x 0.2s here; the window takes ~0.2s.
+    delays = {"slow-1": 0.2, "slow-2": 0.2, "slow-3": 0.2}
+    ids = ["slow-1", "a", "slow-2", "b", "slow-3", "c", "d", "e"]
+    summarize = _FakeSummarizer({**delays, **{cid: 0.01 for cid in "abcde"}})
+
+    started = time.monotonic()
+    result = await summarize_conversations(ids, concurrency=2, summarize=summarize)
+
+    assert time.monotonic() - started < 0.45
+    assert len(result.succeeded) == len(ids)
+
+
+@pytest.mark.asyncio
+async def test_timed_out_item_fails_and_frees_its_slot() -> None:
+    summarize = _FakeSummarizer({"stuck": 5.0})
+
+    result = await summarize_conversations(
+        ["stuck", "ok-1", "ok-2"], concurrency=1, item_timeout=0.05, summarize=summarize
+    )
+
+    assert result.failed == ["stuck"]
+    assert "Timed out" in result.errors["stuck"]
+    assert result.succeeded == ["ok-1", "ok-2"]
+
+
+@pytest.mark.asyncio
+async def test_progress_is_reported_per_item_and_callback_errors_are_contained() -> None:
+    seen: list[tuple[str, int, int]] = []
+
+    def _progress(item: SummarizationResult, done: int, total: int) -> None:
+        seen.append((item.conversation_id, done, total))
+        if done == 1:
+            raise RuntimeError("progress sink down")
+
+    result = await summarize_conversations(
+        ["a", "b", "c"], concurrency=2, on_progress=_progress, summarize=_FakeSummarizer({})
+    )
+
+    assert [entry[1:] for entry in seen] == [(1, 3), (2, 3), (3, 3)]
+    assert len(result.succeeded) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancellation_stops_new_items_and_reports_the_rest() -> None:
+    summarize = _FakeSummarizer({})
+    ids = [f"c{n}" for n in range(6)]
+
+    result = await summarize_conversations(
+        ids,
+        concurrency=1,
+        should_cancel=lambda: len(summarize.started) >= 3,
+        summarize=summarize,
+    )
+
+    assert summarize.started == ["c0", "c1", "c2"]
+    assert result.cancelled == ["c3", "c4", "c5"]
+    assert result.total_processed == 3
+
+
+@pytest.mark.asyncio
+async def test_ensure_skips_existing_summaries(monkeypatch) -> None:
+    summarize = _FakeSummarizer({})
+    monkeypatch.setattr(summary_utils, "safe_summarize_conversation", summarize)
+
+    async def _fake_thread_pool(_fn, *_args, **_kwargs):
+        return [{"id": "done", "summary": "already"}, {"id": "todo", "summary": None}]
+
+    monkeypatch.setattr(summary_utils, "run_in_thread_pool", _fake_thread_pool)
+
+    result = await ensure_conversation_summaries(["done", "todo"])
+
+    assert summarize.started == ["todo"]
+    assert result.succeeded == ["done", "todo"]
@@ -42,7 +42,7 @@ def _common_monkeypatch(monkeypatch, cleared):
 
 def _raise_in_loop(exc):
     def _run(coro_or_factory):
-        # the actor passes a summarize_conversation factory here; close the
+        # the actor passes a run_conversation_summary factory here; close the
         # created coroutine to avoid an "un-awaited coroutine" warning.
         coro = coro_or_factory() if callable(coro_or_factory) else coro_or_factory
         try:
@@ -37,7 +37,9 @@ def _router_dispatch(transcribe_json: dict[str, Any], correction_json: dict[str,
     user message) with transcribe_json and the correction/redaction call (candidate
     transcript text plus audio) with correction_json."""
 
-    def _fake(model: Any, messages: Any, response_format: Any) -> _FakeCompletion:
+    def _fake(
+        model: Any, messages: Any, response_format: Any, priority: Any = None
+    ) -> _FakeCompletion:
         user_msg = next(m for m in messages if m["role"] == "user")
         has_candidate_text = any(part.get("type") == "text" for part in user_msg["content"])
         return _FakeCompletion(
@@ -51,9 +53,12 @@ def test_transcribe_26_07_audio_only_no_candidate(monkeypatch: pytest.MonkeyPatc
     _stub_common(monkeypatch)
     captured: dict[str, Any] = {}
 
-    def _fake_router(model: Any, messages: Any, response_format: Any) -> _FakeCompletion:
+    def _fake_router(
+        model: Any, messages: Any, response_format: Any, priority: Any = None
+    ) -> _FakeCompletion:
         captured["model"] = model
         captured["messages"] = messages
+        captured["priority"] = priority
         return _FakeCompletion(
             json.dumps({"corrected_transcript": "hello world", "note": "speak closer"})
         )
@@ -68,6 +73,8 @@ def test_transcribe_26_07_audio_only_no_candidate(monkeypatch: pytest.MonkeyPatc
     assert meta["note"] == "speak closer"
     assert meta["error"] is None
     assert captured["model"] == transcribe.MODELS.MULTI_MODAL_PRO
+    # live transcription outranks the worker's background LLM work
+    assert captured["priority"] == "standard"
     user_msg = next(m for m in captured["messages"] if m["role"] == "user")
     # audio-only: no text (candidate transcript) part in the user message
     assert all(part.get("type") != "text" for part in user_msg["content"])
@@ -77,7 +84,9 @@ def test_transcribe_26_07_no_pii_is_single_call(monkeypatch: pytest.MonkeyPatch)
     _stub_common(monkeypatch)
     calls = {"n": 0}
 
-    def _fake_router(model: Any, messages: Any, response_format: Any) -> _FakeCompletion:
+    def _fake_router(
+        model: Any, messages: Any, response_format: Any, priority: Any = None
+    ) -> _FakeCompletion:
         calls["n"] += 1
         return _FakeCompletion(json.dumps({"corrected_transcript": "hello", "note": ""}))
 
@@ -109,7 +118,9 @@ def test_transcribe_26_07_prompt_override_replaces_transcription_prompt(
     _stub_common(monkeypatch)
     captured: dict[str, Any] = {}
 
-    def _fake_router(model: Any, messages: Any, response_format: Any) -> _FakeCompletion:
+    def _fake_router(
+        model: Any, messages: Any, response_format: Any, priority: Any = None
+    ) -> _FakeCompletion:
         captured["messages"] = messages
         return _FakeCompletion(json.dumps({"corrected_transcript": "HELLO", "note": ""}))
 
@@ -132,7 +143,9 @@ def test_transcribe_26_07_prompt_override_leaves_redaction_prompt_alone(
     _stub_common(monkeypatch)
     system_prompts: list[str] = []
 
-    def _fake_router(model: Any, messages: Any, response_format: Any) -> _FakeCompletion:
+    def _fake_router(
+        model: Any, messages: Any, response_format: Any, priority: Any = None
+    ) -> _FakeCompletion:
         system_msg = next(m for m in messages if m["role"] == "system")
         system_prompts.append(system_msg["content"][0]["text"])
         return _FakeCompletion(json.dumps({"corrected_transcript": "x", "note": ""}))
@@ -159,7 +172,9 @@ def test_transcribe_26_07_pii_runs_correction_pass_over_audio_and_transcript(
     _stub_common(monkeypatch)
     correction_msgs: dict[str, Any] = {}
 
-    def _router(model: Any, messages: Any, response_format: Any) -> _FakeCompletion:
+    def _router(
+        model: Any, messages: Any, response_format: Any, priority: Any = None
+    ) -> _FakeCompletion:
         user_msg = next(m for m in messages if m["role"] == "user")
         has_candidate_text = any(part.get("type") == "text" for part in user_msg["content"])
         if has_candidate_text:
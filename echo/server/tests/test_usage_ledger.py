@@ -0,0 +1,258 @@
+"""Usage ledger: O(1) counters, delta-idempotent records, Directus rebuild/reconcile."""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+from datetime import datetime, timezone
+
+import pytest
+
+import dembrane.usage_ledger as ledger
+
+NOW = datetime(2026, 5, 14, 12, 0, tzinfo=timezone.utc)
+
+
+class _FakeRedis:
+    """Async Redis stand-in covering the commands the ledger issues.
+
+    `eval` emulates _RECORD_DURATION_SCRIPT: delta vs the recorded duration,
+    applied only to counters that already exist.
+    """
+
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.sets: dict[str, set[str]] = {}
+        self.gets = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.gets += 1
+        value = self.store.get(key)
+        return value.encode("utf-8") if value is not None else None
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None, nx: bool = False) -> bool:
+        if nx and key in self.store:
+            return False
+        self.store[key] = str(value)
+        return True
+
+    async def sadd(self, key: str, *members: str) -> int:
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    async def smembers(self, key: str) -> set[bytes]:
+        return {m.encode("utf-8") for m in self.sets.get(key, set())}
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        return True
+
+    async def eval(self, script: str, numkeys: int, *args: Any) -> str:
+        assert script == ledger._RECORD_DURATION_SCRIPT
+        keys, argv = list(args[:numkeys]), list(args[numkeys:])
+        previous = float(self.store.get(keys[0], "0"))
+        current = float(argv[0])
+        delta = current - previous
+        self.store[keys[0]] = argv[0]
+        if delta != 0:
+            for key in keys[1:]:
+                if key in self.store:
+                    self.store[key] = repr(float(self.store[key]) + delta)
+        return repr(delta)
+
+
+class _FakeDirectus:
+    """Workspace ws-1 owns p1/p2; conversation rows carry created_at + duration."""
+
+    def __init__(self) -> None:
+        self.conversations: dict[str, dict[str, Any]] = {}
+        self.events: list[dict[str, Any]] = []
+        self.queries: list[tuple[str, dict]] = []
+
+    def add(self, conv_id: str, project_id: str, created_at: str, duration: float) -> None:
+        self.conversations[conv_id] = {
+            "id": conv_id,
+            "project_id": project_id,
+            "created_at": created_at,
+            "duration": duration,
+        }
+
+    async def get_item(self, collection: str, item_id: str, **_kwargs: Any) -> Any:
+        assert collection == "conversation"
+        row = self.conversations.get(item_id)
+        if row is None:
+            return None
+        return {
+            "created_at": row["created_at"],
+            "project_id": {"id": row["project_id"], "workspace_id": "ws-1"},
+        }
+
+    async def create_item(self, collection: str, data: dict[str, Any]) -> dict[str, Any]:
+        assert collection == ledger.USAGE_EVENT_COLLECTION
+        self.events.append(data)
+        return {"data": data}
+
+    async def get_items(self, collection: str, params: dict[str, Any]) -> Any:
+        query = params["query"]
+        self.queries.append((collection, query))
+        if collection == "project":
+            return [{"id": "p1"}, {"id": "p2"}]
+        assert "aggregate" in query, "ledger must never row-scan conversations"
+        filt = query["filter"]
+        rows = [
+            r for r in self.conversations.values() if r["project_id"] in filt["project_id"]["_in"]
+        ]
+        if "created_at" in filt:
+            lo, hi = filt["created_at"]["_gte"], filt["created_at"]["_lt"]
+            rows = [
+                r
+                for r in rows
+                if datetime.fromisoformat(lo)
+                <= datetime.fromisoformat(r["created_at"])
+                < datetime.fromisoformat(hi)
+            ]
+        return [{"sum": {"duration": sum(r["duration"] for r in rows)}}]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> _FakeRedis:
+    client = _FakeRedis()
+
+    async def _get_client() -> _FakeRedis:
+        return client
+
+    monkeypatch.setattr(ledger, "get_redis_client", _get_client)
+    return client
+
+
+@pytest.fixture
+def fake_directus(monkeypatch) -> _FakeDirectus:
+    directus = _FakeDirectus()
+    monkeypatch.setattr(ledger, "async_directus", directus)
+    return directus
+
+
+def test_cycle_bounds_roll_over_december() -> None:
+    assert ledger.cycle_bounds("2026-12") == (
+        "2026-12-01T00:00:00+00:00",
+        "2027-01-01T00:00:00+00:00",
+    )
+    assert ledger.cycle_for(datetime(2026, 3, 31, 23, 59)) == "2026-03"
+
+
+@pytest.mark.asyncio
+async def test_cold_read_rebuilds_from_aggregate_then_is_o1(
+    fake_redis: _FakeRedis, fake_directus: _FakeDirectus
+) -> None:
+    fake_directus.add("c1", "p1", "2026-05-02T10:00:00+00:00", 1800)
+    fake_directus.add("c2", "p2", "2026-04-30T10:00:00+00:00", 3600)
+
+    assert await ledger.get_cycle_seconds("ws-1", now=NOW) == 1800
+    queries_after_rebuild = len(fake_directus.queries)
+
+    for _ in range(50):
+        assert await ledger.get_cycle_seconds("ws-1", now=NOW) == 1800
+    assert len(fake_directus.queries) == queries_after_rebuild
+    assert "ws-1" in fake_redis.sets[ledger.active_workspaces_key("2026-05")]
+
+
+@pytest.mark.asyncio
+async def test_record_applies_delta_and_is_idempotent(
+    fake_redis: _FakeRedis, fake_directus: _FakeDirectus
+) -> None:
+    fake_directus.add("c1", "p1", "2026-05-02T10:00:00+00:00", 0)
+    await ledger.get_cycle_seconds("ws-1", now=NOW)
+    await ledger.get_lifetime_seconds("ws-1")
+
+    assert await ledger.record_conversation_duration("c1", 600, source="merge") == 600
+    # A late chunk re-merges to a longer duration: only the difference lands.
+    assert await ledger.record_conversation_duration("c1", 900, source="merge") == 300
+    # A retried merge with the same result is a zero delta.
+    assert await ledger.record_conversation_duration("c1", 900, source="merge") == 0
+
+    assert await ledger.get_cycle_seconds("ws-1", now=NOW) == 900
+    assert await ledger.get_lifetime_seconds("ws-1") == 900
+    assert [e["delta_seconds"] for e in fake_directus.events] == [600, 300, 0]
+    assert {e["cycle"] for e in fake_directus.events} == {"2026-05"}
+
+
+@pytest.mark.asyncio
+async def test_record_never_initialises_a_cold_counter(
+    fake_redis: _FakeRedis, fake_directus: _FakeDirectus
+) -> None:
+    fake_directus.add("c1", "p1", "2026-05-02T10:00:00+00:00", 1200)
+    fake_directus.add("c2", "p1", "2026-05-03T10:00:00+00:00", 600)
+
+    await ledger.record_conversation_duration("c2", 600, source="merge")
+    assert ledger.counter_key("ws-1", "2026-05") not in fake_redis.store
+
+    # The first read sees the full Directus truth, not just c2's delta.
+    assert await ledger.get_cycle_seconds("ws-1", now=NOW) == 1800
+
+
+@pytest.mark.asyncio
+async def test_record_skips_conversation_without_workspace(
+    fake_redis: _FakeRedis, fake_directus: _FakeDirectus
+) -> None:
+    assert await ledger.record_conversation_duration("missing", 60, source="merge") is None
+    assert fake_directus.events == []
+
+
+@pytest.mark.asyncio
+async def test_reconcile_overwrites_drifted_counters(
+    fake_redis: _FakeRedis, fake_directus: _FakeDirectus
+) -> None:
+    fake_directus.add("c1", "p1", "2026-05-02T10:00:00+00:00", 1800)
+    await ledger.get_cycle_seconds("ws-1", now=NOW)
+    fake_redis.store[ledger.counter_key("ws-1", "2026-05")] = "99999"
+
+    assert await ledger.reconcile_usage_counters(now=NOW) == 1
+    assert await ledger.get_cycle_seconds("ws-1", now=NOW) == 1800
+
+
+@pytest.mark.asyncio
+async def test_directus_error_is_never_cached(
+    fake_redis: _FakeRedis, fake_directus: _FakeDirectus, monkeypatch
+) -> None:
+    async def _broken(collection: str, params: dict[str, Any]) -> Any:
+        return {"error": "boom"}
+
+    monkeypatch.setattr(fake_directus, "get_items", _broken)
+    assert await ledger.get_cycle_seconds("ws-1", now=NOW) == 0.0
+    assert ledger.counter_key("ws-1", "2026-05") not in fake_redis.store
+
+
+@pytest.mark.asyncio
+async def test_pilot_gate_reads_ledger(
+    fake_redis: _FakeRedis, fake_directus: _FakeDirectus
+) -> None:
+    from dembrane.api.v2 import middleware
+
+    current = ledger.cycle_for(datetime.now(timezone.utc))
+    fake_redis.store[ledger.counter_key("ws-1", current)] = "36000"
+
+    assert await middleware._current_cycle_hours("ws-1") == 10.0
+    assert fake_directus.queries == []
+
+
+@pytest.mark.asyncio
+async def test_nightly_check_reports_drift_including_last_month(
+    fake_redis: _FakeRedis, fake_directus: _FakeDirectus
+) -> None:
+    fake_directus.add("c1", "p1", "2026-05-02T10:00:00+00:00", 1800)
+    fake_directus.add("c2", "p1", "2026-04-20T10:00:00+00:00", 3600)
+    await ledger.get_cycle_seconds("ws-1", now=NOW)
+    await ledger.get_seconds("ws-1", "2026-04")
+    await ledger.get_lifetime_seconds("ws-1")
+    fake_redis.store[ledger.counter_key("ws-1", "2026-04")] = "100.0"
+
+    drifted = await ledger.check_ledger_consistency(now=NOW)
+
+    assert drifted == [
+        {
+            "workspace_id": "ws-1",
+            "cycle": "2026-04",
+            "counter_seconds": 100.0,
+            "directus_seconds": 3600.0,
+        }
+    ]
+    assert await ledger.get_seconds("ws-1", "2026-04") == 3600
+    assert ledger.previous_cycle("2026-01") == "2025-12"
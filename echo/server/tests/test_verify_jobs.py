@@ -0,0 +1,231 @@
+"""Verification artifacts: one job per conversation/topic, budgeted audio, SSE replay."""
+
+from __future__ import annotations
+
+import json
+import time
+import threading
+from typing import Any, Optional
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import dembrane.api.verify as verify
+import dembrane.redis_async as redis_async
+from dembrane.verify_jobs import start_job
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    async def set(self, key: str, value: Any, nx: bool = False, ex: Optional[int] = None) -> Any:
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    async def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis(monkeypatch) -> _FakeRedis:
+    fake = _FakeRedis()
+    monkeypatch.setattr(redis_async, "get_redis_client", AsyncMock(return_value=fake))
+    return fake
+
+
+def _chunks(n: int) -> list[dict]:
+    return [
+        {"id": f"c{i}", "timestamp": None, "path": f"https://s3/chunk-{i}.mp3"} for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_double_click_joins_the_running_job(redis) -> None:
+    body = verify.GenerateArtifactsRequest(topic_list=["agreements"], conversation_id="conv-1")
+
+    with (
+        patch.object(verify, "GCP_SA_JSON", {"type": "service_account"}),
+        patch.object(verify, "_get_generation_topic", AsyncMock()),
+        patch.object(verify, "_conversation_has_chunks", AsyncMock(return_value=True)),
+        patch("dembrane.tasks.task_generate_verification_artifact") as task,
+    ):
+        first = await verify.generate_verification_artifacts(body)
+        second = await verify.generate_verification_artifacts(body)
+
+    assert first.created and not second.created
+    assert second.job_id == first.job_id
+    task.send.assert_called_once_with(first.job_id, "conv-1", "agreements")
+    # The joining request left no orphaned job state behind.
+    assert [key for key in redis.data if key.startswith("verify:job:")] == [
+        f"verify:job:{first.job_id}"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_enqueue_fails_the_job_and_releases_the_claim(redis) -> None:
+    body = verify.GenerateArtifactsRequest(topic_list=["agreements"], conversation_id="conv-1")
+
+    with (
+        patch.object(verify, "GCP_SA_JSON", {"type": "service_account"}),
+        patch.object(verify, "_get_generation_topic", AsyncMock()),
+        patch.object(verify, "_conversation_has_chunks", AsyncMock(return_value=True)),
+        patch("dembrane.tasks.task_generate_verification_artifact") as task,
+        patch.object(verify, "publish_job_progress") as publish,
+        patch.object(verify, "finish_job") as finish,
+    ):
+        task.send.side_effect = ConnectionError("broker down")
+        with pytest.raises(verify.HTTPException) as exc_info:
+            await verify.generate_verification_artifacts(body)
+
+    assert exc_info.value.status_code == 500
+    job_id = publish.call_args.args[0]
+    assert publish.call_args.args[1] == "failed"
+    finish.assert_called_once_with(job_id, "conv-1", "agreements")
+
+
+@pytest.mark.asyncio
+async def test_other_topics_get_their_own_job(redis) -> None:
+    first, _ = await start_job("conv-1", "agreements")
+    second, created = await start_job("conv-1", "actions")
+
+    assert created and second != first
+
+
+@pytest.mark.asyncio
+async def test_audio_keeps_the_newest_chunks_within_the_budget() -> None:
+    chunks = _chunks(5)
+    sizes = {chunk["path"]: 40 for chunk in chunks}
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fetch(path: str) -> dict:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return {"type": "file", "file": {"file_id": path}}
+
+    with (
+        patch.object(verify, "get_file_size_bytes_from_s3", sizes.__getitem__),
+        patch.object(verify, "_get_audio_file_object", side_effect=fetch) as get_audio,
+    ):
+        async with verify._prepared_audio(
+            chunks, "conv-1", byte_budget=100, concurrency=2, merge_min_chunks=0
+        ) as (parts, attached):
+            pass
+
+    assert [chunk["id"] for chunk in attached] == ["c3", "c4"]
+    assert get_audio.call_count == 2
+    assert peak <= 2
+    assert [part["type"] for part in parts] == ["text", "file", "text", "file"]
+    assert parts[1]["file"]["file_id"] == chunks[3]["path"]
+    assert "3 older chunk(s) omitted" in verify._format_audio_summary(attached, omitted=3)
+
+
+@pytest.mark.asyncio
+async def test_many_chunks_are_merged_and_the_merged_file_removed() -> None:
+    chunks = _chunks(4)
+
+    with (
+        patch.object(verify, "get_file_size_bytes_from_s3", return_value=10),
+        patch.object(
+            verify,
+            "merge_multiple_audio_files_and_save_to_s3",
+            return_value=("https://s3/merged.mp3", 12.0),
+        ) as merge,
+        patch.object(verify, "get_signed_url", return_value="https://s3/merged.mp3?sig"),
+        patch.object(verify, "_get_audio_file_object", return_value={"type": "file"}) as get_audio,
+        patch.object(verify, "delete_from_s3") as delete,
+    ):
+        async with verify._prepared_audio(chunks, "conv-1", merge_min_chunks=4) as (parts, _):
+            delete.assert_not_called()
+
+    assert merge.call_args.args[0] == [chunk["path"] for chunk in chunks]
+    get_audio.assert_called_once_with("https://s3/merged.mp3?sig")
+    assert len(parts) == 2
+    delete.assert_called_once_with("https://s3/merged.mp3")
+
+
+@pytest.mark.asyncio
+async def test_failed_merge_falls_back_to_separate_parts() -> None:
+    chunks = _chunks(4)
+
+    with (
+        patch.object(verify, "get_file_size_bytes_from_s3", return_value=10),
+        patch.object(
+            verify, "merge_multiple_audio_files_and_save_to_s3", side_effect=RuntimeError("ffmpeg")
+        ),
+        patch.object(verify, "_get_audio_file_object", return_value={"type": "file"}) as get_audio,
+        patch.object(verify, "delete_from_s3") as delete,
+    ):
+        async with verify._prepared_audio(chunks, "conv-1", merge_min_chunks=4) as (parts, _):
+            pass
+
+    assert get_audio.call_count == 4
+    assert len(parts) == 8
+    delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_progress_stream_replays_a_finished_job() -> None:
+    state = {"type": "completed", "message": "Artifact ready", "detail": {"artifact_list": []}}
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(return_value=False)
+
+    @asynccontextmanager
+    async def subscribe(_job_id: str) -> Any:
+        yield MagicMock()
+
+    with (
+        patch.object(verify, "get_job_state", AsyncMock(return_value=state)),
+        patch.object(verify, "subscribe_job_events", subscribe),
+        patch.object(verify, "read_job_event", AsyncMock()) as read_event,
+    ):
+        response = await verify.stream_verification_job("job-1", request)
+        frames = [frame async for frame in response.body_iterator]
+
+    assert frames == [f"event: progress\ndata: {json.dumps(state)}\n\n"]
+    read_event.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_progress_stream_for_unknown_job_is_404() -> None:
+    with patch.object(verify, "get_job_state", AsyncMock(return_value=None)):
+        with pytest.raises(verify.HTTPException) as exc:
+            await verify.stream_verification_job("missing", MagicMock())
+
+    assert exc.value.status_code == 404
+
+
+def test_worker_reports_failure_and_releases_the_claim() -> None:
+    from dembrane.tasks import task_generate_verification_artifact
+
+    published: list[tuple[str, Any]] = []
+
+    with (
+        patch.object(
+            verify,
+            "generate_verification_artifact",
+            AsyncMock(side_effect=verify.HTTPException(status_code=400, detail="gone")),
+        ),
+        patch(
+            "dembrane.verify_jobs.publish_job_progress",
+            lambda _job, event_type, _msg, detail=None: published.append((event_type, detail)),
+        ),
+        patch("dembrane.verify_jobs.finish_job") as finish,
+    ):
+        task_generate_verification_artifact.fn("job-1", "conv-1", "agreements")
+
+    assert published == [("started", None), ("failed", {"status_code": 400, "detail": "gone"})]
+    finish.assert_called_once_with("job-1", "conv-1", "agreements")